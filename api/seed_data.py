@@ -8,16 +8,25 @@ This script:
 4. Creates some audit log entries
 5. Flags some recommendations for review
 
+Scale mode bulk-generates a large, repeatable operator dataset for load
+testing the operator API (recommendations, traces, audit logs, flags):
+
+    python seed_data.py --recommendations 2M --audit-days 365 --operators 200
+
 Run with: python seed_data.py
 """
 
+import argparse
 import sqlite3
 from datetime import datetime, timedelta
+from functools import lru_cache
 import random
 import json
 import sys
 from pathlib import Path
 
+import numpy as np
+
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
@@ -41,6 +50,9 @@ PERSONAS = [
 PRIORITIES = ['high', 'medium', 'low']
 STATUSES = ['pending', 'approved', 'rejected', 'flagged']
 
+# Weight status toward pending (operator dashboard needs pending items)
+STATUS_WEIGHTS = [0.5, 0.2, 0.15, 0.15]  # pending, approved, rejected, flagged
+
 # Sample recommendation titles by persona
 RECOMMENDATION_TITLES = {
     'high_utilization': [
@@ -87,6 +99,23 @@ RECOMMENDATION_TITLES = {
     ]
 }
 
+# Operator notes and flag reasons
+APPROVAL_NOTES = ["LGTM", "Approved", "Good recommendation", ""]
+REJECTION_NOTES = [
+    "Rationale not specific enough",
+    "Content not appropriate for persona",
+    "Duplicate recommendation",
+    "User already received similar content"
+]
+FLAG_REASONS = [
+    "Content appropriateness unclear",
+    "Persona assignment needs review",
+    "Rationale seems generic",
+    "Similar recommendation recently sent",
+    "User feedback indicates poor match",
+    "Requires senior operator review"
+]
+
 # Sample rationales
 RATIONALE_TEMPLATES = {
     'high_utilization': "Based on your current credit utilization of {util}%, this resource can help you understand the impact on your credit score and strategies to reduce your balance. Many users with similar patterns have found this helpful.",
@@ -184,9 +213,7 @@ def seed_recommendations(conn, user_ids, num_recommendations=30):
         content_type = random.choice(CONTENT_TYPES)
         priority = random.choice(PRIORITIES)
         
-        # Weight status toward pending (operator dashboard needs pending items)
-        status_weights = [0.5, 0.2, 0.15, 0.15]  # pending, approved, rejected, flagged
-        status = random.choices(STATUSES, weights=status_weights)[0]
+        status = random.choices(STATUSES, weights=STATUS_WEIGHTS)[0]
         
         title = get_title_for_persona(persona)
         rationale = get_rationale_for_persona(persona)
@@ -211,16 +238,11 @@ def seed_recommendations(conn, user_ids, num_recommendations=30):
         if status == 'approved':
             approved_by = f"op_{random.randint(1, 5):03d}"
             approved_at = random_date_recent(20)
-            operator_notes = random.choice(["LGTM", "Approved", "Good recommendation", ""])
+            operator_notes = random.choice(APPROVAL_NOTES)
         elif status == 'rejected':
             rejected_by = f"op_{random.randint(1, 5):03d}"
             rejected_at = random_date_recent(20)
-            operator_notes = random.choice([
-                "Rationale not specific enough",
-                "Content not appropriate for persona",
-                "Duplicate recommendation",
-                "User already received similar content"
-            ])
+            operator_notes = random.choice(REJECTION_NOTES)
         
         # Read time (if article/video)
         read_time_minutes = None
@@ -399,15 +421,6 @@ def seed_flags(conn, recommendation_ids):
     
     print(f"Creating {num_flags} flags...")
     
-    flag_reasons = [
-        "Content appropriateness unclear",
-        "Persona assignment needs review",
-        "Rationale seems generic",
-        "Similar recommendation recently sent",
-        "User feedback indicates poor match",
-        "Requires senior operator review"
-    ]
-    
     operators = [f"op_{i:03d}" for i in range(1, 6)]
     
     for i in range(num_flags):
@@ -421,7 +434,7 @@ def seed_flags(conn, recommendation_ids):
         
         flagged_by = random.choice(operators)
         flagged_at = random_date_recent(20)
-        reason = random.choice(flag_reasons)
+        reason = random.choice(FLAG_REASONS)
         
         cursor.execute("""
             INSERT INTO recommendation_flags (
@@ -434,6 +447,465 @@ def seed_flags(conn, recommendation_ids):
     print(f"✓ Created {num_flags} flags")
 
 
+# ========================================================================
+# SCALE SEEDING (LOAD TESTING)
+# ========================================================================
+
+# Recommendations generated and committed per transaction in scale mode
+SCALE_BATCH_SIZE = 100_000
+
+# Pre-rendered variants per rationale / JSON payload pool in scale mode
+SCALE_POOL_SIZE = 1024
+
+# ID prefix of scale-mode rows (rec_scale_..., trace_scale_..., ...)
+SCALE_ID_TAG = 'scale'
+
+# Page cache used during scale seeding (KiB)
+SCALE_CACHE_SIZE_KIB = 262144
+
+# Operator tables filled in scale mode, in foreign key order
+SCALE_TABLES = ['recommendations', 'decision_traces', 'operator_audit_log', 'recommendation_flags']
+
+# Share of recommendations that also get a 'modify' audit entry
+MODIFY_RATE = 0.1
+
+# Share of flags that are resolved
+FLAG_RESOLVED_RATE = 0.3
+
+# Mean delay between generation and operator action (hours)
+ACTION_DELAY_HOURS = 18
+
+
+def parse_count(value: str) -> int:
+    """
+    Parse a row count with an optional K/M suffix ('2M', '500k', '1500').
+    
+    Args:
+        value: Count string
+    
+    Returns:
+        Count as an integer
+    
+    Raises:
+        ValueError: If the value is not a positive count
+    """
+    text = str(value).strip().lower().replace('_', '')
+    multiplier = {'k': 1_000, 'm': 1_000_000}.get(text[-1:], 1)
+    if multiplier > 1:
+        text = text[:-1]
+    
+    try:
+        count = int(float(text) * multiplier)
+    except ValueError:
+        raise ValueError(f"Invalid count: {value!r} (use e.g. 5000, 500k, 2M)")
+    
+    if count <= 0:
+        raise ValueError(f"Count must be positive: {value!r}")
+    return count
+
+
+def _table_columns(conn, table):
+    """
+    Get the columns of a table that seeding should fill.
+    
+    INTEGER PRIMARY KEY columns are left to SQLite (they alias the rowid).
+    """
+    columns = []
+    for row in conn.execute(f"PRAGMA table_info({table})"):
+        name, col_type, pk = row[1], row[2], row[5]
+        if pk and col_type.upper() == 'INTEGER':
+            continue
+        columns.append(name)
+    return columns
+
+
+def _drop_indexes(conn, tables):
+    """
+    Drop the explicit indexes of tables before a bulk load.
+    
+    Returns:
+        CREATE INDEX statements to restore them afterwards
+    """
+    placeholders = ', '.join('?' * len(tables))
+    rows = conn.execute(f"""
+        SELECT name, sql FROM sqlite_master
+        WHERE type = 'index' AND sql IS NOT NULL AND tbl_name IN ({placeholders})
+    """, tables).fetchall()
+    
+    for row in rows:
+        conn.execute(f"DROP INDEX IF EXISTS {row[0]}")
+    return [row[1] for row in rows]
+
+
+def _insert_rows(conn, table, columns, values):
+    """
+    Insert column arrays into a table with a single executemany.
+    
+    Only columns that exist in the table are written, so the same generator
+    works against older schemas missing some operator columns.
+    
+    Args:
+        conn: Database connection
+        table: Table name
+        columns: Insertable columns of the table (see _table_columns)
+        values: Column name -> list of values (all the same length)
+    
+    Returns:
+        Number of rows inserted
+    """
+    names = [c for c in columns if c in values]
+    rows = list(zip(*(values[c] for c in names)))
+    conn.executemany(
+        f"INSERT INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})",
+        rows
+    )
+    return len(rows)
+
+
+@lru_cache(maxsize=1)
+def _times_of_day():
+    """'THH:MM:SS' strings for every second of a day."""
+    times = np.datetime_as_string(np.arange(86400).astype('datetime64[s]'), unit='s')
+    return np.array(['T' + t[11:] for t in times], dtype=object)
+
+
+def _timestamps(seconds):
+    """
+    Render epoch seconds as ISO-8601 strings (one list item per row).
+    
+    Each date and time of day is formatted once and the pieces are joined,
+    which is much faster than formatting every timestamp.
+    """
+    days, times = np.divmod(np.asarray(seconds, dtype=np.int64), 86400)
+    if len(days) == 0:
+        return []
+    first = days.min()
+    dates = np.datetime_as_string(np.arange(first, days.max() + 1).astype('datetime64[D]')).astype(object)
+    return (dates[days - first] + _times_of_day()[times]).tolist()
+
+
+def _nullable(mask, values):
+    """Keep values where mask is set and None elsewhere."""
+    return [v if m else None for v, m in zip(values, mask)]
+
+
+def _build_pools(rng):
+    """
+    Pre-render rationales and JSON payloads for scale mode.
+    
+    Rows draw from these pools instead of formatting text one row at a
+    time, which keeps payload sizes realistic at bulk-load speed.
+    
+    Args:
+        rng: NumPy random generator
+    
+    Returns:
+        Dictionary of pools; per-persona pools are lists indexed by persona
+    """
+    size = SCALE_POOL_SIZE
+    
+    def rationales(persona):
+        template = RATIONALE_TEMPLATES.get(persona, RATIONALE_TEMPLATES['general'])
+        count = rng.integers(5, 13, size)
+        return [
+            template.format(util=u, gap=g, count=c, amount=c * k, rate=round(r, 1))
+            for u, g, c, k, r in zip(rng.integers(60, 96, size), rng.integers(14, 46, size),
+                                     count, rng.integers(8, 26, size), rng.uniform(5, 25, size))
+        ]
+    
+    def persona_assignments(persona):
+        return [
+            json.dumps({
+                'primary': persona,
+                'secondary': [PERSONAS[j] for j in rng.choice(len(PERSONAS), rng.integers(0, 3), replace=False)],
+                'confidence': round(float(rng.uniform(0.7, 0.99)), 2)
+            })
+            for _ in range(size)
+        ]
+    
+    def content_matches(persona):
+        titles = RECOMMENDATION_TITLES.get(persona, RECOMMENDATION_TITLES['general'])
+        return [
+            json.dumps([
+                {
+                    'content_id': f"content_{i}",
+                    'title': titles[rng.integers(len(titles))],
+                    'type': CONTENT_TYPES[rng.integers(len(CONTENT_TYPES))],
+                    'score': round(float(rng.uniform(0.7, 0.95)), 3)
+                }
+                for i in range(3)
+            ])
+            for _ in range(size)
+        ]
+    
+    return {
+        'rationale': [rationales(p) for p in PERSONAS],
+        'persona_assignment': [persona_assignments(p) for p in PERSONAS],
+        'content_matches': [content_matches(p) for p in PERSONAS],
+        'signals': [
+            json.dumps({
+                'credit_utilization': int(rng.integers(30, 96)),
+                'monthly_income': int(rng.integers(2000, 8001)),
+                'savings_rate': round(float(rng.uniform(5, 25)), 2),
+                'subscription_count': int(rng.integers(3, 16))
+            })
+            for _ in range(size)
+        ],
+        'relevance_scores': [
+            json.dumps({f"match_{i}": round(float(rng.uniform(0.6, 0.95)), 3) for i in range(5)})
+            for _ in range(size)
+        ],
+        'audit_metadata': [
+            json.dumps({
+                'notes': ['Quick review', 'Detailed check', 'Routine approval', ''][rng.integers(4)],
+                'duration_seconds': int(rng.integers(30, 301))
+            })
+            for _ in range(size)
+        ]
+    }
+
+
+def _pick(rng, pool, count, groups=None):
+    """Draw one pooled value per row (from the row's persona pool when grouped)."""
+    picks = rng.integers(0, SCALE_POOL_SIZE, count)
+    if groups is None:
+        return [pool[i] for i in picks]
+    return [pool[g][i] for g, i in zip(groups, picks)]
+
+
+def generate_scale_batch(rng, pools, start, count, user_ids, operator_ids,
+                         operator_weights, window_start, window_seconds):
+    """
+    Generate one batch of recommendations and their traces, audits and flags.
+    
+    Args:
+        rng: NumPy random generator
+        pools: Pre-rendered text pools (see _build_pools)
+        start: Index of the first recommendation in the batch
+        count: Number of recommendations
+        user_ids: Users to recommend to
+        operator_ids: Operator IDs
+        operator_weights: Probability of each operator handling an action
+        window_start: Epoch seconds of the start of the generation window
+        window_seconds: Length of the generation window in seconds
+    
+    Returns:
+        Dictionary mapping table name to column name -> list of values
+    """
+    now = window_start + window_seconds
+    index = np.arange(start, start + count)
+    rec_ids = [f"rec_{SCALE_ID_TAG}_{i:09d}" for i in index]
+    
+    persona = rng.integers(0, len(PERSONAS), count)
+    content_type = rng.integers(0, len(CONTENT_TYPES), count)
+    status = rng.choice(len(STATUSES), count, p=STATUS_WEIGHTS)
+    generated = window_start + rng.integers(0, window_seconds, count)
+    acted = np.minimum(generated + rng.exponential(ACTION_DELAY_HOURS * 3600, count).astype(np.int64), now)
+    operator = rng.choice(len(operator_ids), count, p=operator_weights)
+    
+    approved = status == STATUSES.index('approved')
+    rejected = status == STATUSES.index('rejected')
+    flagged = status == STATUSES.index('flagged')
+    tone_check = rng.random(count) > 0.1
+    advice_check = rng.random(count) > 0.05
+    eligibility_check = rng.random(count) > 0.05
+    
+    type_names = [CONTENT_TYPES[t] for t in content_type]
+    persona_names = [PERSONAS[p] for p in persona]
+    operators = [operator_ids[o] for o in operator]
+    generated_at = _timestamps(generated)
+    acted_at = _timestamps(acted)
+    titles = [
+        RECOMMENDATION_TITLES[PERSONAS[p]][t]
+        for p, t in zip(persona, rng.integers(0, 5, count))
+    ]
+    notes = np.where(
+        approved, np.array(APPROVAL_NOTES, dtype=object)[rng.integers(0, len(APPROVAL_NOTES), count)],
+        np.array(REJECTION_NOTES, dtype=object)[rng.integers(0, len(REJECTION_NOTES), count)]
+    )
+    
+    recommendations = {
+        'recommendation_id': rec_ids,
+        'user_id': [user_ids[u] for u in rng.integers(0, len(user_ids), count)],
+        'persona_primary': persona_names,
+        'type': type_names,
+        'title': titles,
+        'rationale': _pick(rng, pools['rationale'], count, persona),
+        'priority': [PRIORITIES[p] for p in rng.integers(0, len(PRIORITIES), count)],
+        'status': [STATUSES[s] for s in status],
+        'content_url': [f"https://content.spendsense.com/{t}/{r}" for t, r in zip(type_names, rec_ids)],
+        'read_time_minutes': _nullable(content_type < 2, rng.integers(3, 16, count).tolist()),
+        'tone_check': tone_check.tolist(),
+        'advice_check': advice_check.tolist(),
+        'eligibility_check': eligibility_check.tolist(),
+        'guardrails_passed': (tone_check & advice_check & eligibility_check).tolist(),
+        'approved_by': _nullable(approved, operators),
+        'approved_at': _nullable(approved, acted_at),
+        'rejected_by': _nullable(rejected, operators),
+        'rejected_at': _nullable(rejected, acted_at),
+        'operator_notes': _nullable(approved | rejected, notes.tolist()),
+        'generated_at': generated_at,
+        'created_at': generated_at,
+        'updated_at': [a if m else g for a, g, m in zip(acted_at, generated_at, approved | rejected)]
+    }
+    
+    # One trace per recommendation; pipeline steps finish just before generation
+    step = lambda offset: _timestamps(generated - 6 + offset)
+    traces = {
+        'trace_id': [f"trace_{SCALE_ID_TAG}_{i:09d}" for i in index],
+        'recommendation_id': rec_ids,
+        'signals_detected_at': step(0),
+        'persona_assigned_at': step(1),
+        'content_matched_at': step(2),
+        'rationale_generated_at': step(5),
+        'guardrails_checked_at': step(6),
+        'signals_json': _pick(rng, pools['signals'], count),
+        'persona_assignment_json': _pick(rng, pools['persona_assignment'], count, persona),
+        'content_matches_json': _pick(rng, pools['content_matches'], count, persona),
+        'relevance_scores_json': _pick(rng, pools['relevance_scores'], count),
+        'llm_model': ['gpt-4'] * count,
+        'temperature': [0.7] * count,
+        'tokens_used': rng.integers(150, 501, count).tolist(),
+        'created_at': generated_at
+    }
+    
+    # Audit entries: the action behind each processed status, plus some edits
+    acted_rows = np.flatnonzero(approved | rejected | flagged)
+    modified_rows = np.flatnonzero(rng.random(count) < MODIFY_RATE)
+    audit_rows = np.concatenate([acted_rows, modified_rows])
+    audit_actions = np.where(approved, 'approve', np.where(rejected, 'reject', 'flag'))[acted_rows].tolist()
+    audit_actions += ['modify'] * len(modified_rows)
+    audit_time = acted[audit_rows].copy()
+    audit_time[len(acted_rows):] = np.minimum(
+        generated[modified_rows] + rng.exponential(ACTION_DELAY_HOURS * 3600, len(modified_rows)).astype(np.int64),
+        now
+    )
+    audit_operators = np.concatenate([
+        operator[acted_rows], rng.choice(len(operator_ids), len(modified_rows), p=operator_weights)
+    ])
+    audits = {
+        'audit_id': [f"audit_{SCALE_ID_TAG}_{start:09d}_{j:06d}" for j in range(len(audit_rows))],
+        'operator_id': [operator_ids[o] for o in audit_operators],
+        'action': audit_actions,
+        'recommendation_id': [rec_ids[r] for r in audit_rows],
+        'metadata': _pick(rng, pools['audit_metadata'], len(audit_rows)),
+        'timestamp': _timestamps(audit_time)
+    }
+    
+    # One flag per flagged recommendation, some already resolved
+    flag_rows = np.flatnonzero(flagged)
+    resolved = rng.random(len(flag_rows)) < FLAG_RESOLVED_RATE
+    resolved_time = np.minimum(
+        acted[flag_rows] + rng.exponential(ACTION_DELAY_HOURS * 3600, len(flag_rows)).astype(np.int64), now
+    )
+    flags = {
+        'flag_id': [f"flag_{rec_ids[r]}" for r in flag_rows],
+        'recommendation_id': [rec_ids[r] for r in flag_rows],
+        'flagged_by': [operators[r] for r in flag_rows],
+        'flag_reason': [FLAG_REASONS[f] for f in rng.integers(0, len(FLAG_REASONS), len(flag_rows))],
+        'resolved': resolved.tolist(),
+        'resolved_by': _nullable(resolved, [operator_ids[o] for o in rng.choice(
+            len(operator_ids), len(flag_rows), p=operator_weights)]),
+        'resolved_at': _nullable(resolved, _timestamps(resolved_time)),
+        'flagged_at': [acted_at[r] for r in flag_rows]
+    }
+    
+    return {
+        'recommendations': recommendations,
+        'decision_traces': traces,
+        'operator_audit_log': audits,
+        'recommendation_flags': flags
+    }
+
+
+def seed_scale(conn, user_ids, num_recommendations, audit_days=365, num_operators=200,
+               seed=42, batch_size=SCALE_BATCH_SIZE):
+    """
+    Bulk-generate a large operator dataset for load testing.
+    
+    Recommendations are spread over the last audit_days days, each with a
+    decision trace; processed ones get audit entries and flagged ones get a
+    flag. Rows are inserted with executemany, one transaction per batch, and
+    the operator tables' indexes are rebuilt once at the end. Output is
+    repeatable for a seed (timestamps are relative to today); rows from a
+    previous scale run are replaced.
+    
+    Args:
+        conn: Database connection
+        user_ids: User IDs to create recommendations for
+        num_recommendations: Number of recommendations to create
+        audit_days: Days of history to spread recommendations and actions over
+        num_operators: Number of distinct operators (op_001, op_002, ...)
+        seed: Random seed
+        batch_size: Recommendations per transaction
+    
+    Returns:
+        Rows inserted per table
+    
+    Raises:
+        ValueError: If there are no users or a count is not positive
+    """
+    if not user_ids:
+        raise ValueError("No users to create recommendations for")
+    if num_recommendations <= 0 or audit_days <= 0 or num_operators <= 0 or batch_size <= 0:
+        raise ValueError("num_recommendations, audit_days, num_operators and batch_size must be positive")
+    
+    rng = np.random.default_rng(seed)
+    pools = _build_pools(rng)
+    operator_ids = [f"op_{i:03d}" for i in range(1, num_operators + 1)]
+    # A few operators handle most of the queue (Zipf-like workload)
+    operator_weights = 1.0 / np.arange(1, num_operators + 1)
+    operator_weights /= operator_weights.sum()
+    
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    window_seconds = audit_days * 86400
+    window_start = int(today.timestamp()) - window_seconds
+    
+    columns = {table: _table_columns(conn, table) for table in SCALE_TABLES}
+    counts = {table: 0 for table in SCALE_TABLES}
+    
+    # Replace a previous scale run (children first)
+    pattern = f"rec_{SCALE_ID_TAG}_*"
+    for table in reversed(SCALE_TABLES):
+        conn.execute(f"DELETE FROM {table} WHERE recommendation_id GLOB ?", (pattern,))
+    
+    index_sql = _drop_indexes(conn, SCALE_TABLES)
+    conn.commit()
+    
+    # Generated rows reference each other consistently; skip per-row FK lookups
+    foreign_keys = conn.execute("PRAGMA foreign_keys").fetchone()[0]
+    conn.execute("PRAGMA foreign_keys = OFF")
+    conn.execute(f"PRAGMA cache_size = -{SCALE_CACHE_SIZE_KIB}")
+    
+    print(f"Seeding {num_recommendations:,} recommendations over {audit_days} days "
+          f"({num_operators} operators, {len(user_ids):,} users)...")
+    started = datetime.now()
+    
+    try:
+        for start in range(0, num_recommendations, batch_size):
+            batch = generate_scale_batch(
+                rng, pools, start, min(batch_size, num_recommendations - start), user_ids,
+                operator_ids, operator_weights, window_start, window_seconds
+            )
+            for table in SCALE_TABLES:
+                counts[table] += _insert_rows(conn, table, columns[table], batch[table])
+            conn.commit()
+            
+            done = start + len(batch['recommendations']['recommendation_id'])
+            print(f"  Created {done:,}/{num_recommendations:,} recommendations...")
+    finally:
+        print(f"Rebuilding {len(index_sql)} indexes...")
+        for sql in index_sql:
+            conn.execute(sql)
+        conn.commit()
+        conn.execute(f"PRAGMA foreign_keys = {'ON' if foreign_keys else 'OFF'}")
+    
+    elapsed = (datetime.now() - started).total_seconds()
+    total = sum(counts.values())
+    print(f"✓ Created {total:,} rows in {elapsed:.1f}s ({total / max(elapsed, 1e-9):,.0f} rows/s)")
+    return counts
+
+
 # ========================================================================
 # MAIN SEEDING FUNCTION
 # ========================================================================
@@ -507,10 +979,92 @@ def seed_all():
     print()
 
 
+def seed_scale_all(num_recommendations, audit_days=365, num_operators=200, seed=42,
+                   batch_size=SCALE_BATCH_SIZE):
+    """
+    Scale seeding entry point - bulk-generates operator data for load testing.
+    
+    Uses every user in the database (not just the first 20).
+    """
+    print("=" * 70)
+    print("SpendSense Operator Dashboard - Scale Seeding")
+    print("=" * 70)
+    print()
+    
+    print("Initializing database schema...")
+    try:
+        init_database()
+    except Exception as e:
+        print(f"Note: {e}")
+        print("Continuing with existing schema...")
+    
+    print()
+    
+    with get_db() as conn:
+        user_ids = [row['user_id'] for row in conn.execute("SELECT user_id FROM users")]
+        
+        if not user_ids:
+            print("✗ No users found in database!")
+            print("  Please run the data generator first to create users.")
+            return
+        
+        counts = seed_scale(conn, user_ids, num_recommendations, audit_days,
+                            num_operators, seed, batch_size)
+    
+    print()
+    print("Summary:")
+    for table, count in counts.items():
+        print(f"  • {count:,} {table} rows")
+    print()
+
+
 # ========================================================================
 # ENTRY POINT
 # ========================================================================
 
+def parse_args():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description='Seed operator dashboard data (small demo set, or scale mode for load testing)'
+    )
+    parser.add_argument(
+        '--recommendations',
+        type=parse_count,
+        default=None,
+        help='Scale mode: number of recommendations to generate (e.g. 2M, 500k)'
+    )
+    parser.add_argument(
+        '--audit-days',
+        type=int,
+        default=365,
+        help='Scale mode: days of history to spread recommendations and audit logs over (default: 365)'
+    )
+    parser.add_argument(
+        '--operators',
+        type=int,
+        default=200,
+        help='Scale mode: number of distinct operators (default: 200)'
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=42,
+        help='Scale mode: random seed (default: 42)'
+    )
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=SCALE_BATCH_SIZE,
+        help=f'Scale mode: recommendations per transaction (default: {SCALE_BATCH_SIZE})'
+    )
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    seed_all()
+    args = parse_args()
+    if args.recommendations:
+        seed_scale_all(args.recommendations, args.audit_days, args.operators,
+                       args.seed, args.batch_size)
+    else:
+        seed_all()
 
@@ -0,0 +1,112 @@
+"""
+Tests for scale-mode seeding (seed_data.py --recommendations).
+
+Tests cover:
+- Count parsing for --recommendations
+- Row counts and consistency between operator tables
+- Index rebuild after the bulk load
+- Re-running replaces the previous scale run
+"""
+
+import pytest
+import sqlite3
+
+from seed_data import parse_count, seed_scale, STATUSES
+
+
+@pytest.fixture
+def seeded_db(test_db: sqlite3.Connection):
+    """Test database with users and a small scale run."""
+    test_db.executemany(
+        "INSERT INTO users (user_id) VALUES (?)",
+        [(f'user_{i:03d}',) for i in range(50)]
+    )
+    test_db.execute("CREATE INDEX idx_test_status ON recommendations(status)")
+    test_db.commit()
+
+    user_ids = [row['user_id'] for row in test_db.execute("SELECT user_id FROM users")]
+    counts = seed_scale(test_db, user_ids, 3000, audit_days=30, num_operators=10,
+                        seed=7, batch_size=1000)
+    return test_db, user_ids, counts
+
+
+class TestParseCount:
+    """Test suite for --recommendations count parsing."""
+
+    def test_suffixes(self):
+        """Test plain counts and K/M suffixes."""
+        assert parse_count('1500') == 1500
+        assert parse_count('500k') == 500_000
+        assert parse_count('2M') == 2_000_000
+        assert parse_count('1.5m') == 1_500_000
+
+    def test_invalid(self):
+        """Test that malformed and non-positive counts are rejected."""
+        with pytest.raises(ValueError):
+            parse_count('lots')
+        with pytest.raises(ValueError):
+            parse_count('0')
+
+
+class TestSeedScale:
+    """Test suite for bulk operator data generation."""
+
+    def test_row_counts(self, seeded_db):
+        """Test that every recommendation gets a trace, and actions match statuses."""
+        db, _, counts = seeded_db
+        statuses = dict(db.execute(
+            "SELECT status, COUNT(*) FROM recommendations GROUP BY status"
+        ).fetchall())
+
+        assert counts['recommendations'] == 3000
+        assert counts['decision_traces'] == 3000
+        assert set(statuses) <= set(STATUSES)
+        assert counts['recommendation_flags'] == statuses['flagged']
+
+        processed = db.execute("""
+            SELECT COUNT(*) FROM operator_audit_log WHERE action IN ('approve', 'reject', 'flag')
+        """).fetchone()[0]
+        assert processed == statuses['approved'] + statuses['rejected'] + statuses['flagged']
+
+    def test_rows_reference_each_other(self, seeded_db):
+        """Test that child rows point at seeded recommendations and known users."""
+        db, user_ids, _ = seeded_db
+
+        orphans = db.execute("""
+            SELECT COUNT(*) FROM operator_audit_log a
+            LEFT JOIN recommendations r ON r.recommendation_id = a.recommendation_id
+            WHERE r.recommendation_id IS NULL
+        """).fetchone()[0]
+        assert orphans == 0
+
+        approvals = db.execute("""
+            SELECT r.approved_by, a.operator_id, r.approved_at, a.timestamp
+            FROM recommendations r
+            JOIN operator_audit_log a ON a.recommendation_id = r.recommendation_id
+            WHERE a.action = 'approve'
+        """).fetchall()
+        assert approvals
+        assert all(row[0] == row[1] and row[2] == row[3] for row in approvals)
+
+        users = {row[0] for row in db.execute("SELECT DISTINCT user_id FROM recommendations")}
+        assert users <= set(user_ids)
+
+    def test_indexes_restored(self, seeded_db):
+        """Test that indexes dropped for the bulk load are rebuilt."""
+        db, _, _ = seeded_db
+        names = {row[0] for row in db.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+        assert 'idx_test_status' in names
+
+    def test_rerun_replaces_previous_run(self, seeded_db):
+        """Test that seeding again replaces the earlier scale rows."""
+        db, user_ids, _ = seeded_db
+        seed_scale(db, user_ids, 2000, audit_days=30, num_operators=10, seed=7, batch_size=1000)
+
+        assert db.execute("SELECT COUNT(*) FROM recommendations").fetchone()[0] == 2000
+        assert db.execute("SELECT COUNT(*) FROM decision_traces").fetchone()[0] == 2000
+
+    def test_requires_users(self, test_db: sqlite3.Connection):
+        """Test that seeding without users fails clearly."""
+        with pytest.raises(ValueError):
+            seed_scale(test_db, [], 100)
@@ -8,9 +8,28 @@ Endpoints:
 """
 
 from fastapi import APIRouter, HTTPException, Depends, Query
-from typing import Optional, List
+from typing import Optional, List, Tuple
 import sqlite3
 import json
+import sys
+import os
+
+# Add parent directory to path to import the features package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+try:
+    from features.cube import DailyTotals, window_days
+    DAILY_TOTALS_AVAILABLE = True
+except ImportError as e:
+    DAILY_TOTALS_AVAILABLE = False
+    print(f"Warning: Daily totals not available: {e}")
+
+try:
+    from features.store import SIGNAL_TABLE, read_user_signals
+    TYPED_SIGNALS_AVAILABLE = True
+except ImportError as e:
+    TYPED_SIGNALS_AVAILABLE = False
+    print(f"Warning: Typed signal store not available: {e}")
 
 from database import get_db
 from auth import verify_token
@@ -24,6 +43,72 @@ import schemas
 router = APIRouter()
 
 
+def get_cash_flow_signals(db: sqlite3.Connection, user_id: str,
+                          window_type: str) -> Optional[Tuple[dict, str]]:
+    """
+    Derive a user's cash_flow signals for any window from daily_category_totals.
+    
+    Args:
+        db: Database connection
+        user_id: User ID to query
+        window_type: Number of days followed by 'd' (e.g. 7d, 90d)
+    
+    Returns:
+        Tuple of (cash_flow signal dict, last day of the window), or None
+        when the database has no daily totals for the user
+    
+    Raises:
+        HTTPException: 400 if the window is malformed
+    """
+    if not DAILY_TOTALS_AVAILABLE:
+        return None
+    
+    try:
+        days = window_days(window_type)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        totals = DailyTotals.from_database(db, user_ids=[user_id])
+    except ValueError:
+        return None
+    if not len(totals.keys):
+        return None
+    
+    signals = totals.signals(days).to_dict('records')[0]
+    return signals, totals.as_of_date
+
+
+def get_typed_signals(db: sqlite3.Connection, user_id: str,
+                      window_type: str) -> Optional[Tuple[dict, str]]:
+    """
+    Read a user's signal blocks from the typed user_signal_values table.
+    
+    Args:
+        db: Database connection
+        user_id: User ID to query
+        window_type: Time window (30d or 180d)
+    
+    Returns:
+        Tuple of (category -> signal dict, computation timestamp), or None
+        when the database has no typed signals for the user and window
+    """
+    if not TYPED_SIGNALS_AVAILABLE:
+        return None
+    
+    signals = read_user_signals(db, user_id, window_type)
+    if signals is None:
+        return None
+    
+    cursor = db.cursor()
+    cursor.execute(f"""
+        SELECT computed_at
+        FROM {SIGNAL_TABLE}
+        WHERE user_id = ? AND window_type = ?
+    """, (user_id, window_type))
+    return signals, cursor.fetchone()[0]
+
+
 # ========================================================================
 # GET USER SIGNALS
 # ========================================================================
@@ -49,7 +134,13 @@ def get_user_signals(
     
     Query parameters:
     - window_type: Time window for signals (default: 30d)
-      Options: 7d, 30d, 90d, 180d
+      Options: 7d, 30d, 90d, 180d (any number of days)
+    
+    The response is one category row. Databases whose signals are only
+    in user_signal_values return the credit block from there in the same
+    shape (use /signals/all for every category). Windows without stored
+    signals (only 30d and 180d are stored) return the cash_flow signals
+    derived from daily_category_totals.
     
     Returns:
         User signals data with all detected patterns
@@ -69,10 +160,34 @@ def get_user_signals(
     row = cursor.fetchone()
     
     if not row:
-        raise HTTPException(
-            status_code=404,
-            detail=f"No signals found for user {user_id} with window {window_type}"
-        )
+        typed = get_typed_signals(db, user_id, window_type)
+        if typed is not None:
+            typed_signals, computed_at = typed
+            category = next(iter(typed_signals))
+            return {
+                'signal_id': f"sig_{user_id}_{window_type}_{category}",
+                'user_id': user_id,
+                'window_type': window_type,
+                'signal_category': category,
+                'signal_data': typed_signals[category],
+                'detected_at': computed_at
+            }
+        
+        cash_flow = get_cash_flow_signals(db, user_id, window_type)
+        if cash_flow is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No signals found for user {user_id} with window {window_type}"
+            )
+        signal_data, as_of = cash_flow
+        return {
+            'signal_id': None,
+            'user_id': user_id,
+            'window_type': window_type,
+            'signal_category': 'cash_flow',
+            'signal_data': signal_data,
+            'detected_at': as_of
+        }
     
     # Convert to dict and parse JSON
     signals = dict(row)
@@ -113,6 +228,7 @@ def get_all_user_signals(
     - savings
     - credit
     - income
+    - cash_flow (derived from daily_category_totals for any window)
     
     Path parameters:
     - user_id: User ID to query
@@ -123,20 +239,22 @@ def get_all_user_signals(
     Returns:
         Dict with all signal categories and their data
     """
-    cursor = db.cursor()
-    
-    # Query all signals for user and window
-    cursor.execute("""
-        SELECT *
-        FROM user_signals
-        WHERE user_id = ?
-          AND window_type = ?
-        ORDER BY detected_at DESC
-    """, (user_id, window_type))
-    
-    rows = cursor.fetchall()
-    
-    if not rows:
+    # Typed signals first; legacy JSON rows for older databases
+    typed = get_typed_signals(db, user_id, window_type)
+    rows = []
+    if typed is None:
+        cursor = db.cursor()
+        cursor.execute("""
+            SELECT *
+            FROM user_signals
+            WHERE user_id = ?
+              AND window_type = ?
+            ORDER BY detected_at DESC
+        """, (user_id, window_type))
+        rows = cursor.fetchall()
+    cash_flow = get_cash_flow_signals(db, user_id, window_type)
+    
+    if not rows and typed is None and cash_flow is None:
         raise HTTPException(
             status_code=404,
             detail=f"No signals found for user {user_id} with window {window_type}"
@@ -145,6 +263,16 @@ def get_all_user_signals(
     # Organize by category
     signals_by_category = {}
     
+    if typed is not None:
+        typed_signals, computed_at = typed
+        for category, signal_data in typed_signals.items():
+            signals_by_category[category] = {
+                'signal_id': f"sig_{user_id}_{window_type}_{category}",
+                'category': category,
+                'data': signal_data,
+                'detected_at': computed_at
+            }
+    
     for row in rows:
         signal = dict(row)
         category = signal['signal_category']
@@ -160,7 +288,16 @@ def get_all_user_signals(
             'data': signal_data,
             'detected_at': signal['detected_at']
         }
-    
+
+    if cash_flow is not None:
+        signal_data, as_of = cash_flow
+        signals_by_category['cash_flow'] = {
+            'signal_id': None,
+            'category': 'cash_flow',
+            'data': signal_data,
+            'detected_at': as_of
+        }
+
     return {
         'user_id': user_id,
         'window_type': window_type,
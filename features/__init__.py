@@ -0,0 +1,47 @@
+"""
+SpendSense Behavioral Signals
+
+This package derives the signal blocks the persona system reads,
+directly from transactions, accounts and liabilities:
+
+- credit: Card utilization, minimum payments, interest and overdue flags
+- income: Pay frequency, income variability and cash-flow buffer
+- subscriptions: Recurring merchants and subscription spend
+- savings: Net inflow, growth and emergency fund coverage
+
+Each analyzer computes its block for the whole population at once with
+columnar aggregations; SignalEngine runs them and stores the results in
+user_signal_values, one typed column per signal (read_user_signals and
+read_signal_frame read it back).
+RollingSignals keeps the windows current as new days arrive, and
+DailyTotals derives cash-flow signals for any window length from the
+daily_category_totals table ingest maintains.
+"""
+
+from .base import WINDOW_DAYS, SignalFrames
+from .credit import CreditAnalyzer
+from .income import IncomeAnalyzer
+from .savings import SavingsAnalyzer
+from .subscriptions import SubscriptionDetector
+from .rolling import RollingSignals
+from .cube import DailyTotals, window_days
+from .store import SIGNAL_TABLE, read_signal_frame, read_user_signals
+from .pipeline import SIGNAL_CATEGORIES, SignalEngine
+
+__version__ = "1.0.0"
+__all__ = [
+    "SignalEngine",
+    "SignalFrames",
+    "CreditAnalyzer",
+    "IncomeAnalyzer",
+    "SavingsAnalyzer",
+    "SubscriptionDetector",
+    "RollingSignals",
+    "DailyTotals",
+    "window_days",
+    "read_user_signals",
+    "read_signal_frame",
+    "SIGNAL_TABLE",
+    "SIGNAL_CATEGORIES",
+    "WINDOW_DAYS",
+]
@@ -0,0 +1,317 @@
+"""
+Population tables shared by the signal analyzers.
+
+Signals are computed for every user at once. SignalFrames reads the
+transactions, accounts and liabilities tables once and prepares the columns
+the analyzers aggregate over:
+
+- dates become integer day numbers, so a window is one comparison
+- users become integer codes aligned with user_ids, so per-user sums and
+  counts are single np.bincount calls
+- each transaction carries its account's type, so no analyzer joins again
+
+Windows end at as_of (the latest transaction date unless given), so the same
+tables always produce the same signals.
+"""
+
+import os
+import sqlite3
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+# Signal windows stored in user_signals
+WINDOW_DAYS = {'30d': 30, '180d': 180}
+
+# Days of checking debits averaged into monthly expenses
+EXPENSE_WINDOW_DAYS = 180
+
+# Average days per month, used to turn window totals into monthly figures
+DAYS_PER_MONTH = 30
+
+TRANSACTION_COLUMNS = [
+    'user_id', 'account_id', 'date', 'amount', 'merchant_name', 'category_primary', 'category_detailed'
+]
+ACCOUNT_COLUMNS = ['account_id', 'user_id', 'type', 'subtype', 'mask', 'current_balance', 'credit_limit']
+LIABILITY_COLUMNS = [
+    'account_id', 'type', 'minimum_payment_amount', 'last_payment_amount', 'is_overdue',
+    'apr_percentage', 'created_at'
+]
+
+
+def day_numbers(dates: pd.Series) -> np.ndarray:
+    """
+    Convert dates to days since 1970-01-01, parsing each distinct value once.
+
+    Args:
+        dates: ISO date strings ('YYYY-MM-DD', optionally followed by a
+            time) or datetimes
+
+    Returns:
+        int32 array of day numbers
+    """
+    codes, uniques = pd.factorize(dates)
+    uniques = pd.Series(uniques)
+    if not pd.api.types.is_datetime64_any_dtype(uniques):
+        uniques = pd.to_datetime(uniques.astype(str).str[:10], format='%Y-%m-%d')
+    days = uniques.to_numpy().astype('datetime64[D]').astype(np.int32)
+    return days[codes]
+
+
+def factorize_into(index: pd.Index, values: pd.Series) -> np.ndarray:
+    """
+    Map values to their positions in an index (-1 when absent).
+
+    Args:
+        index: Index to look values up in
+        values: Values (hashed once per distinct value)
+
+    Returns:
+        int32 array of positions
+    """
+    codes, uniques = pd.factorize(values)
+    positions = np.r_[index.get_indexer(uniques), -1].astype(np.int32)
+    return positions[codes]
+
+
+def iso_date(day: int) -> str:
+    """Format a day number as an ISO date."""
+    return str(np.datetime64(int(day), 'D'))
+
+
+def empty_lists(length: int) -> np.ndarray:
+    """Create an object array of distinct empty lists."""
+    lists = np.empty(length, dtype=object)
+    for index in range(length):
+        lists[index] = []
+    return lists
+
+
+def as_bool(values: pd.Series) -> np.ndarray:
+    """Read a boolean column stored as 0/1, True/False or 'True'/'False'."""
+    if pd.api.types.is_bool_dtype(values) or pd.api.types.is_numeric_dtype(values):
+        return values.fillna(0).astype(bool).to_numpy()
+    return values.astype(str).str.lower().isin(['true', '1']).to_numpy()
+
+
+class SignalFrames:
+    """
+    Transactions, accounts and liabilities of the whole population.
+
+    transactions holds one row per transaction with the columns:
+    - user: code into user_ids (-1 for users not computed)
+    - account_id, amount, category_primary, category_detailed
+    - day: day number of the date
+    - account_type: type of the account (categorical)
+    - merchant: code into merchant_names (-1 without a merchant)
+    """
+
+    def __init__(self, transactions: pd.DataFrame, accounts: pd.DataFrame,
+                 liabilities: pd.DataFrame, user_ids: Optional[np.ndarray] = None,
+                 as_of: Optional[str] = None):
+        """
+        Prepare the tables.
+
+        Args:
+            transactions: Transactions with the TRANSACTION_COLUMNS
+            accounts: Accounts with the ACCOUNT_COLUMNS
+            liabilities: Liabilities with the LIABILITY_COLUMNS
+            user_ids: Users to compute signals for (default: every user with
+                an account or a transaction)
+            as_of: Last day of every window (default: latest transaction date)
+        """
+        if user_ids is None:
+            user_ids = pd.concat([accounts['user_id'].astype(object), transactions['user_id'].astype(object)]).unique()
+        self.user_ids = np.sort(np.asarray(user_ids, dtype=object))
+        self.users = pd.Index(self.user_ids)
+
+        self.account_index = pd.Index(accounts['account_id'].astype(object))
+        self.account_types = pd.Categorical(accounts['type'].astype(object))
+        self.merchant_names = pd.Index([], dtype=object)
+        self.transactions = self.encode(transactions)
+
+        accounts = accounts.reset_index(drop=True)
+        accounts['user'] = factorize_into(self.users, accounts['user_id'])
+        for column in ['current_balance', 'credit_limit']:
+            accounts[column] = pd.to_numeric(accounts[column], errors='coerce').astype(float)
+        self.accounts = accounts
+        self.liabilities = liabilities.reset_index(drop=True)
+
+        if as_of is not None:
+            self.as_of = int(day_numbers(pd.Series([as_of]))[0])
+        elif len(transactions):
+            self.as_of = int(self.transactions['day'].max())
+        else:
+            self.as_of = int(np.datetime64('today', 'D').astype(np.int64))
+        self._monthly_expenses = None
+
+    @classmethod
+    def from_database(cls, conn: sqlite3.Connection, as_of: Optional[str] = None) -> 'SignalFrames':
+        """
+        Read the tables from a SpendSense database.
+
+        Args:
+            conn: Open SQLite connection
+            as_of: Last day of every window (default: latest transaction date)
+
+        Returns:
+            SignalFrames over every user in the users table
+        """
+        # Plain tuples even when the connection has a row_factory
+        cursor = conn.cursor()
+        cursor.row_factory = None
+
+        def read(table, columns):
+            rows = cursor.execute(f"SELECT {', '.join(columns)} FROM {table}").fetchall()
+            return pd.DataFrame(rows, columns=columns)
+
+        user_ids = [row[0] for row in cursor.execute("SELECT user_id FROM users")]
+        return cls(read('transactions', TRANSACTION_COLUMNS), read('accounts', ACCOUNT_COLUMNS),
+                   read('liabilities', LIABILITY_COLUMNS), user_ids=user_ids, as_of=as_of)
+
+    @classmethod
+    def from_parquet(cls, data_dir: str, as_of: Optional[str] = None) -> 'SignalFrames':
+        """
+        Read the tables from a Parquet export (see ingest/parquet_io.py).
+
+        Columnar files skip SQLite's row-by-row fetch, which dominates at
+        population scale. Transaction IDs columns are dictionary-encoded and
+        dates kept as dates, so no Python object is created per row.
+
+        Args:
+            data_dir: Directory holding the Parquet export
+            as_of: Last day of every window (default: latest transaction date)
+
+        Returns:
+            SignalFrames over every user in the users file
+
+        Raises:
+            FileNotFoundError: If the transactions export is missing
+        """
+        import pyarrow.compute as pc
+        import pyarrow.dataset as ds
+        from ingest.parquet_io import PARQUET_FILES, read_table
+
+        path = os.path.join(data_dir, PARQUET_FILES['transactions'])
+        if not os.path.isdir(path):
+            raise FileNotFoundError(f"Transactions Parquet not found: {path}")
+        table = ds.dataset(path, format='parquet', partitioning='hive').to_table(columns=TRANSACTION_COLUMNS)
+        for column in ['user_id', 'account_id']:
+            table = table.set_column(table.schema.get_field_index(column), column,
+                                     pc.dictionary_encode(table[column]))
+
+        transactions = table.to_pandas(date_as_object=False, split_blocks=True, self_destruct=True)
+        del table
+
+        users = read_table(data_dir, 'users', columns=['user_id'])
+        return cls(transactions, read_table(data_dir, 'accounts', columns=ACCOUNT_COLUMNS),
+                   read_table(data_dir, 'liabilities', columns=LIABILITY_COLUMNS),
+                   user_ids=users['user_id'].to_numpy(), as_of=as_of)
+
+    def encode(self, transactions: pd.DataFrame) -> pd.DataFrame:
+        """
+        Convert transactions to the columns of self.transactions.
+
+        Merchants not seen before are appended to merchant_names.
+
+        Args:
+            transactions: Transactions with the TRANSACTION_COLUMNS
+
+        Returns:
+            DataFrame with the columns described in the class docstring
+        """
+        codes, names = pd.factorize(transactions['merchant_name'])
+        positions = self.merchant_names.get_indexer(names)
+        unseen = positions < 0
+        positions[unseen] = len(self.merchant_names) + np.arange(unseen.sum())
+        self.merchant_names = self.merchant_names.append(pd.Index(names[unseen], dtype=object))
+
+        type_codes = np.r_[self.account_types.codes, -1]
+        return pd.DataFrame({
+            'user': factorize_into(self.users, transactions['user_id']),
+            'account_id': transactions['account_id'].array,
+            'day': day_numbers(transactions['date']),
+            'amount': transactions['amount'].to_numpy(dtype=float),
+            'merchant': np.r_[positions, -1][codes].astype(np.int32),
+            'category_primary': transactions['category_primary'].array,
+            'category_detailed': transactions['category_detailed'].array,
+            'account_type': pd.Categorical.from_codes(
+                type_codes[factorize_into(self.account_index, transactions['account_id'])],
+                self.account_types.categories
+            )
+        })
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    def in_window(self, days: int) -> np.ndarray:
+        """Get a mask of the transactions dated within the last days up to as_of."""
+        day = self.transactions['day'].to_numpy()
+        return (day > self.as_of - days) & (day <= self.as_of)
+
+    def per_user(self, codes: np.ndarray, values: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Sum values (or count rows) per user.
+
+        Args:
+            codes: User codes (rows with -1 are ignored)
+            values: Values to sum (default: count)
+
+        Returns:
+            float array with one entry per user
+        """
+        known = codes >= 0
+        weights = None if values is None else np.asarray(values, dtype=float)[known]
+        return np.bincount(codes[known], weights=weights, minlength=len(self)).astype(float)
+
+    def monthly_expenses(self) -> np.ndarray:
+        """
+        Average monthly checking debits per user over EXPENSE_WINDOW_DAYS.
+
+        Only months with debits are averaged.
+
+        Returns:
+            float array with one entry per user (0 without debits)
+        """
+        if self._monthly_expenses is None:
+            tx = self.transactions
+            debits = (self.in_window(EXPENSE_WINDOW_DAYS) & (tx['account_type'] == 'checking').to_numpy()
+                      & (tx['amount'] < 0).to_numpy() & (tx['user'] >= 0).to_numpy())
+            months = tx['day'].to_numpy()[debits].astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
+            totals = pd.Series(-tx['amount'].to_numpy()[debits]).groupby(
+                [tx['user'].to_numpy()[debits], months], sort=False
+            ).sum()
+            average = totals.groupby(level=0, sort=False).mean()
+            expenses = np.zeros(len(self))
+            expenses[average.index.to_numpy()] = average.to_numpy()
+            self._monthly_expenses = expenses
+        return self._monthly_expenses
+
+    def lists_per_user(self, codes: np.ndarray, rows: pd.DataFrame) -> np.ndarray:
+        """
+        Group rows into one list of dicts per user.
+
+        Args:
+            codes: User code of each row (all known)
+            rows: Rows to convert, in the order they should be listed
+
+        Returns:
+            Object array with one list per user (empty without rows)
+        """
+        lists = empty_lists(len(self))
+        order = np.argsort(codes, kind='stable')
+        records = rows.iloc[order].to_dict('records')
+        bounds = np.r_[0, np.flatnonzero(np.diff(codes[order])) + 1, len(order)]
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            if end > start:
+                lists[codes[order[start]]] = records[start:end]
+        return lists
+
+    def empty(self, columns: dict) -> pd.DataFrame:
+        """Create a per-user frame filled with the given column defaults."""
+        frame = pd.DataFrame(index=self.users.rename('user_id'))
+        for column, default in columns.items():
+            frame[column] = empty_lists(len(self)) if isinstance(default, list) else default
+        return frame
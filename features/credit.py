@@ -0,0 +1,108 @@
+"""
+Credit utilization signals.
+
+Utilization is current_balance / credit_limit per credit card, and total
+balance / total limit across a user's cards. A card counts as paying the
+minimum only when its last payment was under 110% of the minimum payment.
+Interest charges are INTEREST_CHARGED transactions in the last
+INTEREST_WINDOW_DAYS, whatever the signal window.
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .base import SignalFrames, as_bool
+
+
+HIGH_UTILIZATION_PCT = 50
+VERY_HIGH_UTILIZATION_PCT = 80
+
+# A last payment under this multiple of the minimum counts as minimum-only
+MINIMUM_PAYMENT_MARGIN = 1.1
+
+INTEREST_WINDOW_DAYS = 30
+
+EMPTY_CREDIT = {
+    'cards': [],
+    'aggregate_utilization_pct': 0.0,
+    'total_credit_available': 0.0,
+    'total_credit_used': 0.0,
+    'any_card_high_util': False,
+    'any_card_very_high_util': False,
+    'any_interest_charges': False,
+    'any_overdue': False,
+    'num_credit_cards': 0
+}
+
+
+class CreditAnalyzer:
+    """Compute the credit block for every user."""
+
+    def calculate(self, frames: SignalFrames, interest: Optional[pd.Series] = None) -> pd.DataFrame:
+        """
+        Compute credit signals.
+
+        Args:
+            frames: Population tables
+            interest: Interest charged per account_id over INTEREST_WINDOW_DAYS
+                (default: summed from the transactions)
+
+        Returns:
+            DataFrame indexed by user_id with the EMPTY_CREDIT keys as columns
+        """
+        result = frames.empty(EMPTY_CREDIT)
+        cards = frames.accounts[(frames.accounts['type'] == 'credit_card') & (frames.accounts['user'] >= 0)]
+        if len(cards) == 0:
+            return result
+
+        # Latest credit card liability of each account
+        liabilities = frames.liabilities[frames.liabilities['type'] == 'credit_card']
+        liabilities = liabilities.sort_values('created_at', kind='stable').drop_duplicates('account_id', keep='last')
+        cards = cards.merge(liabilities.drop(columns='type'), on='account_id', how='left')
+
+        if interest is None:
+            tx = frames.transactions
+            charged = frames.in_window(INTEREST_WINDOW_DAYS) & (tx['category_detailed'] == 'INTEREST_CHARGED').to_numpy()
+            interest = tx.loc[charged, 'amount'].abs().groupby(tx.loc[charged, 'account_id']).sum()
+
+        balance = cards['current_balance'].fillna(0).to_numpy()
+        limit = cards['credit_limit'].fillna(0).to_numpy()
+        utilization = np.divide(balance * 100, limit, out=np.zeros(len(cards)), where=limit > 0)
+        minimum = pd.to_numeric(cards['minimum_payment_amount'], errors='coerce').fillna(0).to_numpy()
+        last_payment = pd.to_numeric(cards['last_payment_amount'], errors='coerce').fillna(0).to_numpy()
+        interest = cards['account_id'].map(interest).fillna(0).to_numpy()
+        overdue = as_bool(cards['is_overdue'])
+
+        card_rows = pd.DataFrame({
+            'account_id': cards['account_id'].to_numpy(),
+            'mask': cards['mask'].to_numpy(),
+            'type': cards['subtype'].fillna('Credit Card').to_numpy(),
+            'balance': balance.round(2),
+            'limit': limit.round(2),
+            'utilization_pct': utilization.round(2),
+            'minimum_payment': minimum.round(2),
+            'last_payment_amount': last_payment.round(2),
+            'minimum_payment_only': (last_payment > 0) & (last_payment < minimum * MINIMUM_PAYMENT_MARGIN),
+            'interest_charges': interest.round(2),
+            'apr_percentage': pd.to_numeric(cards['apr_percentage'], errors='coerce').fillna(0).round(2).to_numpy(),
+            'is_overdue': overdue
+        })
+
+        user = cards['user'].to_numpy()
+        total_balance = frames.per_user(user, balance)
+        total_limit = frames.per_user(user, limit)
+
+        result['aggregate_utilization_pct'] = np.divide(
+            total_balance * 100, total_limit, out=np.zeros(len(frames)), where=total_limit > 0
+        ).round(2)
+        result['total_credit_available'] = (total_limit - total_balance).round(2)
+        result['total_credit_used'] = total_balance.round(2)
+        result['any_card_high_util'] = frames.per_user(user, utilization >= HIGH_UTILIZATION_PCT) > 0
+        result['any_card_very_high_util'] = frames.per_user(user, utilization >= VERY_HIGH_UTILIZATION_PCT) > 0
+        result['any_interest_charges'] = frames.per_user(user, interest > 0) > 0
+        result['any_overdue'] = frames.per_user(user, overdue) > 0
+        result['num_credit_cards'] = frames.per_user(user).astype(np.int64)
+        result['cards'] = frames.lists_per_user(user, card_rows)
+        return result
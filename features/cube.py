@@ -0,0 +1,227 @@
+"""
+Cash-flow signals for windows of any length, from daily category totals.
+
+Ingest keeps daily_category_totals: one row per (user, day,
+category_primary) with txn_count, inflow, outflow and spend (see
+ingest/daily_totals.py). DailyTotals sorts those rows by (user, category,
+day) and keeps their running sums, so the totals of any window are two
+binary searches and a subtraction per (user, category). No transaction is
+read, so ad-hoc windows such as '7d' or '90d' are cheap enough to serve
+online.
+
+The cash_flow block derived here complements the stored blocks: pay gaps,
+recurring merchants and balances need the transactions themselves, so
+credit, income, subscriptions and savings stay 30d/180d signals computed by
+SignalEngine.
+"""
+
+import re
+import sqlite3
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from .base import DAYS_PER_MONTH, day_numbers, empty_lists, factorize_into, iso_date
+
+
+# Measures of daily_category_totals, in the order DailyTotals sums them
+MEASURES = ['txn_count', 'inflow', 'outflow', 'spend']
+
+# Categories listed in top_categories
+TOP_CATEGORIES = 3
+
+# Category whose inflows count as income
+INCOME_CATEGORY = 'INCOME'
+
+# Users read per query when DailyTotals.from_database is given user_ids
+USER_QUERY_BATCH = 500
+
+EMPTY_CASH_FLOW = {
+    'transaction_count': 0,
+    'total_inflow': 0.0,
+    'total_outflow': 0.0,
+    'net_cash_flow': 0.0,
+    'income_inflow': 0.0,
+    'total_spend': 0.0,
+    'monthly_spend': 0.0,
+    'daily_average_spend': 0.0,
+    'top_categories': []
+}
+
+
+def window_days(window_type: str) -> int:
+    """
+    Parse a window key such as '7d' or '90d'.
+
+    Args:
+        window_type: Number of days followed by 'd'
+
+    Returns:
+        Number of days
+
+    Raises:
+        ValueError: If the key is malformed or not positive
+    """
+    match = re.fullmatch(r'(\d+)d', window_type or '')
+    if match is None or int(match.group(1)) < 1:
+        raise ValueError(f"Unknown window '{window_type}' (expected a number of days such as '7d' or '90d')")
+    return int(match.group(1))
+
+
+class DailyTotals:
+    """
+    Running sums of daily category totals of a population.
+
+    Example:
+        totals = DailyTotals.from_database(conn, user_ids=['user_000'])
+        block = totals.signals(window_days('7d')).loc['user_000']
+    """
+
+    def __init__(self, totals: pd.DataFrame, user_ids: Optional[Iterable[str]] = None,
+                 as_of: Optional[str] = None):
+        """
+        Sort the daily rows and build their running sums.
+
+        Args:
+            totals: Rows with the daily_category_totals columns
+            user_ids: Users to compute signals for (default: users in totals)
+            as_of: Last day of every window (default: latest date in totals)
+        """
+        if user_ids is None:
+            user_ids = totals['user_id'].astype(object).unique()
+        self.user_ids = np.sort(np.asarray(list(user_ids), dtype=object))
+        self.users = pd.Index(self.user_ids)
+        self.categories = pd.Index(np.sort(totals['category_primary'].astype(object).unique()))
+
+        user = factorize_into(self.users, totals['user_id']).astype(np.int64)
+        category = factorize_into(self.categories, totals['category_primary']).astype(np.int64)
+        day = day_numbers(totals['date']).astype(np.int64)
+        known = user >= 0
+
+        # One key per row: (user, category) series in the high bits, day below
+        keys = ((user * len(self.categories) + category) << 32 | day)[known]
+        order = np.argsort(keys, kind='stable')
+        self.keys = keys[order]
+
+        # Sums in integer cents, so window differences are exact
+        measures = np.column_stack([
+            pd.to_numeric(totals[column]).to_numpy(dtype=float)[known][order] * (1 if column == 'txn_count' else 100)
+            for column in MEASURES
+        ]) if len(self.keys) else np.empty((0, len(MEASURES)))
+        self.prefix = np.zeros((len(self.keys) + 1, len(MEASURES)), dtype=np.int64)
+        np.cumsum(np.round(measures).astype(np.int64), axis=0, out=self.prefix[1:])
+
+        if as_of is not None:
+            self.as_of = int(day_numbers(pd.Series([as_of]))[0])
+        elif len(totals):
+            self.as_of = int(day.max())
+        else:
+            self.as_of = int(np.datetime64('today', 'D').astype(np.int64))
+
+    @classmethod
+    def from_database(cls, conn: sqlite3.Connection, user_ids: Optional[Iterable[str]] = None,
+                      as_of: Optional[str] = None) -> 'DailyTotals':
+        """
+        Read daily_category_totals from a SpendSense database.
+
+        Args:
+            conn: Open SQLite connection
+            user_ids: Users to read (default: every user in the table)
+            as_of: Last day of every window (default: latest date in the
+                table across all users, so one user's windows line up with
+                the population's)
+
+        Returns:
+            DailyTotals over the users
+
+        Raises:
+            ValueError: If there is no daily_category_totals table
+        """
+        # Plain tuples even when the connection has a row_factory
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        if cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'daily_category_totals'").fetchone() is None:
+            raise ValueError("Database has no daily_category_totals table")
+
+        query = f"SELECT user_id, date, category_primary, {', '.join(MEASURES)} FROM daily_category_totals"
+        if user_ids is None:
+            rows = cursor.execute(query).fetchall()
+        else:
+            user_ids = list(user_ids)
+            rows = []
+            for i in range(0, len(user_ids), USER_QUERY_BATCH):
+                batch = user_ids[i:i + USER_QUERY_BATCH]
+                rows.extend(cursor.execute(f"{query} WHERE user_id IN ({', '.join('?' * len(batch))})", batch))
+
+        if as_of is None:
+            as_of = cursor.execute("SELECT MAX(date) FROM daily_category_totals").fetchone()[0]
+        totals = pd.DataFrame(rows, columns=['user_id', 'date', 'category_primary'] + MEASURES)
+        return cls(totals, user_ids=user_ids, as_of=as_of)
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    def window(self, days: int) -> np.ndarray:
+        """
+        Sum each measure per user and category over the last days up to as_of.
+
+        Args:
+            days: Window length
+
+        Returns:
+            int64 array (users, categories, MEASURES): counts, and amounts
+            in cents
+        """
+        series = np.arange(len(self) * len(self.categories), dtype=np.int64) << 32
+        end = np.searchsorted(self.keys, series + self.as_of, side='right')
+        start = np.searchsorted(self.keys, series + self.as_of - days, side='right')
+        return (self.prefix[end] - self.prefix[start]).reshape(len(self), len(self.categories), len(MEASURES))
+
+    def signals(self, days: int) -> pd.DataFrame:
+        """
+        Compute the cash_flow block of every user for a window.
+
+        Args:
+            days: Window length
+
+        Returns:
+            DataFrame indexed by user_id with the EMPTY_CASH_FLOW columns
+        """
+        totals = self.window(days)
+        count, inflow, outflow, spend = (totals[:, :, index] for index in range(len(MEASURES)))
+        income = inflow[:, self.categories.get_loc(INCOME_CATEGORY)] if INCOME_CATEGORY in self.categories \
+            else np.zeros(len(self), dtype=np.int64)
+
+        total_inflow, total_outflow = inflow.sum(axis=1), outflow.sum(axis=1)
+        total_spend = spend.sum(axis=1) / 100
+        return pd.DataFrame({
+            'transaction_count': count.sum(axis=1),
+            'total_inflow': total_inflow / 100,
+            'total_outflow': total_outflow / 100,
+            'net_cash_flow': (total_inflow - total_outflow) / 100,
+            'income_inflow': income / 100,
+            'total_spend': total_spend,
+            'monthly_spend': np.round(total_spend * DAYS_PER_MONTH / days, 2),
+            'daily_average_spend': np.round(total_spend / days, 2),
+            'top_categories': self._top_categories(spend)
+        }, index=self.users.rename('user_id'))
+
+    def _top_categories(self, spend: np.ndarray) -> np.ndarray:
+        """List each user's TOP_CATEGORIES categories by spend, with their share."""
+        lists = empty_lists(len(self))
+        total = spend.sum(axis=1)
+        order = np.argsort(-spend, axis=1, kind='stable')[:, :TOP_CATEGORIES]
+        names = self.categories.to_numpy()
+        for user in np.flatnonzero(total > 0).tolist():
+            lists[user] = [
+                {'category': names[category], 'spend': float(spend[user, category]) / 100,
+                 'share_pct': round(float(spend[user, category]) * 100 / float(total[user]), 2)}
+                for category in order[user].tolist() if spend[user, category] > 0
+            ]
+        return lists
+
+    @property
+    def as_of_date(self) -> str:
+        """Last day of every window as an ISO date."""
+        return iso_date(self.as_of)
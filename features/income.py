@@ -0,0 +1,154 @@
+"""
+Income stability signals.
+
+Deposits of at least MIN_DEPOSIT_AMOUNT into checking accounts count as
+income. Their gaps give the payment frequency, their coefficient of
+variation the income variability, and checking balances divided by monthly
+expenses the cash-flow buffer. Users with fewer than two deposits in the
+window get EMPTY_INCOME.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .base import SignalFrames
+
+
+# Smaller deposits are treated as transfers, not income
+MIN_DEPOSIT_AMOUNT = 100
+
+# Median gap (days) ranges of each payment frequency; anything else is irregular
+PAY_FREQUENCIES = [('biweekly', 12, 16), ('weekly', 6, 8), ('monthly', 25, 35)]
+
+# Deposits listed in recent_deposits
+RECENT_DEPOSITS = 5
+
+EMPTY_INCOME = {
+    'income_type': 'unknown',
+    'payment_frequency': 'unknown',
+    'median_pay_gap_days': 0,
+    'income_variability_pct': 0.0,
+    'cash_flow_buffer_months': 0.0,
+    'median_deposit_amount': 0.0,
+    'num_deposits_in_window': 0,
+    'recent_deposits': []
+}
+
+
+class IncomeAnalyzer:
+    """Compute the income block for every user."""
+
+    def calculate(self, frames: SignalFrames, window_days: int) -> pd.DataFrame:
+        """
+        Compute income signals.
+
+        Args:
+            frames: Population tables
+            window_days: Days of deposits analyzed
+
+        Returns:
+            DataFrame indexed by user_id with the EMPTY_INCOME keys as columns
+        """
+        result = frames.empty(EMPTY_INCOME)
+        tx = frames.transactions
+        is_deposit = (frames.in_window(window_days) & (tx['account_type'] == 'checking').to_numpy()
+                      & (tx['amount'] >= MIN_DEPOSIT_AMOUNT).to_numpy() & (tx['user'] >= 0).to_numpy())
+        user = tx['user'].to_numpy()[is_deposit]
+        day = tx['day'].to_numpy()[is_deposit]
+        amount = tx['amount'].to_numpy()[is_deposit]
+        order = np.lexsort((day, user))
+
+        self.fill_deposits(result, self.deposit_signals(user[order], day[order], amount[order]))
+        self.fill_buffer(frames, result, frames.monthly_expenses())
+        return result
+
+    def deposit_signals(self, user: np.ndarray, day: np.ndarray, amount: np.ndarray) -> pd.DataFrame:
+        """
+        Summarize the deposits of users with two or more.
+
+        Args:
+            user: User code of each deposit, sorted
+            day: Day number of each deposit, sorted within each user
+            amount: Deposit amounts
+
+        Returns:
+            DataFrame indexed by user code with the EMPTY_INCOME keys except
+            cash_flow_buffer_months
+        """
+        columns = [column for column in EMPTY_INCOME if column != 'cash_flow_buffer_months']
+        none = pd.DataFrame(columns=columns, index=pd.Index([], dtype=np.int64))
+        if len(user) == 0:
+            return none
+        follows = np.r_[False, user[1:] == user[:-1]]
+        gap = np.where(follows, np.r_[0, np.diff(day)], -1)
+
+        deposits = pd.DataFrame({'user': user, 'amount': amount})
+        stats = deposits.groupby('user', sort=False)['amount'].agg(['count', 'mean', 'std', 'median'])
+        gaps = pd.Series(gap[follows]).groupby(user[follows], sort=False).median()
+        stats = stats[stats['count'] >= 2].join(gaps.rename('gap'))
+        if len(stats) == 0:
+            return none
+
+        median_gap = stats['gap'].to_numpy()
+        frequency = np.select(
+            [(median_gap >= low) & (median_gap <= high) for _, low, high in PAY_FREQUENCIES],
+            [name for name, _, _ in PAY_FREQUENCIES], default='irregular'
+        )
+        mean = stats['mean'].to_numpy()
+        variability = np.divide(stats['std'].to_numpy() * 100, mean, out=np.zeros(len(stats)), where=mean > 0)
+        income_type = np.where((variability < 10) & (frequency != 'irregular'), 'payroll',
+                               np.where(variability >= 20, 'freelance', 'mixed'))
+
+        # Last RECENT_DEPOSITS deposits of each user with two or more
+        group = np.cumsum(~follows) - 1
+        ends = np.r_[np.flatnonzero(~follows)[1:], len(user)]
+        from_end = ends[group] - np.arange(len(user))
+        recent = (from_end <= RECENT_DEPOSITS) & np.isin(user, stats.index.to_numpy())
+        recent_rows = pd.DataFrame({
+            'date': day[recent].astype('datetime64[D]').astype(str),
+            'amount': amount[recent].round(2),
+            'days_since_last': pd.Series([int(value) if value >= 0 else None for value in gap[recent]], dtype=object)
+        })
+        recent_user = user[recent]
+        bounds = np.r_[0, np.flatnonzero(np.diff(recent_user)) + 1, len(recent_user)]
+        records = recent_rows.to_dict('records')
+        lists = {recent_user[start]: records[start:end] for start, end in zip(bounds[:-1], bounds[1:]) if end > start}
+
+        return pd.DataFrame({
+            'income_type': income_type,
+            'payment_frequency': frequency,
+            'median_pay_gap_days': median_gap.astype(np.int64),
+            'income_variability_pct': variability.round(2),
+            'median_deposit_amount': stats['median'].round(2).to_numpy(),
+            'num_deposits_in_window': stats['count'].to_numpy(),
+            'recent_deposits': pd.Series([lists[code] for code in stats.index], dtype=object).to_numpy()
+        }, index=stats.index)[columns]
+
+    def fill_deposits(self, result: pd.DataFrame, signals: pd.DataFrame) -> None:
+        """
+        Write deposit_signals() rows into a per-user result frame.
+
+        Args:
+            result: Frame from frames.empty(EMPTY_INCOME)
+            signals: Rows indexed by user code
+        """
+        rows = signals.index.to_numpy()
+        for column in signals.columns:
+            result.iloc[rows, result.columns.get_loc(column)] = signals[column].to_numpy()
+
+    def fill_buffer(self, frames: SignalFrames, result: pd.DataFrame, expenses: np.ndarray) -> None:
+        """
+        Set cash_flow_buffer_months (checking balance over monthly expenses).
+
+        Only users with two or more deposits get a buffer.
+
+        Args:
+            frames: Population tables
+            result: Per-user income frame
+            expenses: Monthly expenses of each user
+        """
+        checking = frames.accounts[frames.accounts['type'] == 'checking']
+        balance = frames.per_user(checking['user'].to_numpy(), checking['current_balance'].fillna(0).to_numpy())
+        buffer = np.divide(balance, expenses, out=np.zeros(len(frames)), where=expenses > 0)
+        has_income = result['num_deposits_in_window'].to_numpy() >= 2
+        result['cash_flow_buffer_months'] = np.where(has_income, buffer, 0).round(2)
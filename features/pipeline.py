@@ -0,0 +1,266 @@
+"""
+Signal pipeline: compute every signal block for every user and store them.
+
+SignalEngine reads the population once (SignalFrames) and runs each
+analyzer over all users with grouped NumPy/pandas aggregations; no query or
+Python loop runs per user. The blocks are written to user_signal_values,
+one row per user and window with a typed column per signal (see
+store.py), which PersonaAssigner and the API read. The legacy user_signals
+rows (one JSON blob per user, window and category) are still written by
+default for readers not yet ported (the Firestore migration, the persona
+examples); pass json_blobs=False to skip them.
+
+For a daily refresh, advance() hands the new transactions to
+RollingSignals, which moves running aggregates forward instead of
+recomputing every window from the whole history.
+"""
+
+import json
+import sqlite3
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+import pandas as pd
+
+from .base import WINDOW_DAYS, SignalFrames
+from .credit import CreditAnalyzer
+from .income import IncomeAnalyzer
+from .rolling import RollingSignals
+from .savings import SavingsAnalyzer
+from .store import write_signal_table
+from .subscriptions import SubscriptionDetector
+
+
+SIGNAL_CATEGORIES = ['credit', 'income', 'subscriptions', 'savings']
+
+
+def signal_columns(conn: sqlite3.Connection) -> Tuple[str, str, bool]:
+    """
+    Describe the user_signals table of a database.
+
+    The ingest schema names the columns signal_category/signal_data with
+    text signal IDs; databases migrated for the persona system
+    (migrate_schema.py) use signal_type/signal_json, and the persona tests
+    use integer signal IDs.
+
+    Args:
+        conn: Open SQLite connection
+
+    Returns:
+        Tuple of (category column, JSON column, whether signal_id is text)
+
+    Raises:
+        ValueError: If there is no user_signals table
+    """
+    columns = {row[1]: row[2].upper() for row in conn.execute("PRAGMA table_info(user_signals)")}
+    if not columns:
+        raise ValueError("Database has no user_signals table")
+    text_ids = columns.get('signal_id') != 'INTEGER'
+    if 'signal_type' in columns:
+        return 'signal_type', 'signal_json', text_ids
+    return 'signal_category', 'signal_data', text_ids
+
+
+class SignalEngine:
+    """
+    Compute credit, income, subscription and savings signals from data.
+
+    Example:
+        engine = SignalEngine(conn)
+        engine.generate_all()                      # store 30d and 180d signals
+        signals = engine.user_signals('user_000')  # one user's blocks
+
+        engine.advance(tick['transactions'], tick['balances'])  # next day
+        engine.generate_all()
+    """
+
+    def __init__(self, db_connection: sqlite3.Connection, as_of: Optional[str] = None,
+                 frames: Optional[SignalFrames] = None, json_blobs: bool = True):
+        """
+        Initialize the engine.
+
+        Args:
+            db_connection: SQLite database connection
+            as_of: Last day of every window (default: latest transaction date)
+            frames: Population tables to use instead of reading the database
+            json_blobs: Also write the legacy user_signals JSON rows (for
+                readers that have not moved to user_signal_values)
+        """
+        self.db = db_connection
+        self.as_of = as_of
+        self._frames = frames
+        self.json_blobs = json_blobs
+        self.credit = CreditAnalyzer()
+        self.income = IncomeAnalyzer()
+        self.subscriptions = SubscriptionDetector()
+        self.savings = SavingsAnalyzer()
+        self.timings: Dict[str, float] = {}
+        self._results: Dict[str, Dict[str, pd.DataFrame]] = {}
+        self._credit: Optional[pd.DataFrame] = None
+        self.rolling: Optional[RollingSignals] = None
+
+    @property
+    def frames(self) -> SignalFrames:
+        """Population tables, read from the database on first use."""
+        if self._frames is None:
+            started = time.perf_counter()
+            self._frames = SignalFrames.from_database(self.db, self.as_of)
+            self.timings['read'] = time.perf_counter() - started
+        return self._frames
+
+    def compute(self, window_type: str = '30d') -> Dict[str, pd.DataFrame]:
+        """
+        Compute every signal block of a window for all users.
+
+        Args:
+            window_type: Window key of WINDOW_DAYS ('30d' or '180d')
+
+        Returns:
+            Dict of category -> DataFrame indexed by user_id, one column per signal
+
+        Raises:
+            ValueError: If window_type is unknown
+        """
+        if window_type not in WINDOW_DAYS:
+            raise ValueError(f"Unknown window '{window_type}' (expected one of {list(WINDOW_DAYS)})")
+        if window_type in self._results:
+            return self._results[window_type]
+
+        frames, days = self.frames, WINDOW_DAYS[window_type]
+        if self.rolling is not None and window_type in self.rolling.windows:
+            rolling = self.rolling
+            steps = {
+                'credit': self._credit_block,
+                'income': lambda: rolling.income(window_type),
+                'subscriptions': lambda: rolling.subscriptions(window_type),
+                'savings': lambda: rolling.savings(window_type)
+            }
+        else:
+            steps = {
+                'credit': self._credit_block,
+                'income': lambda: self.income.calculate(frames, days),
+                'subscriptions': lambda: self.subscriptions.calculate(frames, days),
+                'savings': lambda: self.savings.calculate(frames, days)
+            }
+
+        results = {}
+        for category in SIGNAL_CATEGORIES:
+            started = time.perf_counter()
+            results[category] = steps[category]()
+            key = f'{window_type}.{category}'
+            self.timings[key] = self.timings.get(key, 0.0) + time.perf_counter() - started
+
+        self._results[window_type] = results
+        return results
+
+    def _credit_block(self) -> pd.DataFrame:
+        """Credit signals do not depend on the window; computed once."""
+        if self._credit is None:
+            self._credit = self.rolling.credit() if self.rolling is not None else self.credit.calculate(self.frames)
+        return self._credit
+
+    def advance(self, transactions: pd.DataFrame, balances: Optional[pd.DataFrame] = None,
+                as_of: Optional[str] = None) -> None:
+        """
+        Move every window forward over new days of transactions.
+
+        The first call builds the rolling aggregates from the history (one
+        full pass); later calls cost the new and evicted rows only. Windows
+        the rolling state keeps are served from it afterwards; the
+        transactions are not written to the database.
+
+        Args:
+            transactions: New transactions, all dated after the current windows
+                (e.g. LiveFeed.advance()['transactions'])
+            balances: account_id and current_balance of accounts whose balance
+                changed (e.g. LiveFeed.advance()['balances'])
+            as_of: New last day of every window (default: latest new transaction)
+
+        Raises:
+            ValueError: If a transaction is not newer than the current windows
+        """
+        if self.rolling is None:
+            started = time.perf_counter()
+            self.rolling = RollingSignals(self.frames)
+            self.timings['rolling.build'] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        self.rolling.advance(transactions, balances, as_of)
+        self.timings['rolling.advance'] = time.perf_counter() - started
+        self._results = {}
+        self._credit = None
+
+    def user_signals(self, user_id: str, window_type: str = '30d') -> Dict[str, dict]:
+        """
+        Get one user's signal blocks.
+
+        Args:
+            user_id: User identifier
+            window_type: Window key of WINDOW_DAYS
+
+        Returns:
+            Dict of category -> signal dict
+
+        Raises:
+            ValueError: If the user is unknown
+        """
+        results = self.compute(window_type)
+        if user_id not in self.frames.users:
+            raise ValueError(f"Unknown user '{user_id}'")
+        return {category: frame.loc[[user_id]].to_dict('records')[0] for category, frame in results.items()}
+
+    def store(self, window_type: str = '30d') -> int:
+        """
+        Compute a window's signals and replace that window in user_signal_values.
+
+        Unless json_blobs is off, the window is also replaced in the legacy
+        user_signals table (one JSON blob per user and category).
+
+        Args:
+            window_type: Window key of WINDOW_DAYS
+
+        Returns:
+            Number of users written
+        """
+        results = self.compute(window_type)
+
+        started = time.perf_counter()
+        written = write_signal_table(self.db, window_type, results)
+        if self.json_blobs:
+            self._store_json(window_type, results)
+        self.db.commit()
+        self.timings[f'{window_type}.store'] = time.perf_counter() - started
+        return written
+
+    def _store_json(self, window_type: str, results: Dict[str, pd.DataFrame]) -> None:
+        """Replace a window in user_signals with one JSON blob per user and category."""
+        category_column, json_column, text_ids = signal_columns(self.db)
+        rows = []
+        for category, frame in results.items():
+            records = frame.to_dict('records')
+            rows.extend(
+                (f"sig_{user_id}_{window_type}_{category}", user_id, window_type, category, json.dumps(record))
+                for user_id, record in zip(frame.index, records)
+            )
+        if not text_ids:
+            rows = [row[1:] for row in rows]
+
+        id_column, id_value = ('signal_id, ', '?, ') if text_ids else ('', '')
+        self.db.execute("DELETE FROM user_signals WHERE window_type = ?", (window_type,))
+        self.db.executemany(f"""
+            INSERT INTO user_signals (
+                {id_column}user_id, window_type, {category_column}, {json_column}, detected_at
+            ) VALUES ({id_value}?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """, rows)
+
+    def generate_all(self, windows: Iterable[str] = ('30d', '180d')) -> Dict[str, int]:
+        """
+        Compute and store the signals of several windows.
+
+        Args:
+            windows: Window keys of WINDOW_DAYS
+
+        Returns:
+            Dict of window -> users written
+        """
+        return {window_type: self.store(window_type) for window_type in windows}
@@ -0,0 +1,523 @@
+"""
+Rolling-window signal maintenance.
+
+A nightly refresh adds one day of transactions, so recomputing every window
+from the whole history repeats almost all of the work. RollingSignals keeps
+the aggregates the analyzers build their blocks from and moves them forward
+a day at a time:
+
+- running sums in integer cents (outflows, coffee/food spend and savings net
+  flow per user, interest per card, checking debits per user and month):
+  the new day is added and the day that left each window subtracted
+- row lists per key (deposits per user for pay gaps, charges per
+  user/merchant series, savings flows per user): only keys touched by new or
+  evicted rows are summarized again, with the analyzers' own vectorized code
+- balances (utilization and savings snapshots), updated for the accounts
+  whose balance changed
+
+A refresh therefore costs O(new and evicted rows) plus one vectorized pass
+over users for the figures that depend on balances. Rows that leave every
+window are dropped, so memory holds the longest window only. verify()
+compares the result with a full recompute.
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .base import EXPENSE_WINDOW_DAYS, WINDOW_DAYS, SignalFrames, empty_lists, factorize_into
+from .credit import INTEREST_WINDOW_DAYS, CreditAnalyzer
+from .income import EMPTY_INCOME, MIN_DEPOSIT_AMOUNT, IncomeAnalyzer
+from .savings import SAVINGS_ACCOUNT_TYPES, SavingsAnalyzer
+from .subscriptions import NON_SUBSCRIPTION_CATEGORIES, RECURRING_LOOKBACK_DAYS, SubscriptionDetector
+
+
+# Row kinds kept in the day blocks (bit flags)
+DEPOSIT, CHARGE, OUTFLOW, COFFEE_FOOD, SAVINGS_FLOW, INTEREST, CHECKING_DEBIT = (1 << bit for bit in range(7))
+
+# Month slots of the per-user debit ring: more than the months a window spans
+EXPENSE_MONTH_SLOTS = EXPENSE_WINDOW_DAYS // 28 + 2
+
+# Blocks round to hundredths; running sums add in a different order than a
+# full recompute, so a figure may land one hundredth away
+VERIFY_TOLERANCE = 0.011
+
+BLOCK_FIELDS = ['user', 'account', 'series', 'day', 'amount', 'cents', 'flags']
+
+_NO_DAYS = np.empty(0, dtype=np.int32)
+_NO_AMOUNTS = np.empty(0)
+
+
+class RowLists:
+    """Day-ordered (day, amount) rows of each key (a user or a charge series)."""
+
+    def __init__(self, size: int = 0):
+        """
+        Initialize empty lists.
+
+        Args:
+            size: Number of keys
+        """
+        self.days: List[np.ndarray] = []
+        self.amounts: List[np.ndarray] = []
+        self.grow(size)
+
+    def grow(self, size: int) -> None:
+        """Add empty lists up to size keys."""
+        missing = size - len(self.days)
+        self.days.extend([_NO_DAYS] * missing)
+        self.amounts.extend([_NO_AMOUNTS] * missing)
+
+    def add(self, keys: np.ndarray, days: np.ndarray, amounts: np.ndarray) -> np.ndarray:
+        """
+        Append rows newer than every stored row.
+
+        Returns:
+            Sorted keys that received rows
+        """
+        order = np.lexsort((days, keys))
+        keys, days, amounts = keys[order], days[order], amounts[order]
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if len(keys) else np.empty(0, dtype=np.int64)
+        ends = np.r_[starts[1:], len(keys)]
+        for key, start, end in zip(keys[starts].tolist(), starts.tolist(), ends.tolist()):
+            key_days, key_amounts = days[start:end], amounts[start:end]
+            # Keys without rows (the whole history on the first pass) take the slices as they are
+            if len(self.days[key]):
+                key_days = np.concatenate((self.days[key], key_days))
+                key_amounts = np.concatenate((self.amounts[key], key_amounts))
+            self.days[key], self.amounts[key] = key_days, key_amounts
+        return keys[starts]
+
+    def evict(self, keys: np.ndarray) -> np.ndarray:
+        """
+        Drop the oldest rows: one per occurrence of a key in keys.
+
+        Args:
+            keys: Key of each evicted row (evicted rows are always the
+                oldest of their key)
+
+        Returns:
+            Sorted distinct keys
+        """
+        keys, counts = np.unique(keys, return_counts=True)
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            self.days[key] = self.days[key][count:]
+            self.amounts[key] = self.amounts[key][count:]
+        return keys
+
+    def gather(self, keys: np.ndarray):
+        """
+        Concatenate the rows of some keys.
+
+        Args:
+            keys: Sorted distinct keys
+
+        Returns:
+            Tuple of (key, day, amount) arrays, sorted by key then day
+        """
+        days = [self.days[key] for key in keys.tolist()]
+        amounts = [self.amounts[key] for key in keys.tolist()]
+        lengths = np.fromiter(map(len, days), dtype=np.int64, count=len(days))
+        if not days:
+            return np.empty(0, dtype=np.int64), _NO_DAYS, _NO_AMOUNTS
+        return np.repeat(keys, lengths), np.concatenate(days), np.concatenate(amounts)
+
+
+class _WindowState:
+    """Running aggregates of one signal window."""
+
+    def __init__(self, frames: SignalFrames, days: int):
+        self.days = days
+        self.lookback = max(days, RECURRING_LOOKBACK_DAYS)
+        users = len(frames)
+        self.spend = np.zeros(users, dtype=np.int64)
+        self.coffee_food = np.zeros(users, dtype=np.int64)
+        self.net = np.zeros(users, dtype=np.int64)
+        self.largest_deposit = np.zeros(users)
+        self.largest_withdrawal = np.zeros(users)
+        self.deposits = RowLists(users)
+        self.flows = RowLists(users)
+        self.charges = RowLists()
+        self.income = frames.empty(EMPTY_INCOME)
+        self.recurring = pd.DataFrame({
+            'amount': np.empty(0), 'frequency': np.empty(0, dtype=object),
+            'last_day': np.empty(0, dtype=np.int64), 'charges_in_window': np.empty(0, dtype=np.int64)
+        }, index=pd.Index([], dtype=np.int64, name='series'))
+
+
+class RollingSignals:
+    """
+    Keep the signal blocks of every window current, one day at a time.
+
+    Example:
+        rolling = RollingSignals(SignalFrames.from_database(conn))
+        tick = feed.advance(1)                              # LiveFeed
+        rolling.advance(tick['transactions'], tick['balances'])
+        blocks = rolling.compute('30d')
+    """
+
+    def __init__(self, frames: SignalFrames, windows: Iterable[str] = ('30d', '180d')):
+        """
+        Build the aggregates from the history in frames (one full pass).
+
+        The rolling state takes over frames: balances, merchant_names and
+        as_of move forward with advance(), frames.transactions does not.
+
+        Args:
+            frames: Population tables, windows ending at frames.as_of
+            windows: Window keys of WINDOW_DAYS to maintain
+
+        Raises:
+            ValueError: If a window is unknown
+        """
+        unknown = [window_type for window_type in windows if window_type not in WINDOW_DAYS]
+        if unknown:
+            raise ValueError(f"Unknown windows {unknown} (expected some of {list(WINDOW_DAYS)})")
+
+        self.frames = frames
+        self.credit_analyzer = CreditAnalyzer()
+        self.income_analyzer = IncomeAnalyzer()
+        self.subscription_detector = SubscriptionDetector()
+        self.savings_analyzer = SavingsAnalyzer()
+
+        self.windows = {window_type: _WindowState(frames, WINDOW_DAYS[window_type]) for window_type in windows}
+        self.horizon = max([EXPENSE_WINDOW_DAYS, INTEREST_WINDOW_DAYS]
+                           + [state.lookback for state in self.windows.values()])
+        self.interest = np.zeros(len(frames.accounts), dtype=np.int64)
+        self.debits = np.zeros(len(frames) * EXPENSE_MONTH_SLOTS, dtype=np.int64)
+        self.debit_rows = np.zeros(len(frames) * EXPENSE_MONTH_SLOTS, dtype=np.int64)
+
+        # Charge series: (user, merchant) pairs numbered as they appear
+        self.series_ids: Dict[int, int] = {}
+        self.series_user = np.empty(0, dtype=np.int64)
+        self.series_merchant = np.empty(0, dtype=np.int64)
+        self.blocks: Dict[int, Dict[str, np.ndarray]] = {}
+
+        tx = frames.transactions
+        day = tx['day'].to_numpy()
+        history = tx[(day > frames.as_of - self.horizon) & (day <= frames.as_of)]
+        self.as_of = frames.as_of
+        self._update(self._classify(history), frames.as_of)
+
+    def advance(self, transactions: pd.DataFrame, balances: Optional[pd.DataFrame] = None,
+                as_of: Optional[str] = None) -> None:
+        """
+        Add new days of transactions and move every window forward.
+
+        Args:
+            transactions: New transactions with the TRANSACTION_COLUMNS, all
+                dated after the current as_of (e.g. LiveFeed.advance()['transactions'])
+            balances: account_id and current_balance of accounts whose balance
+                changed (e.g. LiveFeed.advance()['balances'])
+            as_of: New last day of every window (default: latest new transaction)
+
+        Raises:
+            ValueError: If a transaction is not newer than the current as_of
+        """
+        rows = self._classify(self.frames.encode(transactions))
+        if len(rows['day']) and rows['day'].min() <= self.as_of:
+            raise ValueError(f"New transactions must be dated after {np.datetime64(self.as_of, 'D')}")
+
+        if as_of is not None:
+            new_as_of = int(np.datetime64(as_of[:10], 'D').astype(np.int64))
+        else:
+            new_as_of = int(rows['day'].max()) if len(rows['day']) else self.as_of
+        if len(rows['day']) and rows['day'].max() > new_as_of:
+            raise ValueError(f"Transactions dated after as_of {as_of}")
+
+        if balances is not None and len(balances):
+            positions = factorize_into(self.frames.account_index, balances['account_id'])
+            known = positions >= 0
+            self.frames.accounts.loc[positions[known], 'current_balance'] = \
+                pd.to_numeric(balances['current_balance'], errors='coerce').to_numpy(dtype=float)[known]
+
+        self._update(rows, new_as_of)
+
+    def _classify(self, tx: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Flag the rows any aggregate uses and number their charge series."""
+        user = tx['user'].to_numpy()
+        amount = tx['amount'].to_numpy()
+        merchant = tx['merchant'].to_numpy()
+        account = factorize_into(self.frames.account_index, tx['account_id'])
+        checking = (tx['account_type'] == 'checking').to_numpy()
+        known = user >= 0
+        outflow = (amount < 0) & known
+
+        flags = np.zeros(len(tx), dtype=np.uint8)
+        flags[checking & (amount >= MIN_DEPOSIT_AMOUNT) & known] |= DEPOSIT
+        flags[outflow & (merchant >= 0) & ~tx['category_primary'].isin(NON_SUBSCRIPTION_CATEGORIES).to_numpy()] |= CHARGE
+        flags[outflow] |= OUTFLOW
+        flags[outflow & self.subscription_detector.coffee_food(self.frames, tx['category_detailed'], merchant)] |= COFFEE_FOOD
+        flags[tx['account_type'].isin(SAVINGS_ACCOUNT_TYPES).to_numpy() & known] |= SAVINGS_FLOW
+        flags[(tx['category_detailed'] == 'INTEREST_CHARGED').to_numpy() & (account >= 0)] |= INTEREST
+        flags[checking & outflow] |= CHECKING_DEBIT
+
+        used = flags != 0
+        rows = {
+            'user': user[used].astype(np.int64), 'account': account[used].astype(np.int64),
+            'day': tx['day'].to_numpy()[used], 'amount': amount[used],
+            'cents': np.round(amount[used] * 100).astype(np.int64), 'flags': flags[used]
+        }
+        rows['series'] = np.full(len(rows['day']), -1, dtype=np.int64)
+        charge = (rows['flags'] & CHARGE) != 0
+        rows['series'][charge] = self._series(rows['user'][charge], merchant[used][charge].astype(np.int64))
+        return rows
+
+    def _series(self, user: np.ndarray, merchant: np.ndarray) -> np.ndarray:
+        """Number (user, merchant) pairs, adding unseen pairs."""
+        pairs, inverse = np.unique((user << 32) + merchant, return_inverse=True)
+        known = len(self.series_ids)
+        ids = np.array([self.series_ids.setdefault(pair, len(self.series_ids)) for pair in pairs.tolist()],
+                       dtype=np.int64)
+        unseen = ids >= known
+        self.series_user = np.r_[self.series_user, pairs[unseen] >> 32]
+        self.series_merchant = np.r_[self.series_merchant, pairs[unseen] & 0xFFFFFFFF]
+        for state in self.windows.values():
+            state.charges.grow(len(self.series_ids))
+        return ids[inverse.ravel()]
+
+    def _update(self, rows: Dict[str, np.ndarray], new_as_of: int) -> None:
+        """Evict what left each window, add the new rows and summarize touched keys."""
+        old_as_of = self.as_of
+
+        def window_rows(days: int, flag: int):
+            """(added, evicted) rows of one kind for a window of days."""
+            added = ((rows['flags'] & flag) != 0) & (rows['day'] > new_as_of - days)
+            evicted = self._block_rows(old_as_of - days, new_as_of - days)
+            evicted_kind = (evicted['flags'] & flag) != 0
+            return ({field: values[added] for field, values in rows.items()},
+                    {field: values[evicted_kind] for field, values in evicted.items()})
+
+        # Interest per card account
+        added, evicted = window_rows(INTEREST_WINDOW_DAYS, INTEREST)
+        self.interest += self._sum(added['account'], np.abs(added['cents']), len(self.interest))
+        self.interest -= self._sum(evicted['account'], np.abs(evicted['cents']), len(self.interest))
+
+        # Checking debits per user and calendar month
+        added, evicted = window_rows(EXPENSE_WINDOW_DAYS, CHECKING_DEBIT)
+        for part, sign in [(added, 1), (evicted, -1)]:
+            slot = part['user'] * EXPENSE_MONTH_SLOTS + _month(part['day']) % EXPENSE_MONTH_SLOTS
+            self.debits += sign * self._sum(slot, -part['cents'], len(self.debits))
+            self.debit_rows += sign * np.bincount(slot, minlength=len(self.debit_rows))
+
+        for state in self.windows.values():
+            for name, flag, sign in [('spend', OUTFLOW, -1), ('coffee_food', COFFEE_FOOD, -1), ('net', SAVINGS_FLOW, 1)]:
+                added, evicted = window_rows(state.days, flag)
+                total = getattr(state, name)
+                total += sign * self._sum(added['user'], added['cents'], len(total))
+                total -= sign * self._sum(evicted['user'], evicted['cents'], len(total))
+
+            added, evicted = window_rows(state.days, SAVINGS_FLOW)
+            touched = self._move(state.flows, 'user', added, evicted)
+            self._savings_extremes(state, touched)
+
+            added, evicted = window_rows(state.days, DEPOSIT)
+            touched = self._move(state.deposits, 'user', added, evicted)
+            self._income_rows(state, touched)
+
+            added, evicted = window_rows(state.lookback, CHARGE)
+            touched = self._move(state.charges, 'series', added, evicted)
+            self._recurring_rows(state, touched, new_as_of)
+
+        # Keep each day's rows until the longest window no longer covers it
+        order = np.argsort(rows['day'], kind='stable')
+        days = rows['day'][order]
+        starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]]) if len(days) else []
+        ends = np.r_[starts[1:], len(days)] if len(days) else []
+        for start, end in zip(starts, ends):
+            if days[start] > new_as_of - self.horizon:
+                self.blocks[int(days[start])] = {field: values[order[start:end]] for field, values in rows.items()}
+        for day in [day for day in self.blocks if day <= new_as_of - self.horizon]:
+            del self.blocks[day]
+
+        self.as_of = new_as_of
+        self.frames.as_of = new_as_of
+
+    def _block_rows(self, after: int, through: int) -> Dict[str, np.ndarray]:
+        """Stored rows dated after `after` and through `through`."""
+        blocks = [self.blocks[day] for day in range(after + 1, through + 1) if day in self.blocks]
+        if not blocks:
+            return {field: np.empty(0, dtype=np.uint8 if field == 'flags' else np.int64) for field in BLOCK_FIELDS}
+        return {field: np.concatenate([block[field] for block in blocks]) for field in BLOCK_FIELDS}
+
+    @staticmethod
+    def _sum(index: np.ndarray, cents: np.ndarray, length: int) -> np.ndarray:
+        """Sum cents per index (exact: float64 holds integers up to 2**53)."""
+        return np.bincount(index, weights=cents, minlength=length).astype(np.int64)
+
+    @staticmethod
+    def _move(lists: RowLists, key: str, added: Dict[str, np.ndarray], evicted: Dict[str, np.ndarray]) -> np.ndarray:
+        """Evict and append rows of some keys; returns the sorted touched keys."""
+        touched = np.union1d(lists.evict(evicted[key]),
+                             lists.add(added[key], added['day'], added['amount']))
+        return touched.astype(np.int64)
+
+    def _savings_extremes(self, state: _WindowState, users: np.ndarray) -> None:
+        """Recompute the largest savings deposit and withdrawal of some users."""
+        state.largest_deposit[users] = 0
+        state.largest_withdrawal[users] = 0
+        user, _, amount = state.flows.gather(users)
+        np.maximum.at(state.largest_deposit, user, amount)
+        np.maximum.at(state.largest_withdrawal, user, -amount)
+
+    def _income_rows(self, state: _WindowState, users: np.ndarray) -> None:
+        """Recompute the deposit-based income signals of some users."""
+        income = state.income
+        for column, default in EMPTY_INCOME.items():
+            income.iloc[users, income.columns.get_loc(column)] = \
+                empty_lists(len(users)) if isinstance(default, list) else default
+        user, day, amount = state.deposits.gather(users)
+        self.income_analyzer.fill_deposits(income, self.income_analyzer.deposit_signals(user, day, amount))
+
+    def _recurring_rows(self, state: _WindowState, series: np.ndarray, new_as_of: int) -> None:
+        """Reclassify some charge series of a window."""
+        first_day = new_as_of - state.lookback + 1
+        key, day, amount = state.charges.gather(series)
+        found = self.subscription_detector.recurring_series(key, day.astype(np.int64) - first_day,
+                                                            -amount, state.lookback)
+        found = pd.DataFrame({
+            'amount': found['amount'].to_numpy(),
+            'frequency': found['frequency'].to_numpy(),
+            'last_day': found['last_offset'].to_numpy() + first_day,
+            'charges_in_window': found['charges_in_window'].to_numpy()
+        }, index=pd.Index(found['series'].to_numpy(), name='series'))
+        kept = state.recurring[~state.recurring.index.isin(series)]
+        state.recurring = pd.concat([kept, found]) if len(found) else kept
+
+    def monthly_expenses(self) -> np.ndarray:
+        """Average monthly checking debits per user (see SignalFrames.monthly_expenses)."""
+        debits = self.debits.reshape(len(self.frames), EXPENSE_MONTH_SLOTS)
+        months = (self.debit_rows.reshape(debits.shape) > 0).sum(axis=1)
+        total = np.where(self.debit_rows.reshape(debits.shape) > 0, debits, 0).sum(axis=1) / 100
+        return np.divide(total, months, out=np.zeros(len(self.frames)), where=months > 0)
+
+    def credit(self) -> pd.DataFrame:
+        """Credit block from current balances and the running interest."""
+        interest = pd.Series(self.interest / 100, index=self.frames.account_index)
+        return self.credit_analyzer.calculate(self.frames, interest=interest)
+
+    def income(self, window_type: str) -> pd.DataFrame:
+        """Income block of a window."""
+        result = self.windows[window_type].income.copy()
+        self.income_analyzer.fill_buffer(self.frames, result, self.monthly_expenses())
+        return result
+
+    def subscriptions(self, window_type: str) -> pd.DataFrame:
+        """Subscriptions block of a window."""
+        state = self.windows[window_type]
+        found = state.recurring
+        series = found.index.to_numpy()
+        user, merchant = self.series_user[series], self.series_merchant[series]
+        order = np.lexsort((merchant, user))
+        recurring = pd.DataFrame({
+            'user': user[order],
+            'name': np.asarray(self.frames.merchant_names, dtype=object)[merchant[order]],
+            'amount': found['amount'].to_numpy()[order],
+            'frequency': found['frequency'].to_numpy()[order],
+            'last_charge_date': found['last_day'].to_numpy()[order].astype('datetime64[D]').astype(str),
+            'charges_in_window': found['charges_in_window'].to_numpy()[order]
+        })
+        return self.subscription_detector.summarize(self.frames, recurring, state.spend / 100,
+                                                    state.coffee_food / 100, state.days)
+
+    def savings(self, window_type: str) -> pd.DataFrame:
+        """Savings block of a window."""
+        state = self.windows[window_type]
+        return self.savings_analyzer.summarize(self.frames, state.net / 100, state.largest_deposit,
+                                               state.largest_withdrawal, self.monthly_expenses(), state.days)
+
+    def compute(self, window_type: str = '30d') -> Dict[str, pd.DataFrame]:
+        """
+        Get every signal block of a window.
+
+        Returns:
+            Dict of category -> DataFrame indexed by user_id, as SignalEngine.compute()
+        """
+        return {
+            'credit': self.credit(),
+            'income': self.income(window_type),
+            'subscriptions': self.subscriptions(window_type),
+            'savings': self.savings(window_type)
+        }
+
+    def verify(self, frames: SignalFrames, tolerance: float = VERIFY_TOLERANCE) -> List[str]:
+        """
+        Compare the rolling blocks with a full recompute.
+
+        Args:
+            frames: Population tables holding the whole history, including
+                every day added with advance(), and the current balances
+            tolerance: Largest accepted difference of a number
+
+        Returns:
+            One message per mismatching (window, category, column); empty when
+            the rolling state matches
+
+        Raises:
+            ValueError: If frames' windows do not end on the rolling as_of
+        """
+        if frames.as_of != self.as_of:
+            raise ValueError(f"Frames end on {np.datetime64(frames.as_of, 'D')}, "
+                             f"rolling windows on {np.datetime64(self.as_of, 'D')}")
+        full = {
+            'credit': lambda days: self.credit_analyzer.calculate(frames),
+            'income': lambda days: self.income_analyzer.calculate(frames, days),
+            'subscriptions': lambda days: self.subscription_detector.calculate(frames, days),
+            'savings': lambda days: self.savings_analyzer.calculate(frames, days)
+        }
+        problems = []
+        for window_type, state in self.windows.items():
+            for category, actual in self.compute(window_type).items():
+                expected = full[category](state.days)
+                problems.extend(f"{window_type}.{category}.{problem}"
+                                for problem in compare_blocks(expected, actual, tolerance))
+        return problems
+
+
+def compare_blocks(expected: pd.DataFrame, actual: pd.DataFrame, tolerance: float = VERIFY_TOLERANCE) -> List[str]:
+    """
+    Compare two per-user signal blocks.
+
+    Numbers match within tolerance; lists match in any order.
+
+    Returns:
+        One message per mismatching column
+    """
+    if not expected.index.equals(actual.index):
+        return ['users differ']
+    problems = []
+    for column in expected.columns:
+        different = [user for user, left, right in zip(expected.index, expected[column], actual[column])
+                     if not _close(left, right, tolerance)]
+        if different:
+            user = different[0]
+            problems.append(f"{column}: {len(different)} users differ, e.g. {user}: "
+                            f"{expected.at[user, column]!r} != {actual.at[user, column]!r}")
+    return problems
+
+
+def _close(expected, actual, tolerance: float) -> bool:
+    """Compare signal values, numbers within tolerance and lists in any order."""
+    if isinstance(expected, dict):
+        return (isinstance(actual, dict) and expected.keys() == actual.keys()
+                and all(_close(expected[key], actual[key], tolerance) for key in expected))
+    if isinstance(expected, list):
+        return (isinstance(actual, list) and len(expected) == len(actual)
+                and all(_close(left, right, tolerance)
+                        for left, right in zip(sorted(expected, key=_sort_key), sorted(actual, key=_sort_key))))
+    if isinstance(expected, (float, np.floating)) and isinstance(actual, (int, float, np.number)):
+        return abs(expected - actual) <= tolerance
+    return expected == actual
+
+
+def _sort_key(item) -> str:
+    """Order list items by their non-float fields."""
+    if isinstance(item, dict):
+        return repr(sorted((key, value) for key, value in item.items() if not isinstance(value, float)))
+    return repr(item)
+
+
+def _month(day: np.ndarray) -> np.ndarray:
+    """Months since 1970-01 of day numbers."""
+    return day.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
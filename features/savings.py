@@ -0,0 +1,91 @@
+"""
+Savings signals.
+
+Savings-like accounts are SAVINGS_ACCOUNT_TYPES. Net inflow is deposits
+minus withdrawals on them over the window, reported per month. There are no
+balance snapshots, so the balance at the start of the window is the current
+balance minus that net flow. Emergency fund coverage is the savings balance
+over monthly expenses. Users without savings accounts get EMPTY_SAVINGS.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .base import DAYS_PER_MONTH, SignalFrames
+
+
+SAVINGS_ACCOUNT_TYPES = ['savings', 'money_market', 'hsa']
+
+EMPTY_SAVINGS = {
+    'net_savings_inflow': 0.0,
+    'savings_growth_rate_pct': 0.0,
+    'emergency_fund_months': 0.0,
+    'total_savings_balance': 0.0,
+    'num_savings_accounts': 0,
+    'largest_deposit': 0.0,
+    'largest_withdrawal': 0.0
+}
+
+
+class SavingsAnalyzer:
+    """Compute the savings block for every user."""
+
+    def calculate(self, frames: SignalFrames, window_days: int) -> pd.DataFrame:
+        """
+        Compute savings signals.
+
+        Args:
+            frames: Population tables
+            window_days: Days of savings transactions analyzed
+
+        Returns:
+            DataFrame indexed by user_id with the EMPTY_SAVINGS keys as columns
+        """
+        tx = frames.transactions
+        flows = frames.in_window(window_days) & tx['account_type'].isin(SAVINGS_ACCOUNT_TYPES).to_numpy() \
+            & (tx['user'] >= 0).to_numpy()
+        user = tx['user'].to_numpy()[flows]
+        amount = tx['amount'].to_numpy()[flows]
+        net = frames.per_user(user, amount)
+
+        largest_deposit = np.zeros(len(frames))
+        np.maximum.at(largest_deposit, user, amount)
+        largest_withdrawal = np.zeros(len(frames))
+        np.maximum.at(largest_withdrawal, user, -amount)
+        return self.summarize(frames, net, largest_deposit, largest_withdrawal,
+                              frames.monthly_expenses(), window_days)
+
+    def summarize(self, frames: SignalFrames, net: np.ndarray, largest_deposit: np.ndarray,
+                  largest_withdrawal: np.ndarray, expenses: np.ndarray, window_days: int) -> pd.DataFrame:
+        """
+        Build the savings block from window flows and current balances.
+
+        Args:
+            frames: Population tables
+            net: Net savings flow of each user in the window
+            largest_deposit: Largest savings deposit of each user (0 without)
+            largest_withdrawal: Largest savings withdrawal of each user (0 without)
+            expenses: Monthly expenses of each user
+            window_days: Days the flows cover
+
+        Returns:
+            DataFrame indexed by user_id with the EMPTY_SAVINGS keys as columns
+        """
+        result = frames.empty(EMPTY_SAVINGS)
+        accounts = frames.accounts[frames.accounts['type'].isin(SAVINGS_ACCOUNT_TYPES) & (frames.accounts['user'] >= 0)]
+        account_count = frames.per_user(accounts['user'].to_numpy())
+        balance = frames.per_user(accounts['user'].to_numpy(), accounts['current_balance'].fillna(0).to_numpy())
+
+        start = balance - net
+        growth = np.divide((balance - start) * 100, start, out=np.zeros(len(frames)), where=start > 0)
+        emergency = np.divide(balance, expenses, out=np.zeros(len(frames)), where=expenses > 0)
+
+        has_savings = account_count > 0
+        result['net_savings_inflow'] = np.where(has_savings, net / (window_days / DAYS_PER_MONTH), 0).round(2)
+        result['savings_growth_rate_pct'] = np.where(has_savings, growth, 0).round(2)
+        result['emergency_fund_months'] = np.where(has_savings, emergency, 0).round(2)
+        result['total_savings_balance'] = balance.round(2)
+        result['num_savings_accounts'] = account_count.astype(np.int64)
+        result['largest_deposit'] = np.where(has_savings, largest_deposit, 0).round(2)
+        result['largest_withdrawal'] = np.where(has_savings, largest_withdrawal, 0).round(2)
+        return result
@@ -0,0 +1,197 @@
+"""
+Typed signal table.
+
+user_signal_values holds one row per user and window with one typed column
+per scalar signal (REAL, INTEGER, TEXT; flags as 0/1). Only the list-valued
+signals (cards, recent_deposits, merchants) are JSON. Signal names are
+unique across the four blocks, so each column is named after its signal:
+
+    SELECT COUNT(*) FROM user_signal_values
+    WHERE window_type = '30d' AND aggregate_utilization_pct > 50
+
+Population questions are plain column scans, and reading one user's
+signals decodes three small JSON values instead of four blobs.
+"""
+
+import json
+import sqlite3
+from typing import Dict, Iterable, Optional
+
+import pandas as pd
+
+from .credit import EMPTY_CREDIT
+from .income import EMPTY_INCOME
+from .savings import EMPTY_SAVINGS
+from .subscriptions import EMPTY_SUBSCRIPTIONS
+
+
+SIGNAL_TABLE = 'user_signal_values'
+
+SIGNAL_BLOCKS = {
+    'credit': EMPTY_CREDIT,
+    'income': EMPTY_INCOME,
+    'subscriptions': EMPTY_SUBSCRIPTIONS,
+    'savings': EMPTY_SAVINGS
+}
+
+
+def _sql_type(default) -> str:
+    """SQLite column type of a signal, from its empty-block default."""
+    if isinstance(default, (bool, int)):
+        return 'INTEGER'
+    if isinstance(default, float):
+        return 'REAL'
+    return 'TEXT'
+
+
+# Signal name -> (category, SQL type, default)
+SIGNAL_COLUMNS = {
+    field: (category, _sql_type(default), default)
+    for category, block in SIGNAL_BLOCKS.items()
+    for field, default in block.items()
+}
+JSON_COLUMNS = [field for field, (_, _, default) in SIGNAL_COLUMNS.items() if isinstance(default, list)]
+BOOL_COLUMNS = [field for field, (_, _, default) in SIGNAL_COLUMNS.items() if isinstance(default, bool)]
+
+
+def create_signal_table(conn: sqlite3.Connection) -> None:
+    """
+    Create user_signal_values when missing.
+
+    Args:
+        conn: Open SQLite connection
+    """
+    columns = ',\n'.join(f"    {field} {sql_type} NOT NULL" for field, (_, sql_type, _) in SIGNAL_COLUMNS.items())
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {SIGNAL_TABLE} (
+            user_id TEXT NOT NULL,
+            window_type TEXT NOT NULL,
+        {columns},
+            computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (user_id, window_type)
+        )
+    """)
+
+
+def has_signal_table(conn: sqlite3.Connection) -> bool:
+    """Check whether a database has user_signal_values."""
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (SIGNAL_TABLE,)
+    ).fetchone() is not None
+
+
+def write_signal_table(conn: sqlite3.Connection, window_type: str, results: Dict[str, pd.DataFrame]) -> int:
+    """
+    Replace one window of user_signal_values with computed blocks.
+
+    Runs in the caller's transaction.
+
+    Args:
+        conn: Open SQLite connection
+        window_type: Window key the blocks were computed for
+        results: Dict of category -> DataFrame indexed by user_id (as
+            SignalEngine.compute() returns)
+
+    Returns:
+        Number of rows written (one per user)
+    """
+    create_signal_table(conn)
+    users = results['credit'].index
+    columns = []
+    for field, (category, _, _) in SIGNAL_COLUMNS.items():
+        values = results[category][field]
+        if not values.index.equals(users):
+            values = values.reindex(users)
+        if field in JSON_COLUMNS:
+            columns.append([json.dumps(value) for value in values.tolist()])
+        else:
+            columns.append(values.tolist())
+
+    names = ['user_id', 'window_type'] + list(SIGNAL_COLUMNS)
+    conn.execute(f"DELETE FROM {SIGNAL_TABLE} WHERE window_type = ?", (window_type,))
+    conn.executemany(
+        f"INSERT INTO {SIGNAL_TABLE} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})",
+        zip(users.tolist(), [window_type] * len(users), *columns)
+    )
+    return len(users)
+
+
+def read_signal_frame(conn: sqlite3.Connection, window_type: str, columns: Optional[Iterable[str]] = None,
+                      where: str = '', params: tuple = ()) -> pd.DataFrame:
+    """
+    Read signals of many users as a typed DataFrame.
+
+    Args:
+        conn: Open SQLite connection
+        window_type: Window key
+        columns: Signals to read (default: all of SIGNAL_COLUMNS)
+        where: Extra SQL condition over signal columns, e.g.
+            'aggregate_utilization_pct > ?'
+        params: Parameters of the condition
+
+    Returns:
+        DataFrame indexed by user_id, one column per signal (flags as
+        bools, list signals decoded)
+
+    Raises:
+        ValueError: If a column is not a signal or the table is missing
+    """
+    columns = list(SIGNAL_COLUMNS) if columns is None else list(columns)
+    unknown = [column for column in columns if column not in SIGNAL_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown signals {unknown}")
+    if not has_signal_table(conn):
+        raise ValueError(f"Database has no {SIGNAL_TABLE} table")
+
+    # Plain tuples even when the connection has a row_factory
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    condition = f" AND ({where})" if where else ''
+    rows = cursor.execute(
+        f"SELECT user_id, {', '.join(columns)} FROM {SIGNAL_TABLE} WHERE window_type = ?{condition}",
+        (window_type, *params)
+    ).fetchall()
+
+    frame = pd.DataFrame(rows, columns=['user_id'] + columns).set_index('user_id')
+    for column in columns:
+        if column in BOOL_COLUMNS:
+            frame[column] = frame[column].astype(bool)
+        elif column in JSON_COLUMNS:
+            frame[column] = [json.loads(value) for value in frame[column].tolist()]
+    return frame
+
+
+def read_user_signals(conn: sqlite3.Connection, user_id: str, window_type: str) -> Optional[Dict[str, dict]]:
+    """
+    Read one user's signal blocks from user_signal_values.
+
+    Args:
+        conn: Open SQLite connection
+        user_id: User identifier
+        window_type: Window key
+
+    Returns:
+        Dict of category -> signal dict (as SignalEngine.user_signals()),
+        or None when the table or the user's row is missing
+    """
+    if not has_signal_table(conn):
+        return None
+
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    row = cursor.execute(
+        f"SELECT {', '.join(SIGNAL_COLUMNS)} FROM {SIGNAL_TABLE} WHERE user_id = ? AND window_type = ?",
+        (user_id, window_type)
+    ).fetchone()
+    if row is None:
+        return None
+
+    signals: Dict[str, dict] = {category: {} for category in SIGNAL_BLOCKS}
+    for (field, (category, _, _)), value in zip(SIGNAL_COLUMNS.items(), row):
+        if field in JSON_COLUMNS:
+            value = json.loads(value)
+        elif field in BOOL_COLUMNS:
+            value = bool(value)
+        signals[category][field] = value
+    return signals
+
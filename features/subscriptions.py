@@ -0,0 +1,216 @@
+"""
+Subscription signals.
+
+A merchant is recurring for a user when, within the last
+max(window, RECURRING_LOOKBACK_DAYS) days, the user was charged by it at
+least MIN_RECURRING_CHARGES times, the amounts vary by at most
+MAX_AMOUNT_VARIATION_PCT (coefficient of variation) and the median gap
+between charges is weekly or monthly. Only outflows count, and bills and
+transfers (NON_SUBSCRIPTION_CATEGORIES) are left out: rent and utilities
+recur monthly at steady amounts but are not subscriptions.
+
+Monthly recurring spend converts weekly charges with WEEKS_PER_MONTH; the
+subscription share compares it with the user's average monthly outflows in
+the window.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .base import DAYS_PER_MONTH, SignalFrames
+
+
+RECURRING_LOOKBACK_DAYS = 90
+MIN_RECURRING_CHARGES = 3
+MAX_AMOUNT_VARIATION_PCT = 10
+
+# Median gap (days) ranges of each recurring cadence
+CADENCES = [('monthly', 25, 35), ('weekly', 6, 8)]
+WEEKS_PER_MONTH = 4.33
+
+NON_SUBSCRIPTION_CATEGORIES = ['RENT_AND_UTILITIES', 'TRANSFER', 'INCOME']
+
+# Spending counted in coffee_food_delivery_monthly
+COFFEE_FOOD_CATEGORIES = ['COFFEE_SHOPS', 'FAST_FOOD']
+FOOD_DELIVERY_MERCHANTS = ['doordash', 'uber eats', 'grubhub', 'postmates', 'instacart']
+
+EMPTY_SUBSCRIPTIONS = {
+    'recurring_merchant_count': 0,
+    'monthly_recurring_spend': 0.0,
+    'subscription_share_pct': 0.0,
+    'coffee_food_delivery_monthly': 0.0,
+    'merchants': []
+}
+
+
+class SubscriptionDetector:
+    """Compute the subscriptions block for every user."""
+
+    def detect_recurring(self, frames: SignalFrames, lookback_days: int) -> pd.DataFrame:
+        """
+        Find recurring merchants.
+
+        Args:
+            frames: Population tables
+            lookback_days: Days of charges analyzed
+
+        Returns:
+            DataFrame with one row per recurring (user, merchant): user (code),
+            name, amount, frequency, last_charge_date, charges_in_window
+        """
+        tx = frames.transactions
+        charges = (frames.in_window(lookback_days) & (tx['amount'] < 0).to_numpy()
+                   & (tx['user'] >= 0).to_numpy() & (tx['merchant'] >= 0).to_numpy()
+                   & ~tx['category_primary'].isin(NON_SUBSCRIPTION_CATEGORIES).to_numpy())
+        first_day = frames.as_of - lookback_days + 1
+        num_merchants = len(frames.merchant_names)
+        series = tx['user'].to_numpy()[charges].astype(np.int64) * num_merchants + tx['merchant'].to_numpy()[charges]
+        offset = tx['day'].to_numpy()[charges].astype(np.int64) - first_day
+
+        recurring = self.recurring_series(series, offset, -tx['amount'].to_numpy()[charges], lookback_days)
+        series = recurring['series'].to_numpy()
+        return pd.DataFrame({
+            'user': series // num_merchants,
+            'name': np.asarray(frames.merchant_names, dtype=object)[series % num_merchants],
+            'amount': recurring['amount'].to_numpy(),
+            'frequency': recurring['frequency'].to_numpy(),
+            'last_charge_date': (recurring['last_offset'].to_numpy() + first_day).astype('datetime64[D]').astype(str),
+            'charges_in_window': recurring['charges_in_window'].to_numpy()
+        })
+
+    def recurring_series(self, series: np.ndarray, offset: np.ndarray, amount: np.ndarray,
+                         span: int) -> pd.DataFrame:
+        """
+        Classify charge series with one sort and vectorized diffs.
+
+        Charges are sorted once by (series, day), which puts each series in
+        one contiguous run. Gaps are a diff of the sorted days, amount
+        deviations a difference from the run's mean, and run statistics come
+        from np.add.reduceat over run starts, so the work after the sort is
+        linear in the number of charges.
+
+        Args:
+            series: int64 series key of each charge (e.g. user and merchant)
+            offset: Day of each charge, 0 to span - 1
+            amount: Charged amounts (positive)
+            span: Days covered by the offsets
+
+        Returns:
+            DataFrame with one row per recurring series: series, amount (mean),
+            frequency, last_offset, charges_in_window
+        """
+        order = np.argsort(series * span + offset)
+        series, offset, amount = series[order], offset[order], amount[order]
+
+        # Drop series with too few charges before computing anything else
+        starts = np.flatnonzero(np.r_[True, series[1:] != series[:-1]])
+        counts = np.diff(np.r_[starts, len(series)])
+        keep = np.repeat(counts >= MIN_RECURRING_CHARGES, counts)
+        series, offset, amount = series[keep], offset[keep], amount[keep]
+        counts = counts[counts >= MIN_RECURRING_CHARGES]
+        if len(counts) == 0:
+            return pd.DataFrame({
+                'series': np.empty(0, dtype=np.int64), 'amount': np.empty(0),
+                'frequency': np.empty(0, dtype=object), 'last_offset': np.empty(0, dtype=np.int64),
+                'charges_in_window': np.empty(0, dtype=np.int64)
+            })
+        starts = np.r_[0, np.cumsum(counts)[:-1]]
+        run = np.repeat(np.arange(len(counts)), counts)
+
+        # Coefficient of variation of each run's amounts (sample std)
+        mean = np.add.reduceat(amount, starts) / counts
+        deviation = amount - mean[run]
+        std = np.sqrt(np.add.reduceat(deviation ** 2, starts) / (counts - 1))
+        variation = np.divide(std * 100, mean, out=np.full(len(counts), np.inf), where=mean > 0)
+
+        # Median gap: gaps of a run follow its first charge; sort them within the run
+        follows = np.ones(len(series), dtype=bool)
+        follows[starts] = False
+        gap = np.r_[0, np.diff(offset)][follows]
+        gap = np.sort(run[follows] * span + gap) - run[follows] * span
+        gap_starts = starts - np.arange(len(counts))
+        median_gap = (gap[gap_starts + (counts - 2) // 2] + gap[gap_starts + (counts - 1) // 2]) / 2
+
+        frequency = np.select(
+            [(median_gap >= low) & (median_gap <= high) for _, low, high in CADENCES],
+            [name for name, _, _ in CADENCES], default=''
+        )
+        recurring = (variation <= MAX_AMOUNT_VARIATION_PCT) & (frequency != '')
+        ends = starts[recurring] + counts[recurring] - 1
+        return pd.DataFrame({
+            'series': series[ends],
+            'amount': mean[recurring].round(2),
+            'frequency': frequency[recurring],
+            'last_offset': offset[ends],
+            'charges_in_window': counts[recurring]
+        })
+
+    def calculate(self, frames: SignalFrames, window_days: int) -> pd.DataFrame:
+        """
+        Compute subscription signals.
+
+        Args:
+            frames: Population tables
+            window_days: Days of spending the shares are measured over
+
+        Returns:
+            DataFrame indexed by user_id with the EMPTY_SUBSCRIPTIONS keys as columns
+        """
+        recurring = self.detect_recurring(frames, max(window_days, RECURRING_LOOKBACK_DAYS))
+
+        tx = frames.transactions
+        outflows = frames.in_window(window_days) & (tx['amount'] < 0).to_numpy()
+        spend = frames.per_user(tx['user'].to_numpy()[outflows], -tx['amount'].to_numpy()[outflows])
+        coffee_food = outflows & self.coffee_food(frames, tx['category_detailed'], tx['merchant'].to_numpy())
+        coffee_food = frames.per_user(tx['user'].to_numpy()[coffee_food], -tx['amount'].to_numpy()[coffee_food])
+        return self.summarize(frames, recurring, spend, coffee_food, window_days)
+
+    def coffee_food(self, frames: SignalFrames, category_detailed: pd.Series, merchant: np.ndarray) -> np.ndarray:
+        """
+        Flag coffee shop, fast food and food delivery transactions.
+
+        Args:
+            frames: Population tables (for merchant_names)
+            category_detailed: Detailed category of each transaction
+            merchant: Merchant code of each transaction (-1 without a merchant)
+
+        Returns:
+            Boolean array
+        """
+        # Delivery merchants matched once per distinct name
+        names = pd.Series(frames.merchant_names, dtype=object).str.lower()
+        delivery = names.str.contains('|'.join(FOOD_DELIVERY_MERCHANTS)).to_numpy(dtype=bool)
+        delivery = np.r_[delivery, False][merchant]
+        return category_detailed.isin(COFFEE_FOOD_CATEGORIES).to_numpy() | delivery
+
+    def summarize(self, frames: SignalFrames, recurring: pd.DataFrame, spend: np.ndarray,
+                  coffee_food: np.ndarray, window_days: int) -> pd.DataFrame:
+        """
+        Build the subscriptions block from recurring merchants and window totals.
+
+        Args:
+            frames: Population tables
+            recurring: detect_recurring() rows
+            spend: Outflows of each user in the window
+            coffee_food: Coffee, fast food and delivery outflows of each user in the window
+            window_days: Days the totals cover
+
+        Returns:
+            DataFrame indexed by user_id with the EMPTY_SUBSCRIPTIONS keys as columns
+        """
+        result = frames.empty(EMPTY_SUBSCRIPTIONS)
+        user = recurring['user'].to_numpy()
+        monthly = np.where(recurring['frequency'] == 'weekly', WEEKS_PER_MONTH, 1) * recurring['amount'].to_numpy()
+        monthly_spend = frames.per_user(user, monthly)
+
+        months = window_days / DAYS_PER_MONTH
+        spend = spend / months
+
+        result['recurring_merchant_count'] = frames.per_user(user).astype(np.int64)
+        result['monthly_recurring_spend'] = monthly_spend.round(2)
+        result['subscription_share_pct'] = np.divide(
+            monthly_spend * 100, spend, out=np.zeros(len(frames)), where=spend > 0
+        ).round(2)
+        result['coffee_food_delivery_monthly'] = (coffee_food / months).round(2)
+        result['merchants'] = frames.lists_per_user(user, recurring.drop(columns='user'))
+        return result
@@ -6,12 +6,45 @@ Usage:
     python generate_data.py
     python generate_data.py --num-users 50 --seed 123
     python generate_data.py --output-dir custom_data/
+    python generate_data.py --num-users 1000 --vectorized
+    python generate_data.py --num-users 200000 --vectorized --compact
+    python generate_data.py --num-users 1000000 --workers 32
+    python generate_data.py --num-users 1000000 --workers 32 --memory-budget-mb 2048
+    python generate_data.py --format parquet
+    python generate_data.py --num-users 100000 --workers 8 --into spendsense.db
+    python generate_data.py --into spendsense.db --live-feed
+    python generate_data.py --into spendsense.db --advance-days 1
 """
 
 import argparse
 import sys
 from ingest.data_generator import SyntheticDataGenerator
 from ingest.config import NUM_USERS_DEFAULT, SEED_DEFAULT, CSV_OUTPUT_DIR
+from ingest.live_feed import LiveFeed, feed_state_path
+
+
+def advance_clock(db_path: str, days: int, quiet: bool = False) -> int:
+    """Append days of transactions to a database generated with --live-feed."""
+    import time
+    
+    try:
+        state_path = feed_state_path(db_path)
+        feed = LiveFeed.load(state_path)
+        
+        start_time = time.time()
+        counts = feed.advance_into(db_path, days, state_path=state_path)
+        elapsed_ms = (time.time() - start_time) * 1000
+        
+        if not quiet:
+            print(f"✓ Advanced {db_path} to {feed.current_date.strftime('%Y-%m-%d')}: "
+                  f"{counts['transactions']} transactions, {counts['accounts']} balances updated "
+                  f"({elapsed_ms:.0f} ms)")
+        return 0
+    
+    except Exception as e:
+        print(f"\n❌ ERROR: Advancing the clock failed!")
+        print(f"Error: {str(e)}")
+        return 1
 
 
 def main():
@@ -32,6 +65,28 @@ Examples:
   
   # Quick test with 10 users
   python generate_data.py --num-users 10
+  
+  # Large dataset with vectorized user, account and transaction generation
+  python generate_data.py --num-users 1000 --vectorized
+  
+  # Keep transactions dictionary-encoded in memory (~8x smaller)
+  python generate_data.py --num-users 200000 --vectorized --compact
+  
+  # Very large dataset sharded across 32 processes (same output for any --workers)
+  python generate_data.py --num-users 1000000 --workers 32
+  
+  # Stream to disk, keeping each process under ~2 GB regardless of --num-users
+  python generate_data.py --num-users 1000000 --workers 32 --memory-budget-mb 2048
+  
+  # Typed Parquet output, transactions partitioned by month (requires pyarrow)
+  python generate_data.py --format parquet
+  
+  # Generate straight into SQLite (no CSV files written)
+  python generate_data.py --num-users 100000 --workers 8 --into spendsense.db
+  
+  # Record live-feed state, then append one more day at a time
+  python generate_data.py --num-users 1000 --into spendsense.db --reset-db --live-feed
+  python generate_data.py --into spendsense.db --advance-days 1
         """
     )
     
@@ -56,6 +111,66 @@ Examples:
         help=f'Output directory for CSV files (default: {CSV_OUTPUT_DIR})'
     )
     
+    parser.add_argument(
+        '--vectorized',
+        action='store_true',
+        help='Generate users, accounts and transactions with vectorized NumPy draws (faster for large datasets)'
+    )
+    
+    parser.add_argument(
+        '--compact',
+        action='store_true',
+        help='Hold transactions as a compact dictionary-encoded frame (implies vectorized transactions)'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Generate users in deterministic shards across N processes'
+    )
+    
+    parser.add_argument(
+        '--memory-budget-mb',
+        type=int,
+        default=None,
+        help='Stream shards to disk, keeping memory per process under this budget (MB)'
+    )
+    
+    parser.add_argument(
+        '--format',
+        choices=['csv', 'parquet'],
+        default='csv',
+        help='Output format (default: csv; parquet requires pyarrow)'
+    )
+    
+    parser.add_argument(
+        '--into',
+        type=str,
+        default=None,
+        metavar='DB_PATH',
+        help='Insert directly into this SQLite database instead of writing files'
+    )
+    
+    parser.add_argument(
+        '--reset-db',
+        action='store_true',
+        help='With --into: delete and recreate the database first'
+    )
+    
+    parser.add_argument(
+        '--live-feed',
+        action='store_true',
+        help='With --into: save live-feed state next to the database (DB_PATH.feed.npz)'
+    )
+    
+    parser.add_argument(
+        '--advance-days',
+        type=int,
+        default=None,
+        help='With --into: append N more days to a --live-feed database instead of generating'
+    )
+    
     parser.add_argument(
         '--quiet',
         action='store_true',
@@ -69,25 +184,61 @@ Examples:
         print("Error: --num-users must be at least 1")
         sys.exit(1)
     
-    if args.num_users > 1000:
-        print("Warning: Generating more than 1000 users may take a while...")
+    if args.workers is not None and args.workers < 1:
+        print("Error: --workers must be at least 1")
+        sys.exit(1)
+    
+    if args.memory_budget_mb is not None and args.memory_budget_mb < 256:
+        print("Error: --memory-budget-mb must be at least 256")
+        sys.exit(1)
+    
+    if (args.live_feed or args.advance_days is not None) and not args.into:
+        print("Error: --live-feed and --advance-days require --into")
+        sys.exit(1)
+    
+    if args.advance_days is not None and args.advance_days < 1:
+        print("Error: --advance-days must be at least 1")
+        sys.exit(1)
+    
+    if args.advance_days is not None:
+        return advance_clock(args.into, args.advance_days, args.quiet)
+    
+    if args.num_users > 1000 and not (args.vectorized or args.workers or args.memory_budget_mb):
+        print("Warning: Generating more than 1000 users may take a while (try --vectorized or --workers)...")
     
     # Initialize generator
     try:
         generator = SyntheticDataGenerator(
             num_users=args.num_users,
-            seed=args.seed
+            seed=args.seed,
+            vectorized=args.vectorized,
+            workers=args.workers,
+            memory_budget_mb=args.memory_budget_mb,
+            compact=args.compact
         )
         
+        if args.into:
+            generator.generate_into(
+                db_path=args.into,
+                reset=args.reset_db,
+                feed_state_path=feed_state_path(args.into) if args.live_feed else None
+            )
+            
+            if not args.quiet:
+                print("\n✅ SUCCESS: Data generation completed!")
+                print(f"\nDatabase ready: {args.into}")
+            
+            return 0
+        
         # Generate all data
-        metadata = generator.generate_all(output_dir=args.output_dir)
+        metadata = generator.generate_all(output_dir=args.output_dir, output_format=args.format)
         
         if not args.quiet:
             print("\n✅ SUCCESS: Data generation completed!")
             print(f"\nYou can now:")
             print(f"  1. Load data into database: python -c 'from ingest.loader import DataLoader; loader = DataLoader(); loader.load_all(\"{args.output_dir}\")'")
             print(f"  2. View the data: python view_data.py")
-            print(f"  3. Inspect CSV files in: {args.output_dir}")
+            print(f"  3. Inspect {args.format.upper()} files in: {args.output_dir}")
         
         return 0
         
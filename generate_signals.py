@@ -2,15 +2,23 @@
 """
 Signal Generation Script
 
-Generates realistic financial signals for all users in the database.
-This creates varied signal patterns across different personas for testing.
+Computes the credit, income, subscription and savings signals of every user
+from their transactions, accounts and liabilities (features.SignalEngine)
+and stores them in user_signal_values (plus the legacy user_signals JSON
+rows unless --no-json-blobs).
+
+With --synthetic it instead fabricates varied signal patterns per persona
+for testing, as before.
 """
 
+import argparse
+import sys
 import sqlite3
 import json
 import random
+import time
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 
 def generate_signal_id() -> str:
@@ -278,10 +286,10 @@ def update_user_metadata(cursor: sqlite3.Cursor, user_id: str, persona_type: str
               random.randint(60, 150), random.uniform(50, 75), user_id))
 
 
-def generate_signals_for_users(db_path: str = 'spendsense.db'):
-    """Generate signals for all users in the database."""
+def generate_synthetic_signals(db_path: str = 'spendsense.db'):
+    """Generate random persona-shaped signals for all users in the database."""
     print("=" * 70)
-    print("SIGNAL GENERATION")
+    print("SYNTHETIC SIGNAL GENERATION")
     print("=" * 70)
     print()
     
@@ -378,6 +386,88 @@ def generate_signals_for_users(db_path: str = 'spendsense.db'):
     print("=" * 70)
 
 
+def generate_signals_for_users(db_path: str = 'spendsense.db', parquet_dir: Optional[str] = None,
+                               as_of: Optional[str] = None, json_blobs: bool = True) -> Dict[str, int]:
+    """
+    Compute signals for all users from their data and store them.
+
+    Args:
+        db_path: SQLite database holding the signals (and the data, unless parquet_dir)
+        parquet_dir: Read transactions, accounts and liabilities from this
+            Parquet output directory instead of the database
+        as_of: Last day of every window (default: latest transaction date)
+        json_blobs: Also write the legacy user_signals JSON rows
+
+    Returns:
+        Dict of window -> users written
+    """
+    from features import SignalEngine, SignalFrames
+
+    print("=" * 70)
+    print("SIGNAL GENERATION")
+    print("=" * 70)
+    print()
+
+    conn = sqlite3.connect(db_path)
+    frames = SignalFrames.from_parquet(parquet_dir, as_of) if parquet_dir else None
+    engine = SignalEngine(conn, as_of=as_of, frames=frames, json_blobs=json_blobs)
+
+    started = time.perf_counter()
+    print(f"Found {len(engine.frames)} users, {len(engine.frames.transactions):,} transactions")
+    written = engine.generate_all()
+    conn.close()
+
+    for window_type, count in written.items():
+        print(f"✓ Stored {window_type} signals of {count:,} users in user_signal_values")
+    if json_blobs:
+        print("✓ Wrote legacy user_signals JSON rows")
+    print(f"✓ Computed in {time.perf_counter() - started:.1f}s")
+    for step, seconds in engine.timings.items():
+        print(f"  {step:25} {seconds:6.2f}s")
+    print()
+
+    print("=" * 70)
+    print("✓ SIGNAL GENERATION COMPLETE")
+    print("=" * 70)
+    return written
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description='Compute behavioral signals for SpendSense users',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Compute 30d and 180d signals from spendsense.db
+  python generate_signals.py
+
+  # Read the data from generate_data.py --format parquet output
+  python generate_signals.py --parquet-dir data/synthetic
+
+  # Skip the legacy user_signals JSON rows (only user_signal_values)
+  python generate_signals.py --no-json-blobs
+
+  # Random persona-shaped signals for testing (old behavior)
+  python generate_signals.py --synthetic
+        """
+    )
+    parser.add_argument('--db', default='spendsense.db', help='SQLite database (default: spendsense.db)')
+    parser.add_argument('--parquet-dir', default=None, help='Read the data from a Parquet output directory')
+    parser.add_argument('--as-of', default=None, help='Last day of every window, YYYY-MM-DD (default: latest transaction)')
+    parser.add_argument('--no-json-blobs', dest='json_blobs', action='store_false',
+                        help='Skip the legacy user_signals JSON rows (one per user and category)')
+    parser.add_argument('--synthetic', action='store_true',
+                        help='Fabricate random signals per persona instead of computing them')
+    args = parser.parse_args()
+
+    if args.synthetic:
+        generate_synthetic_signals(args.db)
+    else:
+        generate_signals_for_users(args.db, args.parquet_dir, args.as_of, args.json_blobs)
+    return 0
+
+
 if __name__ == '__main__':
-    generate_signals_for_users()
+    sys.exit(main())
 
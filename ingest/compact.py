@@ -0,0 +1,227 @@
+"""
+Dictionary-encoded, compact in-memory transaction frames.
+
+The regular transactions DataFrame stores every ID, date, merchant, category
+and timestamp as a string per row. A compact frame holds the same data as
+fixed-width codes:
+- transaction_key: the 48-bit scrambled ID (rendered as 'txn_' + 12 hex digits)
+- account_id, user_id, merchant and category columns, locations and
+  created_at: pandas categoricals (small integer codes + one copy of each value)
+- day: int32 offset from the start date instead of a 'YYYY-MM-DD' string
+- amount_cents: integer cents instead of float dollars
+
+expand_transactions() turns a compact frame (or a slice of it) back into the
+regular schema, so CSV and Parquet exports only materialize strings chunk by
+chunk.
+"""
+
+from datetime import datetime, timedelta
+from typing import Iterator, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .config import *
+from .utils import format_ids, scramble_ids
+from .vectorized import CHANNELS, DEFAULT_LOCATION, TEMPLATES
+
+
+# Column order of a compact transactions frame
+COMPACT_COLUMNS = [
+    'transaction_key', 'account_id', 'user_id', 'day', 'amount_cents', 'merchant_name',
+    'merchant_entity_id', 'payment_channel', 'category_primary', 'category_detailed',
+    'pending', 'location_city', 'location_region', 'location_postal_code', 'created_at'
+]
+
+# Location columns (set only for in-person templates)
+LOCATION_COLUMNS = ['location_city', 'location_region', 'location_postal_code']
+
+# Rows expanded at a time when a compact frame is exported
+EXPAND_CHUNK_ROWS = 500_000
+
+
+def is_compact(df: pd.DataFrame) -> bool:
+    """Check whether a transactions DataFrame uses the compact encoding."""
+    return df is not None and 'transaction_key' in df.columns
+
+
+def _categorical(codes: np.ndarray, categories) -> pd.Categorical:
+    """Build a categorical from codes (-1 = missing) without validating values."""
+    return pd.Categorical.from_codes(codes, pd.Index(categories, dtype=object))
+
+
+def _template_categorical(values: np.ndarray, template: np.ndarray) -> pd.Categorical:
+    """Encode a per-template value table for a column of template codes."""
+    categories, codes = np.unique(values, return_inverse=True)
+    return _categorical(codes[template], categories)
+
+
+def build_compact_frame(block: dict, start_date: datetime, account_ids: np.ndarray,
+                        user_ids: np.ndarray, id_key: int, created_at: str = None,
+                        id_counters: np.ndarray = None) -> pd.DataFrame:
+    """
+    Build a compact transactions DataFrame from a merged engine block.
+
+    Rows are in the same order as VectorizedTransactionEngine.build_frame()
+    and expand to exactly the same values.
+
+    Args:
+        block: Merged block whose 'account' indexes account_ids/user_ids
+        start_date: Date of day offset 0
+        account_ids: Account ID for each account index
+        user_ids: User ID for each account index
+        id_key: Key used to scramble transaction IDs
+        created_at: Timestamp stored in created_at (default: now)
+        id_counters: Counter for each row's transaction ID, aligned with
+            the block (default: position after sorting)
+
+    Returns:
+        DataFrame with COMPACT_COLUMNS
+    """
+    order = np.argsort(block['day'], kind='stable')
+    account = block['account'][order]
+    template = block['template'][order]
+    n = len(order)
+    counters = np.arange(n) if id_counters is None else np.asarray(id_counters)[order]
+
+    # Users are coded once per account, then looked up per transaction
+    user_codes, user_categories = pd.factorize(np.asarray(user_ids, dtype=object))
+    txn_user_codes = user_codes[account]
+
+    # Payroll rows carry a per-user employer ID after the template entities
+    entity_categories, entity_codes = np.unique(TEMPLATES.merchant_entity_id, return_inverse=True)
+    txn_entity_codes = entity_codes[template]
+    payroll = template == TEMPLATES.payroll_code
+    txn_entity_codes[payroll] = len(entity_categories) + txn_user_codes[payroll]
+    employers = 'employer_' + np.asarray(user_categories, dtype=object)
+
+    location_codes = np.where(TEMPLATES.located[template], 0, -1)
+    amount_cents = np.rint(block['amount'][order] * 100).astype(np.int64)
+    if n == 0 or np.abs(amount_cents).max() < 2**31:
+        amount_cents = amount_cents.astype(np.int32)
+
+    columns = {
+        'transaction_key': scramble_ids(counters, id_key).astype(np.int64),
+        'account_id': _categorical(account, account_ids),
+        'user_id': _categorical(txn_user_codes, user_categories),
+        'day': block['day'][order].astype(np.int32),
+        'amount_cents': amount_cents,
+        'merchant_name': _template_categorical(TEMPLATES.merchant_name, template),
+        'merchant_entity_id': _categorical(
+            txn_entity_codes, np.concatenate([entity_categories, employers])
+        ),
+        'payment_channel': _categorical(block['channel'][order], CHANNELS),
+        'category_primary': _template_categorical(TEMPLATES.category_primary, template),
+        'category_detailed': _template_categorical(TEMPLATES.category_detailed, template),
+        'pending': np.zeros(n, dtype=bool)
+    }
+    for column, value in zip(LOCATION_COLUMNS, DEFAULT_LOCATION):
+        columns[column] = _categorical(location_codes, [value])
+    columns['created_at'] = _categorical(np.zeros(n, dtype=np.int8), [created_at or datetime.now().isoformat()])
+
+    df = pd.DataFrame(columns)
+    df.attrs['start_date'] = start_date.strftime('%Y-%m-%d')
+    return df
+
+
+def _start_date(df: pd.DataFrame) -> datetime:
+    """Get the date of day offset 0 of a compact frame."""
+    return datetime.strptime(df.attrs.get('start_date', DATE_RANGE_START), '%Y-%m-%d')
+
+
+def _decode(values: pd.Series) -> np.ndarray:
+    """Decode a categorical column to an object array with None for missing."""
+    lookup = np.append(values.cat.categories.to_numpy(dtype=object), None)
+    return lookup[values.cat.codes.to_numpy()]
+
+
+def format_days(days: np.ndarray, start_date: datetime) -> np.ndarray:
+    """
+    Render day offsets as 'YYYY-MM-DD' strings, formatting each date once.
+
+    Args:
+        days: Day offsets from start_date
+        start_date: Date of day offset 0
+
+    Returns:
+        Object array of date strings
+    """
+    days = np.asarray(days)
+    if len(days) == 0:
+        return np.zeros(0, dtype=object)
+
+    first, last = int(days.min()), int(days.max())
+    dates = np.array([
+        (start_date + timedelta(days=d)).strftime('%Y-%m-%d') for d in range(first, last + 1)
+    ], dtype=object)
+    return dates[days - first]
+
+
+def expand_transactions(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert a compact transactions frame to the regular schema.
+
+    Args:
+        df: Compact frame (or a slice of one)
+
+    Returns:
+        DataFrame with the same columns and values as the regular generator
+    """
+    return pd.DataFrame({
+        'transaction_id': format_ids('txn_', df['transaction_key'].to_numpy()).astype(object),
+        'account_id': _decode(df['account_id']),
+        'user_id': _decode(df['user_id']),
+        'date': format_days(df['day'].to_numpy(), _start_date(df)),
+        'amount': df['amount_cents'].to_numpy() / 100,
+        'merchant_name': _decode(df['merchant_name']),
+        'merchant_entity_id': _decode(df['merchant_entity_id']),
+        'payment_channel': _decode(df['payment_channel']),
+        'category_primary': _decode(df['category_primary']),
+        'category_detailed': _decode(df['category_detailed']),
+        'pending': df['pending'].to_numpy(),
+        'location_city': _decode(df['location_city']),
+        'location_region': _decode(df['location_region']),
+        'location_postal_code': _decode(df['location_postal_code']),
+        'created_at': _decode(df['created_at'])
+    })
+
+
+def iter_expanded(df: pd.DataFrame, chunk_rows: int = None) -> Iterator[pd.DataFrame]:
+    """
+    Expand a transactions frame chunk by chunk.
+
+    Regular frames are yielded unchanged, in one piece.
+
+    Args:
+        df: Compact or regular transactions frame
+        chunk_rows: Rows per expanded chunk (default: EXPAND_CHUNK_ROWS)
+
+    Yields:
+        DataFrames in the regular schema
+    """
+    if not is_compact(df):
+        yield df
+        return
+
+    chunk_rows = chunk_rows or EXPAND_CHUNK_ROWS
+    for start in range(0, max(len(df), 1), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        chunk.attrs = df.attrs
+        yield expand_transactions(chunk)
+
+
+def transaction_amounts(df: pd.DataFrame) -> pd.Series:
+    """Get transaction amounts in dollars from a compact or regular frame."""
+    if is_compact(df):
+        return df['amount_cents'] / 100
+    return df['amount']
+
+
+def transaction_date_range(df: pd.DataFrame) -> Tuple[str, str]:
+    """Get the first and last transaction date ('YYYY-MM-DD') of a frame."""
+    if is_compact(df):
+        if len(df) == 0:
+            return None, None
+        first, last = format_days([df['day'].min(), df['day'].max()], _start_date(df))
+        return first, last
+    return df['date'].min(), df['date'].max()
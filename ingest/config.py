@@ -219,6 +219,116 @@ MERCHANTS = {
     ]
 }
 
+# ============================================================================
+# MERCHANT CATEGORIZATION
+# ============================================================================
+
+# Merchant pools -> (category_primary, category_detailed) for raw merchant
+# strings categorized at ingest (pools not listed here are not merchants)
+MERCHANT_POOL_CATEGORIES = {
+    'coffee': ('FOOD_AND_DRINK', 'COFFEE_SHOPS'),
+    'grocery': ('FOOD_AND_DRINK', 'GROCERIES'),
+    'restaurant': ('FOOD_AND_DRINK', 'RESTAURANTS'),
+    'fast_food': ('FOOD_AND_DRINK', 'FAST_FOOD'),
+    'gas': ('TRANSPORTATION', 'GAS'),
+    'pharmacy': ('HEALTHCARE', 'PHARMACY'),
+    'subscription': ('ENTERTAINMENT', 'SUBSCRIPTION')
+}
+
+# Priority of a merchant pool name; keyword rules above it override a pool
+# match (e.g. 'transfer'), ones below only apply when no pool name matches
+MERCHANT_POOL_PRIORITY = 10
+
+# Keyword rules: (keyword, category_primary, category_detailed, priority).
+# Keywords match whole words of the normalized merchant name; the highest
+# priority wins, then the longest keyword, then the earliest rule
+CATEGORY_KEYWORD_RULES = [
+    # Money movement and income outrank any merchant name
+    ('credit card payment', 'TRANSFER', 'INTERNAL', 30),
+    ('autopay', 'TRANSFER', 'INTERNAL', 25),
+    ('transfer', 'TRANSFER', 'INTERNAL', 20),
+    ('withdrawal', 'TRANSFER', 'INTERNAL', 20),
+    ('wire', 'TRANSFER', 'WIRE', 20),
+    ('check deposit', 'TRANSFER', 'CHECK', 20),
+    ('mobile deposit', 'TRANSFER', 'CHECK', 20),
+    ('payroll', 'INCOME', 'PAYROLL', 20),
+    ('direct deposit', 'INCOME', 'PAYROLL', 20),
+    ('direct dep', 'INCOME', 'PAYROLL', 20),
+    ('interest', 'INCOME', 'INTEREST', 20),
+    ('tax refund', 'INCOME', 'REFUND', 20),
+    ('irs treas', 'INCOME', 'REFUND', 20),
+    ('bonus', 'INCOME', 'BONUS', 20),
+    # Housing and utilities
+    ('rent', 'RENT_AND_UTILITIES', 'RENT', 15),
+    ('property management', 'RENT_AND_UTILITIES', 'RENT', 15),
+    ('mortgage', 'RENT_AND_UTILITIES', 'MORTGAGE', 15),
+    ('electric', 'RENT_AND_UTILITIES', 'ELECTRIC', 15),
+    ('energy', 'RENT_AND_UTILITIES', 'ELECTRIC', 15),
+    ('water', 'RENT_AND_UTILITIES', 'WATER', 15),
+    ('internet', 'RENT_AND_UTILITIES', 'INTERNET', 15),
+    ('comcast', 'RENT_AND_UTILITIES', 'INTERNET', 15),
+    ('xfinity', 'RENT_AND_UTILITIES', 'INTERNET', 15),
+    ('phone', 'RENT_AND_UTILITIES', 'PHONE', 15),
+    ('wireless', 'RENT_AND_UTILITIES', 'PHONE', 15),
+    ('verizon', 'RENT_AND_UTILITIES', 'PHONE', 15),
+    ('t mobile', 'RENT_AND_UTILITIES', 'PHONE', 15),
+    # Brands outside the merchant pools
+    ('amazon', 'SHOPPING', 'ONLINE', 8),
+    ('amzn', 'SHOPPING', 'ONLINE', 8),
+    ('ebay', 'SHOPPING', 'ONLINE', 8),
+    ('best buy', 'SHOPPING', 'ELECTRONICS', 8),
+    ('apple store', 'SHOPPING', 'ELECTRONICS', 12),
+    ('macys', 'SHOPPING', 'CLOTHING', 8),
+    ('nordstrom', 'SHOPPING', 'CLOTHING', 8),
+    ('costco', 'SHOPPING', 'GENERAL', 8),
+    ('uber eats', 'FOOD_AND_DRINK', 'RESTAURANTS', 12),
+    ('doordash', 'FOOD_AND_DRINK', 'RESTAURANTS', 8),
+    ('uber', 'TRANSPORTATION', 'TAXI', 8),
+    ('lyft', 'TRANSPORTATION', 'TAXI', 8),
+    ('amc', 'ENTERTAINMENT', 'MOVIES', 8),
+    ('ticketmaster', 'ENTERTAINMENT', 'CONCERTS', 8),
+    ('steam', 'SHOPPING', 'ONLINE', 8),
+    ('hulu', 'ENTERTAINMENT', 'STREAMING', 8),
+    ('youtube', 'ENTERTAINMENT', 'STREAMING', 8),
+    # Generic words, used when nothing more specific matches
+    ('coffee', 'FOOD_AND_DRINK', 'COFFEE_SHOPS', 5),
+    ('cafe', 'FOOD_AND_DRINK', 'COFFEE_SHOPS', 5),
+    ('restaurant', 'FOOD_AND_DRINK', 'RESTAURANTS', 5),
+    ('diner', 'FOOD_AND_DRINK', 'RESTAURANTS', 5),
+    ('grill', 'FOOD_AND_DRINK', 'RESTAURANTS', 5),
+    ('kitchen', 'FOOD_AND_DRINK', 'RESTAURANTS', 5),
+    ('pizza', 'FOOD_AND_DRINK', 'RESTAURANTS', 5),
+    ('sushi', 'FOOD_AND_DRINK', 'RESTAURANTS', 5),
+    ('bar', 'FOOD_AND_DRINK', 'BARS', 5),
+    ('pub', 'FOOD_AND_DRINK', 'BARS', 5),
+    ('brewery', 'FOOD_AND_DRINK', 'BARS', 5),
+    ('grocery', 'FOOD_AND_DRINK', 'GROCERIES', 5),
+    ('supermarket', 'FOOD_AND_DRINK', 'GROCERIES', 5),
+    ('market', 'FOOD_AND_DRINK', 'GROCERIES', 3),
+    ('fuel', 'TRANSPORTATION', 'GAS', 5),
+    ('gas', 'TRANSPORTATION', 'GAS', 5),
+    ('parking', 'TRANSPORTATION', 'PARKING', 5),
+    ('transit', 'TRANSPORTATION', 'PUBLIC_TRANSIT', 5),
+    ('metro', 'TRANSPORTATION', 'PUBLIC_TRANSIT', 5),
+    ('taxi', 'TRANSPORTATION', 'TAXI', 5),
+    ('auto insurance', 'TRANSPORTATION', 'AUTO_INSURANCE', 12),
+    ('geico', 'TRANSPORTATION', 'AUTO_INSURANCE', 8),
+    ('pharmacy', 'HEALTHCARE', 'PHARMACY', 5),
+    ('dental', 'HEALTHCARE', 'DENTAL', 5),
+    ('dentist', 'HEALTHCARE', 'DENTAL', 5),
+    ('clinic', 'HEALTHCARE', 'DOCTOR', 5),
+    ('medical', 'HEALTHCARE', 'DOCTOR', 5),
+    ('health insurance', 'HEALTHCARE', 'INSURANCE', 12),
+    ('gym', 'ENTERTAINMENT', 'GYM', 5),
+    ('fitness', 'ENTERTAINMENT', 'GYM', 5),
+    ('cinema', 'ENTERTAINMENT', 'MOVIES', 5),
+    ('theater', 'ENTERTAINMENT', 'MOVIES', 5),
+    ('theaters', 'ENTERTAINMENT', 'MOVIES', 5),
+    ('books', 'SHOPPING', 'BOOKSTORES', 5),
+    ('electronics', 'SHOPPING', 'ELECTRONICS', 5),
+    ('clothing', 'SHOPPING', 'CLOTHING', 5)
+]
+
 # ============================================================================
 # ACCOUNT TYPE DISTRIBUTION
 # ============================================================================
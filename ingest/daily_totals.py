@@ -0,0 +1,104 @@
+"""
+Per-user daily category totals.
+
+daily_category_totals holds one row per (user, day, category_primary) with
+the transaction count, inflow, outflow and spend of that day. Signals for
+any window length are sums over a user's days (see features/cube.py), so
+ad-hoc windows never rescan transactions.
+
+The table is derived data: every writer of transactions calls
+refresh_daily_totals() inside its own database transaction, from the
+earliest date it may have changed and for the users it touched. Limiting
+the refresh to those users lets both the DELETE and the GROUP BY seek the
+(user_id, date) indexes instead of scanning the whole history.
+"""
+
+import sqlite3
+from typing import Iterable, Optional
+
+from .sqlite_writer import is_interned
+
+
+# Categories whose outflows are moving money rather than spending it
+NON_SPEND_CATEGORIES = ['INCOME', 'TRANSFER', 'LOAN_PAYMENTS']
+
+# category_primary stored for transactions without one
+UNCATEGORIZED = 'UNCATEGORIZED'
+
+DAILY_TOTALS_COLUMNS = ['user_id', 'date', 'category_primary', 'txn_count', 'inflow', 'outflow', 'spend']
+
+
+def create_daily_totals_table(conn: sqlite3.Connection) -> None:
+    """
+    Create daily_category_totals and its index when missing.
+
+    Args:
+        conn: Open SQLite connection (or cursor)
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS daily_category_totals (
+            user_id TEXT NOT NULL,
+            date TEXT NOT NULL,
+            category_primary TEXT NOT NULL,
+            txn_count INTEGER NOT NULL,
+            inflow REAL NOT NULL,
+            outflow REAL NOT NULL,
+            spend REAL NOT NULL,
+            PRIMARY KEY (user_id, date, category_primary)
+        ) WITHOUT ROWID
+    """)
+
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_daily_category_totals_date
+        ON daily_category_totals(date)
+    """)
+
+
+def refresh_daily_totals(conn: sqlite3.Connection, since: Optional[str] = None,
+                         user_ids: Optional[Iterable[str]] = None) -> int:
+    """
+    Rebuild daily_category_totals from transactions, from a date onward.
+
+    Runs in the caller's transaction: rows dated on or after since are
+    deleted and aggregated again with one GROUP BY over those transactions.
+
+    Args:
+        conn: Open SQLite connection
+        since: Earliest date ('YYYY-MM-DD') whose transactions changed
+            (default: rebuild every day)
+        user_ids: Users whose transactions changed (default: every user)
+
+    Returns:
+        Number of daily rows written
+    """
+    create_daily_totals_table(conn)
+    since = since[:10] if since else ''
+    non_spend = ', '.join('?' * len(NON_SPEND_CATEGORIES))
+    table = 'transaction_records' if is_interned(conn) else 'transactions'
+
+    condition = 'date >= ?'
+    if user_ids is not None:
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS daily_totals_users (user_id TEXT PRIMARY KEY)")
+        conn.execute("DELETE FROM temp.daily_totals_users")
+        conn.executemany(
+            "INSERT OR IGNORE INTO temp.daily_totals_users (user_id) VALUES (?)",
+            ((user_id,) for user_id in user_ids)
+        )
+        condition = f"user_id IN (SELECT user_id FROM temp.daily_totals_users) AND {condition}"
+
+    conn.execute(f"DELETE FROM daily_category_totals WHERE {condition}", (since,))
+    cursor = conn.execute(f"""
+        INSERT INTO daily_category_totals ({', '.join(DAILY_TOTALS_COLUMNS)})
+        SELECT user_id,
+               substr(date, 1, 10) AS day,
+               COALESCE(category_primary, ?) AS category,
+               COUNT(*),
+               ROUND(SUM(CASE WHEN amount > 0 THEN amount ELSE 0 END), 2),
+               ROUND(SUM(CASE WHEN amount < 0 THEN -amount ELSE 0 END), 2),
+               ROUND(SUM(CASE WHEN amount < 0 AND COALESCE(category_primary, '') NOT IN ({non_spend})
+                              THEN -amount ELSE 0 END), 2)
+        FROM {table}
+        WHERE {condition} AND user_id IS NOT NULL
+        GROUP BY user_id, day, category
+    """, (UNCATEGORIZED, *NON_SPEND_CATEGORIES, since))
+    return cursor.rowcount
@@ -18,6 +18,9 @@ import uuid
 
 from .config import *
 from .utils import *
+from .vectorized import VectorizedTransactionEngine
+from .compact import build_compact_frame, iter_expanded, transaction_amounts, transaction_date_range
+from .population import PopulationSynthesizer, UserProfiles
 
 
 class SyntheticDataGenerator:
@@ -28,22 +31,44 @@ class SyntheticDataGenerator:
     with proper statistical distributions and behavioral patterns.
     """
     
-    def __init__(self, num_users: int = NUM_USERS_DEFAULT, seed: int = SEED_DEFAULT):
+    def __init__(self, num_users: int = NUM_USERS_DEFAULT, seed: int = SEED_DEFAULT,
+                 vectorized: bool = False, workers: Optional[int] = None,
+                 memory_budget_mb: Optional[int] = None, compact: bool = False):
         """
         Initialize generator with reproducible seed.
         
         Args:
             num_users: Number of users to generate (50-100)
             seed: Random seed for reproducibility
+            vectorized: Generate users, accounts and transactions with array
+                draws (PopulationSynthesizer and the NumPy transaction engine)
+                instead of the row-by-row generators (much faster for large
+                user counts)
+            workers: Generate users in shards across this many processes. Each
+                user gets its own seed-derived random stream and seed-derived
+                IDs, so output is identical for any worker count. None keeps
+                the original single-stream generator.
+            memory_budget_mb: Stream shards straight to disk, sizing shards to
+                stay within this many megabytes per process (implies sharded
+                generation). None keeps everything in memory.
+            compact: Keep transactions_df as a dictionary-encoded compact
+                frame (categorical codes, int32 day offsets, integer cents;
+                see ingest/compact.py). Implies the vectorized transaction
+                engine; exports are expanded to the regular columns.
         """
         self.num_users = num_users
         self.seed = seed
+        self.vectorized = vectorized
+        self.workers = workers
+        self.memory_budget_mb = memory_budget_mb
+        self.compact = compact
         
         # Initialize random generators with seed
         self.fake = Faker()
         Faker.seed(seed)
         random.seed(seed)
         np.random.seed(seed)
+        self.rng = np.random.default_rng(seed)
         
         # Data storage
         self.users_df = None
@@ -51,9 +76,13 @@ class SyntheticDataGenerator:
         self.transactions_df = None
         self.liabilities_df = None
         
+        # Indexed user demographics (rebuilt when users_df changes)
+        self.user_profiles = None
+        self._profiles_source = None
+        
         print(f"✓ SyntheticDataGenerator initialized (users={num_users}, seed={seed})")
     
-    def generate_all(self, output_dir: str = CSV_OUTPUT_DIR) -> Dict:
+    def generate_all(self, output_dir: str = CSV_OUTPUT_DIR, output_format: str = 'csv') -> Dict:
         """
         Generate complete dataset and export to CSV.
         
@@ -67,44 +96,72 @@ class SyntheticDataGenerator:
         
         Args:
             output_dir: Directory to save CSV files (default: 'data/')
+            output_format: 'csv' or 'parquet' (typed, month-partitioned
+                transactions; requires pyarrow)
         
         Returns:
             Dictionary with metadata about generated data
         """
         import time
         
+        if output_format not in ('csv', 'parquet'):
+            raise ValueError(f"Unknown output format: {output_format}")
+        if output_format == 'parquet' and self.memory_budget_mb is not None:
+            raise ValueError("Streaming generation (memory_budget_mb) only supports CSV output")
+        if self.compact and (self.workers is not None or self.memory_budget_mb is not None):
+            raise ValueError("Compact transaction frames require in-memory generation (no workers or memory budget)")
+        
         print("\n" + "="*60)
         print("STARTING SYNTHETIC DATA GENERATION")
         print("="*60 + "\n")
         
         start_time = time.time()
         
-        # Step 1: Generate users
-        print("Step 1/5: Generating users...")
-        self.users_df = self.generate_users()
-        self._print_user_stats()
-        
-        # Step 2: Generate accounts
-        print("\nStep 2/5: Generating accounts...")
-        self.accounts_df = self.generate_accounts(self.users_df)
-        self._print_account_stats()
-        
-        # Step 3: Generate transactions
-        print("\nStep 3/5: Generating transactions...")
-        self.transactions_df = self.generate_transactions(self.accounts_df)
-        self._print_transaction_stats()
-        
-        # Step 4: Generate liabilities
-        print("\nStep 4/5: Generating liabilities...")
-        self.liabilities_df = self.generate_liabilities(self.accounts_df)
-        self._print_liability_stats()
+        if self.memory_budget_mb is not None:
+            # Steps 1-5: Generate shards and write them to disk as they complete
+            print(f"Steps 1-5/5: Streaming {self.num_users} users "
+                  f"(budget {self.memory_budget_mb} MB, {self.workers or 1} workers)...")
+            metadata = self.generate_streaming(output_dir)
+            
+            elapsed_time = time.time() - start_time
+            print(f"\n⏱ Generation time: {elapsed_time:.2f} seconds")
+            print(f"📁 Output directory: {output_dir}")
+            return metadata
+        
+        if self.workers is not None:
+            # Steps 1-4: Generate users, accounts, transactions and liabilities per shard
+            print(f"Steps 1-4/5: Generating {self.num_users} users in shards ({self.workers} workers)...")
+            self.generate_sharded()
+        else:
+            # Step 1: Generate users
+            print("Step 1/5: Generating users...")
+            self.users_df = self.generate_users()
+            self._print_user_stats()
+            
+            # Step 2: Generate accounts
+            print("\nStep 2/5: Generating accounts...")
+            self.accounts_df = self.generate_accounts(self.users_df)
+            self._print_account_stats()
+            
+            # Step 3: Generate transactions
+            print("\nStep 3/5: Generating transactions...")
+            self.transactions_df = self.generate_transactions(self.accounts_df)
+            self._print_transaction_stats()
+            
+            # Step 4: Generate liabilities
+            print("\nStep 4/5: Generating liabilities...")
+            self.liabilities_df = self.generate_liabilities(self.accounts_df)
+            self._print_liability_stats()
         
-        # Step 5: Export to CSV
+        # Step 5: Export to CSV or Parquet
         print("\nStep 5/5: Exporting data...")
-        self.export_csv(output_dir)
+        if output_format == 'parquet':
+            self.export_parquet(output_dir)
+        else:
+            self.export_csv(output_dir)
         
         # Step 6: Create metadata
-        metadata = self._create_metadata(output_dir)
+        metadata = self._create_metadata(output_dir, output_format=output_format)
         
         # Calculate elapsed time
         elapsed_time = time.time() - start_time
@@ -122,6 +179,235 @@ class SyntheticDataGenerator:
         
         return metadata
     
+    def generate_sharded(self, shard_size: Optional[int] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Generate users, accounts, transactions and liabilities in parallel shards.
+        
+        Users are split into contiguous shards that run in a process pool of
+        self.workers processes. Each user draws from its own random stream
+        derived from the master seed, and IDs and timestamps are derived from
+        the seed and user index, so the result is identical for any worker
+        count or shard size.
+        
+        Args:
+            shard_size: Users per shard (default: SHARD_SIZE_DEFAULT)
+        
+        Returns:
+            Dictionary with 'users', 'accounts', 'transactions' and 'liabilities' DataFrames
+        """
+        from .sharded import generate_sharded, SHARD_SIZE_DEFAULT
+        
+        data = generate_sharded(
+            self.num_users,
+            seed=self.seed,
+            workers=self.workers or 1,
+            shard_size=shard_size or SHARD_SIZE_DEFAULT
+        )
+        
+        self.users_df = data['users']
+        self.accounts_df = data['accounts']
+        self.transactions_df = data['transactions']
+        self.liabilities_df = data['liabilities']
+        
+        print(f"✓ Generated {len(self.users_df)} users, {len(self.accounts_df)} accounts, "
+              f"{len(self.transactions_df)} transactions, {len(self.liabilities_df)} liabilities")
+        self._print_user_stats()
+        self._print_account_stats()
+        self._print_transaction_stats()
+        self._print_liability_stats()
+        
+        return data
+    
+    def generate_streaming(self, output_dir: str = CSV_OUTPUT_DIR) -> Dict:
+        """
+        Generate the dataset shard by shard, writing CSV files incrementally.
+        
+        Peak memory is bounded by self.memory_budget_mb instead of growing with
+        the number of users. Transactions are spilled as date-sorted runs and
+        combined with an external merge. The CSV files are identical to those of
+        generate_sharded() with the same seed.
+        
+        Args:
+            output_dir: Directory to save CSV files
+        
+        Returns:
+            Dictionary with metadata about generated data
+        """
+        from .streaming import generate_streaming, MEMORY_BUDGET_MB_DEFAULT
+        
+        summary = generate_streaming(
+            self.num_users,
+            seed=self.seed,
+            output_dir=output_dir,
+            workers=self.workers or 1,
+            memory_budget_mb=self.memory_budget_mb or MEMORY_BUDGET_MB_DEFAULT
+        )
+        
+        return self._create_metadata(output_dir, summary=summary)
+    
+    def generate_into(self, db_path: str = 'spendsense.db', reset: bool = False,
+                      shard_size: Optional[int] = None,
+                      feed_state_path: Optional[str] = None) -> Dict:
+        """
+        Generate the dataset straight into SQLite, skipping CSV files.
+        
+        Shards are generated as in generate_sharded() (self.workers processes,
+        deterministic per-user streams) and bulk inserted with executemany into
+        the schema from ingest/db_schema.py inside a single transaction. The
+        secondary transaction indexes are dropped during the load and rebuilt
+        once at the end (inside the same transaction). If anything fails, the
+        whole load is rolled back. Memory stays bounded by the shard size.
+        
+        Args:
+            db_path: Path to SQLite database
+            reset: Delete and recreate the database first
+            shard_size: Users per shard (default: derived from
+                self.memory_budget_mb, else SHARD_SIZE_DEFAULT)
+            feed_state_path: Also save the live-feed state here, so the
+                population can later be advanced day by day with
+                ingest.live_feed.LiveFeed (default: don't save)
+        
+        Returns:
+            Dictionary with row counts per table
+        """
+        import sqlite3
+        import time
+        from .daily_totals import refresh_daily_totals
+        from .db_schema import create_database_schema, reset_database
+        from .sharded import generate_shards, SHARD_SIZE_DEFAULT
+        from .sqlite_writer import (
+            insert_shard, drop_bulk_indexes, create_bulk_indexes, BULK_CACHE_SIZE_KIB
+        )
+        
+        if shard_size is None and self.memory_budget_mb is not None:
+            from .streaming import shard_size_for_budget
+            shard_size = shard_size_for_budget(self.memory_budget_mb, self.workers or 1)
+        shard_size = shard_size or SHARD_SIZE_DEFAULT
+        
+        print(f"\nGenerating {self.num_users} users into {db_path} "
+              f"(shard size {shard_size}, {self.workers or 1} workers)...")
+        start_time = time.time()
+        
+        if reset:
+            reset_database(db_path)
+        else:
+            create_database_schema(db_path)
+        
+        counts = {'users': 0, 'accounts': 0, 'transactions': 0, 'liabilities': 0}
+        feed_parts = []
+        conn = sqlite3.connect(db_path)
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute(f"PRAGMA cache_size = -{BULK_CACHE_SIZE_KIB}")
+        
+        try:
+            conn.execute("BEGIN TRANSACTION")
+            drop_bulk_indexes(conn)
+            
+            shards = generate_shards(self.num_users, self.seed, self.workers or 1, shard_size,
+                                     feed_state=feed_state_path is not None)
+            for i, shard in enumerate(shards):
+                for table, inserted in insert_shard(conn, shard).items():
+                    counts[table] += inserted
+                if feed_state_path is not None:
+                    feed_parts.append(shard['feed'])
+                
+                if (i + 1) % 10 == 0 or counts['users'] == self.num_users:
+                    print(f"  Progress: {counts['users']}/{self.num_users} users")
+            
+            print("  Rebuilding transaction indexes...")
+            create_bulk_indexes(conn)
+            print("  Aggregating daily category totals...")
+            refresh_daily_totals(conn)
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            print(f"\n❌ ERROR: Generation into database failed! Rolling back changes...")
+            print(f"Error: {str(e)}\n")
+            raise
+        finally:
+            conn.close()
+        
+        elapsed_time = time.time() - start_time
+        print(f"✓ Inserted {counts['users']} users, {counts['accounts']} accounts, "
+              f"{counts['transactions']} transactions, {counts['liabilities']} liabilities")
+        print(f"⏱ Generation time: {elapsed_time:.2f} seconds")
+        
+        if feed_state_path is not None:
+            from .live_feed import FeedState
+            FeedState.concat(feed_parts).save(feed_state_path)
+            print(f"✓ Saved live-feed state to {feed_state_path}")
+        
+        return counts
+    
+    def generate_user(self, index: int) -> Dict[str, pd.DataFrame]:
+        """
+        Generate one user of the population by index.
+        
+        Uses the same per-user random stream and seed-derived IDs as sharded
+        generation, so the rows are exactly that user's rows in
+        generate_sharded()/generate_into() with the same seed, and no other
+        user is generated.
+        
+        Args:
+            index: Zero-based user index (user_id is f'user_{index:03d}')
+        
+        Returns:
+            Dictionary with 'users', 'accounts', 'transactions' and 'liabilities'
+            DataFrames for this user
+        
+        Raises:
+            ValueError: If index is outside the population
+        """
+        self._check_user_index(index)
+        return self._get_shard_generator().generate_user(index)
+    
+    def find_users(self, count: int = 1, start: int = 0, **criteria) -> List[int]:
+        """
+        Find users whose profile matches all criteria, without generating them.
+        
+        Only demographics are drawn while scanning, so this is cheap even for
+        large populations. Pass the result to generate_user().
+        
+        Args:
+            count: Maximum number of indices to return
+            start: First index to scan
+            **criteria: Metadata fields and required values, e.g.
+                income_bracket='high' or life_stage='student'
+        
+        Returns:
+            Matching user indices in ascending order (may be fewer than count)
+        
+        Example:
+            >>> generator = SyntheticDataGenerator(num_users=1000)
+            >>> index = generator.find_users(income_bracket='low', age_bracket='18-25')[0]
+            >>> data = generator.generate_user(index)
+        """
+        self._check_user_index(start)
+        shard_generator = self._get_shard_generator()
+        matches = []
+        
+        for index in range(start, self.num_users):
+            metadata = json.loads(shard_generator.user_profile(index)['metadata'])
+            if all(metadata.get(field) == value for field, value in criteria.items()):
+                matches.append(index)
+                if len(matches) >= count:
+                    break
+        
+        return matches
+    
+    def _check_user_index(self, index: int) -> None:
+        """Raise ValueError unless 0 <= index < num_users."""
+        if not 0 <= index < self.num_users:
+            raise ValueError(f"User index {index} out of range (population has {self.num_users} users)")
+    
+    def _get_shard_generator(self):
+        """Get the (cached) per-user generator used by generate_user()."""
+        from .sharded import ShardGenerator
+        
+        if getattr(self, '_shard_generator', None) is None:
+            self._shard_generator = ShardGenerator(self.seed)
+        return self._shard_generator
+    
     def generate_users(self) -> pd.DataFrame:
         """
         Generate user profiles with demographics.
@@ -134,6 +420,18 @@ class SyntheticDataGenerator:
         """
         print(f"Generating {self.num_users} users...")
         
+        if self.vectorized:
+            synthesizer = PopulationSynthesizer(self.rng, self.fake)
+            self.users_df, self.user_profiles = synthesizer.generate_users(
+                self.num_users, datetime.now().isoformat()
+            )
+            self._profiles_source = self.users_df
+            
+            print(f"✓ Generated {len(self.users_df)} users (vectorized)")
+            self._print_user_stats()
+            
+            return self.users_df
+        
         users = []
         
         for i in range(self.num_users):
@@ -205,28 +503,40 @@ class SyntheticDataGenerator:
         Returns:
             Annual income in dollars
         """
+        # Choose income bracket
+        bracket_name = weighted_choice(self._income_bracket_weights(age))
+        bracket_range = INCOME_BRACKETS[bracket_name]['range']
+        
+        # Sample uniformly within bracket
+        return random.randint(bracket_range[0], bracket_range[1])
+    
+    @staticmethod
+    def _income_bracket_weights(age: int) -> Dict[str, float]:
+        """
+        Get income bracket weights for an age.
+        
+        Args:
+            age: User's age
+        
+        Returns:
+            Dictionary mapping income bracket name to weight
+        """
         # Younger users tend toward lower income
         if age < 25:
             # Students and early career
-            bracket_weights = {'low': 0.50, 'mid': 0.40, 'upper_mid': 0.08, 'high': 0.02}
+            return {'low': 0.50, 'mid': 0.40, 'upper_mid': 0.08, 'high': 0.02}
         elif age < 35:
             # Young professionals
-            bracket_weights = {'low': 0.15, 'mid': 0.50, 'upper_mid': 0.30, 'high': 0.05}
+            return {'low': 0.15, 'mid': 0.50, 'upper_mid': 0.30, 'high': 0.05}
         elif age < 50:
             # Peak earning years
-            bracket_weights = {'low': 0.10, 'mid': 0.35, 'upper_mid': 0.40, 'high': 0.15}
+            return {'low': 0.10, 'mid': 0.35, 'upper_mid': 0.40, 'high': 0.15}
         else:
             # Late career
-            bracket_weights = {'low': 0.15, 'mid': 0.30, 'upper_mid': 0.35, 'high': 0.20}
-        
-        # Choose income bracket
-        bracket_name = weighted_choice(bracket_weights)
-        bracket_range = INCOME_BRACKETS[bracket_name]['range']
-        
-        # Sample uniformly within bracket
-        return random.randint(bracket_range[0], bracket_range[1])
+            return {'low': 0.15, 'mid': 0.30, 'upper_mid': 0.35, 'high': 0.20}
     
-    def _get_age_bracket(self, age: int) -> str:
+    @staticmethod
+    def _get_age_bracket(age: int) -> str:
         """
         Categorize age into bracket.
         
@@ -243,7 +553,8 @@ class SyntheticDataGenerator:
         
         return 'unknown'
     
-    def _get_income_bracket(self, income: int) -> str:
+    @staticmethod
+    def _get_income_bracket(income: int) -> str:
         """
         Categorize income into bracket.
         
@@ -260,7 +571,8 @@ class SyntheticDataGenerator:
         
         return 'unknown'
     
-    def _infer_life_stage(self, age: int, income: int) -> str:
+    @staticmethod
+    def _infer_life_stage(age: int, income: int) -> str:
         """
         Infer life stage from age and income.
         
@@ -302,31 +614,32 @@ class SyntheticDataGenerator:
         print("\nUser Demographics Summary:")
         print("-" * 50)
         
-        # Parse metadata
-        metadata_list = self.users_df['metadata'].apply(json.loads).tolist()
+        # Count from the indexed profile table (metadata parsed once)
+        profiles = self._get_user_profiles()
+        num_users = len(profiles)
         
         # Age distribution
-        age_brackets = [m['age_bracket'] for m in metadata_list]
+        age_counts = pd.Series(profiles.columns['age_bracket']).value_counts()
         print("\nAge Distribution:")
         for bracket in AGE_BRACKETS.keys():
-            count = age_brackets.count(bracket)
-            pct = (count / len(age_brackets)) * 100
+            count = int(age_counts.get(bracket, 0))
+            pct = (count / num_users) * 100
             print(f"  {bracket}: {count} users ({pct:.1f}%)")
         
         # Income distribution
-        income_brackets = [m['income_bracket'] for m in metadata_list]
+        income_counts = pd.Series(profiles.columns['income_bracket']).value_counts()
         print("\nIncome Distribution:")
         for bracket in INCOME_BRACKETS.keys():
-            count = income_brackets.count(bracket)
-            pct = (count / len(income_brackets)) * 100
+            count = int(income_counts.get(bracket, 0))
+            pct = (count / num_users) * 100
             print(f"  {bracket}: {count} users ({pct:.1f}%)")
         
         # Region distribution
-        regions = [m['region'] for m in metadata_list]
+        region_counts = pd.Series(profiles.columns['region']).value_counts()
         print("\nGeographic Distribution:")
         for region in GEOGRAPHIC_REGIONS.keys():
-            count = regions.count(region)
-            pct = (count / len(regions)) * 100
+            count = int(region_counts.get(region, 0))
+            pct = (count / num_users) * 100
             print(f"  {region}: {count} users ({pct:.1f}%)")
         
         print("-" * 50)
@@ -349,11 +662,21 @@ class SyntheticDataGenerator:
         """
         print(f"\nGenerating accounts for {len(users_df)} users...")
         
+        profiles = self._get_user_profiles(users_df)
+        
+        if self.vectorized:
+            synthesizer = PopulationSynthesizer(self.rng, self.fake)
+            self.accounts_df = synthesizer.generate_accounts(profiles, datetime.now().isoformat())
+            
+            print(f"✓ Generated {len(self.accounts_df)} accounts (vectorized)")
+            self._print_account_stats()
+            
+            return self.accounts_df
+        
         accounts = []
         
-        for _, user in users_df.iterrows():
-            user_id = user['user_id']
-            metadata = json.loads(user['metadata'])
+        for user_id in users_df['user_id']:
+            metadata = profiles.metadata(user_id)
             income = metadata['income']
             age = metadata['age']
             
@@ -553,20 +876,31 @@ class SyntheticDataGenerator:
         Returns:
             Number of credit cards (0-3)
         """
+        return random.choices([0, 1, 2, 3], weights=self._credit_card_weights(income))[0]
+    
+    @staticmethod
+    def _credit_card_weights(income: int) -> List[float]:
+        """
+        Get weights for owning 0, 1, 2 or 3 credit cards.
+        
+        Args:
+            income: Annual income
+        
+        Returns:
+            List of 4 weights for card counts [0, 1, 2, 3]
+        """
         if income < 35000:
             # Low income: 0-1 cards
-            weights = [0.60, 0.30, 0.10, 0.00]  # [0, 1, 2, 3]
+            return [0.60, 0.30, 0.10, 0.00]
         elif income < 75000:
             # Mid income: 1-2 cards
-            weights = [0.20, 0.40, 0.30, 0.10]
+            return [0.20, 0.40, 0.30, 0.10]
         elif income < 150000:
             # Upper-mid income: 1-3 cards
-            weights = [0.10, 0.30, 0.40, 0.20]
+            return [0.10, 0.30, 0.40, 0.20]
         else:
             # High income: 2-3 cards
-            weights = [0.05, 0.20, 0.40, 0.35]
-        
-        return random.choices([0, 1, 2, 3], weights=weights)[0]
+            return [0.05, 0.20, 0.40, 0.35]
     
     def _generate_account_mask(self) -> str:
         """
@@ -636,6 +970,9 @@ class SyntheticDataGenerator:
         """
         print(f"\nGenerating transactions for {len(accounts_df)} accounts...")
         
+        if self.vectorized or self.compact:
+            return self._generate_transactions_vectorized(accounts_df)
+        
         all_transactions = []
         
         # Date range
@@ -680,6 +1017,70 @@ class SyntheticDataGenerator:
         
         return self.transactions_df
     
+    def _generate_transactions_vectorized(self, accounts_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Generate transactions for all accounts with the vectorized NumPy engine.
+        
+        Produces the same patterns and columns as the row-by-row generators, but
+        batches every account of a type into a single set of array draws.
+        
+        Args:
+            accounts_df: DataFrame with account data
+        
+        Returns:
+            DataFrame with transaction data
+        """
+        if self.users_df is None:
+            raise ValueError("Users must be generated first")
+        
+        start_date = datetime.strptime(DATE_RANGE_START, "%Y-%m-%d")
+        end_date = datetime.strptime(DATE_RANGE_END, "%Y-%m-%d")
+        engine = VectorizedTransactionEngine(self.rng, start_date, end_date)
+        
+        # Per-account demographics from the indexed profile table
+        profiles = self._get_user_profiles()
+        account_types = accounts_df['type'].to_numpy()
+        user_ids = accounts_df['user_id'].to_numpy()
+        income = profiles.column('income', user_ids)
+        age = profiles.column('age', user_ids)
+        blocks = []
+        
+        # Checking: payroll, regular expenses and daily spending
+        idx = np.flatnonzero(account_types == 'checking')
+        if len(idx) > 0:
+            params = engine.draw_checking_params(income[idx] / 12, age[idx])
+            blocks.append(engine.concat_blocks(engine.checking_window(params), idx))
+        
+        # Savings: transfers, withdrawals and interest
+        idx = np.flatnonzero(account_types == 'savings')
+        if len(idx) > 0:
+            params = engine.draw_savings_params(income[idx] / 12)
+            blocks.append(engine.concat_blocks(engine.savings_window(params), idx))
+        
+        # Credit cards: purchases and monthly payments
+        idx = np.flatnonzero(account_types == 'credit_card')
+        if len(idx) > 0:
+            params = engine.draw_credit_params(len(idx))
+            blocks.append(engine.concat_blocks(engine.credit_window(params), idx))
+        
+        # Student loans and other accounts have minimal transactions
+        merged = engine.concat_blocks(blocks)
+        id_key = int(self.rng.integers(0, 2**48))
+        if self.compact:
+            self.transactions_df = build_compact_frame(
+                merged, start_date, accounts_df['account_id'].to_numpy(), user_ids, id_key
+            )
+        else:
+            self.transactions_df = engine.build_frame(
+                merged, accounts_df['account_id'].to_numpy(), user_ids, id_key=id_key
+            )
+        
+        print(f"✓ Generated {len(self.transactions_df)} transactions "
+              f"({'vectorized, compact' if self.compact else 'vectorized'})")
+        self._print_transaction_stats()
+        
+        return self.transactions_df
+    
     def _get_user_metadata(self, user_id: str) -> dict:
         """
         Get user metadata for transaction calibration.
@@ -690,15 +1091,30 @@ class SyntheticDataGenerator:
         Returns:
             Dictionary with age, income, etc.
         """
-        if self.users_df is None:
+        return self._get_user_profiles().metadata(user_id)
+    
+    def _get_user_profiles(self, users_df: Optional[pd.DataFrame] = None) -> UserProfiles:
+        """
+        Get the indexed profile table of a users DataFrame.
+        
+        The table is built once (one json.loads per user) and reused until a
+        different users DataFrame is passed or assigned to self.users_df.
+        
+        Args:
+            users_df: Users DataFrame (default: self.users_df)
+        
+        Returns:
+            UserProfiles with O(1) lookups by user_id
+        """
+        users_df = self.users_df if users_df is None else users_df
+        if users_df is None:
             raise ValueError("Users must be generated first")
         
-        user_row = self.users_df[self.users_df['user_id'] == user_id]
-        if len(user_row) == 0:
-            raise ValueError(f"User {user_id} not found")
+        if self.user_profiles is None or self._profiles_source is not users_df:
+            self.user_profiles = UserProfiles.from_users(users_df)
+            self._profiles_source = users_df
         
-        metadata = json.loads(user_row.iloc[0]['metadata'])
-        return metadata
+        return self.user_profiles
     
     def _generate_checking_transactions(self, account_id: str, user_id: str, 
                                        start_date: datetime, end_date: datetime) -> List[dict]:
@@ -1238,8 +1654,7 @@ class SyntheticDataGenerator:
         print(f"Transactions per user (avg): {total_txns / num_users:.1f}")
         
         # Date range
-        min_date = self.transactions_df['date'].min()
-        max_date = self.transactions_df['date'].max()
+        min_date, max_date = transaction_date_range(self.transactions_df)
         print(f"Date range: {min_date} to {max_date}")
         
         # Category breakdown
@@ -1250,11 +1665,9 @@ class SyntheticDataGenerator:
             print(f"  {category}: {count:,} ({pct:.1f}%)")
         
         # Income vs expenses
-        income_txns = self.transactions_df[self.transactions_df['amount'] > 0]
-        expense_txns = self.transactions_df[self.transactions_df['amount'] < 0]
-        
-        total_income = income_txns['amount'].sum()
-        total_expenses = abs(expense_txns['amount'].sum())
+        amounts = transaction_amounts(self.transactions_df)
+        total_income = amounts[amounts > 0].sum()
+        total_expenses = abs(amounts[amounts < 0].sum())
         
         print(f"\nFinancial Summary:")
         print(f"  Total income: ${total_income:,.2f}")
@@ -1503,7 +1916,9 @@ class SyntheticDataGenerator:
         
         if self.transactions_df is not None:
             transactions_path = os.path.join(output_dir, 'synthetic_transactions.csv')
-            self.transactions_df.to_csv(transactions_path, index=False)
+            # Compact frames are expanded and appended chunk by chunk
+            for i, chunk in enumerate(iter_expanded(self.transactions_df)):
+                chunk.to_csv(transactions_path, mode='w' if i == 0 else 'a', header=i == 0, index=False)
             print(f"✓ Exported {len(self.transactions_df)} transactions to {transactions_path}")
         else:
             print("⚠ No transactions data to export")
@@ -1517,7 +1932,35 @@ class SyntheticDataGenerator:
         
         print(f"✓ All data exported successfully to {output_dir}")
     
-    def _create_metadata(self, output_dir: str = CSV_OUTPUT_DIR) -> Dict:
+    def export_parquet(self, output_dir: str = CSV_OUTPUT_DIR) -> None:
+        """
+        Export all data to Parquet files.
+        
+        Writes typed, dictionary-encoded columns; transactions are partitioned
+        by month under synthetic_transactions/month=YYYY-MM/. Requires pyarrow.
+        
+        Args:
+            output_dir: Directory to save files (default: 'data/')
+        """
+        from .parquet_io import write_parquet
+        
+        print(f"\nExporting data to {output_dir} (parquet)...")
+        
+        paths = write_parquet({
+            'users': self.users_df,
+            'accounts': self.accounts_df,
+            'transactions': self.transactions_df,
+            'liabilities': self.liabilities_df
+        }, output_dir)
+        
+        for name, path in paths.items():
+            print(f"✓ Exported {name} to {path}")
+        
+        print(f"✓ All data exported successfully to {output_dir}")
+    
+    def _create_metadata(self, output_dir: str = CSV_OUTPUT_DIR,
+                         summary: Optional[Dict] = None,
+                         output_format: str = 'csv') -> Dict:
         """
         Create metadata dictionary about the generated dataset.
         
@@ -1526,6 +1969,9 @@ class SyntheticDataGenerator:
         
         Args:
             output_dir: Directory to save metadata.json
+            summary: Precomputed counts and statistics (streaming mode, where
+                the DataFrames are not kept in memory)
+            output_format: Format of the exported files ('csv' or 'parquet')
         
         Returns:
             Dictionary with metadata
@@ -1549,6 +1995,7 @@ class SyntheticDataGenerator:
                 'transactions': len(self.transactions_df) if self.transactions_df is not None else 0,
                 'liabilities': len(self.liabilities_df) if self.liabilities_df is not None else 0
             },
+            'format': output_format,
             'files': {
                 'users': 'synthetic_users.csv',
                 'accounts': 'synthetic_accounts.csv',
@@ -1557,6 +2004,13 @@ class SyntheticDataGenerator:
             }
         }
         
+        if output_format == 'parquet':
+            from .parquet_io import PARQUET_FILES
+            metadata['files'] = dict(PARQUET_FILES)
+        
+        if summary is not None:
+            metadata.update(summary)
+        
         # Add account type breakdown
         if self.accounts_df is not None:
             account_types = self.accounts_df['type'].value_counts().to_dict()
@@ -1564,12 +2018,14 @@ class SyntheticDataGenerator:
         
         # Add transaction statistics
         if self.transactions_df is not None:
+            amounts = transaction_amounts(self.transactions_df)
+            min_date, max_date = transaction_date_range(self.transactions_df)
             metadata['transaction_stats'] = {
-                'total_amount': float(self.transactions_df['amount'].sum()),
-                'avg_transaction': float(self.transactions_df['amount'].mean()),
+                'total_amount': float(amounts.sum()),
+                'avg_transaction': float(amounts.mean()),
                 'date_range': {
-                    'min': str(self.transactions_df['date'].min()),
-                    'max': str(self.transactions_df['date'].max())
+                    'min': str(min_date),
+                    'max': str(max_date)
                 }
             }
         
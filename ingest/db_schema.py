@@ -7,6 +7,8 @@ This module creates all required tables for financial data and gamification feat
 import sqlite3
 from typing import Optional
 
+from .daily_totals import create_daily_totals_table
+
 
 def create_database_schema(db_path: str = 'spendsense.db') -> None:
     """
@@ -61,37 +63,16 @@ def create_database_schema(db_path: str = 'spendsense.db') -> None:
         ON accounts(user_id)
     """)
     
-    # Transactions table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS transactions (
-            transaction_id TEXT PRIMARY KEY,
-            account_id TEXT NOT NULL,
-            user_id TEXT NOT NULL,
-            date DATE NOT NULL,
-            amount DECIMAL(10,2) NOT NULL,
-            merchant_name TEXT,
-            merchant_entity_id TEXT,
-            payment_channel TEXT,
-            category_primary TEXT,
-            category_detailed TEXT,
-            pending BOOLEAN DEFAULT FALSE,
-            location_city TEXT,
-            location_region TEXT,
-            location_postal_code TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (account_id) REFERENCES accounts(account_id)
-        )
-    """)
-    
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_transactions_user_date 
-        ON transactions(user_id, date)
-    """)
+    # Transactions, with merchants interned (see _create_transaction_tables);
+    # a pandas.to_sql database keeps its plain transactions table, since its
+    # accounts table has no primary key for transaction_records to reference
+    if _keeps_plain_transactions(cursor):
+        print("✓ Kept the plain transactions table (accounts has no primary key)")
+    else:
+        _create_transaction_tables(cursor)
     
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_transactions_account 
-        ON transactions(account_id)
-    """)
+    # Per-user daily category totals, refreshed by every transaction writer
+    create_daily_totals_table(cursor)
     
     # Liabilities table
     cursor.execute("""
@@ -327,7 +308,175 @@ def create_database_schema(db_path: str = 'spendsense.db') -> None:
     conn.close()
     
     print(f"✓ Database schema created successfully at: {db_path}")
-    print(f"✓ Created 17 tables with indexes and foreign key constraints")
+    print(f"✓ Created 19 tables and 1 view with indexes and foreign key constraints")
+
+
+def _keeps_plain_transactions(cursor: sqlite3.Cursor) -> bool:
+    """
+    Check for a plain transactions table over an accounts table without keys.
+    
+    Args:
+        cursor: Cursor on the database being created or upgraded
+    
+    Returns:
+        True if the transactions table cannot be moved into transaction_records
+    """
+    legacy = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'transactions'"
+    ).fetchone()
+    if legacy is None:
+        return False
+    return not any(column[5] for column in cursor.execute("PRAGMA table_info(accounts)"))
+
+
+def _create_transaction_tables(cursor: sqlite3.Cursor) -> None:
+    """
+    Create the merchants dictionary, transaction_records and the transactions view.
+    
+    Args:
+        cursor: Cursor on the database being created or upgraded
+    """
+    # Merchants dictionary: each distinct (merchant_name, merchant_entity_id)
+    # is stored once and referenced from transactions by integer key
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS merchants (
+            merchant_key INTEGER PRIMARY KEY,
+            merchant_name TEXT,
+            merchant_entity_id TEXT,
+            UNIQUE (merchant_name, merchant_entity_id)
+        )
+    """)
+    
+    # Transaction rows, with the merchant interned as merchant_key
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS transaction_records (
+            transaction_id TEXT PRIMARY KEY,
+            account_id TEXT NOT NULL,
+            user_id TEXT NOT NULL,
+            date DATE NOT NULL,
+            amount DECIMAL(10,2) NOT NULL,
+            merchant_key INTEGER,
+            payment_channel TEXT,
+            category_primary TEXT,
+            category_detailed TEXT,
+            pending BOOLEAN DEFAULT FALSE,
+            location_city TEXT,
+            location_region TEXT,
+            location_postal_code TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (account_id) REFERENCES accounts(account_id),
+            FOREIGN KEY (merchant_key) REFERENCES merchants(merchant_key)
+        )
+    """)
+    
+    # Databases created before merchant interning have a transactions table
+    _migrate_transactions_table(cursor)
+    
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_transactions_user_date 
+        ON transaction_records(user_id, date)
+    """)
+    
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_transactions_account 
+        ON transaction_records(account_id)
+    """)
+    
+    # Outstanding pending transactions, matched against posted rows at load
+    # time (see ingest/reconcile.py)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_transactions_pending_match
+        ON transaction_records(date, account_id, amount, merchant_key)
+        WHERE pending = 1
+    """)
+    
+    # Transactions with merchant names and entity IDs (the original columns);
+    # writes through the view intern the merchant
+    cursor.execute("""
+        CREATE VIEW IF NOT EXISTS transactions AS
+        SELECT t.transaction_id, t.account_id, t.user_id, t.date, t.amount,
+               m.merchant_name, m.merchant_entity_id, t.payment_channel,
+               t.category_primary, t.category_detailed, t.pending,
+               t.location_city, t.location_region, t.location_postal_code, t.created_at
+        FROM transaction_records t
+        LEFT JOIN merchants m ON m.merchant_key = t.merchant_key
+    """)
+    
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS transactions_insert
+        INSTEAD OF INSERT ON transactions
+        BEGIN
+            INSERT INTO merchants (merchant_name, merchant_entity_id)
+            SELECT NEW.merchant_name, NEW.merchant_entity_id
+            WHERE (NEW.merchant_name IS NOT NULL OR NEW.merchant_entity_id IS NOT NULL)
+              AND NOT EXISTS (
+                  SELECT 1 FROM merchants
+                  WHERE merchant_name IS NEW.merchant_name
+                    AND merchant_entity_id IS NEW.merchant_entity_id
+              );
+            INSERT INTO transaction_records (
+                transaction_id, account_id, user_id, date, amount, merchant_key,
+                payment_channel, category_primary, category_detailed, pending,
+                location_city, location_region, location_postal_code, created_at
+            ) VALUES (
+                NEW.transaction_id, NEW.account_id, NEW.user_id, NEW.date, NEW.amount,
+                (SELECT merchant_key FROM merchants
+                 WHERE merchant_name IS NEW.merchant_name
+                   AND merchant_entity_id IS NEW.merchant_entity_id
+                   AND (NEW.merchant_name IS NOT NULL OR NEW.merchant_entity_id IS NOT NULL)),
+                NEW.payment_channel, NEW.category_primary, NEW.category_detailed,
+                coalesce(NEW.pending, FALSE), NEW.location_city, NEW.location_region,
+                NEW.location_postal_code, coalesce(NEW.created_at, CURRENT_TIMESTAMP)
+            );
+        END
+    """)
+    
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS transactions_delete
+        INSTEAD OF DELETE ON transactions
+        BEGIN
+            DELETE FROM transaction_records WHERE transaction_id = OLD.transaction_id;
+        END
+    """)
+
+
+def _migrate_transactions_table(cursor: sqlite3.Cursor) -> None:
+    """
+    Move rows of a pre-interning transactions table into transaction_records.
+    
+    The table (and its indexes) is dropped afterwards so the transactions
+    view can take its name. Does nothing when transactions is already a view
+    or does not exist.
+    
+    Args:
+        cursor: Cursor on the database being created or upgraded
+    """
+    legacy = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'transactions'"
+    ).fetchone()
+    if legacy is None:
+        return
+    
+    cursor.execute("""
+        INSERT INTO merchants (merchant_name, merchant_entity_id)
+        SELECT DISTINCT merchant_name, merchant_entity_id FROM transactions
+        WHERE merchant_name IS NOT NULL OR merchant_entity_id IS NOT NULL
+    """)
+    cursor.execute("""
+        INSERT INTO transaction_records (
+            transaction_id, account_id, user_id, date, amount, merchant_key,
+            payment_channel, category_primary, category_detailed, pending,
+            location_city, location_region, location_postal_code, created_at
+        )
+        SELECT t.transaction_id, t.account_id, t.user_id, t.date, t.amount, m.merchant_key,
+               t.payment_channel, t.category_primary, t.category_detailed, t.pending,
+               t.location_city, t.location_region, t.location_postal_code, t.created_at
+        FROM transactions t
+        LEFT JOIN merchants m
+          ON m.merchant_name IS t.merchant_name AND m.merchant_entity_id IS t.merchant_entity_id
+    """)
+    cursor.execute("DROP TABLE transactions")
+    print(f"✓ Moved existing transactions into transaction_records (merchants interned)")
 
 
 def reset_database(db_path: str = 'spendsense.db') -> None:
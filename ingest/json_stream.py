@@ -0,0 +1,485 @@
+"""
+Streaming ingestion of Plaid-style JSON and NDJSON exports.
+
+A Plaid-style document is an object such as:
+
+    {
+      "user": {"user_id": "user_000", "name": "...", "email": "..."},
+      "accounts": [
+        {"account_id": "...", "type": "depository", "subtype": "checking",
+         "balances": {"available": 100.0, "current": 110.0, "limit": null,
+                      "iso_currency_code": "USD"},
+         "transactions": [...]},
+        ...
+      ],
+      "transactions": [
+        {"transaction_id": "...", "account_id": "...", "date": "2025-05-01",
+         "amount": 12.5, "merchant_name": "...", "payment_channel": "in store",
+         "personal_finance_category": {"primary": "...", "detailed": "..."},
+         "location": {"city": "...", "region": "...", "postal_code": "..."}},
+        ...
+      ],
+      "liabilities": {"credit": [...], "student": [...], "mortgage": [...]}
+    }
+
+A file holds one document, an array of documents, or (NDJSON, .ndjson/.jsonl)
+one document or one bare transaction/account/user record per line. The
+top-level arrays are decoded one element at a time from a sliding text
+buffer, so memory depends on the largest single element (an account with its
+nested transactions), not on the file size.
+
+Records are flattened into the columns of ingest/sqlite_writer.TABLE_COLUMNS:
+- Plaid amounts are positive for money leaving the account; they are negated
+  to this schema's convention (negative = outflow)
+- account type/subtype map to checking/savings/credit_card/student_loan/mortgage
+- liability records get a liability_id derived from their account_id unless
+  they carry one
+- user_id comes from the record, its account, or the enclosing document
+The amount convention follows the record's format, not any one optional key:
+transactions inside a document are Plaid records (even if an export added
+user_id to them), and a bare NDJSON transaction is Plaid unless it carries
+flat-schema columns (category_primary, location_city, ...) and no Plaid-only
+fields, in which case it passes through unchanged.
+"""
+
+import hashlib
+import json
+from typing import Iterator, Optional, TextIO, Tuple
+
+
+# Characters read from the file per refill of the decode buffer
+READ_CHUNK_CHARS = 1 << 20
+
+# Largest single element (e.g. an account with its nested transactions) that
+# is buffered before giving up, so a malformed file cannot fill memory
+MAX_ELEMENT_CHARS = 1 << 28
+
+# Plaid account subtype -> schema account type
+ACCOUNT_SUBTYPES = {
+    'checking': 'checking',
+    'savings': 'savings',
+    'credit card': 'credit_card',
+    'student': 'student_loan',
+    'mortgage': 'mortgage'
+}
+
+# Plaid account type -> schema account type, for subtypes not listed above
+# (e.g. credit/'rewards')
+ACCOUNT_TYPE_FALLBACK = {'credit': 'credit_card'}
+
+# Schema account types (a record with one of these as its type is kept as is)
+ACCOUNT_TYPES = {'checking', 'savings', 'credit_card', 'student_loan', 'mortgage'}
+
+# Plaid payment channel -> schema payment channel
+PAYMENT_CHANNELS = {'in store': 'in_store'}
+
+# Transaction keys only Plaid records carry
+PLAID_TRANSACTION_KEYS = {'personal_finance_category', 'location', 'authorized_date', 'category', 'category_id',
+                          'iso_currency_code', 'unofficial_currency_code', 'payment_meta', 'transaction_type'}
+
+# Transaction columns only flat-schema records carry
+FLAT_TRANSACTION_KEYS = {'category_primary', 'category_detailed', 'location_city', 'location_region',
+                         'location_postal_code'}
+
+# Keys that mark an NDJSON line as a document rather than a single record
+DOCUMENT_KEYS = {'accounts', 'transactions', 'liabilities', 'user', 'users'}
+
+
+class _JsonStream:
+    """Incremental JSON tokenizer over a text file with a sliding buffer."""
+
+    def __init__(self, f: TextIO):
+        self.f = f
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self, size: int = READ_CHUNK_CHARS) -> bool:
+        """Append more text to the buffer, dropping the consumed prefix."""
+        if self.eof:
+            return False
+        text = self.f.read(size)
+        if not text:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + text
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ('' at end of input)."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in ' \t\r\n':
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, chars: str) -> str:
+        """Consume the next character, which must be one of chars."""
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"Invalid JSON: expected one of {chars!r}, found {char or 'end of input'!r}")
+        self.pos += 1
+        return char
+
+    def value(self):
+        """Decode the next complete JSON value."""
+        self.peek()
+        size = READ_CHUNK_CHARS
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Possibly cut off by the end of the buffer: read more and retry
+                if len(self.buffer) - self.pos > MAX_ELEMENT_CHARS:
+                    raise ValueError(f"JSON element larger than {MAX_ELEMENT_CHARS} characters or malformed")
+                if self._fill(size):
+                    size *= 2
+                    continue
+                raise
+            # A number that ends exactly at the buffer end may continue
+            if end == len(self.buffer) and self._fill(size):
+                continue
+            self.pos = end
+            return value
+
+    def items(self) -> Iterator:
+        """Iterate over the elements of an array (or null), decoding one at a time."""
+        if self.peek() == 'n':
+            self.value()
+            return
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.expect(',]') == ']':
+                return
+
+    def members(self) -> Iterator[str]:
+        """
+        Iterate over the keys of an object.
+
+        The caller must consume each member's value (value() or items())
+        before asking for the next key.
+        """
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            if self.peek() != '"':
+                raise ValueError("Invalid JSON: expected an object key")
+            key = self.value()
+            self.expect(':')
+            yield key
+            if self.expect(',}') == '}':
+                return
+
+
+def _path(record: dict, *paths: str):
+    """Get the first non-null value among dotted paths, e.g. 'balances.current'."""
+    for path in paths:
+        value = record
+        for part in path.split('.'):
+            value = value.get(part) if isinstance(value, dict) else None
+        if value is not None:
+            return value
+    return None
+
+
+def flatten_user(record: dict, created_at: str) -> dict:
+    """Flatten a user record into the users columns."""
+    metadata = record.get('metadata')
+    if metadata is not None and not isinstance(metadata, str):
+        metadata = json.dumps(metadata)
+    return {
+        'user_id': record.get('user_id'),
+        'name': record.get('name'),
+        'email': record.get('email'),
+        'created_at': record.get('created_at') or created_at,
+        'metadata': metadata
+    }
+
+
+def flatten_account(record: dict, user_id: Optional[str], created_at: str) -> dict:
+    """Flatten a Plaid (or flat) account record into the accounts columns."""
+    account_type = record.get('type')
+    if account_type not in ACCOUNT_TYPES:
+        account_type = ACCOUNT_SUBTYPES.get(
+            record.get('subtype'), ACCOUNT_TYPE_FALLBACK.get(account_type, account_type)
+        )
+
+    return {
+        'account_id': record.get('account_id'),
+        'user_id': record.get('user_id') or user_id,
+        'type': account_type,
+        'subtype': record.get('subtype'),
+        'name': record.get('name'),
+        'official_name': record.get('official_name'),
+        'mask': record.get('mask'),
+        'available_balance': _path(record, 'available_balance', 'balances.available'),
+        'current_balance': _path(record, 'current_balance', 'balances.current'),
+        'credit_limit': _path(record, 'credit_limit', 'balances.limit'),
+        'iso_currency_code': _path(record, 'iso_currency_code', 'balances.iso_currency_code'),
+        'holder_category': record.get('holder_category'),
+        'created_at': record.get('created_at') or created_at
+    }
+
+
+def is_flat_transaction(record: dict) -> bool:
+    """Tell whether a bare transaction record is in the flat schema rather than Plaid's."""
+    return not PLAID_TRANSACTION_KEYS & record.keys() and bool(FLAT_TRANSACTION_KEYS & record.keys())
+
+
+def flatten_transaction(record: dict, user_id: Optional[str], created_at: str, plaid: bool = True) -> dict:
+    """
+    Flatten a Plaid (or flat) transaction record into the transactions columns.
+
+    Args:
+        record: Transaction record
+        user_id: Fallback user ID
+        created_at: Fallback created_at timestamp
+        plaid: The record uses Plaid's amount sign (positive = money out);
+            False for records already in this schema
+
+    Returns:
+        Dictionary with the transactions columns
+    """
+    amount = record.get('amount')
+    if plaid and amount is not None:
+        # Plaid: positive = money out; schema: negative = money out
+        amount = -amount
+
+    channel = record.get('payment_channel')
+    return {
+        'transaction_id': record.get('transaction_id'),
+        'account_id': record.get('account_id'),
+        'user_id': record.get('user_id') or user_id,
+        'date': record.get('date'),
+        'amount': amount,
+        'merchant_name': _path(record, 'merchant_name', 'name'),
+        'merchant_entity_id': record.get('merchant_entity_id'),
+        'payment_channel': PAYMENT_CHANNELS.get(channel, channel),
+        'category_primary': _path(record, 'category_primary', 'personal_finance_category.primary'),
+        'category_detailed': _path(record, 'category_detailed', 'personal_finance_category.detailed'),
+        'pending': bool(record.get('pending', False)),
+        'location_city': _path(record, 'location_city', 'location.city'),
+        'location_region': _path(record, 'location_region', 'location.region'),
+        'location_postal_code': _path(record, 'location_postal_code', 'location.postal_code'),
+        'created_at': record.get('created_at') or created_at
+    }
+
+
+def flatten_liability(record: dict, kind: Optional[str], user_id: Optional[str],
+                      created_at: str) -> dict:
+    """
+    Flatten a Plaid (or flat) liability record into the liabilities columns.
+
+    Args:
+        record: Liability record
+        kind: Plaid liability group ('credit', 'student', 'mortgage'), or
+            None for a flat record
+        user_id: Fallback user ID
+        created_at: Fallback created_at timestamp
+
+    Returns:
+        Dictionary with the liabilities columns
+    """
+    account_id = record.get('account_id')
+    liability_id = record.get('liability_id')
+    if liability_id is None and account_id is not None:
+        liability_id = 'liab_' + hashlib.sha1(account_id.encode()).hexdigest()[:12]
+
+    row = {
+        'liability_id': liability_id,
+        'account_id': account_id,
+        'user_id': record.get('user_id') or user_id,
+        'type': record.get('type'),
+        'apr_percentage': record.get('apr_percentage'),
+        'apr_type': record.get('apr_type'),
+        'minimum_payment_amount': record.get('minimum_payment_amount'),
+        'last_payment_amount': record.get('last_payment_amount'),
+        'last_payment_date': record.get('last_payment_date'),
+        'next_payment_due_date': record.get('next_payment_due_date'),
+        'last_statement_balance': record.get('last_statement_balance'),
+        'is_overdue': record.get('is_overdue'),
+        'interest_rate': record.get('interest_rate'),
+        'created_at': record.get('created_at') or created_at
+    }
+
+    if kind == 'credit':
+        aprs = record.get('aprs') or []
+        apr = next((a for a in aprs if a.get('apr_type') == 'purchase_apr'), aprs[0] if aprs else {})
+        row.update(type='credit_card', apr_percentage=apr.get('apr_percentage'), apr_type=apr.get('apr_type'))
+    elif kind == 'student':
+        row.update(type='student_loan', interest_rate=record.get('interest_rate_percentage'))
+    elif kind == 'mortgage':
+        past_due = record.get('past_due_amount') or 0
+        row.update(
+            type='mortgage',
+            interest_rate=_path(record, 'interest_rate.percentage'),
+            minimum_payment_amount=record.get('next_monthly_payment'),
+            is_overdue=record.get('is_overdue', past_due > 0)
+        )
+    return row
+
+
+def _account_records(account: dict, user_id: Optional[str],
+                     created_at: str) -> Iterator[Tuple[str, dict]]:
+    """Flatten an account and the transactions nested in it."""
+    row = flatten_account(account, user_id, created_at)
+    yield 'accounts', row
+    for transaction in account.get('transactions') or []:
+        transaction.setdefault('account_id', row['account_id'])
+        yield 'transactions', flatten_transaction(transaction, row['user_id'], created_at)
+
+
+def _document_records(document: dict, created_at: str) -> Iterator[Tuple[str, dict]]:
+    """Flatten a fully decoded document (one NDJSON line)."""
+    user = document.get('user')
+    users = ([user] if user else []) + (document.get('users') or [])
+    user_id = document.get('user_id') or (user or {}).get('user_id')
+
+    for record in users:
+        yield 'users', flatten_user(record, created_at)
+    for account in document.get('accounts') or []:
+        yield from _account_records(account, user_id, created_at)
+    for transaction in document.get('transactions') or []:
+        yield 'transactions', flatten_transaction(transaction, user_id, created_at)
+    liabilities = document.get('liabilities') or {}
+    if isinstance(liabilities, list):
+        liabilities = {None: liabilities}
+    for kind, records in liabilities.items():
+        for record in records or []:
+            yield 'liabilities', flatten_liability(record, kind, user_id, created_at)
+
+
+def _stream_document(stream: _JsonStream, created_at: str) -> Iterator[Tuple[str, dict]]:
+    """
+    Flatten a document while it is being decoded, one array element at a time.
+
+    Key order carries no meaning, so records decoded before the document's
+    user ID (an accounts array ahead of "user") are held back and emitted
+    with the user ID once it is known, or as they are at the end of the
+    document. Documents that put the user first are never buffered.
+    """
+    user_id = None
+    pending = []
+
+    def emit(records: Iterator[Tuple[str, dict]]) -> Iterator[Tuple[str, dict]]:
+        if user_id is not None:
+            yield from records
+        else:
+            pending.extend(records)
+
+    def release() -> Iterator[Tuple[str, dict]]:
+        for table, row in pending:
+            if table != 'users' and row.get('user_id') is None:
+                row['user_id'] = user_id
+            yield table, row
+        pending.clear()
+
+    for key in stream.members():
+        if key == 'user_id':
+            user_id = stream.value()
+            yield from release()
+        elif key == 'user':
+            user = stream.value()
+            if user:
+                user_id = user_id or user.get('user_id')
+                yield 'users', flatten_user(user, created_at)
+                yield from release()
+        elif key == 'users':
+            for record in stream.items():
+                yield 'users', flatten_user(record, created_at)
+        elif key == 'accounts':
+            for account in stream.items():
+                yield from emit(_account_records(account, user_id, created_at))
+        elif key == 'transactions':
+            for transaction in stream.items():
+                yield from emit([('transactions', flatten_transaction(transaction, user_id, created_at))])
+        elif key == 'liabilities':
+            if stream.peek() == '[':
+                for record in stream.items():
+                    yield from emit([('liabilities', flatten_liability(record, None, user_id, created_at))])
+            else:
+                for kind in stream.members():
+                    for record in stream.items():
+                        yield from emit([('liabilities', flatten_liability(record, kind, user_id, created_at))])
+        else:
+            # item, request_id, total_transactions, ...
+            stream.value()
+
+    yield from release()
+
+
+def _record_table(record: dict) -> str:
+    """Classify a bare NDJSON record by its keys."""
+    if 'transaction_id' in record:
+        return 'transactions'
+    if 'liability_id' in record:
+        return 'liabilities'
+    if 'account_id' in record:
+        return 'accounts'
+    if 'email' in record:
+        return 'users'
+    raise ValueError(f"Cannot tell which table a record belongs to: {sorted(record)[:5]}")
+
+
+def iter_plaid_records(path: str, created_at: str) -> Iterator[Tuple[str, dict]]:
+    """
+    Stream flattened records from a Plaid-style JSON or NDJSON file.
+
+    Args:
+        path: .json file (document or array of documents), or .ndjson/.jsonl
+            file (one document or record per line)
+        created_at: Timestamp for records without created_at
+
+    Yields:
+        Tuples of (table name, row dictionary), with accounts before the
+        transactions nested in them
+
+    Raises:
+        ValueError: If the file is not valid JSON or a record cannot be classified
+    """
+    with open(path, encoding='utf-8') as f:
+        if path.endswith(('.ndjson', '.jsonl')):
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"Invalid JSON on line {number}: {e}") from e
+
+                if DOCUMENT_KEYS & record.keys():
+                    yield from _document_records(record, created_at)
+                    continue
+
+                table = _record_table(record)
+                if table == 'transactions':
+                    yield table, flatten_transaction(record, None, created_at, plaid=not is_flat_transaction(record))
+                elif table == 'accounts':
+                    yield from _account_records(record, None, created_at)
+                elif table == 'liabilities':
+                    yield table, flatten_liability(record, None, None, created_at)
+                else:
+                    yield table, flatten_user(record, created_at)
+            return
+
+        stream = _JsonStream(f)
+        if stream.peek() == '[':
+            stream.expect('[')
+            if stream.peek() == ']':
+                return
+            while True:
+                yield from _stream_document(stream, created_at)
+                if stream.expect(',]') == ']':
+                    return
+        else:
+            yield from _stream_document(stream, created_at)
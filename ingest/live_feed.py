@@ -0,0 +1,373 @@
+"""
+Incremental "advance the clock" generation for live-feed simulation.
+
+A sharded generation run can record the state needed to keep going past
+DATE_RANGE_END (see generate_into(..., feed_state_path=...)):
+- the schedule parameters of every checking, savings and credit card account
+  (pay cadence and amount, rent/utility days, subscriptions, transfer days)
+- current balances
+- the next transaction sequence number of every user
+
+LiveFeed then generates only the new days with the same vectorized engine,
+continuing each schedule where it left off, and appends them to the database.
+Transaction IDs continue each user's sequence under the original ID key, so
+they never collide with the initial six months. Every tick draws from a
+stream derived from (seed, first day of the tick), so replaying the same
+ticks from the same state gives identical rows.
+"""
+
+import os
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .config import *
+from .vectorized import VectorizedTransactionEngine
+
+
+# Seed stream for ticks (sharded.py uses 0 for users and 1 for IDs)
+STREAM_FEED = 2
+
+# Account types with generated transactions, and their engine windows
+SCHEDULED_TYPES = {
+    'checking': 'checking_window',
+    'savings': 'savings_window',
+    'credit_card': 'credit_window'
+}
+
+DEPOSITORY_TYPES = ('checking', 'savings')
+
+# Day offset of DATE_RANGE_END, the clock of a freshly generated population
+INITIAL_LAST_DAY = (datetime.strptime(DATE_RANGE_END, "%Y-%m-%d")
+                    - datetime.strptime(DATE_RANGE_START, "%Y-%m-%d")).days
+
+
+def feed_state_path(db_path: str) -> str:
+    """Default location of the live-feed state saved next to a database."""
+    return f'{db_path}.feed.npz'
+
+
+class FeedState:
+    """
+    Persistent generator state for one population.
+
+    Everything is stored as flat NumPy arrays:
+    - per account: 'account_id', 'user_id', 'user_index', 'account_type',
+      'current_balance', 'credit_limit'
+    - per user (from first_user): 'next_seq'
+    - per scheduled account type T: 'T.account' (account row) plus the
+      parameter arrays of VectorizedTransactionEngine.draw_*_params();
+      'T.sub_*' arrays are per subscription and 'T.sub_account' indexes the
+      rows of type T
+    """
+
+    def __init__(self, seed: int, first_user: int, last_day: int, arrays: Dict[str, np.ndarray]):
+        """
+        Initialize state.
+
+        Args:
+            seed: Master seed of the population
+            first_user: Index of the first user covered
+            last_day: Last generated day, as an offset from DATE_RANGE_START
+            arrays: State arrays (see class docstring)
+        """
+        self.seed = seed
+        self.first_user = first_user
+        self.last_day = last_day
+        self.arrays = arrays
+
+    @classmethod
+    def from_users(cls, seed: int, accounts_df: pd.DataFrame, first_user: int,
+                   offsets: List[int], schedules: List[Dict], seq_counts: List[int]) -> 'FeedState':
+        """
+        Build the state of consecutive users right after generation.
+
+        Args:
+            seed: Master seed
+            accounts_df: Accounts of the users, grouped by user
+            first_user: Index of the first user
+            offsets: Position of each user's first account in accounts_df
+            schedules: Per user {type: (account positions, params)} from
+                ShardGenerator._create_transactions()
+            seq_counts: Transactions generated per user
+
+        Returns:
+            FeedState
+        """
+        num_accounts = len(accounts_df)
+        counts = np.diff(np.append(offsets, num_accounts))
+        arrays = {
+            'account_id': accounts_df['account_id'].to_numpy(dtype=str),
+            'user_id': accounts_df['user_id'].to_numpy(dtype=str),
+            'user_index': np.repeat(np.arange(first_user, first_user + len(offsets)), counts),
+            'account_type': accounts_df['type'].to_numpy(dtype=str),
+            'current_balance': accounts_df['current_balance'].to_numpy(dtype=np.float64),
+            'credit_limit': accounts_df['credit_limit'].to_numpy(dtype=np.float64),
+            'next_seq': np.asarray(seq_counts, dtype=np.int64)
+        }
+
+        for account_type in SCHEDULED_TYPES:
+            rows, parts, num_rows = [], {}, 0
+            for offset, user_schedules in zip(offsets, schedules):
+                if account_type not in user_schedules:
+                    continue
+                idx, params = user_schedules[account_type]
+                for key, values in params.items():
+                    # Subscriptions point at rows of this type, not at accounts
+                    parts.setdefault(key, []).append(values + num_rows if key == 'sub_account' else values)
+                rows.append(offset + idx)
+                num_rows += len(idx)
+
+            arrays[f'{account_type}.account'] = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+            for key, values in parts.items():
+                arrays[f'{account_type}.{key}'] = np.concatenate(values)
+
+        return cls(seed, first_user, INITIAL_LAST_DAY, arrays)
+
+    @classmethod
+    def concat(cls, parts: List['FeedState']) -> 'FeedState':
+        """
+        Combine the states of consecutive shards.
+
+        Raises:
+            ValueError: If the parts are empty, not consecutive or out of sync
+        """
+        if not parts:
+            raise ValueError("No feed state to combine")
+
+        num_accounts = 0
+        type_rows = {account_type: 0 for account_type in SCHEDULED_TYPES}
+        next_user = parts[0].first_user
+        combined = {}
+
+        for part in parts:
+            if part.first_user != next_user or part.last_day != parts[0].last_day or part.seed != parts[0].seed:
+                raise ValueError("Feed state parts must be consecutive shards of one population")
+
+            for key, values in part.arrays.items():
+                account_type, _, field = key.partition('.')
+                if field == 'account':
+                    values = values + num_accounts
+                elif field == 'sub_account':
+                    values = values + type_rows[account_type]
+                combined.setdefault(key, []).append(values)
+
+            num_accounts += len(part.arrays['account_id'])
+            for account_type in SCHEDULED_TYPES:
+                type_rows[account_type] += len(part.arrays[f'{account_type}.account'])
+            next_user += len(part.arrays['next_seq'])
+
+        arrays = {key: np.concatenate(values) for key, values in combined.items()}
+        return cls(parts[0].seed, parts[0].first_user, parts[0].last_day, arrays)
+
+    def params(self, account_type: str) -> Dict[str, np.ndarray]:
+        """Get the engine parameters (and 'account' rows) of one account type."""
+        prefix = f'{account_type}.'
+        return {key[len(prefix):]: values for key, values in self.arrays.items() if key.startswith(prefix)}
+
+    def replace(self, last_day: int, **arrays) -> 'FeedState':
+        """Return a copy with a new clock and some arrays replaced."""
+        return FeedState(self.seed, self.first_user, last_day, {**self.arrays, **arrays})
+
+    def save(self, path: str) -> None:
+        """
+        Save the state to a .npz file (written atomically).
+
+        Args:
+            path: Destination file
+        """
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, _seed=self.seed, _first_user=self.first_user,
+                     _last_day=self.last_day, **self.arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'FeedState':
+        """
+        Load a state saved with save().
+
+        Raises:
+            FileNotFoundError: If the file is missing
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Feed state not found: {path}")
+
+        with np.load(path) as data:
+            arrays = {key: data[key] for key in data.files if not key.startswith('_')}
+            return cls(int(data['_seed']), int(data['_first_user']), int(data['_last_day']), arrays)
+
+
+class LiveFeed:
+    """
+    Append new days of transactions to a generated population.
+
+    Each tick generates days (last_day, last_day + days] for every account,
+    updates balances and advances the clock.
+    """
+
+    def __init__(self, state: FeedState):
+        """
+        Initialize feed.
+
+        Args:
+            state: State recorded at generation time (or by a previous tick)
+        """
+        # Imported here: sharded imports this module lazily
+        from .sharded import id_key, ID_TRANSACTION
+
+        self.state = state
+        self.start_date = datetime.strptime(DATE_RANGE_START, "%Y-%m-%d")
+        self.transaction_key = id_key(state.seed, ID_TRANSACTION)
+
+    @classmethod
+    def load(cls, path: str) -> 'LiveFeed':
+        """Create a feed from a saved state file."""
+        return cls(FeedState.load(path))
+
+    @property
+    def current_date(self) -> datetime:
+        """Last generated day."""
+        return self.start_date + timedelta(days=self.state.last_day)
+
+    def advance(self, days: int = 1) -> Dict[str, pd.DataFrame]:
+        """
+        Generate the next days and advance the clock.
+
+        Args:
+            days: Number of days to generate
+
+        Returns:
+            Dictionary with 'transactions' (new rows, sorted by date) and
+            'balances' (account_id, current_balance, available_balance of
+            accounts whose balance changed)
+        """
+        tick, new_state = self._tick(days)
+        self.state = new_state
+        return tick
+
+    def advance_into(self, db_path: str, days: int = 1, state_path: Optional[str] = None) -> Dict[str, int]:
+        """
+        Generate the next days straight into a database in one transaction.
+
+        The new days are added to daily_category_totals in the same
+        transaction. The new state is saved after the database commit
+        succeeds; on any error neither the database nor the state changes.
+
+        Args:
+            db_path: SQLite database holding the population
+            days: Number of days to generate
+            state_path: Where to save the advanced state (default: don't save)
+
+        Returns:
+            Dictionary with 'transactions' and 'accounts' row counts
+        """
+        from .daily_totals import refresh_daily_totals
+        from .sqlite_writer import insert_frame
+
+        tick, new_state = self._tick(days)
+        transactions = tick['transactions']
+        balances = tick['balances']
+
+        conn = sqlite3.connect(db_path)
+        conn.execute("PRAGMA foreign_keys = ON")
+
+        try:
+            insert_frame(conn, 'transactions', transactions)
+            if len(transactions):
+                refresh_daily_totals(conn, str(transactions['date'].min()),
+                                     transactions['user_id'].unique().tolist())
+            conn.executemany(
+                "UPDATE accounts SET current_balance = ?, available_balance = ? WHERE account_id = ?",
+                zip(balances['current_balance'].tolist(),
+                    balances['available_balance'].tolist(),
+                    balances['account_id'].tolist())
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        self.state = new_state
+        if state_path:
+            self.state.save(state_path)
+
+        return {'transactions': len(transactions), 'accounts': len(balances)}
+
+    def _tick(self, days: int):
+        """Generate the next days without modifying self.state."""
+        if days < 1:
+            raise ValueError("days must be at least 1")
+
+        state = self.state
+        arrays = state.arrays
+        first_day = state.last_day + 1
+        last_day = state.last_day + days
+
+        rng = np.random.default_rng(np.random.SeedSequence(state.seed, spawn_key=(STREAM_FEED, first_day)))
+        engine = VectorizedTransactionEngine(rng, self.start_date, self.start_date + timedelta(days=last_day))
+
+        # Continue every schedule over the new window
+        blocks = []
+        for account_type, window in SCHEDULED_TYPES.items():
+            params = state.params(account_type)
+            if len(params['account']) == 0:
+                continue
+            blocks.append(engine.concat_blocks(
+                getattr(engine, window)(params, first_day, last_day), params['account']
+            ))
+        block = engine.concat_blocks(blocks)
+
+        # Continue each user's transaction sequence (in date order)
+        from .sharded import TRANSACTION_SEQ_BITS
+
+        order = np.argsort(block['day'], kind='stable')
+        users = arrays['user_index'][block['account'][order]]
+        rank = _rank_within(users)
+        seq = arrays['next_seq'][users - state.first_user] + rank
+        if len(seq) and seq.max() >= 2 ** TRANSACTION_SEQ_BITS:
+            raise ValueError("Transaction ID sequence exhausted for a user")
+
+        counters = np.empty(len(order), dtype=np.int64)
+        counters[order] = (users << TRANSACTION_SEQ_BITS) + seq
+        next_seq = arrays['next_seq'] + np.bincount(users - state.first_user, minlength=len(arrays['next_seq']))
+
+        transactions = engine.build_frame(
+            block, arrays['account_id'], arrays['user_id'], id_key=self.transaction_key,
+            created_at=(self.start_date + timedelta(days=last_day)).isoformat(),
+            id_counters=counters
+        )
+
+        # Balances: deposits/withdrawals move depository balances; card
+        # purchases (negative) raise the amount owed and payments lower it
+        delta = np.bincount(block['account'], weights=block['amount'], minlength=len(arrays['account_id']))
+        depository = np.isin(arrays['account_type'], DEPOSITORY_TYPES)
+        current = np.round(arrays['current_balance'] + np.where(depository, delta, -delta), 2)
+        available = np.where(depository, current, np.round(arrays['credit_limit'] - current, 2))
+
+        changed = np.flatnonzero(delta != 0)
+        balances = pd.DataFrame({
+            'account_id': arrays['account_id'][changed].astype(object),
+            'current_balance': current[changed],
+            'available_balance': available[changed]
+        })
+
+        new_state = state.replace(last_day, current_balance=current, next_seq=next_seq)
+        return {'transactions': transactions, 'balances': balances}, new_state
+
+
+def _rank_within(groups: np.ndarray) -> np.ndarray:
+    """Position of each element among the earlier elements of its group."""
+    order = np.argsort(groups, kind='stable')
+    sorted_groups = groups[order]
+    positions = np.arange(len(groups))
+    starts = np.r_[True, sorted_groups[1:] != sorted_groups[:-1]] if len(groups) else np.zeros(0, dtype=bool)
+    group_start = np.maximum.accumulate(np.where(starts, positions, 0)) if len(groups) else positions
+    rank = np.empty(len(groups), dtype=np.int64)
+    rank[order] = positions - group_start
+    return rank
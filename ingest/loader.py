@@ -1,16 +1,45 @@
 """
-CSV/JSON data loader with validation.
+CSV/Parquet/JSON data loader with validation.
 
-This module loads generated CSV files into the SQLite database with
-proper validation and error handling.
+This module loads generated CSV (or Parquet) files, and Plaid-style JSON or
+NDJSON exports (see json_stream), into the SQLite database with proper
+validation and error handling.
 """
 
 import sqlite3
 import pandas as pd
 import os
-from typing import Optional
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
 
 from .validator import SchemaValidator
+from .categorizer import MerchantCategorizer
+from .daily_totals import refresh_daily_totals
+from .reconcile import delete_transactions, ensure_pending_index, loaded_pending, reconcile_frame
+from .sqlite_writer import (
+    BULK_LOAD_PRAGMAS, TABLE_COLUMNS, TABLE_KEYS, TABLE_ORDER, apply_pragmas, create_bulk_indexes, drop_bulk_indexes,
+    insert_frame, insert_new_frame, is_interned, upsert_frame
+)
+
+
+# Foreign keys checked before each table is inserted: table -> (column, parent table)
+FOREIGN_KEYS = {
+    'accounts': ('user_id', 'users'),
+    'transactions': ('account_id', 'accounts'),
+    'liabilities': ('account_id', 'accounts')
+}
+
+# Rows buffered per table before a JSON batch is loaded
+JSON_BATCH_ROWS = 50_000
+
+# Digit-only codes that CSV type inference would turn into numbers ('0042' -> 42)
+CSV_TEXT_COLUMNS = {
+    'accounts': {'mask': str},
+    'transactions': {'location_postal_code': str}
+}
 
 
 class DataLoader:
@@ -23,19 +52,75 @@ class DataLoader:
     - Transaction support for atomic operations
     - Comprehensive error handling and logging
     - Foreign key enforcement
+    - Optional bulk-load mode for large datasets
+    - Per-stage timings in load_stats['timings']
+    - Pending transactions replaced by their posted rows (see reconcile)
+    - Uncategorized transactions categorized from their merchant (see categorizer)
+    - daily_category_totals refreshed from the earliest changed day (see daily_totals)
     """
     
-    def __init__(self, db_path: str = 'spendsense.db'):
+    def __init__(self, db_path: str = 'spendsense.db', bulk: bool = False,
+                 chunk_rows: Optional[int] = None, workers: int = 1,
+                 incremental: bool = False, validation: str = 'strict',
+                 reconcile: bool = True, categorize: bool = True):
         """
         Initialize loader with database path.
         
         Args:
             db_path: Path to SQLite database
+            bulk: Bulk-load mode: applies BULK_LOAD_PRAGMAS (WAL,
+                synchronous=OFF, larger cache) for the load, drops the
+                secondary transaction indexes and rebuilds them once before
+                commit, and inserts with executemany instead of pandas
+                to_sql. Foreign keys are still checked for each table before
+                it is inserted, so per-row enforcement is switched off.
+            chunk_rows: Stream CSV files in chunks of this many rows: each
+                chunk is read, validated, foreign-key checked and inserted
+                before the next one is read, so memory stays bounded by the
+                chunk size rather than the file size (Parquet is read whole)
+            workers: Parser processes for CSV files. Above 1, files are split
+                into blocks of about PARSE_BLOCK_BYTES that worker processes
+                parse and validate while this process stays the single
+                SQLite writer (streams like chunk_rows, which it overrides)
+            incremental: Load into an existing database instead of appending:
+                users, accounts and liabilities are upserted (rows whose
+                content is unchanged are left alone), and only transactions
+                dated on or after their account's latest loaded date are
+                added. Counts are recorded in load_stats['changes'].
+            validation: Validation profile: 'strict', 'fast' (skips email,
+                JSON and date format checks) or 'off' (trusted input; the
+                foreign key checks still run)
+            reconcile: Replace pending transactions with the posted rows
+                that settle them (same account, amount and merchant
+                fingerprint, dated up to PENDING_MATCH_DAYS later) instead
+                of loading both. Counts are recorded in
+                load_stats['reconciled'].
+            categorize: Assign categories to transactions loaded without
+                category_primary from their merchant name (see
+                MerchantCategorizer). Counts and hit rates are recorded in
+                load_stats['categorization'].
+        
+        Raises:
+            ValueError: If chunk_rows or workers is not positive, or the
+                validation profile is unknown
         """
+        if chunk_rows is not None and chunk_rows <= 0:
+            raise ValueError(f"chunk_rows must be positive, got {chunk_rows}")
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1, got {workers}")
+        
         self.db_path = db_path
+        self.bulk = bulk
+        self.chunk_rows = chunk_rows
+        self.workers = workers
+        self.incremental = incremental
+        self.reconcile = reconcile
+        self.categorizer = MerchantCategorizer() if categorize else None
         self.conn = None
-        self.validator = SchemaValidator()
+        self.validator = SchemaValidator(validation)
         self.load_stats = {}
+        self._totals_since = None
+        self._totals_users = set()
     
     def connect(self) -> sqlite3.Connection:
         """
@@ -49,9 +134,9 @@ class DataLoader:
         self.conn.execute("PRAGMA foreign_keys = ON")
         return self.conn
     
-    def load_all(self, data_dir: str = 'data/') -> None:
+    def load_all(self, data_dir: str = 'data/', data_format: Optional[str] = None) -> None:
         """
-        Load all CSV files in correct order.
+        Load all CSV (or Parquet) files in correct order.
         
         Loads data in dependency order:
         1. Users (no dependencies)
@@ -64,42 +149,175 @@ class DataLoader:
         
         Args:
             data_dir: Directory containing CSV files
+            data_format: 'csv' or 'parquet' (default: detect from metadata.json,
+                falling back to whichever files exist)
         
         Raises:
             FileNotFoundError: If CSV files not found
             ValueError: If validation fails
             sqlite3.Error: If database operation fails
         """
+        with self._session():
+            # Resolve file paths for the dataset format
+            paths = self._data_paths(data_dir, data_format)
+            
+            # Load in dependency order
+            print("Step 1/4: Loading users...")
+            self.load_users(paths['users'])
+            
+            print("\nStep 2/4: Loading accounts...")
+            self.load_accounts(paths['accounts'])
+            
+            print("\nStep 3/4: Loading transactions...")
+            self.load_transactions(paths['transactions'])
+            
+            print("\nStep 4/4: Loading liabilities...")
+            self.load_liabilities(paths['liabilities'])
+    
+    def load_json(self, path: str, batch_rows: Optional[int] = None) -> None:
+        """
+        Stream a Plaid-style JSON or NDJSON export into the database.
+        
+        The file is decoded incrementally (see json_stream) and flattened
+        into users/accounts/transactions/liabilities rows, which are
+        buffered per table and loaded in batches of batch_rows through the
+        same validation, foreign key and insert path as CSV chunks. Before a
+        batch is loaded, the buffered rows of its parent tables are loaded
+        first, so accounts must appear before their transactions (as they
+        do in Plaid responses). Uses one transaction like load_all.
+        
+        Args:
+            path: .json file (document or array of documents) or
+                .ndjson/.jsonl file (one document or record per line)
+            batch_rows: Rows per batch (default: chunk_rows, else JSON_BATCH_ROWS)
+        
+        Raises:
+            FileNotFoundError: If the file is not found
+            ValueError: If the JSON, validation or a foreign key check fails
+            sqlite3.Error: If database operation fails
+        """
+        from .json_stream import iter_plaid_records
+        
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"JSON file not found: {path}")
+        
+        batch_rows = batch_rows or self.chunk_rows or JSON_BATCH_ROWS
+        buffers = {table: [] for table in TABLE_ORDER}
+        account_users = {}
+        created_at = datetime.now().isoformat()
+        
+        def flush(table: str) -> None:
+            # Parents first, so their rows exist for the foreign key check
+            parent = FOREIGN_KEYS.get(table)
+            if parent is not None:
+                flush(parent[1])
+            if buffers[table]:
+                df = pd.DataFrame(buffers[table], columns=TABLE_COLUMNS[table])
+                buffers[table] = []
+                if table != 'users':
+                    self._fill_user_ids(df, account_users)
+                self._load_chunk(table, df, executemany=True, marks=marks.get(table))
+        
+        with self._session(schema=True):
+            print(f"Streaming {path}...")
+            for table in TABLE_ORDER:
+                self.load_stats[table] = 0
+            marks = {'transactions': self._high_water_marks()} if self.incremental else {}
+            
+            records = iter_plaid_records(path, created_at)
+            while True:
+                with self._stage('json', 'parse'):
+                    record = next(records, None)
+                if record is None:
+                    break
+                table, row = record
+                if table == 'accounts' and row['user_id'] is not None:
+                    account_users[row['account_id']] = row['user_id']
+                buffers[table].append(row)
+                if len(buffers[table]) >= batch_rows:
+                    flush(table)
+                    print(f"    Progress: " + ', '.join(
+                        f"{self.load_stats[name]} {name}" for name in TABLE_ORDER
+                    ))
+            
+            for table in TABLE_ORDER:
+                flush(table)
+            for table in TABLE_ORDER:
+                self._record_rate(table)
+    
+    @contextmanager
+    def _session(self, schema: bool = False):
+        """
+        Run a load inside one database transaction.
+        
+        Connects, creates the schema when needed, applies the bulk-mode
+        settings, and on success rebuilds indexes, commits and prints the
+        summary; on any error rolls everything back.
+        
+        Args:
+            schema: Create the schema when missing even outside the modes
+                that need it (callers that always insert with executemany)
+        
+        Raises:
+            Exception: Whatever the load raised, after rolling back
+        """
         print("\n" + "="*60)
-        print("LOADING DATA INTO DATABASE")
+        modes = [mode for mode, on in [('bulk', self.bulk), ('incremental', self.incremental)] if on]
+        print("LOADING DATA INTO DATABASE" + (f" ({', '.join(modes)} mode)" if modes else ""))
         print("="*60 + "\n")
         
+        previous_pragmas = None
+        self.load_stats['timings'] = {}
+        self.load_stats['reconciled'] = 0
+        self.load_stats.pop('categorization', None)
+        self.load_stats.pop('daily_totals', None)
+        self._totals_since = None
+        self._totals_users = set()
+        if self.categorizer is not None:
+            self.categorizer.stats = dict.fromkeys(self.categorizer.stats, 0)
+        
         try:
             # Connect to database
             self.connect()
             
+            # executemany needs the tables, and streamed chunks rely on the
+            # primary keys to catch duplicates across chunks (to_sql would
+            # create the tables without them); a plain transactions table
+            # is moved into the merchant-interned layout
+            if (schema or self.bulk or self.incremental or self.chunk_rows is not None or self.workers > 1) \
+                    and not is_interned(self.conn):
+                from .db_schema import create_database_schema
+                create_database_schema(self.db_path)
+            
+            if self.bulk:
+                # PRAGMAs cannot change inside a transaction
+                with self._stage('load', 'pragmas'):
+                    previous_pragmas = apply_pragmas(self.conn, BULK_LOAD_PRAGMAS)
+                    self.conn.execute("PRAGMA foreign_keys = OFF")
+            
             # Start transaction
             self.conn.execute("BEGIN TRANSACTION")
             
-            # Load in dependency order
-            print("Step 1/4: Loading users...")
-            users_path = os.path.join(data_dir, 'synthetic_users.csv')
-            self.load_users(users_path)
+            if self.bulk:
+                with self._stage('load', 'drop_indexes'):
+                    drop_bulk_indexes(self.conn)
             
-            print("\nStep 2/4: Loading accounts...")
-            accounts_path = os.path.join(data_dir, 'synthetic_accounts.csv')
-            self.load_accounts(accounts_path)
+            yield
             
-            print("\nStep 3/4: Loading transactions...")
-            transactions_path = os.path.join(data_dir, 'synthetic_transactions.csv')
-            self.load_transactions(transactions_path)
+            if self.bulk:
+                print("\nRebuilding transaction indexes...")
+                with self._stage('load', 'create_indexes'):
+                    create_bulk_indexes(self.conn)
             
-            print("\nStep 4/4: Loading liabilities...")
-            liabilities_path = os.path.join(data_dir, 'synthetic_liabilities.csv')
-            self.load_liabilities(liabilities_path)
+            if self._totals_since is not None:
+                with self._stage('load', 'daily_totals'):
+                    self.load_stats['daily_totals'] = refresh_daily_totals(
+                        self.conn, self._totals_since, self._totals_users
+                    )
             
             # Commit transaction
-            self.conn.commit()
+            with self._stage('load', 'commit'):
+                self.conn.commit()
             
             # Print summary
             print("\n" + "="*60)
@@ -109,6 +327,14 @@ class DataLoader:
             print(f"✓ Accounts loaded: {self.load_stats.get('accounts', 0)}")
             print(f"✓ Transactions loaded: {self.load_stats.get('transactions', 0)}")
             print(f"✓ Liabilities loaded: {self.load_stats.get('liabilities', 0)}")
+            self._print_categorization()
+            if 'daily_totals' in self.load_stats:
+                print(f"✓ Daily category totals refreshed: {self.load_stats['daily_totals']} rows "
+                      f"from {self._totals_since}")
+            if self.load_stats.get('reconciled'):
+                print(f"✓ Pending transactions replaced by posted: {self.load_stats['reconciled']}")
+            self._print_changes()
+            self._print_timings()
             print(f"\n📁 Database: {self.db_path}")
             print("="*60 + "\n")
             
@@ -121,75 +347,528 @@ class DataLoader:
             raise
         
         finally:
-            # Close connection
+            # Restore connection settings changed for the bulk load, then close
             if self.conn:
+                if previous_pragmas:
+                    apply_pragmas(self.conn, previous_pragmas)
                 self.conn.close()
     
-    def load_users(self, csv_path: str) -> None:
+    def _fill_user_ids(self, df: pd.DataFrame, account_users: dict) -> None:
         """
-        Load users from CSV with validation.
+        Fill missing user_ids of account-owned rows from their accounts.
+        
+        Accounts seen in this load are looked up in account_users; the rest
+        are read from the accounts table.
+        
+        Args:
+            df: Accounts, transactions or liabilities batch (modified in place)
+            account_users: Account ID -> user ID of accounts in this load
+        """
+        missing = df['user_id'].isna()
+        if not missing.any():
+            return
+        
+        df.loc[missing, 'user_id'] = df.loc[missing, 'account_id'].map(account_users)
+        unknown = pd.unique(df.loc[df['user_id'].isna(), 'account_id'].dropna()).tolist()
+        for i in range(0, len(unknown), 500):
+            keys = unknown[i:i + 500]
+            rows = self.conn.execute(
+                f"SELECT account_id, user_id FROM accounts WHERE account_id IN ({', '.join('?' * len(keys))})",
+                keys
+            ).fetchall()
+            account_users.update(rows)
+        if unknown:
+            missing = df['user_id'].isna()
+            df.loc[missing, 'user_id'] = df.loc[missing, 'account_id'].map(account_users)
+    
+    def _has_table(self, table: str) -> bool:
+        """Check whether a table (or view) exists in the connected database."""
+        row = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type IN ('table', 'view') AND name = ?", (table,)
+        ).fetchone()
+        return row is not None
+    
+    @contextmanager
+    def _stage(self, group: str, stage: str):
+        """Record the wall time of a load stage in load_stats['timings'][group][stage]."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add_time(group, stage, time.perf_counter() - start)
+    
+    def _add_time(self, group: str, stage: str, seconds: float) -> None:
+        """Add seconds to load_stats['timings'][group][stage]."""
+        timings = self.load_stats.setdefault('timings', {}).setdefault(group, {})
+        timings[stage] = timings.get(stage, 0.0) + seconds
+    
+    def _insert(self, table: str, df: pd.DataFrame, chunk_size: Optional[int] = None,
+                executemany: bool = False) -> None:
+        """
+        Insert a validated DataFrame into a table.
+        
+        Bulk mode uses one executemany over typed tuples (see sqlite_writer);
+        otherwise pandas to_sql, in chunks when chunk_size is given.
+        
+        Args:
+            table: Table name
+            df: DataFrame with the table's columns
+            chunk_size: Rows per to_sql call (non-bulk mode only)
+            executemany: Use executemany outside bulk mode too (to_sql
+                commits after every call)
+        """
+        with self._stage(table, 'insert'):
+            if self.bulk or executemany:
+                insert_frame(self.conn, table, df)
+            elif chunk_size is None:
+                df.to_sql(table, self.conn, if_exists='append', index=False)
+            else:
+                total_rows = len(df)
+                for i in range(0, total_rows, chunk_size):
+                    chunk = df.iloc[i:i+chunk_size]
+                    chunk.to_sql(table, self.conn, if_exists='append', index=False)
+                    
+                    # Progress indicator
+                    progress = min(i + chunk_size, total_rows)
+                    if progress % 5000 == 0 or progress == total_rows:
+                        print(f"    Progress: {progress}/{total_rows} {table}")
+
+    
+    def _print_changes(self) -> None:
+        """Print inserted/updated/unchanged counts of an incremental load."""
+        changes = self.load_stats.get('changes', {})
+        if not changes:
+            return
+        
+        print("\nChanges:")
+        for table, counts in changes.items():
+            print(f"  {table}: {counts['inserted']} inserted, {counts['updated']} updated, "
+                  f"{counts['unchanged']} unchanged")
+    
+    def _print_categorization(self) -> None:
+        """Print how many uncategorized transactions were categorized."""
+        stats = self.load_stats.get('categorization')
+        if not stats:
+            return
+        
+        print(f"✓ Transactions categorized: {stats['matched']} of {stats['rows']} uncategorized "
+              f"({stats['match_rate']:.1%} matched, {stats['cache_hit_rate']:.1%} cache hits)")
+    
+    def _high_water_marks(self) -> dict:
+        """Get the latest loaded transaction date of each account."""
+        return dict(self.conn.execute(
+            "SELECT account_id, MAX(date) FROM transactions GROUP BY account_id"
+        ).fetchall())
+    
+    @staticmethod
+    def _recent(df: pd.DataFrame, marks: dict) -> pd.Series:
+        """Mask transactions dated on or after their account's high-water mark."""
+        mark = df['account_id'].map(marks)
+        return mark.isna() | (df['date'] >= mark.fillna(''))
+    
+    def _upsert(self, table: str, df: pd.DataFrame, marks: Optional[dict] = None) -> None:
+        """
+        Merge a validated DataFrame into a table (incremental mode).
+        
+        With marks, only rows dated on or after their account's high-water
+        mark are inserted (rows already loaded from that day are skipped by
+        primary key); otherwise new rows are inserted and rows whose content
+        differs are updated.
+        
+        Args:
+            table: Table name
+            df: DataFrame with the table's columns
+            marks: Account ID -> latest loaded date (transactions only)
+        """
+        counts = self.load_stats.setdefault('changes', {}).setdefault(
+            table, {'inserted': 0, 'updated': 0, 'unchanged': 0}
+        )
+        
+        with self._stage(table, 'insert'):
+            if marks is not None:
+                inserted = insert_new_frame(self.conn, table, df[self._recent(df, marks)])
+                updated = 0
+            else:
+                key = TABLE_KEYS[table]
+                inserted = len(self._missing_references(df[key], table, key))
+                updated = upsert_frame(self.conn, table, df) - inserted
+        
+        counts['inserted'] += inserted
+        counts['updated'] += updated
+        counts['unchanged'] += len(df) - inserted - updated
+    
+    def _print_timings(self) -> None:
+        """Print per-stage load timings."""
+        timings = self.load_stats.get('timings', {})
+        if not timings:
+            return
+        
+        print("\nTimings:")
+        for group, stages in timings.items():
+            parts = ', '.join(f"{stage} {seconds:.2f}s" for stage, seconds in stages.items())
+            print(f"  {group}: {parts}")
+        
+        rate = self.load_stats.get('rows_per_second', {}).get('transactions')
+        if rate:
+            print(f"  transactions insert rate: {rate:,.0f} rows/s")
+    
+    def _data_paths(self, data_dir: str, data_format: Optional[str] = None) -> dict:
+        """
+        Resolve the file path of each table for a dataset directory.
+        
+        Args:
+            data_dir: Directory containing the dataset
+            data_format: 'csv', 'parquet' or None to detect
+        
+        Returns:
+            Dictionary mapping table name to path
+        """
+        if data_format is None:
+            metadata_path = os.path.join(data_dir, 'metadata.json')
+            if os.path.exists(metadata_path):
+                with open(metadata_path) as f:
+                    data_format = json.load(f).get('format')
+        
+        if data_format is None:
+            from .parquet_io import has_parquet
+            has_csv = os.path.exists(os.path.join(data_dir, 'synthetic_users.csv'))
+            data_format = 'parquet' if not has_csv and has_parquet(data_dir) else 'csv'
+        
+        if data_format == 'parquet':
+            from .parquet_io import PARQUET_FILES
+            files = PARQUET_FILES
+        elif data_format == 'csv':
+            files = {
+                'users': 'synthetic_users.csv',
+                'accounts': 'synthetic_accounts.csv',
+                'transactions': 'synthetic_transactions.csv',
+                'liabilities': 'synthetic_liabilities.csv'
+            }
+        else:
+            raise ValueError(f"Unknown data format: {data_format}")
+        
+        return {name: os.path.join(data_dir, filename) for name, filename in files.items()}
+    
+    def _read_table(self, path: str, table: str) -> pd.DataFrame:
+        """
+        Read a table from CSV or Parquet, based on the path.
+        
+        Args:
+            path: CSV file, Parquet file or partitioned Parquet directory
+            table: Table name
+        
+        Returns:
+            DataFrame
+        """
+        if self._is_parquet(path):
+            from .parquet_io import read_parquet_path
+            return read_parquet_path(path, table)
+        
+        return pd.read_csv(path, dtype=CSV_TEXT_COLUMNS.get(table))
+    
+    @staticmethod
+    def _is_parquet(path: str) -> bool:
+        """Check whether a table path is a Parquet file or partitioned directory."""
+        return path.endswith('.parquet') or os.path.isdir(path)
+    
+    def _is_streaming(self, path: str) -> bool:
+        """Check whether a table file is loaded in chunks rather than whole."""
+        return (self.chunk_rows is not None or self.workers > 1) and not self._is_parquet(path)
+    
+    def _iter_chunks(self, path: str, table: str) -> Iterator[Tuple[pd.DataFrame, bool]]:
+        """
+        Yield a table in chunks of chunk_rows rows (or whole, when not streaming).
+        
+        Reading is timed as the table's 'read' stage; the next chunk is only
+        read once the caller has finished with the previous one. With
+        workers > 1, CSV files are parsed and validated in worker processes
+        (see parallel_csv) and 'read' is the time spent waiting for them;
+        their own parse and validate times are added to the 'parse' and
+        'validate' stages.
         
         Args:
-            csv_path: Path to users CSV file
+            path: CSV file, Parquet file or partitioned Parquet directory
+            table: Table name
+        
+        Yields:
+            Tuples of (DataFrame, already validated)
+        """
+        if self.workers > 1 and not self._is_parquet(path):
+            from .parallel_csv import parse_csv_parallel
+            blocks = parse_csv_parallel(path, table, self.workers, dtype=CSV_TEXT_COLUMNS.get(table),
+                                        profile=self.validator.profile)
+            while True:
+                with self._stage(table, 'read'):
+                    block = next(blocks, None)
+                if block is None:
+                    return
+                df, parse_seconds, validate_seconds = block
+                self._add_time(table, 'parse', parse_seconds)
+                self._add_time(table, 'validate', validate_seconds)
+                yield df, True
+        
+        if not self._is_streaming(path):
+            with self._stage(table, 'read'):
+                df = self._read_table(path, table)
+            yield df, False
+            return
+        
+        with self._stage(table, 'read'):
+            reader = pd.read_csv(path, dtype=CSV_TEXT_COLUMNS.get(table), chunksize=self.chunk_rows)
+        
+        with reader:
+            while True:
+                with self._stage(table, 'read'):
+                    chunk = next(reader, None)
+                if chunk is None:
+                    return
+                yield chunk, False
+    
+    def _missing_references(self, keys: pd.Series, parent: str, column: str) -> list:
+        """
+        Find keys that have no matching row in a parent table.
+        
+        The distinct keys of the chunk go into an indexed temp table that is
+        anti-joined with the parent, so the parent's keys are never pulled
+        into Python (SQLite builds an automatic index when the parent column
+        has none).
+        
+        Args:
+            keys: Foreign key values of the rows being loaded
+            parent: Referenced table
+            column: Referenced (and referencing) column
+        
+        Returns:
+            List of keys missing from the parent table
+        """
+        self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS fk_keys (key TEXT PRIMARY KEY)")
+        self.conn.execute("DELETE FROM temp.fk_keys")
+        self.conn.executemany(
+            "INSERT INTO temp.fk_keys (key) VALUES (?)",
+            ((key,) for key in pd.unique(keys.dropna()).tolist())
+        )
+        rows = self.conn.execute(f"""
+            SELECT k.key FROM temp.fk_keys k
+            LEFT JOIN {parent} p ON p.{column} = k.key
+            WHERE p.{column} IS NULL
+        """).fetchall()
+        return [row[0] for row in rows]
+    
+    def _load_table(self, path: str, table: str, chunk_size: Optional[int] = None) -> None:
+        """
+        Validate, foreign-key check and insert one table, chunk by chunk.
+        
+        Args:
+            path: Path to the table's CSV (or Parquet) file
+            table: Table name
+            chunk_size: Rows per to_sql call (non-bulk mode only)
         
         Raises:
-            FileNotFoundError: If CSV file not found
-            ValueError: If validation fails
+            FileNotFoundError: If the file is not found
+            ValueError: If validation or the foreign key check fails
         """
-        # Read CSV
-        if not os.path.exists(csv_path):
-            raise FileNotFoundError(f"Users CSV not found: {csv_path}")
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"{table.capitalize()} file not found: {path}")
+        
+        streaming = self._is_streaming(path)
+        marks = self._high_water_marks() if self.incremental and table == 'transactions' else None
+        self.load_stats[table] = 0
+        total = 0
+        
+        for df, validated in self._iter_chunks(path, table):
+            self._load_chunk(table, df, validated, chunk_size, marks, executemany=streaming,
+                             verbose=not streaming)
+            total += len(df)
+            if streaming:
+                print(f"    Progress: {total} {table} validated and loaded")
+        
+        self._record_rate(table)
+        print(f"  ✓ Loaded {total} {table}")
+    
+    def _load_chunk(self, table: str, df: pd.DataFrame, validated: bool = False,
+                    chunk_size: Optional[int] = None, marks: Optional[dict] = None,
+                    executemany: bool = False, verbose: bool = False) -> None:
+        """
+        Validate, foreign-key check and insert one chunk of a table.
         
-        df = pd.read_csv(csv_path)
+        Args:
+            table: Table name
+            df: Chunk with the table's columns
+            validated: The chunk was already validated (parallel parsing)
+            chunk_size: Rows per to_sql call (non-bulk mode only)
+            marks: Account ID -> latest loaded date (incremental transactions)
+            executemany: Insert with executemany outside bulk mode too
+            verbose: Print each step (whole-table loads)
         
+        Raises:
+            ValueError: If validation or the foreign key check fails
+        """
         # Validate
-        print(f"  Validating {len(df)} users...")
-        self.validator.validate_users(df)
-        print(f"  ✓ Validation passed")
+        if not validated and self.validator.profile != 'off':
+            if verbose:
+                print(f"  Validating {len(df)} {table} ({self.validator.profile})...")
+            with self._stage(table, 'validate'):
+                getattr(self.validator, f'validate_{table}')(df)
+            if verbose:
+                print(f"  ✓ Validation passed")
+        
+        # Verify foreign keys (parent rows exist)
+        reference = FOREIGN_KEYS.get(table)
+        if reference is not None:
+            column, parent = reference
+            if verbose:
+                print(f"  Checking foreign key constraints...")
+            with self._stage(table, 'foreign_keys'):
+                missing = self._missing_references(df[column], parent, column)
+            if missing:
+                rows = int(df[column].isin(missing).sum())
+                raise ValueError(
+                    f"Foreign key violation: {rows} {table} reference non-existent {parent}"
+                )
+            if verbose:
+                print(f"  ✓ Foreign keys valid")
+        
+        # Categorize transactions that arrived without a category
+        if table == 'transactions' and self.categorizer is not None \
+                and df['category_primary'].isna().any():
+            with self._stage(table, 'categorize'):
+                self.categorizer.fill_missing(df)
+            self.load_stats['categorization'] = dict(self.categorizer.stats, **self.categorizer.hit_rates())
+        
+        # Rows an incremental load actually inserts (the rest are skipped)
+        inserted = None
+        if table == 'transactions' and marks is not None and self._has_table('transactions'):
+            inserted = self._new_rows(df, marks)
+        
+        # Settled pending rows share an account, so a user, with an inserted row
+        if table == 'transactions':
+            changed = df if inserted is None else df[inserted]
+            self._note_totals_since(changed['date'])
+            self._totals_users.update(pd.unique(changed['user_id'].dropna()).tolist())
+        
+        # Replace pending transactions settled by posted rows of this chunk
+        if table == 'transactions' and self.reconcile:
+            with self._stage(table, 'reconcile'):
+                df, settled_dates = self._reconcile(df, inserted)
+            self._note_totals_since(pd.Series(settled_dates, dtype=object))
         
         # Load to database
-        print(f"  Loading into database...")
-        df.to_sql('users', self.conn, if_exists='append', index=False)
+        if verbose:
+            if self.incremental:
+                print(f"  Merging into database (incremental)...")
+            elif self.bulk:
+                print(f"  Loading into database (bulk)...")
+            elif chunk_size is not None:
+                print(f"  Loading into database (chunk_size={chunk_size})...")
+            else:
+                print(f"  Loading into database...")
+        # Streamed chunks go in with executemany: to_sql would commit each
+        # chunk, so a bad row in a later chunk could not roll back the load
+        if self.incremental:
+            self._upsert(table, df, marks)
+        else:
+            self._insert(table, df, chunk_size, executemany=executemany)
+        
+        self.load_stats[table] = self.load_stats.get(table, 0) + len(df)
+    
+    def _note_totals_since(self, dates: pd.Series) -> None:
+        """
+        Lower the date daily_category_totals is refreshed from to cover changed days.
+        
+        Only days that change count: those of the rows about to be inserted
+        and of the loaded pending rows reconciliation deleted. A load that
+        changes nothing leaves the date unset and skips the refresh.
         
-        self.load_stats['users'] = len(df)
-        print(f"  ✓ Loaded {len(df)} users")
+        Args:
+            dates: Dates of transactions inserted or deleted
+        """
+        if len(dates) == 0:
+            return
+        since = str(dates.min())[:10]
+        if self._totals_since is None or since < self._totals_since:
+            self._totals_since = since
     
-    def load_accounts(self, csv_path: str) -> None:
+    def _new_rows(self, df: pd.DataFrame, marks: dict) -> pd.Series:
         """
-        Load accounts from CSV with validation.
+        Mask the transactions an incremental load inserts.
+        
+        Rows before their account's high-water mark are skipped, and so are
+        rows from the mark's day that are already loaded.
+        
+        Args:
+            df: Transactions chunk
+            marks: Account ID -> latest loaded date
+        
+        Returns:
+            Boolean Series aligned with df
+        """
+        recent = self._recent(df, marks)
+        missing = self._missing_references(df.loc[recent, 'transaction_id'], 'transactions', 'transaction_id')
+        return recent & df['transaction_id'].isin(missing)
+    
+    def _reconcile(self, df: pd.DataFrame,
+                   inserted: Optional[pd.Series] = None) -> Tuple[pd.DataFrame, List[str]]:
+        """
+        Drop or delete the pending transactions that posted rows of a chunk settle.
+        
+        Pending rows of the chunk itself are dropped from it; pending rows
+        loaded earlier are deleted from the database (the posted rows are
+        inserted in their place).
         
         Args:
-            csv_path: Path to accounts CSV file
+            df: Validated transactions chunk
+            inserted: Mask of the rows an incremental load inserts (rows it
+                skips settle nothing); default all
+        
+        Returns:
+            Tuple of (the chunk without its settled pending rows, dates of
+            the loaded pending rows deleted)
+        """
+        loaded = None
+        if self._has_table('transactions'):
+            ensure_pending_index(self.conn)
+            loaded = loaded_pending(self.conn, df)
+        
+        before = len(df)
+        df, settled = reconcile_frame(df, loaded, inserted)
+        deleted = delete_transactions(self.conn, settled) if settled else 0
+        settled_dates = loaded.loc[loaded['transaction_id'].isin(settled), 'date'].astype(str).tolist() \
+            if settled else []
+        
+        self.load_stats['reconciled'] = self.load_stats.get('reconciled', 0) + before - len(df) + deleted
+        return df, settled_dates
+    
+    def _record_rate(self, table: str) -> None:
+        """Set load_stats['rows_per_second'][table] from the rows loaded and insert time."""
+        elapsed = self.load_stats.get('timings', {}).get(table, {}).get('insert', 0.0)
+        rows = self.load_stats.get(table, 0)
+        self.load_stats.setdefault('rows_per_second', {})[table] = rows / elapsed if elapsed > 0 else 0.0
+    
+    def load_users(self, csv_path: str) -> None:
+        """
+        Load users from CSV with validation.
+        
+        Args:
+            csv_path: Path to users CSV (or Parquet) file
         
         Raises:
             FileNotFoundError: If CSV file not found
             ValueError: If validation fails
         """
-        # Read CSV
-        if not os.path.exists(csv_path):
-            raise FileNotFoundError(f"Accounts CSV not found: {csv_path}")
-        
-        df = pd.read_csv(csv_path)
-        
-        # Validate
-        print(f"  Validating {len(df)} accounts...")
-        self.validator.validate_accounts(df)
-        print(f"  ✓ Validation passed")
-        
-        # Verify foreign keys (users exist)
-        print(f"  Checking foreign key constraints...")
-        user_ids = pd.read_sql("SELECT user_id FROM users", self.conn)['user_id'].tolist()
-        missing_users = df[~df['user_id'].isin(user_ids)]
-        if len(missing_users) > 0:
-            raise ValueError(f"Foreign key violation: {len(missing_users)} accounts reference non-existent users")
-        print(f"  ✓ Foreign keys valid")
+        self._load_table(csv_path, 'users')
+    
+    def load_accounts(self, csv_path: str) -> None:
+        """
+        Load accounts from CSV with validation.
         
-        # Load to database
-        print(f"  Loading into database...")
-        df.to_sql('accounts', self.conn, if_exists='append', index=False)
+        Args:
+            csv_path: Path to accounts CSV (or Parquet) file
         
-        self.load_stats['accounts'] = len(df)
-        print(f"  ✓ Loaded {len(df)} accounts")
+        Raises:
+            FileNotFoundError: If CSV file not found
+            ValueError: If validation fails
+        """
+        self._load_table(csv_path, 'accounts')
     
     def load_transactions(self, csv_path: str, chunk_size: int = 1000) -> None:
         """
@@ -199,81 +878,25 @@ class DataLoader:
         without consuming too much memory.
         
         Args:
-            csv_path: Path to transactions CSV file
-            chunk_size: Number of rows to load at once (default: 1000)
+            csv_path: Path to transactions CSV (or Parquet) file
+            chunk_size: Number of rows to load at once (default: 1000; bulk
+                mode inserts each chunk with one executemany)
         
         Raises:
             FileNotFoundError: If CSV file not found
             ValueError: If validation fails
         """
-        # Read CSV
-        if not os.path.exists(csv_path):
-            raise FileNotFoundError(f"Transactions CSV not found: {csv_path}")
-        
-        df = pd.read_csv(csv_path)
-        
-        # Validate
-        print(f"  Validating {len(df)} transactions...")
-        self.validator.validate_transactions(df)
-        print(f"  ✓ Validation passed")
-        
-        # Verify foreign keys (accounts exist)
-        print(f"  Checking foreign key constraints...")
-        account_ids = pd.read_sql("SELECT account_id FROM accounts", self.conn)['account_id'].tolist()
-        missing_accounts = df[~df['account_id'].isin(account_ids)]
-        if len(missing_accounts) > 0:
-            raise ValueError(f"Foreign key violation: {len(missing_accounts)} transactions reference non-existent accounts")
-        print(f"  ✓ Foreign keys valid")
-        
-        # Load in chunks
-        print(f"  Loading into database (chunk_size={chunk_size})...")
-        total_rows = len(df)
-        for i in range(0, total_rows, chunk_size):
-            chunk = df.iloc[i:i+chunk_size]
-            chunk.to_sql('transactions', self.conn, if_exists='append', index=False)
-            
-            # Progress indicator
-            progress = min(i + chunk_size, total_rows)
-            if progress % 5000 == 0 or progress == total_rows:
-                print(f"    Progress: {progress}/{total_rows} transactions")
-        
-        self.load_stats['transactions'] = len(df)
-        print(f"  ✓ Loaded {len(df)} transactions")
+        self._load_table(csv_path, 'transactions', chunk_size)
     
     def load_liabilities(self, csv_path: str) -> None:
         """
         Load liabilities from CSV with validation.
         
         Args:
-            csv_path: Path to liabilities CSV file
+            csv_path: Path to liabilities CSV (or Parquet) file
         
         Raises:
             FileNotFoundError: If CSV file not found
             ValueError: If validation fails
         """
-        # Read CSV
-        if not os.path.exists(csv_path):
-            raise FileNotFoundError(f"Liabilities CSV not found: {csv_path}")
-        
-        df = pd.read_csv(csv_path)
-        
-        # Validate
-        print(f"  Validating {len(df)} liabilities...")
-        self.validator.validate_liabilities(df)
-        print(f"  ✓ Validation passed")
-        
-        # Verify foreign keys (accounts exist)
-        print(f"  Checking foreign key constraints...")
-        account_ids = pd.read_sql("SELECT account_id FROM accounts", self.conn)['account_id'].tolist()
-        missing_accounts = df[~df['account_id'].isin(account_ids)]
-        if len(missing_accounts) > 0:
-            raise ValueError(f"Foreign key violation: {len(missing_accounts)} liabilities reference non-existent accounts")
-        print(f"  ✓ Foreign keys valid")
-        
-        # Load to database
-        print(f"  Loading into database...")
-        df.to_sql('liabilities', self.conn, if_exists='append', index=False)
-        
-        self.load_stats['liabilities'] = len(df)
-        print(f"  ✓ Loaded {len(df)} liabilities")
-
+        self._load_table(csv_path, 'liabilities')
@@ -0,0 +1,160 @@
+"""
+Parallel CSV parsing for the single-writer loader.
+
+SQLite accepts one writer at a time, but parsing and validating CSV text is
+CPU-bound and independent per block of lines. A CSV file is split into byte
+ranges that end on line boundaries; worker processes parse and validate the
+ranges, and the blocks are handed back to the caller (the one thread that
+writes to SQLite) strictly in file order.
+
+At most max_in_flight blocks are submitted but not yet consumed, so a slow
+writer holds the parsers back instead of letting parsed blocks pile up in
+memory. A worker error (including a validation failure) is re-raised in the
+caller when its block is reached.
+
+Blocks are split on newlines, so quoted fields must not contain line breaks
+(the generated exports never do).
+"""
+
+import io
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from .validator import SchemaValidator
+
+
+# Approximate bytes of CSV text parsed per task handed to a worker
+PARSE_BLOCK_BYTES = 16 * 1024 * 1024
+
+# Per-process validator, created by _init_worker()
+_worker_validator: Optional[SchemaValidator] = None
+
+
+def _init_worker(profile: str = 'strict') -> None:
+    """Create the schema validator of a worker process."""
+    global _worker_validator
+    _worker_validator = SchemaValidator(profile)
+
+
+def csv_blocks(path: str, block_bytes: int = None) -> Tuple[List[str], List[Tuple[int, int]]]:
+    """
+    Split a CSV file into byte ranges that start and end on line boundaries.
+
+    Args:
+        path: CSV file with a header line
+        block_bytes: Approximate size of each range (default: PARSE_BLOCK_BYTES)
+
+    Returns:
+        Tuple of (column names, list of (start, end) byte offsets)
+
+    Raises:
+        ValueError: If block_bytes is not positive
+    """
+    block_bytes = PARSE_BLOCK_BYTES if block_bytes is None else block_bytes
+    if block_bytes <= 0:
+        raise ValueError(f"block_bytes must be positive, got {block_bytes}")
+
+    size = os.path.getsize(path)
+    bounds = []
+
+    with open(path, 'rb') as f:
+        header = f.readline()
+        start = f.tell()
+        while start < size:
+            f.seek(min(start + block_bytes, size))
+            f.readline()
+            end = min(f.tell(), size)
+            bounds.append((start, end))
+            start = end
+
+    columns = pd.read_csv(io.BytesIO(header), nrows=0).columns.tolist()
+    return columns, bounds
+
+
+def parse_block(path: str, table: str, columns: List[str], start: int, end: int,
+                dtype: Optional[Dict[str, type]] = None,
+                validator: Optional[SchemaValidator] = None) -> Tuple[pd.DataFrame, float, float]:
+    """
+    Parse and validate one byte range of a CSV file.
+
+    Args:
+        path: CSV file
+        table: Table name (selects the validate_<table> check)
+        columns: Column names from the header line
+        start: First byte of the range
+        end: Byte after the range
+        dtype: Column dtypes passed to read_csv
+        validator: Validator to use (default: the worker's)
+
+    Returns:
+        Tuple of (validated DataFrame, parse seconds, validate seconds)
+
+    Raises:
+        ValueError: If validation fails
+    """
+    validator = validator or _worker_validator or SchemaValidator()
+
+    started = time.perf_counter()
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    df = pd.read_csv(io.BytesIO(data), header=None, names=columns, dtype=dtype)
+    parsed = time.perf_counter()
+
+    getattr(validator, f'validate_{table}')(df)
+    return df, parsed - started, time.perf_counter() - parsed
+
+
+def _run_block(args: tuple) -> Tuple[pd.DataFrame, float, float]:
+    """Parse and validate one block inside a worker process."""
+    return parse_block(*args)
+
+
+def parse_csv_parallel(path: str, table: str, workers: int,
+                       dtype: Optional[Dict[str, type]] = None,
+                       block_bytes: int = None,
+                       max_in_flight: Optional[int] = None,
+                       profile: str = 'strict') -> Iterator[Tuple[pd.DataFrame, float, float]]:
+    """
+    Parse and validate a CSV file across a process pool, yielding blocks in order.
+
+    Args:
+        path: CSV file
+        table: Table name (selects the validate_<table> check)
+        workers: Number of worker processes
+        dtype: Column dtypes passed to read_csv
+        block_bytes: Approximate bytes per block (default: PARSE_BLOCK_BYTES)
+        max_in_flight: Maximum blocks submitted but not yet yielded
+            (default: 2 * workers)
+        profile: Validation profile of the workers (see SchemaValidator)
+
+    Yields:
+        Tuples of (validated DataFrame, parse seconds, validate seconds)
+
+    Raises:
+        ValueError: If any block fails validation
+    """
+    columns, bounds = csv_blocks(path, block_bytes)
+    tasks = ((path, table, columns, start, end, dtype) for start, end in bounds)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(profile,)) as executor:
+        pending = deque()
+        try:
+            for task in islice(tasks, max_in_flight or 2 * workers):
+                pending.append(executor.submit(_run_block, task))
+
+            while pending:
+                block = pending.popleft().result()
+                for task in islice(tasks, 1):
+                    pending.append(executor.submit(_run_block, task))
+                yield block
+        finally:
+            # Stopped early (error or abandoned): drop blocks not yet started
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,296 @@
+"""
+Parquet export and import for the synthetic dataset.
+
+Writes the same four tables as export_csv(), but as typed, columnar Parquet:
+- dates are date32, created_at is a timestamp, flags are booleans
+- low-cardinality text columns (categories, merchants, account types, ...)
+  are dictionary-encoded and read back as pandas categoricals
+- transactions are partitioned by month (Hive layout: month=YYYY-MM/)
+
+Reading returns DataFrames in the same shape the CSV loader produces, so the
+validator and SQLite loading code work unchanged. Single columns can be read
+without touching the rest of the file.
+
+Requires pyarrow (optional dependency: pip install pyarrow).
+"""
+
+import os
+import shutil
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .compact import iter_expanded
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+PARQUET_FILES = {
+    'users': 'synthetic_users.parquet',
+    'accounts': 'synthetic_accounts.parquet',
+    'transactions': 'synthetic_transactions',  # directory of month partitions
+    'liabilities': 'synthetic_liabilities.parquet'
+}
+
+# Parquet compression codec
+COMPRESSION = 'zstd'
+
+# Column types: string, dict (dictionary-encoded string), float, bool, date, timestamp
+TABLE_SCHEMAS = {
+    'users': {
+        'user_id': 'string',
+        'name': 'string',
+        'email': 'string',
+        'created_at': 'timestamp',
+        'metadata': 'string'
+    },
+    'accounts': {
+        'account_id': 'string',
+        'user_id': 'string',
+        'type': 'dict',
+        'subtype': 'dict',
+        'name': 'dict',
+        'official_name': 'dict',
+        'mask': 'string',
+        'available_balance': 'float',
+        'current_balance': 'float',
+        'credit_limit': 'float',
+        'iso_currency_code': 'dict',
+        'holder_category': 'dict',
+        'created_at': 'timestamp'
+    },
+    'transactions': {
+        'transaction_id': 'string',
+        'account_id': 'string',
+        'user_id': 'string',
+        'date': 'date',
+        'amount': 'float',
+        'merchant_name': 'dict',
+        'merchant_entity_id': 'dict',
+        'payment_channel': 'dict',
+        'category_primary': 'dict',
+        'category_detailed': 'dict',
+        'pending': 'bool',
+        'location_city': 'dict',
+        'location_region': 'dict',
+        'location_postal_code': 'dict',
+        'created_at': 'timestamp'
+    },
+    'liabilities': {
+        'liability_id': 'string',
+        'account_id': 'string',
+        'user_id': 'string',
+        'type': 'dict',
+        'apr_percentage': 'float',
+        'apr_type': 'dict',
+        'minimum_payment_amount': 'float',
+        'last_payment_amount': 'float',
+        'last_payment_date': 'date',
+        'next_payment_due_date': 'date',
+        'last_statement_balance': 'float',
+        'is_overdue': 'bool',
+        'interest_rate': 'float',
+        'created_at': 'timestamp'
+    }
+}
+
+
+def _require_pyarrow() -> None:
+    """Raise a helpful error when pyarrow is not installed."""
+    if not PYARROW_AVAILABLE:
+        raise ImportError("Parquet support requires pyarrow. Install with: pip install pyarrow")
+
+
+def _arrow_type(kind: str):
+    """Map a schema kind to an Arrow type."""
+    return {
+        'string': pa.string(),
+        'dict': pa.dictionary(pa.int32(), pa.string()),
+        'float': pa.float64(),
+        'bool': pa.bool_(),
+        'date': pa.date32(),
+        'timestamp': pa.timestamp('us')
+    }[kind]
+
+
+def to_arrow(df: pd.DataFrame, table: str) -> 'pa.Table':
+    """
+    Convert a generator DataFrame to a typed Arrow table.
+
+    Args:
+        df: DataFrame as produced by SyntheticDataGenerator
+        table: Table name ('users', 'accounts', 'transactions', 'liabilities')
+
+    Returns:
+        Arrow table with the types from TABLE_SCHEMAS
+    """
+    _require_pyarrow()
+
+    arrays = []
+    fields = []
+    for column, kind in TABLE_SCHEMAS[table].items():
+        values = df[column]
+
+        if kind == 'date':
+            array = pa.array(pd.to_datetime(values).to_numpy().astype('datetime64[D]'), type=pa.date32())
+        elif kind == 'timestamp':
+            array = pa.array(pd.to_datetime(values).to_numpy().astype('datetime64[us]'), type=pa.timestamp('us'))
+        elif kind == 'dict':
+            array = pa.array(values.astype(object), type=pa.string(), from_pandas=True).dictionary_encode()
+        elif kind == 'string':
+            array = pa.array(values.astype(object), type=pa.string(), from_pandas=True)
+        elif kind == 'float':
+            array = pa.array(pd.to_numeric(values), type=pa.float64(), from_pandas=True)
+        else:
+            array = pa.array(values.astype(bool), type=pa.bool_())
+
+        arrays.append(array)
+        fields.append(pa.field(column, _arrow_type(kind)))
+
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+
+
+def from_arrow(arrow_table: 'pa.Table', table: str) -> pd.DataFrame:
+    """
+    Convert an Arrow table back to the DataFrame shape used by the loader.
+
+    Dates and timestamps are rendered as the same strings the CSV files hold
+    (SQLite stores them as TEXT); dictionary columns become categoricals.
+
+    Args:
+        arrow_table: Table read from Parquet
+        table: Table name
+
+    Returns:
+        DataFrame
+    """
+    schema = TABLE_SCHEMAS[table]
+    df = arrow_table.to_pandas()
+
+    for column in df.columns:
+        kind = schema.get(column)
+        if kind == 'date':
+            df[column] = _format_unique(df[column], lambda value: value.strftime('%Y-%m-%d'))
+        elif kind == 'timestamp':
+            df[column] = _format_unique(df[column], lambda value: value.isoformat())
+
+    return df
+
+
+def _format_unique(values: pd.Series, formatter) -> pd.Series:
+    """Format a date-like column by formatting each distinct value once."""
+    codes, uniques = pd.factorize(pd.to_datetime(values))
+    formatted = np.array([formatter(value) for value in uniques] + [None], dtype=object)
+    return pd.Series(formatted[codes], index=values.index)
+
+
+def write_parquet(tables: Dict[str, pd.DataFrame], output_dir: str) -> Dict[str, str]:
+    """
+    Write the dataset as Parquet files.
+
+    Args:
+        tables: Dictionary with 'users', 'accounts', 'transactions', 'liabilities'
+        output_dir: Output directory
+
+    Returns:
+        Dictionary mapping table name to written path
+    """
+    _require_pyarrow()
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {}
+
+    for name, df in tables.items():
+        if df is None:
+            continue
+
+        path = os.path.join(output_dir, PARQUET_FILES[name])
+
+        if name == 'transactions':
+            # Hive-style month partitions; replace any previous export
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            # Compact frames are converted chunk by chunk (see compact.py)
+            parts = []
+            for chunk in iter_expanded(df):
+                month = pa.array(chunk['date'].astype(str).str.slice(0, 7), type=pa.string())
+                parts.append(to_arrow(chunk, name).append_column('month', month))
+            arrow_table = pa.concat_tables(parts)
+            ds.write_dataset(
+                arrow_table,
+                path,
+                format='parquet',
+                partitioning=ds.partitioning(pa.schema([('month', pa.string())]), flavor='hive'),
+                basename_template='part-{i}.parquet',
+                file_options=ds.ParquetFileFormat().make_write_options(compression=COMPRESSION),
+                existing_data_behavior='overwrite_or_ignore'
+            )
+        else:
+            pq.write_table(to_arrow(df, name), path, compression=COMPRESSION)
+
+        paths[name] = path
+
+    return paths
+
+
+def read_table(data_dir: str, table: str, columns: Optional[List[str]] = None,
+               months: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Read one table of a Parquet export.
+
+    Args:
+        data_dir: Directory containing the Parquet export
+        table: Table name
+        columns: Only read these columns (default: all)
+        months: For transactions, only read these 'YYYY-MM' partitions
+
+    Returns:
+        DataFrame (see from_arrow)
+    """
+    return read_parquet_path(os.path.join(data_dir, PARQUET_FILES[table]), table, columns, months)
+
+
+def read_parquet_path(path: str, table: str, columns: Optional[List[str]] = None,
+                      months: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Read a table from a Parquet file (or partitioned transactions directory).
+
+    Args:
+        path: Parquet file, or directory of month partitions for transactions
+        table: Table name
+        columns: Only read these columns (default: all)
+        months: For transactions, only read these 'YYYY-MM' partitions
+
+    Returns:
+        DataFrame (see from_arrow)
+
+    Raises:
+        FileNotFoundError: If the path is missing
+    """
+    _require_pyarrow()
+
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"{table.capitalize()} Parquet not found: {path}")
+
+    if os.path.isdir(path):
+        dataset = ds.dataset(path, format='parquet', partitioning='hive')
+        columns = columns or list(TABLE_SCHEMAS[table].keys())
+        row_filter = ds.field('month').isin(months) if months else None
+        # Partitions are read in directory (month) order; within a month rows
+        # keep the order they were written in
+        arrow_table = dataset.to_table(columns=columns, filter=row_filter)
+    else:
+        arrow_table = pq.read_table(path, columns=columns)
+
+    return from_arrow(arrow_table, table)
+
+
+def has_parquet(data_dir: str) -> bool:
+    """Check whether a directory holds a Parquet export."""
+    return os.path.exists(os.path.join(data_dir, PARQUET_FILES['users']))
@@ -0,0 +1,358 @@
+"""
+Array-based synthesis of users and accounts.
+
+Samples demographics for the whole population in a few NumPy draws instead of
+one Faker/random call per user, builds names from precomputed first/last name
+pools, and creates every account type with a single batch of draws. Follows
+the same distributions as the row-by-row generate_users()/generate_accounts().
+
+UserProfiles keeps parsed user metadata as columns with a user_id -> row
+index, so per-account lookups are O(1) and never re-parse JSON.
+"""
+
+import json
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from faker import Faker
+
+from .config import *
+from .utils import generate_id_batch
+
+
+# Distinct first and last names drawn from Faker (pool size ** 2 full names)
+NAME_POOL_SIZE = 1000
+
+# Profile fields stored in users.metadata, in JSON key order
+PROFILE_FIELDS = ['age', 'age_bracket', 'income', 'income_bracket', 'region', 'life_stage']
+
+# users.metadata as produced by json.dumps() of the PROFILE_FIELDS dictionary
+# (all string values are plain config identifiers, so no escaping is needed)
+METADATA_TEMPLATE = (
+    '{{"age": {}, "age_bracket": "{}", "income": {}, '
+    '"income_bracket": "{}", "region": "{}", "life_stage": "{}"}}'
+)
+
+CARD_SUBTYPES = ['rewards', 'cash_back', 'travel', 'standard']
+
+# All 4-digit account masks, indexed by number
+MASKS = np.array([f'{i:04d}' for i in range(10000)], dtype=object)
+
+# Account slot order within a user (matches generate_accounts())
+SLOT_CHECKING, SLOT_SAVINGS, SLOT_CREDIT_CARD, SLOT_STUDENT_LOAN = range(4)
+
+
+class UserProfiles:
+    """
+    Indexed in-memory table of user demographics.
+
+    Columns are NumPy arrays aligned with user_ids; index maps user_id to row.
+    """
+
+    def __init__(self, user_ids: np.ndarray, columns: Dict[str, np.ndarray]):
+        """
+        Initialize profile table.
+
+        Args:
+            user_ids: User IDs, one per row
+            columns: Profile arrays keyed by PROFILE_FIELDS
+        """
+        self.user_ids = np.asarray(user_ids)
+        self.columns = columns
+        self.index = {user_id: row for row, user_id in enumerate(self.user_ids.tolist())}
+
+    @classmethod
+    def from_users(cls, users_df: pd.DataFrame) -> 'UserProfiles':
+        """
+        Build the table from a users DataFrame, parsing each metadata JSON once.
+
+        Args:
+            users_df: DataFrame with 'user_id' and 'metadata' columns
+
+        Returns:
+            UserProfiles
+        """
+        records = [json.loads(value) for value in users_df['metadata']]
+        columns = {
+            field: np.array([record[field] for record in records])
+            for field in PROFILE_FIELDS
+        }
+        return cls(users_df['user_id'].to_numpy(), columns)
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    def rows(self, user_ids) -> np.ndarray:
+        """
+        Get row positions of user IDs.
+
+        Raises:
+            ValueError: If a user is unknown
+        """
+        try:
+            return np.fromiter((self.index[user_id] for user_id in user_ids), dtype=np.int64)
+        except KeyError as e:
+            raise ValueError(f"User {e.args[0]} not found")
+
+    def column(self, field: str, user_ids) -> np.ndarray:
+        """Look up one profile field for many users."""
+        return self.columns[field][self.rows(user_ids)]
+
+    def metadata(self, user_id: str) -> dict:
+        """
+        Get the metadata dictionary of one user (same as json.loads(metadata)).
+
+        Raises:
+            ValueError: If the user is unknown
+        """
+        row = self.index.get(user_id)
+        if row is None:
+            raise ValueError(f"User {user_id} not found")
+        values = (self.columns[field][row] for field in PROFILE_FIELDS)
+        return {
+            field: value.item() if isinstance(value, np.generic) else value
+            for field, value in zip(PROFILE_FIELDS, values)
+        }
+
+
+class PopulationSynthesizer:
+    """
+    Generate users and accounts with array draws.
+
+    All randomness comes from one NumPy Generator (plus Faker for the name
+    pools), so output is reproducible for a given seed.
+    """
+
+    def __init__(self, rng: np.random.Generator, fake: Faker):
+        """
+        Initialize synthesizer.
+
+        Args:
+            rng: NumPy random generator
+            fake: Seeded Faker instance used to fill the name pools (drawn on
+                first use)
+        """
+        self.rng = rng
+        self.fake = fake
+        self.first_names = None
+        self.last_names = None
+
+    def _name_pools(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Draw the first and last name pools from Faker (once)."""
+        if self.first_names is None:
+            self.first_names = np.array([self.fake.first_name() for _ in range(NAME_POOL_SIZE)], dtype=object)
+            self.last_names = np.array([self.fake.last_name() for _ in range(NAME_POOL_SIZE)], dtype=object)
+        return self.first_names, self.last_names
+
+    def sample_demographics(self, n: int) -> Dict[str, np.ndarray]:
+        """
+        Sample age, income, region and derived brackets for n users.
+
+        Args:
+            n: Number of users
+
+        Returns:
+            Dictionary of arrays keyed by PROFILE_FIELDS
+        """
+        # Imported here: data_generator imports this module
+        from .data_generator import SyntheticDataGenerator as G
+
+        # Age: bracket by weight, then uniform within the bracket
+        age_names = list(AGE_BRACKETS.keys())
+        age_low = np.array([AGE_BRACKETS[name]['range'][0] for name in age_names])
+        age_high = np.array([AGE_BRACKETS[name]['range'][1] for name in age_names])
+        age_index = _weighted_index(self.rng, [AGE_BRACKETS[name]['weight'] for name in age_names], n)
+        age = self.rng.integers(age_low[age_index], age_high[age_index] + 1)
+
+        # Income: bracket weights depend on the age band (<25, <35, <50, 50+)
+        income_names = list(INCOME_BRACKETS.keys())
+        band_weights = np.array([
+            [G._income_bracket_weights(band_age)[name] for name in income_names]
+            for band_age in (18, 25, 35, 50)
+        ])
+        band = np.searchsorted([25, 35, 50], age, side='right')
+        income_index = _weighted_rows(self.rng, band_weights[band])
+        income_low = np.array([INCOME_BRACKETS[name]['range'][0] for name in income_names])
+        income_high = np.array([INCOME_BRACKETS[name]['range'][1] for name in income_names])
+        income = self.rng.integers(income_low[income_index], income_high[income_index] + 1)
+
+        region_names = np.array(list(GEOGRAPHIC_REGIONS.keys()), dtype=object)
+        region = region_names[_weighted_index(self.rng, list(GEOGRAPHIC_REGIONS.values()), n)]
+
+        # Brackets as _get_age_bracket()/_get_income_bracket() assign them
+        # (first bracket whose upper bound is not exceeded)
+        age_bracket = np.array(age_names, dtype=object)[np.searchsorted(age_high, age, side='left')]
+        income_bracket = np.array(income_names, dtype=object)[np.searchsorted(income_high, income, side='left')]
+
+        ages, incomes = age.tolist(), income.tolist()
+        return {
+            'age': age,
+            'age_bracket': age_bracket,
+            'income': income,
+            'income_bracket': income_bracket,
+            'region': region,
+            'life_stage': np.array([G._infer_life_stage(a, i) for a, i in zip(ages, incomes)], dtype=object)
+        }
+
+    def generate_users(self, n: int, created_at: str) -> Tuple[pd.DataFrame, UserProfiles]:
+        """
+        Generate n users.
+
+        Args:
+            n: Number of users
+            created_at: Timestamp stored on every user
+
+        Returns:
+            Tuple (users DataFrame, UserProfiles for the same users)
+        """
+        demographics = self.sample_demographics(n)
+        user_ids = np.array([f'user_{i:03d}' for i in range(n)], dtype=object)
+
+        first_names, last_names = self._name_pools()
+        first = first_names[self.rng.integers(NAME_POOL_SIZE, size=n)]
+        last = last_names[self.rng.integers(NAME_POOL_SIZE, size=n)]
+
+        columns = [demographics[field].tolist() for field in PROFILE_FIELDS]
+        metadata = [METADATA_TEMPLATE.format(*values) for values in zip(*columns)]
+
+        users_df = pd.DataFrame({
+            'user_id': user_ids,
+            'name': first + ' ' + last,
+            'email': [f'user{i:03d}@example.com' for i in range(n)],
+            'created_at': created_at,
+            'metadata': metadata
+        })
+
+        return users_df, UserProfiles(user_ids, demographics)
+
+    def generate_accounts(self, profiles: UserProfiles, created_at: str,
+                          id_key: Optional[int] = None) -> pd.DataFrame:
+        """
+        Generate checking, savings, credit card and student loan accounts.
+
+        Args:
+            profiles: Users to create accounts for
+            created_at: Timestamp stored on every account
+            id_key: Account ID scrambling key (default: drawn from rng)
+
+        Returns:
+            DataFrame with account data, grouped by user in profile order
+        """
+        from .data_generator import SyntheticDataGenerator as G
+
+        n = len(profiles)
+        income = profiles.columns['income'].astype(float)
+        age = profiles.columns['age']
+        users = np.arange(n)
+
+        # Which accounts each user has
+        has_savings = self.rng.random(n) < ACCOUNT_DISTRIBUTION['savings']
+        card_weights = np.array([G._credit_card_weights(x) for x in (0, 35000, 75000, 150000)])
+        num_cards = _weighted_rows(self.rng, card_weights[np.searchsorted([35000, 75000, 150000], income, side='right')])
+        loan_prob = np.where(age <= 35, ACCOUNT_DISTRIBUTION['student_loan_young'],
+                             ACCOUNT_DISTRIBUTION['student_loan_other'])
+        has_loan = self.rng.random(n) < loan_prob
+
+        # Names are looked up from small per-bank tables instead of built per row
+        banks = np.array(MERCHANTS['banks'], dtype=object)
+        official_names = banks + ' Bank N.A.'
+        parts = []
+
+        # Checking: balance 1-3 months of income
+        balance = np.round(income / 12 * self.rng.uniform(1.0, 3.0, n), 2)
+        bank = self.rng.integers(len(banks), size=n)
+        parts.append(_account_part(users, SLOT_CHECKING, 'checking', 'checking',
+                                   (banks + ' Checking')[bank], official_names[bank],
+                                   balance, balance, np.nan))
+
+        # Savings: balance 1-6 months of expenses (~70% of income)
+        owners = users[has_savings]
+        balance = np.round(income[owners] / 12 * 0.7 * self.rng.uniform(1.0, 6.0, len(owners)), 2)
+        bank = self.rng.integers(len(banks), size=len(owners))
+        parts.append(_account_part(owners, SLOT_SAVINGS, 'savings', 'savings',
+                                   (banks + ' Savings')[bank], official_names[bank],
+                                   balance, balance, np.nan))
+
+        # Credit cards: limit 20-40% of income, 10-70% utilization
+        owners = np.repeat(users, num_cards)
+        m = len(owners)
+        credit_limit = np.round(income[owners] * self.rng.uniform(0.20, 0.40, m), 2)
+        utilization = self.rng.uniform(*FINANCIAL_RATIOS['credit_utilization'], m)
+        current = np.round(credit_limit * utilization, 2)
+        bank = self.rng.integers(len(banks), size=m)
+        subtype = self.rng.integers(len(CARD_SUBTYPES), size=m)
+        card_names = np.array([
+            [f'{b} {s.replace("_", " ").title()} Card' for s in CARD_SUBTYPES] for b in banks
+        ], dtype=object)
+        parts.append(_account_part(owners, SLOT_CREDIT_CARD, 'credit_card',
+                                   np.array(CARD_SUBTYPES, dtype=object)[subtype],
+                                   card_names[bank, subtype], official_names[bank],
+                                   np.round(credit_limit - current, 2), current, credit_limit))
+
+        # Student loans: balance $15K-$60K
+        owners = users[has_loan]
+        balance = np.round(self.rng.uniform(15000, 60000, len(owners)), 2)
+        parts.append(_account_part(owners, SLOT_STUDENT_LOAN, 'student_loan', 'student',
+                                   'Federal Student Loan', 'U.S. Department of Education',
+                                   np.nan, balance, np.nan))
+
+        # Group by user, keeping checking/savings/cards/loan order within a user
+        accounts = {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+        order = np.lexsort((accounts['slot'], accounts['user']))
+        accounts = {key: values[order] for key, values in accounts.items()}
+
+        total = len(order)
+        if id_key is None:
+            id_key = int(self.rng.integers(0, 2**48))
+        masks = MASKS[self.rng.integers(0, 10000, size=total)]
+
+        return pd.DataFrame({
+            'account_id': generate_id_batch('acc_', np.arange(total), id_key).astype(object),
+            'user_id': profiles.user_ids[accounts['user']],
+            'type': accounts['type'],
+            'subtype': accounts['subtype'],
+            'name': accounts['name'],
+            'official_name': accounts['official_name'],
+            'mask': masks,
+            'available_balance': accounts['available_balance'],
+            'current_balance': accounts['current_balance'],
+            'credit_limit': accounts['credit_limit'],
+            'iso_currency_code': 'USD',
+            'holder_category': 'personal',
+            'created_at': created_at
+        })
+
+
+def _weighted_index(rng: np.random.Generator, weights: List[float], n: int) -> np.ndarray:
+    """Draw n indices with the given (unnormalized) weights."""
+    p = np.asarray(weights, dtype=float)
+    return rng.choice(len(p), size=n, p=p / p.sum())
+
+
+def _weighted_rows(rng: np.random.Generator, weights: np.ndarray) -> np.ndarray:
+    """Draw one index per row of a (rows x choices) weight matrix."""
+    cumulative = np.cumsum(weights, axis=1)
+    u = rng.random(len(weights)) * cumulative[:, -1]
+    return np.minimum((u[:, None] >= cumulative).sum(axis=1), weights.shape[1] - 1)
+
+
+def _account_part(users: np.ndarray, slot: int, account_type: str, subtype, name, official_name,
+                  available, current, limit) -> Dict[str, np.ndarray]:
+    """Assemble the column arrays of one account type; scalars are broadcast."""
+    n = len(users)
+    columns = {
+        'type': account_type,
+        'subtype': subtype,
+        'name': name,
+        'official_name': official_name,
+        'available_balance': available,
+        'current_balance': current,
+        'credit_limit': limit
+    }
+    part = {'user': users, 'slot': np.full(n, slot)}
+    for key, value in columns.items():
+        if np.ndim(value) == 0:
+            value = np.full(n, value, dtype=object if isinstance(value, str) else float)
+        part[key] = value
+    return part
@@ -0,0 +1,221 @@
+"""
+Pending -> posted transaction reconciliation.
+
+A card purchase first arrives as a pending transaction and later posts under
+a new transaction ID, usually a day or two later. Loaded naively, both rows
+count as spend. Reconciliation matches each posted row to an earlier pending
+row of the same account, amount and merchant fingerprint, dated at most
+PENDING_MATCH_DAYS before it, and drops the pending row so the posted one
+replaces it.
+
+Outstanding pending rows are kept in a partial index (only rows with
+pending = 1, keyed on date, account and amount), so
+fetching the ones that a batch could settle is one range scan whose cost
+follows the number of pending rows, not the size of the table. They are
+hash-joined with the batch's posted rows in pandas: each posted row is one
+hash lookup, and the fingerprint is only computed for the few rows whose
+account and amount already match.
+
+The merchant fingerprint is the trimmed, ASCII-lowercased merchant name,
+falling back to the merchant entity ID.
+"""
+
+import sqlite3
+import string
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .sqlite_writer import is_interned
+
+
+# Maximum days between a pending transaction and the posted row replacing it
+PENDING_MATCH_DAYS = 5
+
+# Partial index over outstanding pending transactions (definition matches
+# ingest/db_schema.py)
+PENDING_INDEX_SQL = """
+    CREATE INDEX IF NOT EXISTS idx_transactions_pending_match
+    ON transaction_records(date, account_id, amount, merchant_key)
+    WHERE pending = 1
+"""
+
+# The same index on a plain transactions table (created by pandas.to_sql)
+PLAIN_PENDING_INDEX_SQL = """
+    CREATE INDEX IF NOT EXISTS idx_transactions_pending_match
+    ON transactions(date, account_id, amount)
+    WHERE pending = 1
+"""
+
+# Columns a pending candidate carries into the match
+CANDIDATE_COLUMNS = ['transaction_id', 'account_id', 'amount', 'merchant_name', 'merchant_entity_id', 'date']
+
+# Pending rows dated from (first posted date - days) to the last posted date;
+# parameters: first date, days, last date
+LOADED_PENDING_SQL = f"""
+    SELECT {', '.join(CANDIDATE_COLUMNS)} FROM transactions
+    WHERE pending = 1 AND date BETWEEN date(?, '-' || ? || ' days') AND ?
+"""
+
+# str.translate table folding ASCII letters only, like SQLite lower()
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def merchant_fingerprint(df: pd.DataFrame) -> pd.Series:
+    """
+    Compute the merchant fingerprint of each transactions row.
+
+    Args:
+        df: Transactions DataFrame
+
+    Returns:
+        Series of fingerprints ('' when the row has no merchant)
+    """
+    name = df['merchant_name'].astype(object)
+    name = name.where(name.notna()).str.strip(' ').str.translate(_ASCII_LOWER)
+    entity = df['merchant_entity_id'].astype(object)
+    return name.where(name.notna(), entity).fillna('').astype(object)
+
+
+def pending_mask(df: pd.DataFrame) -> pd.Series:
+    """Get a boolean mask of the pending rows of a transactions DataFrame."""
+    pending = df['pending']
+    if pd.api.types.is_bool_dtype(pending):
+        return pending.fillna(False).astype(bool)
+    return pending.astype(str).str.lower().isin(['true', '1'])
+
+
+def ensure_pending_index(conn: sqlite3.Connection) -> None:
+    """Create the pending-match index on a transactions table that lacks it."""
+    conn.execute(PENDING_INDEX_SQL if is_interned(conn) else PLAIN_PENDING_INDEX_SQL)
+
+
+def loaded_pending(conn: sqlite3.Connection, df: pd.DataFrame,
+                   days: int = PENDING_MATCH_DAYS) -> pd.DataFrame:
+    """
+    Fetch the loaded pending transactions that posted rows of a batch could settle.
+
+    Args:
+        conn: Open SQLite connection with the pending-match index
+        df: Transactions DataFrame being loaded
+        days: Maximum days between the pending and the posted date
+
+    Returns:
+        DataFrame with CANDIDATE_COLUMNS, dated within the batch's window
+    """
+    if len(df) == 0:
+        return pd.DataFrame(columns=CANDIDATE_COLUMNS)
+
+    rows = conn.execute(
+        LOADED_PENDING_SQL, (str(df['date'].min()), int(days), str(df['date'].max()))
+    ).fetchall()
+    return pd.DataFrame(rows, columns=CANDIDATE_COLUMNS)
+
+
+def reconcile_frame(df: pd.DataFrame, loaded: Optional[pd.DataFrame] = None,
+                    inserted: Optional[pd.Series] = None,
+                    days: int = PENDING_MATCH_DAYS) -> Tuple[pd.DataFrame, List[str]]:
+    """
+    Match posted rows of a batch to the pending rows they settle.
+
+    Candidates are the batch's own pending rows and the loaded ones. Each
+    posted row settles at most one pending row and each pending row is
+    settled at most once: posted rows are taken in date order and settle
+    the oldest matching pending row still outstanding, so identical
+    purchases on one account pair up one by one.
+
+    Args:
+        df: Transactions DataFrame being loaded
+        loaded: Loaded pending transactions (see loaded_pending)
+        inserted: Mask of the rows that will actually be inserted (rows
+            skipped by an incremental load neither settle nor count as
+            pending); default all
+        days: Maximum days between the pending and the posted date
+
+    Returns:
+        Tuple of (the batch without its settled pending rows, transaction
+        IDs of the settled loaded rows)
+    """
+    is_pending = pending_mask(df).to_numpy()
+    inserted = np.ones(len(df), dtype=bool) if inserted is None else inserted.to_numpy()
+    posted, batch_pending = df[~is_pending & inserted], df[is_pending & inserted]
+
+    candidates = [batch_pending[CANDIDATE_COLUMNS].assign(row=np.flatnonzero(is_pending & inserted))]
+    if loaded is not None and len(loaded):
+        candidates.append(loaded[CANDIDATE_COLUMNS].assign(row=None))
+    candidates = pd.concat(candidates, ignore_index=True) if len(candidates) > 1 else candidates[0]
+    if len(posted) == 0 or len(candidates) == 0:
+        return df, []
+
+    # Hash join on account and amount; fingerprints only for the pairs found
+    keys = ['account_id', 'amount']
+    candidates = candidates.astype({'account_id': object, 'amount': float})
+    pairs = posted[CANDIDATE_COLUMNS].astype({'account_id': object, 'amount': float}).merge(
+        candidates, on=keys, suffixes=('_posted', '_pending')
+    )
+    if len(pairs) == 0:
+        return df, []
+
+    pairs['gap'] = (pd.to_datetime(pairs['date_posted']) - pd.to_datetime(pairs['date_pending'])).dt.days
+    pairs = pairs[pairs['gap'].between(0, days)]
+    posted_print = merchant_fingerprint(pairs.rename(columns={
+        'merchant_name_posted': 'merchant_name', 'merchant_entity_id_posted': 'merchant_entity_id'
+    }))
+    pending_print = merchant_fingerprint(pairs.rename(columns={
+        'merchant_name_pending': 'merchant_name', 'merchant_entity_id_pending': 'merchant_entity_id'
+    }))
+    pairs = pairs[(posted_print == pending_print).to_numpy()]
+    pairs = pairs.sort_values(['date_posted', 'transaction_id_posted', 'date_pending'], kind='stable')
+
+    # Pairs sharing a posted or pending row are resolved one at a time
+    shared = (pairs['transaction_id_posted'].duplicated(keep=False)
+              | pairs['transaction_id_pending'].duplicated(keep=False)).to_numpy()
+    if shared.any():
+        keep = ~shared
+        keep[np.flatnonzero(shared)[_match_in_order(pairs[shared])]] = True
+        pairs = pairs[keep]
+
+    from_batch = pairs['row'].notna()
+    if from_batch.any():
+        keep = np.ones(len(df), dtype=bool)
+        keep[pairs.loc[from_batch, 'row'].astype(np.int64).to_numpy()] = False
+        df = df[keep]
+    return df, pairs.loc[~from_batch, 'transaction_id_pending'].tolist()
+
+
+def _match_in_order(pairs: pd.DataFrame) -> np.ndarray:
+    """
+    Pick a one-to-one subset of candidate pairs.
+
+    Posted rows are taken in date order, each settling the oldest pending
+    row still outstanding. Every pending row a posted row can reach is also
+    reachable from the later posted rows until it ages out, so taking the
+    oldest first settles as many rows as possible.
+
+    Args:
+        pairs: Candidate pairs sorted by posted date, posted ID and pending date
+
+    Returns:
+        Positions of the chosen pairs
+    """
+    chosen, settled, matched = [], set(), set()
+    posted_ids = pairs['transaction_id_posted'].tolist()
+    pending_ids = pairs['transaction_id_pending'].tolist()
+    for position, (posted_id, pending_id) in enumerate(zip(posted_ids, pending_ids)):
+        if posted_id in matched or pending_id in settled:
+            continue
+        chosen.append(position)
+        matched.add(posted_id)
+        settled.add(pending_id)
+    return np.asarray(chosen, dtype=np.int64)
+
+
+def delete_transactions(conn: sqlite3.Connection, transaction_ids: List[str]) -> int:
+    """Delete transactions by ID; returns the number of rows deleted."""
+    table = 'transaction_records' if is_interned(conn) else 'transactions'
+    cursor = conn.executemany(
+        f"DELETE FROM {table} WHERE transaction_id = ?",
+        ((transaction_id,) for transaction_id in transaction_ids)
+    )
+    return cursor.rowcount
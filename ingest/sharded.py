@@ -0,0 +1,545 @@
+"""
+Sharded, deterministic synthetic data generation.
+
+Users are split into contiguous shards that can be generated in parallel
+worker processes. Every user draws from its own random stream derived from
+the master seed, and every ID is derived from the seed and the user index,
+so the output depends only on (seed, num_users) - never on the number of
+workers, the shard size, or the wall clock.
+"""
+
+import numpy as np
+import pandas as pd
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from datetime import datetime, timedelta
+from faker import Faker
+from typing import Dict, Iterator, List, Optional, Tuple
+import json
+
+from .config import *
+from .utils import generate_id_batch
+from .data_generator import SyntheticDataGenerator
+from .vectorized import VectorizedTransactionEngine
+
+
+# Users generated per task handed to a worker
+SHARD_SIZE_DEFAULT = 1000
+
+# Fixed timestamps so output does not depend on when it was generated
+REFERENCE_DATE = datetime.strptime(DATE_RANGE_END, "%Y-%m-%d")
+CREATED_AT = REFERENCE_DATE.isoformat()
+
+# First element of each SeedSequence spawn key, keeping streams independent
+STREAM_USER = 0
+STREAM_IDS = 1
+
+# ID namespaces (second element of the STREAM_IDS spawn key)
+ID_ACCOUNT = 0
+ID_TRANSACTION = 1
+ID_LIABILITY = 2
+
+# Bits reserved for per-user sequence numbers inside ID counters
+ACCOUNT_SEQ_BITS = 4
+TRANSACTION_SEQ_BITS = 16
+
+
+def user_rng(seed: int, user_index: int) -> np.random.Generator:
+    """
+    Get the independent random stream of one user.
+
+    Args:
+        seed: Master seed
+        user_index: Zero-based user index
+
+    Returns:
+        NumPy Generator seeded from (seed, user_index)
+    """
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(STREAM_USER, user_index)))
+
+
+def id_key(seed: int, namespace: int) -> int:
+    """
+    Derive the 48-bit ID scrambling key for an ID namespace.
+
+    Args:
+        seed: Master seed
+        namespace: One of ID_ACCOUNT, ID_TRANSACTION, ID_LIABILITY
+
+    Returns:
+        Integer key for generate_id_batch()
+    """
+    state = np.random.SeedSequence(seed, spawn_key=(STREAM_IDS, namespace)).generate_state(2)
+    return (int(state[0]) << 16) | (int(state[1]) & 0xFFFF)
+
+
+def _choice(rng: np.random.Generator, weights: Dict[str, float]) -> str:
+    """Weighted choice of a dictionary key using a single uniform draw."""
+    keys = list(weights.keys())
+    cumulative = np.cumsum(list(weights.values()))
+    index = int(np.searchsorted(cumulative, rng.random() * cumulative[-1], side='right'))
+    return keys[min(index, len(keys) - 1)]
+
+
+class ShardGenerator:
+    """
+    Generate complete users (profile, accounts, transactions, liabilities) by index.
+
+    Each user is generated from user_rng(seed, index) alone, so any range of
+    users can be produced independently and in any process.
+    """
+
+    def __init__(self, seed: int = SEED_DEFAULT, feed_state: bool = False):
+        """
+        Initialize shard generator.
+
+        Args:
+            seed: Master seed
+            feed_state: Also return each shard's live-feed state (schedule
+                parameters, balances and ID sequences, see live_feed.py)
+        """
+        self.seed = seed
+        self.feed_state = feed_state
+        self.start_date = datetime.strptime(DATE_RANGE_START, "%Y-%m-%d")
+        self.end_date = datetime.strptime(DATE_RANGE_END, "%Y-%m-%d")
+        self.fake = Faker()
+
+        self.account_key = id_key(seed, ID_ACCOUNT)
+        self.transaction_key = id_key(seed, ID_TRANSACTION)
+        self.liability_key = id_key(seed, ID_LIABILITY)
+
+        # Engine used only to assemble frames (no draws)
+        self.frame_engine = VectorizedTransactionEngine(None, self.start_date, self.end_date)
+
+    def generate_shard(self, first_user: int, last_user: int) -> Dict[str, pd.DataFrame]:
+        """
+        Generate users [first_user, last_user).
+
+        Args:
+            first_user: Index of first user (inclusive)
+            last_user: Index of last user (exclusive)
+
+        Returns:
+            Dictionary with 'users', 'accounts', 'transactions' and 'liabilities'
+            DataFrames. Transactions are sorted by date, ties in user order.
+            With feed_state, also 'feed': a FeedState part for these users.
+        """
+        users, accounts, liabilities, blocks, counters, params, offsets = [], [], [], [], [], [], []
+
+        for user_index in range(first_user, last_user):
+            user, user_accounts, block, user_counters, user_liabilities, user_params = \
+                self._generate_user(user_index)
+
+            offsets.append(len(accounts))
+            block['account'] = block['account'] + len(accounts)
+            users.append(user)
+            accounts.extend(user_accounts)
+            liabilities.extend(user_liabilities)
+            blocks.append(block)
+            counters.append(user_counters)
+            params.append(user_params)
+
+        accounts_df = pd.DataFrame(accounts, columns=ACCOUNT_COLUMNS)
+        transactions_df = self.frame_engine.build_frame(
+            VectorizedTransactionEngine.concat_blocks(blocks),
+            accounts_df['account_id'].to_numpy(),
+            accounts_df['user_id'].to_numpy(),
+            id_key=self.transaction_key,
+            created_at=CREATED_AT,
+            id_counters=np.concatenate(counters) if counters else np.zeros(0, dtype=np.int64)
+        )
+
+        shard = {
+            'users': pd.DataFrame(users, columns=USER_COLUMNS),
+            'accounts': accounts_df,
+            'transactions': transactions_df,
+            'liabilities': pd.DataFrame(liabilities, columns=LIABILITY_COLUMNS)
+        }
+
+        if self.feed_state:
+            from .live_feed import FeedState
+            shard['feed'] = FeedState.from_users(
+                self.seed, accounts_df, first_user, offsets, params, [len(c) for c in counters]
+            )
+
+        return shard
+
+    def generate_user(self, user_index: int) -> Dict[str, pd.DataFrame]:
+        """
+        Generate a single user with accounts, transactions and liabilities.
+
+        Rows are identical to that user's rows in a full run with the same
+        seed (any population size, shard size or worker count).
+
+        Args:
+            user_index: Zero-based user index
+
+        Returns:
+            Shard dictionary holding just this user
+        """
+        return self.generate_shard(user_index, user_index + 1)
+
+    def user_profile(self, user_index: int) -> dict:
+        """
+        Get a user's record without generating accounts or transactions.
+
+        Demographics are the first draws of the user's stream, so this is
+        much cheaper than generate_user() and suited to searching for users.
+
+        Args:
+            user_index: Zero-based user index
+
+        Returns:
+            User dictionary (see USER_COLUMNS)
+        """
+        user, _, _ = self._create_user(user_rng(self.seed, user_index), user_index)
+        return user
+
+    def _generate_user(self, user_index: int) -> Tuple[dict, List[dict], Dict[str, np.ndarray], np.ndarray, List[dict], Dict]:
+        """
+        Generate one user and everything that belongs to it.
+
+        Args:
+            user_index: Zero-based user index
+
+        Returns:
+            Tuple (user, accounts, transaction block, transaction ID counters,
+            liabilities, transaction schedule parameters)
+        """
+        rng = user_rng(self.seed, user_index)
+
+        user, age, income = self._create_user(rng, user_index)
+        accounts = self._create_accounts(rng, user_index, user['user_id'], age, income)
+        block, counters, params = self._create_transactions(rng, user_index, accounts, age, income)
+        liabilities = self._create_liabilities(rng, user_index, accounts)
+
+        return user, accounts, block, counters, liabilities, params
+
+    def _create_user(self, rng: np.random.Generator, user_index: int) -> Tuple[dict, int, int]:
+        """Sample demographics and build the user record."""
+        bracket = _choice(rng, {name: info['weight'] for name, info in AGE_BRACKETS.items()})
+        age = int(rng.integers(AGE_BRACKETS[bracket]['range'][0], AGE_BRACKETS[bracket]['range'][1] + 1))
+
+        income_bracket = _choice(rng, SyntheticDataGenerator._income_bracket_weights(age))
+        income_range = INCOME_BRACKETS[income_bracket]['range']
+        income = int(rng.integers(income_range[0], income_range[1] + 1))
+
+        region = _choice(rng, GEOGRAPHIC_REGIONS)
+
+        # Faker keeps its own PRNG; reseed it from this user's stream
+        self.fake.seed_instance(int(rng.integers(0, 2**32)))
+
+        user = {
+            'user_id': f'user_{user_index:03d}',
+            'name': self.fake.name(),
+            'email': f'user{user_index:03d}@example.com',
+            'created_at': CREATED_AT,
+            'metadata': json.dumps({
+                'age': age,
+                'age_bracket': SyntheticDataGenerator._get_age_bracket(age),
+                'income': income,
+                'income_bracket': SyntheticDataGenerator._get_income_bracket(income),
+                'region': region,
+                'life_stage': SyntheticDataGenerator._infer_life_stage(age, income)
+            })
+        }
+
+        return user, age, income
+
+    def _create_accounts(self, rng: np.random.Generator, user_index: int,
+                         user_id: str, age: int, income: int) -> List[dict]:
+        """Create checking, savings, credit card and student loan accounts."""
+        monthly_income = income / 12
+        banks = MERCHANTS['banks']
+        accounts = []
+
+        def account(account_type, subtype, name, official_name, available, current, limit):
+            accounts.append({
+                'account_id': None,
+                'user_id': user_id,
+                'type': account_type,
+                'subtype': subtype,
+                'name': name,
+                'official_name': official_name,
+                'mask': f'{int(rng.integers(0, 10000)):04d}',
+                'available_balance': available,
+                'current_balance': current,
+                'credit_limit': limit,
+                'iso_currency_code': 'USD',
+                'holder_category': 'personal',
+                'created_at': CREATED_AT
+            })
+
+        # Every user has checking account (balance: 1-3 months of income)
+        balance = round(monthly_income * rng.uniform(1.0, 3.0), 2)
+        bank = banks[rng.integers(len(banks))]
+        account('checking', 'checking', f'{bank} Checking', f'{bank} Bank N.A.', balance, balance, None)
+
+        # 70% have savings accounts (balance: 1-6 months of expenses)
+        if rng.random() < ACCOUNT_DISTRIBUTION['savings']:
+            balance = round(monthly_income * 0.7 * rng.uniform(1.0, 6.0), 2)
+            bank = banks[rng.integers(len(banks))]
+            account('savings', 'savings', f'{bank} Savings', f'{bank} Bank N.A.', balance, balance, None)
+
+        # Credit cards (0-3 based on income)
+        weights = SyntheticDataGenerator._credit_card_weights(income)
+        num_cards = int(_choice(rng, dict(enumerate(weights))))
+        for _ in range(num_cards):
+            credit_limit = round(income * rng.uniform(0.20, 0.40), 2)
+            utilization = rng.uniform(
+                FINANCIAL_RATIOS['credit_utilization'][0],
+                FINANCIAL_RATIOS['credit_utilization'][1]
+            )
+            current_balance = round(credit_limit * utilization, 2)
+            bank = banks[rng.integers(len(banks))]
+            subtype = ['rewards', 'cash_back', 'travel', 'standard'][rng.integers(4)]
+            account('credit_card', subtype, f'{bank} {subtype.replace("_", " ").title()} Card',
+                    f'{bank} Bank N.A.', round(credit_limit - current_balance, 2),
+                    current_balance, credit_limit)
+
+        # Student loans (higher for young users)
+        if age <= 35:
+            student_loan_prob = ACCOUNT_DISTRIBUTION['student_loan_young']
+        else:
+            student_loan_prob = ACCOUNT_DISTRIBUTION['student_loan_other']
+
+        if rng.random() < student_loan_prob:
+            balance = round(rng.uniform(15000, 60000), 2)
+            account('student_loan', 'student', 'Federal Student Loan',
+                    'U.S. Department of Education', None, balance, None)
+
+        # Seed-derived account IDs
+        counters = (user_index << ACCOUNT_SEQ_BITS) + np.arange(len(accounts))
+        for acc, account_id in zip(accounts, generate_id_batch('acc_', counters, self.account_key)):
+            acc['account_id'] = str(account_id)
+
+        return accounts
+
+    def _create_transactions(self, rng: np.random.Generator, user_index: int,
+                             accounts: List[dict], age: int, income: int) -> Tuple[Dict[str, np.ndarray], np.ndarray, Dict]:
+        """
+        Generate the user's transactions as a block sorted by day.
+
+        Also returns the schedule parameters of each account type as
+        {type: (account positions, params)} so the schedules can be continued.
+        """
+        engine = VectorizedTransactionEngine(rng, self.start_date, self.end_date)
+        monthly_income = np.array([income / 12])
+        types = np.array([acc['type'] for acc in accounts])
+        blocks = []
+        schedules = {}
+
+        idx = np.flatnonzero(types == 'checking')
+        params = engine.draw_checking_params(np.repeat(monthly_income, len(idx)), np.full(len(idx), age))
+        blocks.append(engine.concat_blocks(engine.checking_window(params), idx))
+        schedules['checking'] = (idx, params)
+
+        idx = np.flatnonzero(types == 'savings')
+        if len(idx) > 0:
+            params = engine.draw_savings_params(np.repeat(monthly_income, len(idx)))
+            blocks.append(engine.concat_blocks(engine.savings_window(params), idx))
+            schedules['savings'] = (idx, params)
+
+        idx = np.flatnonzero(types == 'credit_card')
+        if len(idx) > 0:
+            params = engine.draw_credit_params(len(idx))
+            blocks.append(engine.concat_blocks(engine.credit_window(params), idx))
+            schedules['credit_card'] = (idx, params)
+
+        block = engine.concat_blocks(blocks)
+        order = np.argsort(block['day'], kind='stable')
+        block = {key: values[order] for key, values in block.items()}
+        counters = (user_index << TRANSACTION_SEQ_BITS) + np.arange(len(order))
+
+        return block, counters, schedules
+
+    def _create_liabilities(self, rng: np.random.Generator, user_index: int,
+                            accounts: List[dict]) -> List[dict]:
+        """Create liability records for credit cards and student loans."""
+        liabilities = []
+        counters = []
+
+        for position, acc in enumerate(accounts):
+            current_balance = acc['current_balance']
+
+            if acc['type'] == 'credit_card':
+                minimum_payment = max(round(current_balance * 0.02, 2), 25.00)
+                liability = {
+                    'type': 'credit_card',
+                    'apr_percentage': round(rng.uniform(15.99, 24.99), 2),
+                    'apr_type': 'purchase_apr',
+                    'minimum_payment_amount': minimum_payment,
+                    'last_payment_amount': round(rng.uniform(minimum_payment, current_balance * 0.5), 2),
+                    'last_payment_date': REFERENCE_DATE - timedelta(days=int(rng.integers(5, 26))),
+                    'next_payment_due_date': REFERENCE_DATE + timedelta(days=int(rng.integers(5, 26))),
+                    'last_statement_balance': round(current_balance * rng.uniform(0.95, 1.05), 2),
+                    'is_overdue': bool(rng.random() < 0.05),
+                    'interest_rate': None
+                }
+            elif acc['type'] == 'student_loan':
+                interest_rate = round(rng.uniform(4.5, 7.5), 2)
+                minimum_payment = round(rng.uniform(150, 400), 2)
+                liability = {
+                    'type': 'student_loan',
+                    'apr_percentage': None,
+                    'apr_type': None,
+                    'minimum_payment_amount': minimum_payment,
+                    'last_payment_amount': round(minimum_payment * rng.uniform(0.95, 1.05), 2),
+                    'last_payment_date': REFERENCE_DATE - timedelta(days=int(rng.integers(1, 29))),
+                    'next_payment_due_date': REFERENCE_DATE + timedelta(days=int(rng.integers(1, 29))),
+                    'last_statement_balance': round(current_balance * rng.uniform(0.98, 1.02), 2),
+                    'is_overdue': bool(rng.random() < 0.005),
+                    'interest_rate': interest_rate
+                }
+            else:
+                continue
+
+            counters.append((user_index << ACCOUNT_SEQ_BITS) + position)
+            liability.update({
+                'account_id': acc['account_id'],
+                'user_id': acc['user_id'],
+                'last_payment_date': liability['last_payment_date'].strftime('%Y-%m-%d'),
+                'next_payment_due_date': liability['next_payment_due_date'].strftime('%Y-%m-%d'),
+                'created_at': CREATED_AT
+            })
+            liabilities.append(liability)
+
+        # Liability IDs reuse the account counter under their own key
+        for liability, liability_id in zip(liabilities, generate_id_batch('liab_', counters, self.liability_key)):
+            liability['liability_id'] = str(liability_id)
+
+        return liabilities
+
+
+# ============================================================================
+# COLUMN ORDER (matches the row-by-row generator)
+# ============================================================================
+
+USER_COLUMNS = ['user_id', 'name', 'email', 'created_at', 'metadata']
+
+ACCOUNT_COLUMNS = [
+    'account_id', 'user_id', 'type', 'subtype', 'name', 'official_name', 'mask',
+    'available_balance', 'current_balance', 'credit_limit', 'iso_currency_code',
+    'holder_category', 'created_at'
+]
+
+LIABILITY_COLUMNS = [
+    'liability_id', 'account_id', 'user_id', 'type', 'apr_percentage', 'apr_type',
+    'minimum_payment_amount', 'last_payment_amount', 'last_payment_date',
+    'next_payment_due_date', 'last_statement_balance', 'is_overdue',
+    'interest_rate', 'created_at'
+]
+
+
+# ============================================================================
+# PROCESS POOL
+# ============================================================================
+
+# Per-process generator, created once by the pool initializer
+_worker_generator: Optional[ShardGenerator] = None
+
+
+def _init_worker(seed: int, feed_state: bool = False) -> None:
+    """Create the shard generator of a worker process."""
+    global _worker_generator
+    _worker_generator = ShardGenerator(seed, feed_state)
+
+
+def _run_shard(bounds: Tuple[int, int]) -> Dict[str, pd.DataFrame]:
+    """Generate one shard inside a worker process."""
+    return _worker_generator.generate_shard(*bounds)
+
+
+def shard_bounds(num_users: int, shard_size: int = SHARD_SIZE_DEFAULT) -> List[Tuple[int, int]]:
+    """
+    Split user indices into contiguous shards.
+
+    Args:
+        num_users: Total number of users
+        shard_size: Users per shard
+
+    Returns:
+        List of (first_user, last_user) half-open ranges
+    """
+    if shard_size < 1:
+        raise ValueError("shard_size must be at least 1")
+    return [(first, min(first + shard_size, num_users)) for first in range(0, num_users, shard_size)]
+
+
+def generate_shards(num_users: int, seed: int = SEED_DEFAULT, workers: int = 1,
+                    shard_size: int = SHARD_SIZE_DEFAULT,
+                    max_in_flight: Optional[int] = None,
+                    feed_state: bool = False) -> Iterator[Dict[str, pd.DataFrame]]:
+    """
+    Generate shards in user order, in-process or across a process pool.
+
+    Args:
+        num_users: Total number of users
+        seed: Master seed
+        workers: Number of worker processes (1 = generate in this process)
+        shard_size: Users per shard
+        max_in_flight: Maximum shards submitted to the pool but not yet
+            yielded (default: 2 * workers)
+        feed_state: Include each shard's live-feed state under 'feed'
+
+    Yields:
+        Shard dictionaries from ShardGenerator.generate_shard(), in order
+    """
+    bounds = shard_bounds(num_users, shard_size)
+
+    if workers <= 1:
+        generator = ShardGenerator(seed, feed_state)
+        for first, last in bounds:
+            yield generator.generate_shard(first, last)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(seed, feed_state)) as executor:
+        # Keep at most max_in_flight shards submitted so finished-but-unconsumed
+        # results cannot pile up in memory; yield strictly in submission order
+        pending = deque()
+        remaining = iter(bounds)
+
+        for first_last in islice(remaining, max_in_flight or 2 * workers):
+            pending.append(executor.submit(_run_shard, first_last))
+
+        while pending:
+            shard = pending.popleft().result()
+            for first_last in islice(remaining, 1):
+                pending.append(executor.submit(_run_shard, first_last))
+            yield shard
+
+
+def generate_sharded(num_users: int, seed: int = SEED_DEFAULT, workers: int = 1,
+                     shard_size: int = SHARD_SIZE_DEFAULT) -> Dict[str, pd.DataFrame]:
+    """
+    Generate a complete dataset from shards.
+
+    The result is identical for any number of workers and any shard size.
+
+    Args:
+        num_users: Total number of users
+        seed: Master seed
+        workers: Number of worker processes
+        shard_size: Users per shard
+
+    Returns:
+        Dictionary with 'users', 'accounts', 'transactions' and 'liabilities' DataFrames
+    """
+    parts = {'users': [], 'accounts': [], 'transactions': [], 'liabilities': []}
+
+    for shard in generate_shards(num_users, seed, workers, shard_size):
+        for name, df in shard.items():
+            parts[name].append(df)
+
+    data = {
+        name: pd.concat(frames, ignore_index=True)
+        for name, frames in parts.items()
+    }
+
+    # Shards are each sorted by date; a stable sort keeps user order within a day
+    data['transactions'] = data['transactions'].sort_values(
+        'date', kind='stable'
+    ).reset_index(drop=True)
+
+    return data
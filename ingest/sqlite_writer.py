@@ -0,0 +1,326 @@
+"""
+Bulk insertion of generated DataFrames into the SQLite schema.
+
+Converts DataFrames column-wise into parameter tuples of plain Python values
+(NaN/None -> NULL, NumPy scalars -> int/float/bool) and inserts them with
+executemany, without going through CSV or pandas.to_sql.
+
+In databases created by ingest/db_schema.py, transactions is a view over
+transaction_records, which stores each merchant as an integer key into the
+merchants table. Writers here intern the merchants of a frame and insert into
+transaction_records directly; databases whose transactions is a plain table
+(created by pandas.to_sql) are written as before.
+"""
+
+import sqlite3
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# Column order of each table in ingest/db_schema.py
+TABLE_COLUMNS = {
+    'users': ['user_id', 'name', 'email', 'created_at', 'metadata'],
+    'accounts': [
+        'account_id', 'user_id', 'type', 'subtype', 'name', 'official_name', 'mask',
+        'available_balance', 'current_balance', 'credit_limit', 'iso_currency_code',
+        'holder_category', 'created_at'
+    ],
+    'transactions': [
+        'transaction_id', 'account_id', 'user_id', 'date', 'amount', 'merchant_name',
+        'merchant_entity_id', 'payment_channel', 'category_primary', 'category_detailed',
+        'pending', 'location_city', 'location_region', 'location_postal_code', 'created_at'
+    ],
+    'liabilities': [
+        'liability_id', 'account_id', 'user_id', 'type', 'apr_percentage', 'apr_type',
+        'minimum_payment_amount', 'last_payment_amount', 'last_payment_date',
+        'next_payment_due_date', 'last_statement_balance', 'is_overdue',
+        'interest_rate', 'created_at'
+    ]
+}
+
+# Merchant columns stored once in the merchants table
+MERCHANT_COLUMNS = ['merchant_name', 'merchant_entity_id']
+
+# Column order of transaction_records (transactions with merchant_key in
+# place of the merchant columns)
+TRANSACTION_RECORD_COLUMNS = [
+    'transaction_id', 'account_id', 'user_id', 'date', 'amount', 'merchant_key',
+    'payment_channel', 'category_primary', 'category_detailed', 'pending',
+    'location_city', 'location_region', 'location_postal_code', 'created_at'
+]
+
+# Tables in foreign key dependency order
+TABLE_ORDER = ['users', 'accounts', 'transactions', 'liabilities']
+
+# Primary key column of each table
+TABLE_KEYS = {
+    'users': 'user_id',
+    'accounts': 'account_id',
+    'transactions': 'transaction_id',
+    'liabilities': 'liability_id'
+}
+
+# Columns an upsert neither compares nor overwrites (stamped per export run)
+UPSERT_IGNORED_COLUMNS = {'created_at'}
+
+# Secondary indexes that are cheaper to build once after a bulk load than to
+# maintain row by row (definitions match ingest/db_schema.py)
+BULK_INDEXES = {
+    'idx_transactions_user_date': 'CREATE INDEX IF NOT EXISTS idx_transactions_user_date ON transaction_records(user_id, date)',
+    'idx_transactions_account': 'CREATE INDEX IF NOT EXISTS idx_transactions_account ON transaction_records(account_id)'
+}
+
+# Page cache used during bulk loads (negative = KiB)
+BULK_CACHE_SIZE_KIB = 262144
+
+# Connection settings for bulk loads; must be applied outside a transaction
+BULK_LOAD_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'OFF',
+    'cache_size': -BULK_CACHE_SIZE_KIB,
+    'temp_store': 'MEMORY'
+}
+
+
+def frame_columns(df: pd.DataFrame, columns: List[str]) -> List[list]:
+    """
+    Convert DataFrame columns to lists of plain Python values.
+
+    Args:
+        df: Source DataFrame
+        columns: Columns to extract, in insert order
+
+    Returns:
+        One list per column, with None for nulls
+    """
+    values = []
+    for column in columns:
+        series = df[column]
+        if series.isna().any():
+            series = series.astype(object).where(series.notna(), None)
+        values.append(series.tolist())
+
+    return values
+
+
+def frame_to_rows(df: pd.DataFrame, columns: List[str]) -> List[tuple]:
+    """
+    Convert DataFrame columns to a list of tuples ready for executemany.
+
+    Args:
+        df: Source DataFrame
+        columns: Columns to extract, in insert order
+
+    Returns:
+        List of row tuples with plain Python values and None for nulls
+    """
+    return list(zip(*frame_columns(df, columns)))
+
+
+def is_interned(conn: sqlite3.Connection) -> bool:
+    """Check whether transactions is the merchant-interned view over transaction_records."""
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'view' AND name = 'transactions'"
+    ).fetchone() is not None
+
+
+def intern_merchants(conn: sqlite3.Connection, df: pd.DataFrame) -> list:
+    """
+    Get the merchant key of each transaction, adding new merchants to the dictionary.
+
+    Distinct (merchant_name, merchant_entity_id) pairs are looked up once
+    each, so the cost follows the number of merchants in the frame, not rows.
+
+    Args:
+        conn: Open SQLite connection with the merchants table
+        df: Transactions DataFrame
+
+    Returns:
+        Merchant key of each row (None for rows without a merchant)
+    """
+    codes, pairs = pd.MultiIndex.from_arrays([df[column] for column in MERCHANT_COLUMNS]).factorize()
+
+    keys = []
+    for name, entity_id in pairs:
+        name = None if pd.isna(name) else name
+        entity_id = None if pd.isna(entity_id) else entity_id
+        if name is None and entity_id is None:
+            keys.append(None)
+            continue
+        row = conn.execute(
+            "SELECT merchant_key FROM merchants WHERE merchant_name IS ? AND merchant_entity_id IS ?",
+            (name, entity_id)
+        ).fetchone()
+        if row is None:
+            row = (conn.execute(
+                "INSERT INTO merchants (merchant_name, merchant_entity_id) VALUES (?, ?)", (name, entity_id)
+            ).lastrowid,)
+        keys.append(row[0])
+
+    return np.array(keys + [None], dtype=object)[codes].tolist()
+
+
+def _table_values(conn: sqlite3.Connection, table: str, df: pd.DataFrame) -> Tuple[str, List[str], List[list]]:
+    """
+    Get the table, columns and column values to write a DataFrame with.
+
+    Transactions go to transaction_records with interned merchants when the
+    database has the interned layout; other tables are written as they are.
+
+    Returns:
+        Tuple of (table written to, its columns, one value list per column)
+    """
+    if table != 'transactions' or not is_interned(conn):
+        columns = TABLE_COLUMNS[table]
+        return table, columns, frame_columns(df, columns)
+
+    columns = TRANSACTION_RECORD_COLUMNS
+    values = frame_columns(df, [column for column in columns if column != 'merchant_key'])
+    values.insert(columns.index('merchant_key'), intern_merchants(conn, df))
+    return 'transaction_records', columns, values
+
+
+def insert_sql(table: str, columns: List[str] = None) -> str:
+    """Build a parameterized INSERT statement for a table."""
+    columns = columns or TABLE_COLUMNS[table]
+    placeholders = ', '.join('?' * len(columns))
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+
+
+def insert_frame(conn: sqlite3.Connection, table: str, df: pd.DataFrame) -> int:
+    """
+    Insert a DataFrame into a table with executemany.
+
+    Does not commit; callers control the transaction.
+
+    Args:
+        conn: Open SQLite connection
+        table: Table name (see TABLE_COLUMNS)
+        df: DataFrame with (at least) the table's columns
+
+    Returns:
+        Number of rows inserted
+    """
+    if len(df) == 0:
+        return 0
+
+    table, columns, values = _table_values(conn, table, df)
+    # Rows are zipped lazily, so no list of row tuples is materialized
+    conn.executemany(insert_sql(table, columns), zip(*values))
+    return len(df)
+
+
+def upsert_sql(table: str, columns: List[str] = None, target: str = None) -> str:
+    """
+    Build an INSERT ... ON CONFLICT DO UPDATE statement for a table.
+
+    The update only fires when a compared column differs (IS NOT treats NULLs
+    as equal), so unchanged rows are neither rewritten nor counted.
+
+    Args:
+        table: Table name (see TABLE_COLUMNS and TABLE_KEYS)
+        columns: Inserted columns (default: the table's)
+        target: Table written to (default: table; 'transaction_records' for
+            merchant-interned transactions)
+    """
+    key = TABLE_KEYS[table]
+    columns = columns or TABLE_COLUMNS[table]
+    target = target or table
+    changed = [
+        column for column in columns
+        if column != key and column not in UPSERT_IGNORED_COLUMNS
+    ]
+    assignments = ', '.join(f"{column} = excluded.{column}" for column in changed)
+    differs = ' OR '.join(f"{target}.{column} IS NOT excluded.{column}" for column in changed)
+    return f"{insert_sql(target, columns)} ON CONFLICT({key}) DO UPDATE SET {assignments} WHERE {differs}"
+
+
+def upsert_frame(conn: sqlite3.Connection, table: str, df: pd.DataFrame) -> int:
+    """
+    Insert new rows and update changed rows of a table with executemany.
+
+    Does not commit; callers control the transaction.
+
+    Args:
+        conn: Open SQLite connection
+        table: Table name (see TABLE_COLUMNS and TABLE_KEYS)
+        df: DataFrame with (at least) the table's columns
+
+    Returns:
+        Number of rows inserted or updated (unchanged rows are not counted)
+    """
+    if len(df) == 0:
+        return 0
+
+    target, columns, values = _table_values(conn, table, df)
+    return conn.executemany(upsert_sql(table, columns, target), zip(*values)).rowcount
+
+
+def insert_new_frame(conn: sqlite3.Connection, table: str, df: pd.DataFrame) -> int:
+    """
+    Insert the rows of a DataFrame whose primary key is not in the table yet.
+
+    Does not commit; callers control the transaction.
+
+    Args:
+        conn: Open SQLite connection
+        table: Table name (see TABLE_COLUMNS and TABLE_KEYS)
+        df: DataFrame with (at least) the table's columns
+
+    Returns:
+        Number of rows inserted
+    """
+    if len(df) == 0:
+        return 0
+
+    key = TABLE_KEYS[table]
+    table, columns, values = _table_values(conn, table, df)
+    sql = f"{insert_sql(table, columns)} ON CONFLICT({key}) DO NOTHING"
+    return conn.executemany(sql, zip(*values)).rowcount
+
+
+def insert_shard(conn: sqlite3.Connection, shard: Dict[str, pd.DataFrame]) -> Dict[str, int]:
+    """
+    Insert one generated shard into all four tables in dependency order.
+
+    Args:
+        conn: Open SQLite connection
+        shard: Dictionary with 'users', 'accounts', 'transactions', 'liabilities'
+
+    Returns:
+        Rows inserted per table
+    """
+    return {table: insert_frame(conn, table, shard[table]) for table in TABLE_ORDER}
+
+
+def drop_bulk_indexes(conn: sqlite3.Connection) -> None:
+    """Drop the secondary indexes in BULK_INDEXES before a bulk load."""
+    for name in BULK_INDEXES:
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+def create_bulk_indexes(conn: sqlite3.Connection) -> None:
+    """Recreate the secondary indexes in BULK_INDEXES after a bulk load."""
+    for sql in BULK_INDEXES.values():
+        conn.execute(sql)
+
+
+def apply_pragmas(conn: sqlite3.Connection, pragmas: Dict[str, object]) -> Dict[str, object]:
+    """
+    Set connection PRAGMAs and return their previous values.
+
+    Args:
+        conn: Open SQLite connection (not inside a transaction)
+        pragmas: PRAGMA name -> value, e.g. BULK_LOAD_PRAGMAS
+
+    Returns:
+        PRAGMA name -> previous value, to pass back to restore them
+    """
+    previous = {}
+    for name, value in pragmas.items():
+        previous[name] = conn.execute(f"PRAGMA {name}").fetchone()[0]
+        conn.execute(f"PRAGMA {name} = {value}")
+    return previous
+
@@ -0,0 +1,268 @@
+"""
+Bounded-memory streaming generation.
+
+Generates the dataset shard by shard (see sharded.py) and writes each shard to
+disk as soon as it is produced, so memory use depends on the shard size and
+not on the population size.
+
+Users, accounts and liabilities are appended to their CSV files directly (they
+are already in user order). Each shard's transactions are sorted by date and
+spilled to a temporary run file; the runs are then combined with an external
+k-way merge into synthetic_transactions.csv. The merge is stable, so the files
+are identical to an in-memory sharded run with the same seed.
+"""
+
+import heapq
+import os
+import shutil
+import tempfile
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from .config import *
+from .sharded import generate_shards
+
+
+# Estimated peak bytes per generated user while a shard is built and written
+# (about 0.4 MB of DataFrames plus intermediate arrays and CSV buffers)
+BYTES_PER_USER = 800_000
+
+# Memory reserved for the interpreter, pandas/NumPy and Faker
+BASELINE_MEMORY_MB = 150
+
+# Default memory budget for --memory-budget-mb
+MEMORY_BUDGET_MB_DEFAULT = 512
+
+# Maximum number of run files merged (and open) at once
+MERGE_FAN_IN = 64
+
+# Position of the date column in transaction rows (the three ID columns before
+# it never contain commas, so rows can be keyed without a CSV parser)
+DATE_FIELD = 3
+
+
+def shard_size_for_budget(memory_budget_mb: int, workers: int = 1) -> int:
+    """
+    Choose a shard size that keeps generated data within a memory budget.
+
+    The budget applies per process: the parent holds the shard being written
+    plus up to 2 * workers completed shards waiting in the pool queue.
+
+    Args:
+        memory_budget_mb: Memory budget in megabytes
+        workers: Number of worker processes
+
+    Returns:
+        Users per shard
+
+    Raises:
+        ValueError: If the budget is smaller than the fixed baseline
+    """
+    usable = (memory_budget_mb - BASELINE_MEMORY_MB) * 1024 * 1024
+    if usable <= BYTES_PER_USER:
+        raise ValueError(
+            f"memory budget must be larger than {BASELINE_MEMORY_MB + 1} MB "
+            f"(got {memory_budget_mb} MB)"
+        )
+
+    shards_in_memory = 1 if workers <= 1 else 2 * workers + 1
+    return max(1, int(usable // (shards_in_memory * BYTES_PER_USER)))
+
+
+def _date_key(line: str) -> str:
+    """Extract the date field of a transaction CSV row."""
+    return line.split(',', DATE_FIELD + 1)[DATE_FIELD]
+
+
+def _merge_runs(run_paths: List[str], output) -> None:
+    """
+    Stable k-way merge of date-sorted run files into an open output file.
+
+    heapq.merge breaks ties by input order, so rows with the same date keep
+    the order of the runs (shard order) and their order within each run.
+    """
+    files = [open(path, 'r', newline='') for path in run_paths]
+    try:
+        output.writelines(heapq.merge(*files, key=_date_key))
+    finally:
+        for f in files:
+            f.close()
+
+
+def external_merge(run_paths: List[str], output_path: str, header: str,
+                   tmp_dir: str, fan_in: int = MERGE_FAN_IN) -> None:
+    """
+    Merge date-sorted run files into a single sorted CSV file.
+
+    When there are more runs than fan_in, consecutive groups are merged into
+    intermediate runs first (consecutive groups keep the merge stable).
+
+    Args:
+        run_paths: Run files in shard order, each sorted by date, no header
+        output_path: Destination CSV file
+        header: Header line written before the merged rows
+        tmp_dir: Directory for intermediate runs
+        fan_in: Maximum runs merged at once
+    """
+    level = 0
+    while len(run_paths) > fan_in:
+        merged_paths = []
+        for i in range(0, len(run_paths), fan_in):
+            group = run_paths[i:i + fan_in]
+            merged_path = os.path.join(tmp_dir, f'merge_{level}_{i // fan_in:06d}.csv')
+            with open(merged_path, 'w', newline='') as out:
+                _merge_runs(group, out)
+            for path in group:
+                os.remove(path)
+            merged_paths.append(merged_path)
+        run_paths = merged_paths
+        level += 1
+
+    with open(output_path, 'w', newline='') as out:
+        out.write(header)
+        _merge_runs(run_paths, out)
+
+
+class StreamingCSVWriter:
+    """
+    Write shards incrementally to the four synthetic_*.csv files.
+
+    Keeps running totals so metadata can be produced without reloading the data.
+    """
+
+    FILES = {
+        'users': 'synthetic_users.csv',
+        'accounts': 'synthetic_accounts.csv',
+        'transactions': 'synthetic_transactions.csv',
+        'liabilities': 'synthetic_liabilities.csv'
+    }
+
+    def __init__(self, output_dir: str = CSV_OUTPUT_DIR):
+        """
+        Initialize writer and truncate existing output files.
+
+        Args:
+            output_dir: Directory to save CSV files
+        """
+        self.output_dir = output_dir
+        os.makedirs(output_dir, exist_ok=True)
+        self.tmp_dir = tempfile.mkdtemp(prefix='spendsense_runs_', dir=output_dir)
+
+        self.run_paths = []
+        self.transaction_header = None
+        self.counts = {name: 0 for name in self.FILES}
+        self.account_types = {}
+        self.total_amount = 0.0
+        self.date_min = None
+        self.date_max = None
+
+    def path(self, name: str) -> str:
+        """Get the output path of a table."""
+        return os.path.join(self.output_dir, self.FILES[name])
+
+    def write_shard(self, shard: Dict[str, pd.DataFrame]) -> None:
+        """
+        Append a shard to the output files.
+
+        Args:
+            shard: Shard dictionary from ShardGenerator.generate_shard()
+        """
+        first = self.counts['users'] == 0
+
+        for name in ('users', 'accounts', 'liabilities'):
+            df = shard[name]
+            df.to_csv(self.path(name), mode='w' if first else 'a', header=first, index=False)
+            self.counts[name] += len(df)
+
+        for account_type, count in shard['accounts']['type'].value_counts().items():
+            self.account_types[account_type] = self.account_types.get(account_type, 0) + int(count)
+
+        # Spill this shard's (date-sorted) transactions as a run
+        transactions = shard['transactions']
+        if self.transaction_header is None:
+            self.transaction_header = ','.join(transactions.columns) + '\n'
+
+        if len(transactions) > 0:
+            run_path = os.path.join(self.tmp_dir, f'run_{len(self.run_paths):06d}.csv')
+            transactions.to_csv(run_path, header=False, index=False)
+            self.run_paths.append(run_path)
+
+            self.counts['transactions'] += len(transactions)
+            self.total_amount += float(transactions['amount'].sum())
+            # Shard transactions are sorted, so first/last rows hold the extremes
+            first_date, last_date = transactions['date'].iloc[0], transactions['date'].iloc[-1]
+            if self.date_min is None or first_date < self.date_min:
+                self.date_min = first_date
+            if self.date_max is None or last_date > self.date_max:
+                self.date_max = last_date
+
+    def finish(self) -> Dict:
+        """
+        Merge transaction runs into the final file and remove temporary files.
+
+        Returns:
+            Summary with 'counts', 'account_types' and 'transaction_stats'
+        """
+        try:
+            external_merge(self.run_paths, self.path('transactions'),
+                           self.transaction_header or '', self.tmp_dir)
+        finally:
+            shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+        num_transactions = self.counts['transactions']
+        return {
+            'counts': dict(self.counts),
+            'account_types': dict(self.account_types),
+            'transaction_stats': {
+                'total_amount': self.total_amount,
+                'avg_transaction': self.total_amount / num_transactions if num_transactions else 0.0,
+                'date_range': {
+                    'min': str(self.date_min),
+                    'max': str(self.date_max)
+                }
+            }
+        }
+
+
+def generate_streaming(num_users: int, seed: int = SEED_DEFAULT,
+                       output_dir: str = CSV_OUTPUT_DIR, workers: int = 1,
+                       memory_budget_mb: int = MEMORY_BUDGET_MB_DEFAULT,
+                       shard_size: Optional[int] = None) -> Dict:
+    """
+    Generate a dataset straight to CSV within a memory budget.
+
+    Args:
+        num_users: Total number of users
+        seed: Master seed
+        output_dir: Directory to save CSV files
+        workers: Number of worker processes
+        memory_budget_mb: Memory budget per process, used to size shards
+        shard_size: Explicit users per shard (overrides the budget)
+
+    Returns:
+        Summary from StreamingCSVWriter.finish()
+    """
+    shard_size = shard_size or shard_size_for_budget(memory_budget_mb, workers)
+    writer = StreamingCSVWriter(output_dir)
+
+    print(f"Streaming {num_users} users to {output_dir} "
+          f"(shard size {shard_size}, {workers} worker(s), budget {memory_budget_mb} MB)")
+
+    try:
+        for i, shard in enumerate(generate_shards(num_users, seed, workers, shard_size)):
+            writer.write_shard(shard)
+            if (i + 1) % 10 == 0 or writer.counts['users'] == num_users:
+                print(f"  Progress: {writer.counts['users']}/{num_users} users")
+    except BaseException:
+        shutil.rmtree(writer.tmp_dir, ignore_errors=True)
+        raise
+
+    print(f"Merging {len(writer.run_paths)} sorted transaction runs...")
+    summary = writer.finish()
+
+    print(f"✓ Wrote {summary['counts']['users']} users, {summary['counts']['accounts']} accounts, "
+          f"{summary['counts']['transactions']} transactions, "
+          f"{summary['counts']['liabilities']} liabilities")
+
+    return summary
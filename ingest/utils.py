@@ -6,6 +6,7 @@ This module provides helper functions used across the ingest module.
 
 import uuid
 import random
+import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, Any
 
@@ -23,6 +24,68 @@ def generate_uuid(prefix: str = "") -> str:
     return f"{prefix}{uuid.uuid4().hex[:12]}"
 
 
+def scramble_ids(counters: np.ndarray, key: int) -> np.ndarray:
+    """
+    Scramble counters through a keyed bijection on 48 bits.
+    
+    Distinct counters always give distinct values, so the result can be kept
+    as a compact integer ID and rendered with format_ids() when needed.
+    
+    Args:
+        counters: Non-negative integers below 2**48, one per row
+        key: Scrambling key (e.g., derived from the generator seed)
+    
+    Returns:
+        NumPy uint64 array of scrambled values below 2**48
+    """
+    mask = np.uint64((1 << 48) - 1)
+    x = (np.asarray(counters, dtype=np.uint64) ^ np.uint64(key & ((1 << 48) - 1))) & mask
+    
+    # xorshift and odd multipliers are each invertible modulo 2**48
+    x ^= x >> np.uint64(23)
+    x = (x * np.uint64(0x9E3779B97F4B)) & mask
+    x ^= x >> np.uint64(26)
+    x = (x * np.uint64(0xBF58476D1CE5)) & mask
+    x ^= x >> np.uint64(21)
+    return x
+
+
+def format_ids(prefix: str, values: np.ndarray) -> np.ndarray:
+    """
+    Render 48-bit integer IDs as prefixed 12-hex-digit strings.
+    
+    Args:
+        prefix: ID prefix (e.g., 'txn_')
+        values: Integers below 2**48 (e.g., from scramble_ids())
+    
+    Returns:
+        NumPy string array of IDs with prefix
+    """
+    values = np.asarray(values, dtype=np.uint64)
+    hex16 = np.frombuffer(values.astype('>u8').tobytes().hex().encode('ascii'), dtype='S16')
+    hex12 = hex16.view('S1').reshape(-1, 16)[:, 4:].copy().view('S12').ravel()
+    return np.char.add(prefix, hex12.astype('U12'))
+
+
+def generate_id_batch(prefix: str, counters: np.ndarray, key: int) -> np.ndarray:
+    """
+    Generate unique identifiers for a batch of rows in one pass.
+    
+    Each counter is scrambled through a keyed bijection on 48 bits, so
+    distinct counters always give distinct IDs while the output still looks
+    like the 12-hex-digit IDs produced by generate_uuid().
+    
+    Args:
+        prefix: ID prefix (e.g., 'txn_')
+        counters: Non-negative integers below 2**48, one per row
+        key: Scrambling key (e.g., derived from the generator seed)
+    
+    Returns:
+        NumPy string array of IDs with prefix
+    """
+    return format_ids(prefix, scramble_ids(counters, key))
+
+
 def generate_mask() -> str:
     """
     Generate a 4-digit account mask (last 4 digits).
@@ -3,15 +3,133 @@ Schema validation for Plaid-compliant data.
 
 This module validates dataframes against expected schema requirements
 before loading into the database.
+
+Every validate_* method returns a ValidationReport with, per failed rule, the
+number of offending rows, a capped sample and the first/last offending row,
+so a badly broken file produces a bounded error message. Profiles trade
+checks for speed:
+- strict: all checks (default)
+- fast: skips the expensive format checks (email pattern, metadata JSON,
+  date parsing and date ranges)
+- off: no checks at all, for trusted generator output
 """
 
 import pandas as pd
+import numpy as np
 import json
-import re
-from typing import List, Dict
+from typing import List, Dict, Optional
 from datetime import datetime
 
 
+# Email format accepted for users
+EMAIL_PATTERN = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+
+# Offending rows (or values) kept per failed rule
+SAMPLE_SIZE = 5
+
+# Validation profiles, from most to least thorough
+VALIDATION_PROFILES = ['strict', 'fast', 'off']
+
+
+class ValidationReport:
+    """
+    Outcome of validating one table.
+    
+    Failed rules are kept in insertion order as dictionaries with:
+    - count: number of offending rows
+    - sample: up to sample_size offending rows, values or (row, value) pairs
+    - first_row / last_row: index labels of the first and last offending row
+    - message: description used in the error message
+    """
+    
+    def __init__(self, table: str, rows: int = 0, profile: str = 'strict',
+                 sample_size: int = SAMPLE_SIZE):
+        """
+        Initialize an empty (passing) report.
+        
+        Args:
+            table: Table name, e.g. 'users'
+            rows: Number of rows validated
+            profile: Validation profile used
+            sample_size: Offending rows kept per rule
+        """
+        self.table = table
+        self.rows = rows
+        self.profile = profile
+        self.sample_size = sample_size
+        self.rules = {}
+    
+    @property
+    def passed(self) -> bool:
+        """Whether every rule passed."""
+        return not self.rules
+    
+    def add(self, rule: str, message: str, mask: np.ndarray, df: pd.DataFrame,
+            column: Optional[str] = None, show: str = 'rows') -> None:
+        """
+        Record the offending rows of a rule (nothing is recorded if none offend).
+        
+        Args:
+            rule: Rule name, e.g. 'duplicate_user_id'
+            message: Description, e.g. 'Duplicate user_ids found'
+            mask: Boolean array marking offending rows of df
+            df: Validated dataframe
+            column: Column whose values are sampled (show != 'rows')
+            show: What the sample holds: 'rows' (index labels), 'values',
+                'distinct' (distinct values) or 'pairs' ((row, value) tuples)
+        """
+        positions = np.flatnonzero(mask)
+        if len(positions) == 0:
+            return
+        
+        index = df.index
+        head = positions[:self.sample_size]
+        if show == 'rows':
+            sample = index[head].tolist()
+        elif show == 'values':
+            sample = df[column].iloc[head].tolist()
+        elif show == 'distinct':
+            sample = pd.unique(df[column].iloc[positions])[:self.sample_size].tolist()
+        elif show == 'pairs':
+            sample = list(zip(index[head].tolist(), df[column].iloc[head].tolist()))
+        else:
+            raise ValueError(f"Unknown sample kind: {show}")
+        
+        self.rules[rule] = {
+            'count': len(positions),
+            'sample': sample,
+            'first_row': index[positions[0]],
+            'last_row': index[positions[-1]],
+            'message': message
+        }
+    
+    def errors(self) -> List[str]:
+        """
+        Render failed rules as one bounded line each.
+        
+        Returns:
+            Lines such as "Duplicate user_ids found: ['user_001'] (1 rows, first 3, last 3)"
+        """
+        return [
+            f"{result['message']}: {result['sample']} "
+            f"({result['count']} rows, first {result['first_row']}, last {result['last_row']})"
+            for result in self.rules.values()
+        ]
+    
+    def to_dict(self) -> Dict:
+        """Get the report as plain data (rule -> count/sample/first_row/last_row)."""
+        return {
+            'table': self.table,
+            'rows': self.rows,
+            'profile': self.profile,
+            'passed': self.passed,
+            'rules': {
+                rule: {key: value for key, value in result.items() if key != 'message'}
+                for rule, result in self.rules.items()
+            }
+        }
+
+
 class SchemaValidator:
     """
     Validate data against Plaid schema requirements.
@@ -25,69 +143,79 @@ class SchemaValidator:
     - Format validation (emails, dates, etc.)
     """
     
-    def __init__(self):
-        """Initialize validator."""
+    def __init__(self, profile: str = 'strict', sample_size: int = SAMPLE_SIZE):
+        """
+        Initialize validator.
+        
+        Args:
+            profile: 'strict', 'fast' or 'off' (see VALIDATION_PROFILES)
+            sample_size: Offending rows kept per failed rule
+        
+        Raises:
+            ValueError: If the profile is unknown
+        """
+        if profile not in VALIDATION_PROFILES:
+            raise ValueError(f"Unknown validation profile: {profile} (expected one of {VALIDATION_PROFILES})")
+        
+        self.profile = profile
+        self.sample_size = sample_size
         self.validation_errors = []
+        self.report = None
+    
+    @property
+    def format_checks(self) -> bool:
+        """Whether the expensive format checks run (strict profile only)."""
+        return self.profile == 'strict'
     
-    def validate_users(self, df: pd.DataFrame) -> None:
+    def validate_users(self, df: pd.DataFrame) -> ValidationReport:
         """
         Validate users dataframe.
         
         Checks:
         - Required fields: user_id, name, email
         - user_id uniqueness
-        - email format validity
-        - metadata is valid JSON
+        - email format validity (strict)
+        - metadata is valid JSON (strict)
         
         Args:
             df: Users dataframe
         
+        Returns:
+            ValidationReport (passing)
+        
         Raises:
             ValueError: If validation fails
         """
-        self.validation_errors = []
+        report = self._start('users', df)
+        if self.profile == 'off':
+            return report
         
         # Check required fields
         required = ['user_id', 'name', 'email']
         self._check_required_fields(df, required)
         
-        # Check user_id uniqueness
-        if df['user_id'].duplicated().any():
-            duplicates = df[df['user_id'].duplicated()]['user_id'].tolist()
-            self.validation_errors.append(f"Duplicate user_ids found: {duplicates}")
-        
-        # Check email uniqueness
-        if df['email'].duplicated().any():
-            duplicates = df[df['email'].duplicated()]['email'].tolist()
-            self.validation_errors.append(f"Duplicate emails found: {duplicates}")
-        
-        # Check email format
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        invalid_emails = []
-        for idx, email in df['email'].items():
-            if pd.notna(email) and not re.match(email_pattern, str(email)):
-                invalid_emails.append((idx, email))
-        
-        if invalid_emails:
-            self.validation_errors.append(f"Invalid email formats at rows: {invalid_emails[:5]}")
-        
-        # Check metadata is valid JSON
-        if 'metadata' in df.columns:
-            invalid_json = []
-            for idx, metadata in df['metadata'].items():
-                if pd.notna(metadata):
-                    try:
-                        json.loads(metadata)
-                    except json.JSONDecodeError:
-                        invalid_json.append(idx)
+        # Check user_id and email uniqueness
+        report.add('duplicate_user_id', "Duplicate user_ids found",
+                   df['user_id'].duplicated().to_numpy(), df, 'user_id', show='values')
+        report.add('duplicate_email', "Duplicate emails found",
+                   df['email'].duplicated().to_numpy(), df, 'email', show='values')
+        
+        if self.format_checks:
+            # Check email format
+            emails = df['email']
+            present = emails.notna().to_numpy()
+            valid = emails.astype(str).str.match(EMAIL_PATTERN).astype(bool).to_numpy()
+            report.add('email_format', "Invalid email formats at rows",
+                       present & ~valid, df, 'email', show='pairs')
             
-            if invalid_json:
-                self.validation_errors.append(f"Invalid JSON in metadata at rows: {invalid_json[:5]}")
+            # Check metadata is valid JSON
+            if 'metadata' in df.columns:
+                report.add('metadata_json', "Invalid JSON in metadata at rows",
+                           self._invalid_json(df['metadata']), df)
         
-        if self.validation_errors:
-            raise ValueError(f"User validation failed:\n" + "\n".join(self.validation_errors))
+        return self._finish(report, "User")
     
-    def validate_accounts(self, df: pd.DataFrame) -> None:
+    def validate_accounts(self, df: pd.DataFrame) -> ValidationReport:
         """
         Validate accounts dataframe.
         
@@ -101,38 +229,39 @@ class SchemaValidator:
         Args:
             df: Accounts dataframe
         
+        Returns:
+            ValidationReport (passing)
+        
         Raises:
             ValueError: If validation fails
         """
-        self.validation_errors = []
+        report = self._start('accounts', df)
+        if self.profile == 'off':
+            return report
         
         # Check required fields
         required = ['account_id', 'user_id', 'type']
         self._check_required_fields(df, required)
         
         # Check account_id uniqueness
-        if df['account_id'].duplicated().any():
-            duplicates = df[df['account_id'].duplicated()]['account_id'].tolist()
-            self.validation_errors.append(f"Duplicate account_ids found: {duplicates}")
+        report.add('duplicate_account_id', "Duplicate account_ids found",
+                   df['account_id'].duplicated().to_numpy(), df, 'account_id', show='values')
         
         # Check valid account types
         valid_types = ['checking', 'savings', 'credit_card', 'student_loan', 'mortgage']
-        invalid_types = df[~df['type'].isin(valid_types)]
-        if len(invalid_types) > 0:
-            self.validation_errors.append(f"Invalid account types found: {invalid_types['type'].unique().tolist()}")
+        report.add('account_type', "Invalid account types found",
+                   ~df['type'].isin(valid_types).to_numpy(), df, 'type', show='distinct')
         
         # Check balance fields are numeric
         numeric_fields = ['available_balance', 'current_balance', 'credit_limit']
         for field in numeric_fields:
             if field in df.columns:
-                non_numeric = df[pd.notna(df[field]) & ~df[field].apply(lambda x: isinstance(x, (int, float)))]
-                if len(non_numeric) > 0:
-                    self.validation_errors.append(f"Non-numeric values in {field} at rows: {non_numeric.index.tolist()[:5]}")
+                report.add(f'numeric_{field}', f"Non-numeric values in {field} at rows",
+                           self._non_numeric(df[field]), df)
         
-        if self.validation_errors:
-            raise ValueError(f"Account validation failed:\n" + "\n".join(self.validation_errors))
+        return self._finish(report, "Account")
     
-    def validate_transactions(self, df: pd.DataFrame) -> None:
+    def validate_transactions(self, df: pd.DataFrame) -> ValidationReport:
         """
         Validate transactions dataframe.
         
@@ -140,59 +269,56 @@ class SchemaValidator:
         - Required fields: transaction_id, account_id, user_id, date, amount
         - transaction_id uniqueness
         - amount is numeric
-        - date format (YYYY-MM-DD)
-        - dates within valid range
+        - date format (YYYY-MM-DD) (strict)
+        - dates within valid range (strict)
         - Valid payment channels
         
         Args:
             df: Transactions dataframe
         
+        Returns:
+            ValidationReport (passing)
+        
         Raises:
             ValueError: If validation fails
         """
-        self.validation_errors = []
+        report = self._start('transactions', df)
+        if self.profile == 'off':
+            return report
         
         # Check required fields
         required = ['transaction_id', 'account_id', 'user_id', 'date', 'amount']
         self._check_required_fields(df, required)
         
         # Check transaction_id uniqueness
-        if df['transaction_id'].duplicated().any():
-            duplicates = df[df['transaction_id'].duplicated()]['transaction_id'].tolist()
-            self.validation_errors.append(f"Duplicate transaction_ids found: {duplicates[:5]}")
+        report.add('duplicate_transaction_id', "Duplicate transaction_ids found",
+                   df['transaction_id'].duplicated().to_numpy(), df, 'transaction_id', show='values')
         
         # Check amount is numeric
-        non_numeric = df[~df['amount'].apply(lambda x: isinstance(x, (int, float)))]
-        if len(non_numeric) > 0:
-            self.validation_errors.append(f"Non-numeric amounts at rows: {non_numeric.index.tolist()[:5]}")
+        report.add('numeric_amount', "Non-numeric amounts at rows",
+                   self._non_numeric(df['amount'], allow_null=False), df)
         
         # Check date format and validity
-        try:
-            dates = pd.to_datetime(df['date'])
+        if self.format_checks:
+            unparsed, dates = self._parse_dates(df['date'])
+            report.add('date_format', "Invalid date format at rows", unparsed, df, 'date', show='pairs')
             
             # Check date range (should be within 2025-05-01 to 2025-10-31)
-            min_date = pd.Timestamp('2025-05-01')
-            max_date = pd.Timestamp('2025-10-31')
-            
-            out_of_range = df[(dates < min_date) | (dates > max_date)]
-            if len(out_of_range) > 0:
-                self.validation_errors.append(
-                    f"Dates out of range (2025-05-01 to 2025-10-31) at rows: {out_of_range.index.tolist()[:5]}"
-                )
-        except Exception as e:
-            self.validation_errors.append(f"Invalid date format: {str(e)}")
+            min_date = np.datetime64('2025-05-01')
+            max_date = np.datetime64('2025-10-31')
+            report.add('date_range', "Dates out of range (2025-05-01 to 2025-10-31) at rows",
+                       (dates < min_date) | (dates > max_date), df)
         
         # Check payment channels
         if 'payment_channel' in df.columns:
             valid_channels = ['online', 'in_store', 'other']
-            invalid = df[pd.notna(df['payment_channel']) & ~df['payment_channel'].isin(valid_channels)]
-            if len(invalid) > 0:
-                self.validation_errors.append(f"Invalid payment channels at rows: {invalid.index.tolist()[:5]}")
+            channels = df['payment_channel']
+            report.add('payment_channel', "Invalid payment channels at rows",
+                       (channels.notna() & ~channels.isin(valid_channels)).to_numpy(), df)
         
-        if self.validation_errors:
-            raise ValueError(f"Transaction validation failed:\n" + "\n".join(self.validation_errors))
+        return self._finish(report, "Transaction")
     
-    def validate_liabilities(self, df: pd.DataFrame) -> None:
+    def validate_liabilities(self, df: pd.DataFrame) -> ValidationReport:
         """
         Validate liabilities dataframe.
         
@@ -202,57 +328,155 @@ class SchemaValidator:
         - Valid liability types
         - Numeric payment amounts
         - Valid APR/interest rate ranges
-        - Date formats
+        - Date formats (strict)
         
         Args:
             df: Liabilities dataframe
         
+        Returns:
+            ValidationReport (passing)
+        
         Raises:
             ValueError: If validation fails
         """
-        self.validation_errors = []
+        report = self._start('liabilities', df)
+        if self.profile == 'off':
+            return report
         
         # Check required fields
         required = ['liability_id', 'account_id', 'user_id', 'type']
         self._check_required_fields(df, required)
         
         # Check liability_id uniqueness
-        if df['liability_id'].duplicated().any():
-            duplicates = df[df['liability_id'].duplicated()]['liability_id'].tolist()
-            self.validation_errors.append(f"Duplicate liability_ids found: {duplicates}")
+        report.add('duplicate_liability_id', "Duplicate liability_ids found",
+                   df['liability_id'].duplicated().to_numpy(), df, 'liability_id', show='values')
         
         # Check valid liability types
         valid_types = ['credit_card', 'student_loan', 'mortgage']
-        invalid_types = df[~df['type'].isin(valid_types)]
-        if len(invalid_types) > 0:
-            self.validation_errors.append(f"Invalid liability types found: {invalid_types['type'].unique().tolist()}")
+        report.add('liability_type', "Invalid liability types found",
+                   ~df['type'].isin(valid_types).to_numpy(), df, 'type', show='distinct')
         
         # Check numeric fields
-        numeric_fields = ['apr_percentage', 'minimum_payment_amount', 'last_payment_amount', 
+        numeric_fields = ['apr_percentage', 'minimum_payment_amount', 'last_payment_amount',
                          'last_statement_balance', 'interest_rate']
         for field in numeric_fields:
             if field in df.columns:
-                non_numeric = df[pd.notna(df[field]) & ~df[field].apply(lambda x: isinstance(x, (int, float)))]
-                if len(non_numeric) > 0:
-                    self.validation_errors.append(f"Non-numeric values in {field} at rows: {non_numeric.index.tolist()[:5]}")
+                report.add(f'numeric_{field}', f"Non-numeric values in {field} at rows",
+                           self._non_numeric(df[field]), df)
         
         # Check APR ranges (should be 0-100%)
-        if 'apr_percentage' in df.columns:
-            invalid_apr = df[pd.notna(df['apr_percentage']) & ((df['apr_percentage'] < 0) | (df['apr_percentage'] > 100))]
-            if len(invalid_apr) > 0:
-                self.validation_errors.append(f"APR out of range (0-100%) at rows: {invalid_apr.index.tolist()}")
+        if 'apr_percentage' in df.columns and 'numeric_apr_percentage' not in report.rules:
+            apr = pd.to_numeric(df['apr_percentage'])
+            report.add('apr_range', "APR out of range (0-100%) at rows",
+                       (apr.notna() & ((apr < 0) | (apr > 100))).to_numpy(), df)
         
         # Check date fields
-        date_fields = ['last_payment_date', 'next_payment_due_date']
-        for field in date_fields:
-            if field in df.columns:
-                try:
-                    pd.to_datetime(df[df[field].notna()][field])
-                except Exception as e:
-                    self.validation_errors.append(f"Invalid date format in {field}: {str(e)}")
+        if self.format_checks:
+            date_fields = ['last_payment_date', 'next_payment_due_date']
+            for field in date_fields:
+                if field in df.columns:
+                    unparsed, _ = self._parse_dates(df[field])
+                    report.add(f'date_format_{field}', f"Invalid date format in {field} at rows",
+                               unparsed, df, field, show='pairs')
+        
+        return self._finish(report, "Liability")
+    
+    def _start(self, table: str, df: pd.DataFrame) -> ValidationReport:
+        """Reset state and create the report for a validation run."""
+        self.validation_errors = []
+        self.report = ValidationReport(table, len(df), self.profile, self.sample_size)
+        return self.report
+    
+    def _finish(self, report: ValidationReport, label: str) -> ValidationReport:
+        """
+        Raise if any rule failed, otherwise return the report.
+        
+        Args:
+            report: Report of the validation run
+            label: Record label for the error message, e.g. 'User'
         
+        Returns:
+            The passing report
+        
+        Raises:
+            ValueError: Listing one bounded line per failed rule
+        """
+        self.validation_errors = report.errors()
         if self.validation_errors:
-            raise ValueError(f"Liability validation failed:\n" + "\n".join(self.validation_errors))
+            raise ValueError(f"{label} validation failed:\n" + "\n".join(self.validation_errors))
+        return report
+    
+    @staticmethod
+    def _non_numeric(values: pd.Series, allow_null: bool = True) -> np.ndarray:
+        """
+        Find values that are not numbers.
+        
+        Numeric and boolean columns pass as a whole. In other columns every
+        string is rejected (including numeric-looking ones like '12.5'), as
+        are values that pd.to_numeric cannot convert.
+        
+        Args:
+            values: Column to check
+            allow_null: Let nulls pass. Without it, nulls in an object
+                column (None, NaN, pd.NA) are rejected too
+        
+        Returns:
+            Boolean mask of offending rows
+        """
+        if pd.api.types.is_numeric_dtype(values.dtype) or pd.api.types.is_bool_dtype(values.dtype):
+            return np.zeros(len(values), dtype=bool)
+        
+        present = values.notna().to_numpy()
+        if pd.api.types.is_string_dtype(values.dtype) and not pd.api.types.is_object_dtype(values.dtype):
+            return present
+        
+        kind = pd.api.types.infer_dtype(values, skipna=True)
+        if kind in ('string', 'bytes'):
+            is_text = present
+        elif kind in ('mixed', 'mixed-integer'):
+            is_text = values.str.len().notna().to_numpy()
+        else:
+            is_text = np.zeros(len(values), dtype=bool)
+        numeric = pd.to_numeric(values.where(~is_text), errors='coerce').notna().to_numpy()
+        offending = is_text | ~numeric
+        return offending if not allow_null else present & offending
+    
+    @staticmethod
+    def _parse_dates(values: pd.Series):
+        """
+        Parse a date column, converting each distinct value once.
+        
+        Args:
+            values: Column of dates (nulls allowed)
+        
+        Returns:
+            Tuple of (mask of non-null values that could not be parsed,
+            datetime64 array with NaT for nulls and unparsed values)
+        """
+        codes, uniques = pd.factorize(values)
+        parsed = pd.to_datetime(pd.Series(uniques, dtype=object), errors='coerce').to_numpy()
+        invalid = np.append(np.isnat(parsed), False)
+        return invalid[codes], np.append(parsed, np.datetime64('NaT'))[codes]
+    
+    @staticmethod
+    def _invalid_json(values: pd.Series) -> np.ndarray:
+        """
+        Find non-null values that are not valid JSON, decoding each distinct value once.
+        
+        Args:
+            values: Column of JSON strings
+        
+        Returns:
+            Boolean mask of offending rows
+        """
+        codes, uniques = pd.factorize(values)
+        invalid = np.zeros(len(uniques) + 1, dtype=bool)
+        for i, text in enumerate(uniques):
+            try:
+                json.loads(text)
+            except json.JSONDecodeError:
+                invalid[i] = True
+        return invalid[codes]
     
     def _check_required_fields(self, df: pd.DataFrame, required: List[str]) -> None:
         """
@@ -268,4 +492,3 @@ class SchemaValidator:
         missing = set(required) - set(df.columns)
         if missing:
             raise ValueError(f"Missing required fields: {missing}")
-
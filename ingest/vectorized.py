@@ -0,0 +1,668 @@
+"""
+Vectorized transaction engine for synthetic data generation.
+
+This module produces the same transaction patterns as the row-by-row methods
+of SyntheticDataGenerator, but draws every day x category Bernoulli trial,
+amount and merchant choice for a batch of accounts as NumPy arrays and builds
+the transactions DataFrame column-wise.
+
+Each account type is handled in two steps:
+1. draw_*_params: per-account schedule parameters (pay cadence, rent amount,
+   subscriptions, ...), drawn once per account
+2. *_window: all transactions of those accounts between two day offsets
+
+Day offsets are counted from the engine start date (day 0).
+"""
+
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from .config import *
+from .utils import generate_id_batch
+
+
+# ============================================================================
+# MERCHANT TEMPLATES
+# ============================================================================
+
+# Payment channel codes
+CHANNELS = np.array(['online', 'in_store', 'other'], dtype=object)
+CHANNEL_ONLINE = 0
+CHANNEL_IN_STORE = 1
+CHANNEL_OTHER = 2
+
+# Location used for in-person spending
+DEFAULT_LOCATION = ('Austin', 'TX', '78701')
+
+# Credit card merchants that are not part of the MERCHANTS pools
+CREDIT_SHOPPING_MERCHANTS = ['Amazon', 'Target', 'Best Buy', 'Macys', 'Nordstrom']
+CREDIT_ENTERTAINMENT_MERCHANTS = [
+    ('AMC Theaters', 'MOVIES', 15, 30),
+    ('Spotify', 'STREAMING', 10, 11),
+    ('Steam', 'GENERAL', 5, 60)
+]
+
+
+class MerchantTemplates:
+    """
+    Lookup table of every (merchant, category) combination the generator emits.
+
+    Transactions carry an integer template code while they are generated;
+    names and categories are only materialized when the DataFrame is built.
+    """
+
+    def __init__(self):
+        """Build the template table from the MERCHANTS configuration."""
+        self.rows = []
+        self.groups = {}
+
+        self._add('payroll', [('Employer Direct Deposit', 'employer_', 'INCOME', 'PAYROLL', False)])
+        self._add('rent', [('Property Management Co', 'merch_rent_001', 'RENT_AND_UTILITIES', 'RENT', False)])
+        self._add('utility', [
+            (name, 'merch_utility_001', 'RENT_AND_UTILITIES', 'ELECTRIC', False)
+            for name in MERCHANTS['utilities']
+        ])
+        self._add('subscription', [
+            (name, f'merch_{name.lower().replace(" ", "_")}', 'ENTERTAINMENT', 'SUBSCRIPTION', False)
+            for name, _ in MERCHANTS['subscription']
+        ])
+        self._add('grocery', [
+            (name, 'merch_grocery_001', 'FOOD_AND_DRINK', 'GROCERIES', True)
+            for name in MERCHANTS['grocery']
+        ])
+        self._add('restaurant', [
+            (name, 'merch_restaurant_001', 'FOOD_AND_DRINK', 'RESTAURANTS', True)
+            for name in MERCHANTS['restaurant']
+        ])
+        self._add('coffee', [
+            (name, 'merch_coffee_001', 'FOOD_AND_DRINK', 'COFFEE_SHOPS', True)
+            for name in MERCHANTS['coffee']
+        ])
+        self._add('gas', [
+            (name, 'merch_gas_001', 'TRANSPORTATION', 'GAS', True)
+            for name in MERCHANTS['gas']
+        ])
+        self._add('credit_shopping', [
+            (name, f'merch_{name.lower()}', 'SHOPPING', 'GENERAL', False)
+            for name in CREDIT_SHOPPING_MERCHANTS
+        ])
+        self._add('credit_restaurant', [
+            (name, 'merch_restaurant_cc', 'FOOD_AND_DRINK', 'RESTAURANTS', True)
+            for name in MERCHANTS['restaurant']
+        ])
+        self._add('credit_entertainment', [
+            (name, f'merch_{name.lower().replace(" ", "_")}', 'ENTERTAINMENT', category, False)
+            for name, category, _, _ in CREDIT_ENTERTAINMENT_MERCHANTS
+        ])
+        self._add('credit_payment', [('Credit Card Payment', 'payment_from_checking', 'TRANSFER', 'INTERNAL', False)])
+        self._add('savings_transfer', [('Transfer from Checking', 'transfer_checking', 'TRANSFER', 'INTERNAL', False)])
+        self._add('savings_withdrawal', [('Withdrawal to Checking', 'withdrawal_checking', 'TRANSFER', 'INTERNAL', False)])
+        self._add('interest', [('Interest Earned', 'bank_interest', 'INCOME', 'INTEREST', False)])
+
+        columns = list(zip(*self.rows))
+        self.merchant_name = np.array(columns[0], dtype=object)
+        self.merchant_entity_id = np.array(columns[1], dtype=object)
+        self.category_primary = np.array(columns[2], dtype=object)
+        self.category_detailed = np.array(columns[3], dtype=object)
+        self.located = np.array(columns[4], dtype=bool)
+        self.payroll_code = self.groups['payroll'][0]
+
+    def _add(self, group: str, rows: List[tuple]) -> None:
+        """Register a group of templates and remember its code range."""
+        self.groups[group] = (len(self.rows), len(rows))
+        self.rows.extend(rows)
+
+    def code(self, group: str, choice: np.ndarray = None) -> np.ndarray:
+        """
+        Get template codes for a group.
+
+        Args:
+            group: Template group name
+            choice: Optional index within the group (one per transaction)
+
+        Returns:
+            Template code(s)
+        """
+        offset, _ = self.groups[group]
+        if choice is None:
+            return offset
+        return offset + choice
+
+    def size(self, group: str) -> int:
+        """Number of templates in a group."""
+        return self.groups[group][1]
+
+
+TEMPLATES = MerchantTemplates()
+
+
+# ============================================================================
+# ENGINE
+# ============================================================================
+
+class VectorizedTransactionEngine:
+    """
+    Generate transactions for batches of accounts with NumPy.
+
+    Every *_window method returns a block: a dict of equal-length arrays
+    ('account', 'day', 'amount', 'template', 'channel') where 'account'
+    indexes into the batch that was passed in.
+    """
+
+    def __init__(self, rng: np.random.Generator,
+                 start_date: datetime, end_date: datetime):
+        """
+        Initialize engine for a date range.
+
+        Args:
+            rng: NumPy random generator used for all draws
+            start_date: First day of the range (day offset 0)
+            end_date: Last day of the range (inclusive)
+        """
+        self.rng = rng
+        self.start_date = start_date
+        self.end_date = end_date
+        self.last_day = (end_date - start_date).days
+
+    # ------------------------------------------------------------------------
+    # Calendar helpers
+    # ------------------------------------------------------------------------
+
+    def is_weekend(self, days: np.ndarray) -> np.ndarray:
+        """Weekend mask for day offsets."""
+        return (self.start_date.weekday() + days) % 7 >= 5
+
+    def _schedule(self, first: np.ndarray, interval, first_day: int,
+                  last_day: int) -> tuple:
+        """
+        Expand recurring schedules into occurrences within a window.
+
+        An item recurs on first, first + interval, first + 2*interval, ...
+
+        Args:
+            first: Day offset of the first occurrence, one per item
+            interval: Days between occurrences (scalar or one per item)
+            first_day: First day of the window (inclusive)
+            last_day: Last day of the window (inclusive)
+
+        Returns:
+            Tuple (item index, day offset) of all occurrences in the window
+        """
+        first = np.asarray(first, dtype=np.int64)
+        interval = np.broadcast_to(np.asarray(interval, dtype=np.int64), first.shape)
+
+        k_min = np.maximum(0, -((first - first_day) // interval))
+        k_max = np.floor_divide(last_day - first, interval)
+        counts = np.maximum(k_max - k_min + 1, 0)
+
+        item = np.repeat(np.arange(len(first)), counts)
+        step = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        days = first[item] + (k_min[item] + step) * interval[item]
+
+        return item, days
+
+    def _bernoulli_days(self, probs: np.ndarray, num_accounts: int,
+                        first_day: int, last_day: int,
+                        eligible: np.ndarray = None) -> tuple:
+        """
+        Draw one Bernoulli trial per account per day.
+
+        Args:
+            probs: Success probability for each day in the window
+            num_accounts: Number of accounts in the batch
+            first_day: First day of the window
+            last_day: Last day of the window
+            eligible: Optional mask of accounts that take part
+
+        Returns:
+            Tuple (account index, day offset) of successful trials
+        """
+        hits = self.rng.random((num_accounts, last_day - first_day + 1)) < probs
+        if eligible is not None:
+            hits &= eligible[:, None]
+        account, day = np.nonzero(hits)
+        return account, day + first_day
+
+    def _block(self, account: np.ndarray, day: np.ndarray, amount: np.ndarray,
+               template, channel) -> Dict[str, np.ndarray]:
+        """Package arrays into a transaction block."""
+        n = len(account)
+        return {
+            'account': np.asarray(account, dtype=np.int64),
+            'day': np.asarray(day, dtype=np.int64),
+            'amount': np.round(np.asarray(amount, dtype=np.float64), 2),
+            'template': np.broadcast_to(np.asarray(template, dtype=np.int64), (n,)).copy(),
+            'channel': np.broadcast_to(np.asarray(channel, dtype=np.int64), (n,)).copy()
+        }
+
+    def _window(self, first_day: Optional[int], last_day: Optional[int]) -> tuple:
+        """Resolve an optional window to explicit day offsets."""
+        first_day = 0 if first_day is None else first_day
+        last_day = self.last_day if last_day is None else last_day
+        return first_day, last_day
+
+    # ------------------------------------------------------------------------
+    # Checking accounts
+    # ------------------------------------------------------------------------
+
+    def draw_checking_params(self, monthly_income: np.ndarray,
+                             age: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Draw schedule parameters for checking accounts.
+
+        Args:
+            monthly_income: Monthly income, one per account
+            age: Account holder age, one per account
+
+        Returns:
+            Dict of per-account arrays plus flattened subscription arrays
+            ('sub_account', 'sub_merchant', 'sub_first')
+        """
+        rng = self.rng
+        monthly_income = np.asarray(monthly_income, dtype=np.float64)
+        n = len(monthly_income)
+
+        # Payroll: biweekly or monthly with equal probability
+        biweekly = rng.random(n) < 0.5
+        pay_interval = np.where(biweekly, TRANSACTION_FREQUENCY['payroll_biweekly'],
+                                TRANSACTION_FREQUENCY['payroll_monthly'])
+        pay_amount = np.where(biweekly, monthly_income / 2, monthly_income)
+        pay_first = rng.integers(1, 8, n)
+
+        # Rent (25-35% of monthly income, 1st ±2 days) and utilities (15th ±2 days)
+        rent_amount = monthly_income * rng.uniform(
+            FINANCIAL_RATIOS['rent_to_income'][0],
+            FINANCIAL_RATIOS['rent_to_income'][1],
+            n
+        )
+        rent_first = rng.integers(0, 3, n)
+        utility_amount = rng.uniform(80, 150, n)
+        utility_first = rng.integers(13, 18, n)
+
+        # Subscriptions: 40% of users pick 1-3 distinct services
+        num_services = TEMPLATES.size('subscription')
+        has_subs = rng.random(n) < 0.4
+        num_subs = np.where(has_subs, rng.integers(1, 4, n), 0)
+        ranks = np.argsort(rng.random((n, num_services)), axis=1)
+        picked = np.arange(num_services)[None, :] < num_subs[:, None]
+        sub_account = np.repeat(np.arange(n), num_subs)
+        sub_merchant = ranks[picked]
+        sub_first = rng.integers(1, 29, len(sub_account))
+
+        return {
+            'monthly_income': monthly_income,
+            'pay_interval': pay_interval,
+            'pay_amount': pay_amount,
+            'pay_first': pay_first,
+            'rent_amount': rent_amount,
+            'rent_first': rent_first,
+            'utility_amount': utility_amount,
+            'utility_first': utility_first,
+            'coffee_eligible': (np.asarray(age) <= 25) | (monthly_income > 6000),
+            'sub_account': sub_account,
+            'sub_merchant': sub_merchant,
+            'sub_first': sub_first
+        }
+
+    def checking_window(self, params: Dict[str, np.ndarray],
+                        first_day: int = None, last_day: int = None) -> List[Dict[str, np.ndarray]]:
+        """
+        Generate checking transactions: payroll, regular expenses and daily spending.
+
+        Args:
+            params: Output of draw_checking_params()
+            first_day: First day offset (default: 0)
+            last_day: Last day offset (default: end of range)
+
+        Returns:
+            List of transaction blocks
+        """
+        first_day, last_day = self._window(first_day, last_day)
+        rng = self.rng
+
+        # Payroll deposits (±2% variance)
+        account, day = self._schedule(params['pay_first'], params['pay_interval'], first_day, last_day)
+        amount = params['pay_amount'][account] * rng.uniform(0.98, 1.02, len(account))
+        blocks = [self._block(account, day, amount, TEMPLATES.code('payroll'), CHANNEL_OTHER)]
+
+        blocks.extend(self.regular_expenses_window(params, first_day, last_day))
+        blocks.extend(self.random_spending_window(params, first_day, last_day))
+
+        return blocks
+
+    def regular_expenses_window(self, params: Dict[str, np.ndarray],
+                                first_day: int = None, last_day: int = None) -> List[Dict[str, np.ndarray]]:
+        """
+        Generate rent, utilities and subscriptions (every 30 days).
+
+        Args:
+            params: Output of draw_checking_params()
+            first_day: First day offset (default: 0)
+            last_day: Last day offset (default: end of range)
+
+        Returns:
+            List of transaction blocks
+        """
+        first_day, last_day = self._window(first_day, last_day)
+        rng = self.rng
+        interval = TRANSACTION_FREQUENCY['rent_monthly']
+        blocks = []
+
+        # Rent (±1% variance)
+        account, day = self._schedule(params['rent_first'], interval, first_day, last_day)
+        amount = -params['rent_amount'][account] * rng.uniform(0.99, 1.01, len(account))
+        blocks.append(self._block(account, day, amount, TEMPLATES.code('rent'), CHANNEL_OTHER))
+
+        # Utilities (±10% variance, random provider each month)
+        account, day = self._schedule(params['utility_first'], interval, first_day, last_day)
+        amount = -params['utility_amount'][account] * rng.uniform(0.9, 1.1, len(account))
+        provider = rng.integers(0, TEMPLATES.size('utility'), len(account))
+        blocks.append(self._block(account, day, amount, TEMPLATES.code('utility', provider), CHANNEL_OTHER))
+
+        # Subscriptions (fixed price)
+        prices = np.array([price for _, price in MERCHANTS['subscription']])
+        item, day = self._schedule(params['sub_first'], interval, first_day, last_day)
+        merchant = params['sub_merchant'][item]
+        blocks.append(self._block(
+            params['sub_account'][item], day, -prices[merchant],
+            TEMPLATES.code('subscription', merchant), CHANNEL_ONLINE
+        ))
+
+        return blocks
+
+    def random_spending_window(self, params: Dict[str, np.ndarray],
+                               first_day: int = None, last_day: int = None) -> List[Dict[str, np.ndarray]]:
+        """
+        Generate daily discretionary spending: groceries, restaurants, coffee, gas.
+
+        Args:
+            params: Output of draw_checking_params()
+            first_day: First day offset (default: 0)
+            last_day: Last day offset (default: end of range)
+
+        Returns:
+            List of transaction blocks
+        """
+        first_day, last_day = self._window(first_day, last_day)
+        rng = self.rng
+        n = len(params['monthly_income'])
+        weekend = self.is_weekend(np.arange(first_day, last_day + 1))
+        blocks = []
+
+        # Groceries (40% chance per day, 50% on weekends)
+        account, day = self._bernoulli_days(np.where(weekend, 0.5, 0.4), n, first_day, last_day)
+        k = len(account)
+        blocks.append(self._block(
+            account, day, -rng.uniform(30, 150, k),
+            TEMPLATES.code('grocery', rng.integers(0, TEMPLATES.size('grocery'), k)),
+            CHANNEL_IN_STORE
+        ))
+
+        # Restaurants (50% chance per day, 65% on weekends)
+        account, day = self._bernoulli_days(np.where(weekend, 0.65, 0.5), n, first_day, last_day)
+        k = len(account)
+        blocks.append(self._block(
+            account, day, -rng.uniform(12, 60, k),
+            TEMPLATES.code('restaurant', rng.integers(0, TEMPLATES.size('restaurant'), k)),
+            rng.integers(0, 2, k)
+        ))
+
+        # Coffee shops (students and high-income professionals, mostly weekdays)
+        account, day = self._bernoulli_days(np.where(weekend, 0.3, 0.6), n, first_day, last_day,
+                                            eligible=params['coffee_eligible'])
+        k = len(account)
+        blocks.append(self._block(
+            account, day, -rng.uniform(4, 8, k),
+            TEMPLATES.code('coffee', rng.integers(0, TEMPLATES.size('coffee'), k)),
+            CHANNEL_IN_STORE
+        ))
+
+        # Gas (20% chance per day)
+        account, day = self._bernoulli_days(np.full(len(weekend), 0.2), n, first_day, last_day)
+        k = len(account)
+        blocks.append(self._block(
+            account, day, -rng.uniform(35, 60, k),
+            TEMPLATES.code('gas', rng.integers(0, TEMPLATES.size('gas'), k)),
+            CHANNEL_IN_STORE
+        ))
+
+        return blocks
+
+    # ------------------------------------------------------------------------
+    # Credit cards
+    # ------------------------------------------------------------------------
+
+    def draw_credit_params(self, num_accounts: int) -> Dict[str, np.ndarray]:
+        """
+        Draw schedule parameters for credit card accounts.
+
+        Args:
+            num_accounts: Number of credit card accounts
+
+        Returns:
+            Dict of per-account arrays
+        """
+        start_day = self.start_date.day
+        payment_first = 25 - start_day if start_day < 25 else 55 - start_day
+
+        return {
+            'payment_first': np.full(num_accounts, payment_first, dtype=np.int64)
+        }
+
+    def credit_window(self, params: Dict[str, np.ndarray],
+                      first_day: int = None, last_day: int = None) -> List[Dict[str, np.ndarray]]:
+        """
+        Generate credit card purchases and monthly payments.
+
+        Args:
+            params: Output of draw_credit_params()
+            first_day: First day offset (default: 0)
+            last_day: Last day offset (default: end of range)
+
+        Returns:
+            List of transaction blocks
+        """
+        first_day, last_day = self._window(first_day, last_day)
+        rng = self.rng
+        n = len(params['payment_first'])
+        num_days = last_day - first_day + 1
+        blocks = []
+
+        # Shopping (20% chance per day)
+        account, day = self._bernoulli_days(np.full(num_days, 0.2), n, first_day, last_day)
+        k = len(account)
+        blocks.append(self._block(
+            account, day, -rng.uniform(25, 200, k),
+            TEMPLATES.code('credit_shopping', rng.integers(0, TEMPLATES.size('credit_shopping'), k)),
+            CHANNEL_ONLINE
+        ))
+
+        # Dining (30% chance per day)
+        account, day = self._bernoulli_days(np.full(num_days, 0.3), n, first_day, last_day)
+        k = len(account)
+        blocks.append(self._block(
+            account, day, -rng.uniform(15, 75, k),
+            TEMPLATES.code('credit_restaurant', rng.integers(0, TEMPLATES.size('credit_restaurant'), k)),
+            rng.integers(0, 2, k)
+        ))
+
+        # Entertainment (10% chance per day, amount range depends on merchant)
+        account, day = self._bernoulli_days(np.full(num_days, 0.1), n, first_day, last_day)
+        k = len(account)
+        choice = rng.integers(0, len(CREDIT_ENTERTAINMENT_MERCHANTS), k)
+        low = np.array([m[2] for m in CREDIT_ENTERTAINMENT_MERCHANTS], dtype=np.float64)[choice]
+        high = np.array([m[3] for m in CREDIT_ENTERTAINMENT_MERCHANTS], dtype=np.float64)[choice]
+        blocks.append(self._block(
+            account, day, -rng.uniform(low, high),
+            TEMPLATES.code('credit_entertainment', choice), CHANNEL_ONLINE
+        ))
+
+        # Monthly payment from checking (positive = credit/payment)
+        account, day = self._schedule(params['payment_first'], 30, first_day, last_day)
+        blocks.append(self._block(
+            account, day, rng.uniform(50, 300, len(account)),
+            TEMPLATES.code('credit_payment'), CHANNEL_OTHER
+        ))
+
+        return blocks
+
+    # ------------------------------------------------------------------------
+    # Savings accounts
+    # ------------------------------------------------------------------------
+
+    def draw_savings_params(self, monthly_income: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Draw schedule parameters for savings accounts.
+
+        Args:
+            monthly_income: Monthly income, one per account
+
+        Returns:
+            Dict of per-account arrays
+        """
+        monthly_income = np.asarray(monthly_income, dtype=np.float64)
+        n = len(monthly_income)
+        savings_rate = self.rng.uniform(
+            FINANCIAL_RATIOS['savings_rate'][0],
+            FINANCIAL_RATIOS['savings_rate'][1],
+            n
+        )
+        start_day = self.start_date.day
+        transfer_first = 5 - start_day if start_day < 5 else 35 - start_day
+
+        return {
+            'monthly_savings': monthly_income * savings_rate,
+            'transfer_first': np.full(n, transfer_first, dtype=np.int64),
+            'withdrawal_first': np.zeros(n, dtype=np.int64),
+            'interest_first': np.full(n, 90, dtype=np.int64)
+        }
+
+    def savings_window(self, params: Dict[str, np.ndarray],
+                       first_day: int = None, last_day: int = None) -> List[Dict[str, np.ndarray]]:
+        """
+        Generate savings transfers, occasional withdrawals and quarterly interest.
+
+        Args:
+            params: Output of draw_savings_params()
+            first_day: First day offset (default: 0)
+            last_day: Last day offset (default: end of range)
+
+        Returns:
+            List of transaction blocks
+        """
+        first_day, last_day = self._window(first_day, last_day)
+        rng = self.rng
+        monthly_savings = params['monthly_savings']
+        blocks = []
+
+        # Monthly transfer from checking (±20% variance)
+        account, day = self._schedule(params['transfer_first'], 30, first_day, last_day)
+        blocks.append(self._block(
+            account, day, monthly_savings[account] * rng.uniform(0.8, 1.2, len(account)),
+            TEMPLATES.code('savings_transfer'), CHANNEL_OTHER
+        ))
+
+        # Withdrawal check every 30 days (10% chance)
+        account, day = self._schedule(params['withdrawal_first'], 30, first_day, last_day)
+        hit = rng.random(len(account)) < 0.1
+        account, day = account[hit], day[hit]
+        blocks.append(self._block(
+            account, day, -rng.uniform(100, 500, len(account)),
+            TEMPLATES.code('savings_withdrawal'), CHANNEL_OTHER
+        ))
+
+        # Quarterly interest (0.05% APY on a rough 3-month balance estimate)
+        account, day = self._schedule(params['interest_first'], 90, first_day, last_day)
+        blocks.append(self._block(
+            account, day, monthly_savings[account] * 3 * 0.0005 / 4,
+            TEMPLATES.code('interest'), CHANNEL_OTHER
+        ))
+
+        return blocks
+
+    # ------------------------------------------------------------------------
+    # Assembly
+    # ------------------------------------------------------------------------
+
+    @staticmethod
+    def concat_blocks(blocks: List[Dict[str, np.ndarray]],
+                      account_map: np.ndarray = None) -> Dict[str, np.ndarray]:
+        """
+        Concatenate blocks, optionally remapping batch-local account indices.
+
+        Args:
+            blocks: Transaction blocks
+            account_map: Global account index for each batch-local index
+
+        Returns:
+            Single merged block
+        """
+        merged = {
+            key: np.concatenate([b[key] for b in blocks]) if blocks else np.zeros(0, dtype=np.int64)
+            for key in ('account', 'day', 'amount', 'template', 'channel')
+        }
+        if account_map is not None:
+            merged['account'] = np.asarray(account_map)[merged['account']]
+        return merged
+
+    def build_frame(self, block: Dict[str, np.ndarray], account_ids: np.ndarray,
+                    user_ids: np.ndarray, id_key: int, created_at: str = None,
+                    id_counters: np.ndarray = None) -> pd.DataFrame:
+        """
+        Build the transactions DataFrame column-wise from a merged block.
+
+        Rows are ordered by date (stable, so ties keep generation order).
+
+        Args:
+            block: Merged block whose 'account' indexes account_ids/user_ids
+            account_ids: Account ID for each account index
+            user_ids: User ID for each account index
+            id_key: Key used to scramble transaction IDs
+            created_at: Timestamp stored in created_at (default: now)
+            id_counters: Counter for each row's transaction ID, aligned with
+                the block (default: position after sorting)
+
+        Returns:
+            DataFrame with the same columns as the row-by-row generator
+        """
+        order = np.argsort(block['day'], kind='stable')
+        account = block['account'][order]
+        day = block['day'][order]
+        template = block['template'][order]
+        n = len(order)
+        counters = np.arange(n) if id_counters is None else np.asarray(id_counters)[order]
+
+        account_ids = np.asarray(account_ids, dtype=object)
+        user_ids = np.asarray(user_ids, dtype=object)
+        dates = np.array([
+            (self.start_date + timedelta(days=int(d))).strftime('%Y-%m-%d')
+            for d in range(int(day.min()) if n else 0, (int(day.max()) + 1) if n else 0)
+        ], dtype=object)
+
+        txn_user_ids = user_ids[account]
+        entity_ids = TEMPLATES.merchant_entity_id[template]
+        payroll = template == TEMPLATES.payroll_code
+        entity_ids[payroll] = 'employer_' + txn_user_ids[payroll]
+
+        located = TEMPLATES.located[template]
+        city, region, postal_code = (np.where(located, value, None) for value in DEFAULT_LOCATION)
+
+        return pd.DataFrame({
+            'transaction_id': generate_id_batch('txn_', counters, id_key).astype(object),
+            'account_id': account_ids[account],
+            'user_id': txn_user_ids,
+            'date': dates[day - (day.min() if n else 0)],
+            'amount': block['amount'][order],
+            'merchant_name': TEMPLATES.merchant_name[template],
+            'merchant_entity_id': entity_ids,
+            'payment_channel': CHANNELS[block['channel'][order]],
+            'category_primary': TEMPLATES.category_primary[template],
+            'category_detailed': TEMPLATES.category_detailed[template],
+            'pending': np.zeros(n, dtype=bool),
+            'location_city': city,
+            'location_region': region,
+            'location_postal_code': postal_code,
+            'created_at': created_at or datetime.now().isoformat()
+        })
@@ -129,21 +129,23 @@ class PersonaAssigner:
         """
         cursor = self.db.cursor()
         
-        # Query user_signals table
-        cursor.execute("""
-            SELECT signal_type, signal_json
-            FROM user_signals
-            WHERE user_id = ? AND window_type = ?
-        """, (user_id, window_type))
-        
-        signal_rows = cursor.fetchall()
-        
-        # Build signals dict
-        signals = {}
-        for row in signal_rows:
-            signal_type = row['signal_type']
-            signal_json = row['signal_json']
-            signals[signal_type] = parse_signal_json(signal_json)
+        # Typed signal table first; legacy JSON rows for older databases
+        signals = self._load_typed_signals(user_id, window_type)
+        if signals is None:
+            cursor.execute("""
+                SELECT signal_type, signal_json
+                FROM user_signals
+                WHERE user_id = ? AND window_type = ?
+            """, (user_id, window_type))
+            
+            signal_rows = cursor.fetchall()
+            
+            # Build signals dict
+            signals = {}
+            for row in signal_rows:
+                signal_type = row['signal_type']
+                signal_json = row['signal_json']
+                signals[signal_type] = parse_signal_json(signal_json)
         
         # Load user metadata
         cursor.execute("""
@@ -167,6 +169,28 @@ class PersonaAssigner:
         
         return signals
     
+    def _load_typed_signals(
+        self,
+        user_id: str,
+        window_type: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Load a user's signals from the typed user_signal_values table.
+        
+        Args:
+            user_id: User identifier
+            window_type: Time window ('30d' or '180d')
+            
+        Returns:
+            Dict with signal categories, or None if the table, the user's
+            row or the features package is unavailable
+        """
+        try:
+            from features.store import read_user_signals
+        except ImportError:
+            return None
+        return read_user_signals(self.db, user_id, window_type)
+    
     # ========================================================================
     # Persona Checking Methods
     # ========================================================================
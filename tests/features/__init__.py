@@ -0,0 +1,8 @@
+"""
+Test suite for the behavioral signal engine.
+
+Tests cover:
+- Credit, income, subscription and savings blocks on hand-built data
+- Storing signals in both user_signals layouts
+- Persona assignment from computed signals
+"""
@@ -0,0 +1,131 @@
+"""
+Test fixtures for the signal engine tests.
+
+Provides:
+- A small population with known signals (user_a) and an empty user (user_b)
+- SignalFrames built from it, windows ending 2025-06-30
+- random_population(), a seeded population of charges at scale
+"""
+
+import sqlite3
+
+import numpy as np
+import pytest
+import pandas as pd
+
+from features import SignalFrames
+
+
+AS_OF = '2025-06-30'
+
+
+def transaction(user_id, account_id, date, amount, merchant=None, primary='GENERAL_MERCHANDISE', detailed='OTHER'):
+    """Build one transaction row (negative amounts leave the account)."""
+    return {
+        'user_id': user_id, 'account_id': account_id, 'date': date, 'amount': amount,
+        'merchant_name': merchant, 'category_primary': primary, 'category_detailed': detailed
+    }
+
+
+def random_population(num_users: int, seed: int = 7) -> SignalFrames:
+    """Users with a mix of monthly, weekly and random charges at ten merchants."""
+    rng = np.random.default_rng(seed)
+    end = np.datetime64(AS_OF)
+    rows = []
+    for index in range(num_users):
+        user_id = f'user_{index:05d}'
+        for merchant in range(10):
+            name = f'Merchant {merchant}'
+            kind = rng.integers(3)
+            if kind == 0:
+                # Steady cadence: every 7 or 30 days, small amount jitter
+                step = [7, 30][rng.integers(2)]
+                count = rng.integers(2, 14)
+                days = end - rng.integers(0, 5) - step * np.arange(count)
+                amounts = 10 + merchant + rng.normal(0, rng.choice([0.1, 3.0]), count)
+            else:
+                count = rng.integers(1, 8)
+                days = end - rng.integers(0, 120, count)
+                amounts = rng.uniform(5, 80, count)
+            rows.extend(transaction(user_id, f'chk_{index}', str(day), -round(amount, 2), name)
+                        for day, amount in zip(days, amounts))
+
+    accounts = pd.DataFrame({
+        'account_id': [f'chk_{index}' for index in range(num_users)],
+        'user_id': [f'user_{index:05d}' for index in range(num_users)],
+        'type': 'checking', 'subtype': 'checking', 'mask': '0000',
+        'current_balance': 1000.0, 'credit_limit': None
+    })
+    liabilities = pd.DataFrame(columns=['account_id', 'type', 'minimum_payment_amount', 'last_payment_amount',
+                                        'is_overdue', 'apr_percentage', 'created_at'])
+    return SignalFrames(pd.DataFrame(rows), accounts, liabilities, as_of=AS_OF)
+
+
+@pytest.fixture
+def population():
+    """Transactions, accounts and liabilities of two users."""
+    accounts = pd.DataFrame([
+        {'account_id': 'chk_a', 'user_id': 'user_a', 'type': 'checking', 'subtype': 'checking',
+         'mask': '1111', 'current_balance': 3000.0, 'credit_limit': None},
+        {'account_id': 'sav_a', 'user_id': 'user_a', 'type': 'savings', 'subtype': 'savings',
+         'mask': '2222', 'current_balance': 1200.0, 'credit_limit': None},
+        {'account_id': 'cc_a', 'user_id': 'user_a', 'type': 'credit_card', 'subtype': 'credit card',
+         'mask': '3333', 'current_balance': 800.0, 'credit_limit': 1000.0},
+        {'account_id': 'chk_b', 'user_id': 'user_b', 'type': 'checking', 'subtype': 'checking',
+         'mask': '4444', 'current_balance': 500.0, 'credit_limit': None},
+    ])
+
+    liabilities = pd.DataFrame([
+        {'account_id': 'cc_a', 'type': 'credit_card', 'minimum_payment_amount': 40.0,
+         'last_payment_amount': 60.0, 'is_overdue': 0, 'apr_percentage': 24.99,
+         'created_at': '2025-05-01'},
+        {'account_id': 'cc_a', 'type': 'credit_card', 'minimum_payment_amount': 25.0,
+         'last_payment_amount': 25.0, 'is_overdue': 1, 'apr_percentage': 24.99,
+         'created_at': '2025-06-01'},
+    ])
+
+    rows = []
+    # Biweekly payroll
+    for date in ['2025-05-02', '2025-05-16', '2025-05-30', '2025-06-13', '2025-06-27']:
+        rows.append(transaction('user_a', 'chk_a', date, 2000.0, 'Acme Corp', 'INCOME', 'PAYROLL'))
+    # Monthly subscription and rent
+    for date in ['2025-04-10', '2025-05-10', '2025-06-09']:
+        rows.append(transaction('user_a', 'chk_a', date, -15.99, 'Netflix', 'ENTERTAINMENT', 'SUBSCRIPTION'))
+    for date in ['2025-04-01', '2025-05-01', '2025-06-01']:
+        rows.append(transaction('user_a', 'chk_a', date, -1000.0, 'Oak Apartments', 'RENT_AND_UTILITIES', 'RENT'))
+    rows.append(transaction('user_a', 'chk_a', '2025-06-25', -5.0, 'Blue Bottle', 'FOOD_AND_DRINK', 'COFFEE_SHOPS'))
+    rows.append(transaction('user_a', 'cc_a', '2025-06-20', -12.5, None, 'BANK_FEES', 'INTEREST_CHARGED'))
+    rows.append(transaction('user_a', 'sav_a', '2025-06-15', 200.0, None, 'TRANSFER', 'SAVINGS'))
+    rows.append(transaction('user_a', 'sav_a', '2025-06-20', -50.0, None, 'TRANSFER', 'SAVINGS'))
+
+    return pd.DataFrame(rows), accounts, liabilities
+
+
+@pytest.fixture
+def frames(population):
+    """SignalFrames over the population."""
+    transactions, accounts, liabilities = population
+    return SignalFrames(transactions, accounts, liabilities, as_of=AS_OF)
+
+
+@pytest.fixture
+def signal_db(population):
+    """In-memory database with the population and an ingest-layout user_signals table."""
+    transactions, accounts, liabilities = population
+    conn = sqlite3.connect(':memory:')
+    pd.DataFrame({'user_id': ['user_a', 'user_b']}).to_sql('users', conn, index=False)
+    transactions.to_sql('transactions', conn, index=False)
+    accounts.to_sql('accounts', conn, index=False)
+    liabilities.to_sql('liabilities', conn, index=False)
+    conn.execute("""
+        CREATE TABLE user_signals (
+            signal_id TEXT PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            window_type TEXT NOT NULL,
+            signal_category TEXT NOT NULL,
+            signal_data TEXT NOT NULL,
+            detected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    yield conn
+    conn.close()
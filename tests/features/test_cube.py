@@ -0,0 +1,104 @@
+"""
+Tests for cash-flow signals from daily category totals.
+
+Tests cover:
+- Window totals from running sums against sums over the transactions
+- The cash_flow block, including top categories and users without data
+- Reading one user from a database whose windows end on the population's last day
+- Parsing window keys
+"""
+
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from features import DailyTotals, window_days
+from features.cube import EMPTY_CASH_FLOW, MEASURES
+from ingest.daily_totals import refresh_daily_totals
+from tests.features.conftest import AS_OF
+
+
+@pytest.fixture
+def totals_db(population):
+    """In-memory database with the population's transactions and their daily totals."""
+    transactions, _, _ = population
+    conn = sqlite3.connect(':memory:')
+    transactions.to_sql('transactions', conn, index=False)
+    refresh_daily_totals(conn)
+    yield conn
+    conn.close()
+
+
+def brute_force(transactions: pd.DataFrame, user_id: str, days: int) -> dict:
+    """Sum a user's transactions of the last days up to AS_OF."""
+    start = (np.datetime64(AS_OF) - days + 1).astype(str)
+    tx = transactions[(transactions['user_id'] == user_id) & (transactions['date'] >= start)
+                      & (transactions['date'] <= AS_OF)]
+    spend = tx['amount'] < 0
+    return {
+        'transaction_count': len(tx),
+        'total_inflow': round(tx.loc[tx['amount'] > 0, 'amount'].sum(), 2),
+        'total_outflow': round(-tx.loc[spend, 'amount'].sum(), 2),
+        'total_spend': round(-tx.loc[spend & ~tx['category_primary'].isin(['INCOME', 'TRANSFER']), 'amount'].sum(), 2)
+    }
+
+
+class TestDailyTotals:
+    """Test window signals from running sums."""
+
+    @pytest.mark.parametrize('days', [1, 7, 30, 45, 90, 180])
+    def test_matches_transactions(self, totals_db, population, days):
+        signals = DailyTotals.from_database(totals_db, as_of=AS_OF).signals(days).loc['user_a']
+        for column, expected in brute_force(population[0], 'user_a', days).items():
+            assert signals[column] == pytest.approx(expected), column
+
+    def test_cash_flow_block(self, totals_db):
+        signals = DailyTotals.from_database(totals_db, as_of=AS_OF).signals(30).loc['user_a']
+        # June: two paychecks, a 200 savings deposit; rent, Netflix, coffee, interest, 50 withdrawal
+        assert signals['income_inflow'] == 4000.0
+        assert signals['total_inflow'] == 4200.0
+        assert signals['total_outflow'] == 1000 + 15.99 + 5 + 12.5 + 50
+        assert signals['net_cash_flow'] == round(4200 - 1083.49, 2)
+        assert signals['total_spend'] == 1000 + 15.99 + 5 + 12.5
+        assert signals['monthly_spend'] == signals['total_spend']
+        assert [item['category'] for item in signals['top_categories']] == \
+            ['RENT_AND_UTILITIES', 'ENTERTAINMENT', 'BANK_FEES']
+        assert signals['top_categories'][0]['share_pct'] == round(1000 * 100 / 1033.49, 2)
+
+    def test_one_user_from_database(self, totals_db):
+        # user_a's last transaction is 2025-06-27; windows still end on the population's last day
+        totals_db.execute("INSERT INTO daily_category_totals VALUES ('user_c', ?, 'SHOPPING', 1, 0, 9.5, 9.5)", (AS_OF,))
+        totals = DailyTotals.from_database(totals_db, user_ids=['user_a'])
+        assert list(totals.user_ids) == ['user_a']
+        assert totals.as_of_date == AS_OF
+        assert totals.signals(1).loc['user_a', 'transaction_count'] == 0
+
+    def test_user_without_rows(self, totals_db):
+        totals = DailyTotals.from_database(totals_db, user_ids=['user_a', 'user_b'], as_of=AS_OF)
+        assert totals.signals(30).loc['user_b'].to_dict() == EMPTY_CASH_FLOW
+
+    def test_window_array(self, totals_db):
+        totals = DailyTotals.from_database(totals_db, as_of=AS_OF)
+        window = totals.window(90)
+        assert window.shape == (1, len(totals.categories), len(MEASURES))
+        # 90 days up to 2025-06-30 start on 2025-04-02: only the 2025-04-01 rent falls out
+        assert window[..., 0].sum() == totals.window(180)[..., 0].sum() - 1
+
+    def test_missing_table(self):
+        with pytest.raises(ValueError):
+            DailyTotals.from_database(sqlite3.connect(':memory:'))
+
+
+class TestWindowDays:
+    """Test window key parsing."""
+
+    @pytest.mark.parametrize('window_type, days', [('7d', 7), ('30d', 30), ('365d', 365)])
+    def test_valid(self, window_type, days):
+        assert window_days(window_type) == days
+
+    @pytest.mark.parametrize('window_type', ['0d', '7', 'd', '7w', '-7d', ''])
+    def test_invalid(self, window_type):
+        with pytest.raises(ValueError):
+            window_days(window_type)
@@ -0,0 +1,162 @@
+"""
+Tests for rolling-window signal maintenance.
+
+Tests cover:
+- Day-by-day and multi-day advances matching a full recompute
+- Balance updates reaching the credit and savings blocks
+- Rejecting stale transactions and mismatched verification frames
+- SignalEngine serving advanced windows
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from features import RollingSignals, SignalEngine, SignalFrames
+from tests.features.conftest import AS_OF, transaction
+
+# History is cut here and the remaining days are added with advance()
+CUT = '2025-05-31'
+
+
+def random_history(num_users: int, seed: int = 11):
+    """Six months of payroll, bills, card interest and savings flows for some users."""
+    rng = np.random.default_rng(seed)
+    days = pd.date_range('2025-01-01', AS_OF).strftime('%Y-%m-%d')
+    rows, accounts = [], []
+    for index in range(num_users):
+        user_id = f'user_{index:03d}'
+        checking, savings, card = f'chk_{index}', f'sav_{index}', f'cc_{index}'
+        accounts.extend([
+            {'account_id': checking, 'user_id': user_id, 'type': 'checking', 'subtype': 'checking',
+             'mask': '0000', 'current_balance': float(rng.uniform(100, 5000)), 'credit_limit': None},
+            {'account_id': savings, 'user_id': user_id, 'type': 'savings', 'subtype': 'savings',
+             'mask': '0001', 'current_balance': float(rng.uniform(0, 8000)), 'credit_limit': None},
+            {'account_id': card, 'user_id': user_id, 'type': 'credit_card', 'subtype': 'credit card',
+             'mask': '0002', 'current_balance': float(rng.uniform(0, 900)), 'credit_limit': 1000.0},
+        ])
+
+        pay_step, pay_start = [7, 14, 30][index % 3], int(rng.integers(0, 7))
+        for day in days[pay_start::pay_step]:
+            rows.append(transaction(user_id, checking, day, round(float(rng.normal(1500, 150)), 2),
+                                    'Acme Corp', 'INCOME', 'PAYROLL'))
+        for day in days[int(rng.integers(0, 30))::30]:
+            rows.append(transaction(user_id, checking, day, -12.99, 'Streamly', 'ENTERTAINMENT', 'SUBSCRIPTION'))
+            rows.append(transaction(user_id, card, day, -round(float(rng.uniform(5, 20)), 2), None,
+                                    'BANK_FEES', 'INTEREST_CHARGED'))
+        for day in rng.choice(days, 40):
+            rows.append(transaction(user_id, checking, day, -round(float(rng.uniform(3, 60)), 2),
+                                    f'Shop {rng.integers(5)}', 'FOOD_AND_DRINK', 'COFFEE_SHOPS'))
+        for day in rng.choice(days, 12):
+            rows.append(transaction(user_id, savings, day, round(float(rng.uniform(-300, 500)), 2), None,
+                                    'TRANSFER', 'SAVINGS'))
+
+    liabilities = pd.DataFrame([
+        {'account_id': f'cc_{index}', 'type': 'credit_card', 'minimum_payment_amount': 25.0,
+         'last_payment_amount': float(rng.choice([25.0, 100.0])), 'is_overdue': int(rng.integers(2)),
+         'apr_percentage': 22.9, 'created_at': '2025-06-01'}
+        for index in range(num_users)
+    ])
+    transactions = pd.DataFrame(rows).sort_values('date', kind='stable', ignore_index=True)
+    return transactions, pd.DataFrame(accounts), liabilities
+
+
+@pytest.fixture
+def history():
+    """Transactions, accounts and liabilities of twelve users."""
+    return random_history(12)
+
+
+def build(history, as_of=CUT):
+    """RollingSignals over the history up to as_of."""
+    transactions, accounts, liabilities = history
+    return RollingSignals(SignalFrames(transactions[transactions['date'] <= as_of], accounts.copy(),
+                                       liabilities, as_of=as_of))
+
+
+def full_frames(history, as_of=AS_OF, accounts=None):
+    """SignalFrames over the history up to as_of (a full recompute)."""
+    transactions, all_accounts, liabilities = history
+    accounts = all_accounts if accounts is None else accounts
+    return SignalFrames(transactions[transactions['date'] <= as_of], accounts, liabilities, as_of=as_of)
+
+
+class TestRollingSignals:
+    """Test moving the windows forward."""
+
+    def test_builds_like_full_recompute(self, history):
+        assert build(history).verify(full_frames(history, CUT)) == []
+
+    def test_daily_advance(self, history):
+        transactions = history[0]
+        rolling = build(history)
+        for day in pd.date_range('2025-06-01', AS_OF).strftime('%Y-%m-%d'):
+            rolling.advance(transactions[transactions['date'] == day], as_of=day)
+            if day in ('2025-06-01', '2025-06-15'):
+                assert rolling.verify(full_frames(history, day)) == []
+        assert rolling.verify(full_frames(history)) == []
+
+    def test_multi_day_advance(self, history):
+        transactions = history[0]
+        rolling = build(history)
+        rolling.advance(transactions[transactions['date'] > CUT])
+        assert rolling.verify(full_frames(history)) == []
+
+    def test_balances(self, history):
+        transactions, accounts, _ = history
+        rolling = build(history)
+        balances = pd.DataFrame({'account_id': ['cc_0', 'sav_0', 'unknown'],
+                                 'current_balance': [950.0, 10.0, 1.0]})
+        rolling.advance(transactions[transactions['date'] > CUT], balances)
+
+        updated = accounts.copy()
+        updated.loc[updated['account_id'] == 'cc_0', 'current_balance'] = 950.0
+        updated.loc[updated['account_id'] == 'sav_0', 'current_balance'] = 10.0
+        assert rolling.verify(full_frames(history, accounts=updated)) == []
+        assert rolling.credit().loc['user_000', 'aggregate_utilization_pct'] == 95.0
+        assert rolling.savings('30d').loc['user_000', 'total_savings_balance'] == 10.0
+
+    def test_quiet_day(self, history):
+        rolling = build(history)
+        rolling.advance(history[0].iloc[:0], as_of='2025-06-01')
+        # Only eviction happens: the windows end a day later without new rows
+        expected = full_frames(history, '2025-06-01')
+        expected.transactions = expected.transactions[expected.transactions['day'] < expected.as_of]
+        assert rolling.verify(expected) == []
+
+    def test_rejects_stale_transactions(self, history):
+        transactions = history[0]
+        rolling = build(history)
+        with pytest.raises(ValueError):
+            rolling.advance(transactions[transactions['date'] == CUT])
+        with pytest.raises(ValueError):
+            rolling.advance(transactions[transactions['date'] == '2025-06-03'], as_of='2025-06-02')
+
+    def test_verify_needs_same_as_of(self, history):
+        with pytest.raises(ValueError):
+            build(history).verify(full_frames(history))
+
+    def test_unknown_window(self, history):
+        transactions, accounts, liabilities = history
+        with pytest.raises(ValueError):
+            RollingSignals(SignalFrames(transactions, accounts, liabilities), windows=['7d'])
+
+
+class TestSignalEngineAdvance:
+    """Test the engine serving rolled-forward windows."""
+
+    def test_advance_matches_full_recompute(self, history):
+        transactions = history[0]
+        engine = SignalEngine(None, frames=build(history).frames)
+        engine.compute('30d')
+        engine.advance(transactions[transactions['date'] > CUT])
+
+        expected = SignalEngine(None, frames=full_frames(history))
+        for window_type in ['30d', '180d']:
+            blocks = engine.compute(window_type)
+            for category, frame in expected.compute(window_type).items():
+                assert blocks[category].index.equals(frame.index)
+        assert engine.rolling.verify(full_frames(history)) == []
+        assert 'rolling.advance' in engine.timings
+        assert engine.user_signals('user_001', '30d')['income']['num_deposits_in_window'] == \
+            expected.user_signals('user_001', '30d')['income']['num_deposits_in_window']
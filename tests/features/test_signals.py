@@ -0,0 +1,199 @@
+"""
+Tests for the behavioral signal engine.
+
+Tests cover:
+- Each signal block against values worked out by hand
+- Users without data getting the empty blocks
+- Storing legacy JSON signals in the ingest and persona user_signals layouts
+- PersonaAssigner reading the stored signals
+"""
+
+import json
+
+import pytest
+
+from features import (
+    CreditAnalyzer, IncomeAnalyzer, SavingsAnalyzer, SignalEngine, SignalFrames, SubscriptionDetector
+)
+from features.credit import EMPTY_CREDIT
+from features.income import EMPTY_INCOME
+from features.savings import EMPTY_SAVINGS
+from personas.assignment import PersonaAssigner
+from tests.features.conftest import AS_OF
+
+# Checking debits of user_a: 1015.99 in April and May, 1020.99 in June
+MONTHLY_EXPENSES = (1015.99 * 3 + 5) / 3
+
+
+class TestSignalFrames:
+    """Test the shared population tables."""
+
+    def test_users_and_window(self, frames):
+        assert list(frames.user_ids) == ['user_a', 'user_b']
+        assert len(frames) == 2
+        # 30 days up to 2025-06-30 start on 2025-06-01
+        in_window = frames.transactions.loc[frames.in_window(30), 'day']
+        assert in_window.min() == frames.as_of - 29
+
+    def test_as_of_defaults_to_latest_transaction(self, population):
+        frames = SignalFrames(*population)
+        assert frames.as_of == SignalFrames(*population, as_of='2025-06-27').as_of
+
+    def test_monthly_expenses(self, frames):
+        expenses = frames.monthly_expenses()
+        assert expenses[0] == pytest.approx(MONTHLY_EXPENSES)
+        assert expenses[1] == 0
+
+
+class TestCreditAnalyzer:
+    """Test the credit block."""
+
+    def test_utilization_and_flags(self, frames):
+        credit = CreditAnalyzer().calculate(frames).loc['user_a']
+        assert credit['aggregate_utilization_pct'] == 80.0
+        assert credit['total_credit_used'] == 800.0
+        assert credit['total_credit_available'] == 200.0
+        assert credit['any_card_high_util']
+        assert credit['any_card_very_high_util']
+        assert credit['any_interest_charges']
+        assert credit['any_overdue']
+        assert credit['num_credit_cards'] == 1
+
+    def test_card_uses_latest_liability(self, frames):
+        card, = CreditAnalyzer().calculate(frames).loc['user_a', 'cards']
+        assert card['account_id'] == 'cc_a'
+        assert card['minimum_payment'] == 25.0
+        assert card['minimum_payment_only']
+        assert card['interest_charges'] == 12.5
+        assert card['utilization_pct'] == 80.0
+
+    def test_user_without_cards(self, frames):
+        credit = CreditAnalyzer().calculate(frames).loc['user_b']
+        assert credit.to_dict() == EMPTY_CREDIT
+
+
+class TestIncomeAnalyzer:
+    """Test the income block."""
+
+    def test_biweekly_payroll(self, frames):
+        income = IncomeAnalyzer().calculate(frames, 180).loc['user_a']
+        assert income['payment_frequency'] == 'biweekly'
+        assert income['income_type'] == 'payroll'
+        assert income['median_pay_gap_days'] == 14
+        assert income['income_variability_pct'] == 0.0
+        assert income['num_deposits_in_window'] == 5
+        assert income['median_deposit_amount'] == 2000.0
+        assert income['cash_flow_buffer_months'] == round(3000 / MONTHLY_EXPENSES, 2)
+
+    def test_recent_deposits(self, frames):
+        recent = IncomeAnalyzer().calculate(frames, 180).loc['user_a', 'recent_deposits']
+        assert [deposit['date'] for deposit in recent][-2:] == ['2025-06-13', '2025-06-27']
+        assert [deposit['days_since_last'] for deposit in recent] == [None, 14, 14, 14, 14]
+
+    def test_window_limits_deposits(self, frames):
+        income = IncomeAnalyzer().calculate(frames, 30).loc['user_a']
+        assert income['num_deposits_in_window'] == 2
+
+    def test_user_without_deposits(self, frames):
+        income = IncomeAnalyzer().calculate(frames, 30).loc['user_b']
+        assert income.to_dict() == EMPTY_INCOME
+
+
+class TestSubscriptionDetector:
+    """Test the subscriptions block."""
+
+    def test_detects_monthly_merchant(self, frames):
+        recurring = SubscriptionDetector().detect_recurring(frames, 90)
+        assert len(recurring) == 1
+        merchant = recurring.iloc[0]
+        assert merchant['name'] == 'Netflix'
+        assert merchant['frequency'] == 'monthly'
+        assert merchant['amount'] == 15.99
+        assert merchant['last_charge_date'] == '2025-06-09'
+        assert merchant['charges_in_window'] == 3
+
+    def test_rent_is_not_a_subscription(self, frames):
+        recurring = SubscriptionDetector().detect_recurring(frames, 90)
+        assert 'Oak Apartments' not in set(recurring['name'])
+
+    def test_too_few_charges(self, frames):
+        # 60 days back only reaches two Netflix charges
+        assert len(SubscriptionDetector().detect_recurring(frames, 60)) == 0
+
+    def test_shares(self, frames):
+        subscriptions = SubscriptionDetector().calculate(frames, 30).loc['user_a']
+        outflows = 1000 + 15.99 + 5 + 12.5 + 50
+        assert subscriptions['recurring_merchant_count'] == 1
+        assert subscriptions['monthly_recurring_spend'] == 15.99
+        assert subscriptions['subscription_share_pct'] == round(15.99 * 100 / outflows, 2)
+        assert subscriptions['coffee_food_delivery_monthly'] == 5.0
+        assert subscriptions['merchants'][0]['name'] == 'Netflix'
+
+    def test_user_without_subscriptions(self, frames):
+        subscriptions = SubscriptionDetector().calculate(frames, 30).loc['user_b']
+        assert subscriptions['recurring_merchant_count'] == 0
+        assert subscriptions['merchants'] == []
+
+
+class TestSavingsAnalyzer:
+    """Test the savings block."""
+
+    def test_savings_flows(self, frames):
+        savings = SavingsAnalyzer().calculate(frames, 30).loc['user_a']
+        assert savings['net_savings_inflow'] == 150.0
+        assert savings['total_savings_balance'] == 1200.0
+        # Balance 30 days ago: 1200 - 150
+        assert savings['savings_growth_rate_pct'] == round(150 * 100 / 1050, 2)
+        assert savings['emergency_fund_months'] == round(1200 / MONTHLY_EXPENSES, 2)
+        assert savings['num_savings_accounts'] == 1
+        assert savings['largest_deposit'] == 200.0
+        assert savings['largest_withdrawal'] == 50.0
+
+    def test_inflow_is_monthly(self, frames):
+        savings = SavingsAnalyzer().calculate(frames, 180).loc['user_a']
+        assert savings['net_savings_inflow'] == 25.0
+
+    def test_user_without_savings(self, frames):
+        savings = SavingsAnalyzer().calculate(frames, 30).loc['user_b']
+        assert savings.to_dict() == EMPTY_SAVINGS
+
+
+class TestSignalEngine:
+    """Test computing and storing every block."""
+
+    def test_user_signals(self, signal_db):
+        engine = SignalEngine(signal_db, as_of=AS_OF)
+        signals = engine.user_signals('user_a', '30d')
+        assert set(signals) == {'credit', 'income', 'subscriptions', 'savings'}
+        assert signals['income']['num_deposits_in_window'] == 2
+        assert isinstance(signals['credit']['num_credit_cards'], int)
+
+    def test_unknown_user_and_window(self, signal_db):
+        engine = SignalEngine(signal_db, as_of=AS_OF)
+        with pytest.raises(ValueError):
+            engine.user_signals('user_z')
+        with pytest.raises(ValueError):
+            engine.compute('7d')
+
+    def test_store_ingest_layout(self, signal_db):
+        engine = SignalEngine(signal_db, as_of=AS_OF)
+        assert engine.generate_all() == {'30d': 2, '180d': 2}
+        # Storing again replaces the window
+        engine.store('30d')
+
+        rows = signal_db.execute(
+            "SELECT signal_id, signal_data FROM user_signals WHERE user_id = 'user_a' AND window_type = '30d'"
+            " AND signal_category = 'savings'"
+        ).fetchall()
+        assert len(rows) == 1
+        assert rows[0][0] == 'sig_user_a_30d_savings'
+        assert json.loads(rows[0][1])['net_savings_inflow'] == 150.0
+        assert signal_db.execute("SELECT COUNT(*) FROM user_signals").fetchone()[0] == 16
+
+    def test_persona_assignment_from_stored_signals(self, test_db, frames):
+        test_db.execute("INSERT INTO users (user_id) VALUES ('user_a'), ('user_b')")
+        SignalEngine(test_db, frames=frames).generate_all()
+
+        result = PersonaAssigner(test_db).assign_personas('user_a', '30d')
+        assert result['primary_persona'] == 'high_utilization'
+        assert result['criteria_met']['aggregate_utilization_pct'] == 80.0
@@ -0,0 +1,121 @@
+"""
+Tests for the typed signal table.
+
+Tests cover:
+- Round trips of every block through user_signal_values
+- Replacing a window and leaving other windows alone
+- Population queries over typed columns
+- PersonaAssigner reading typed signals, and falling back to JSON rows
+"""
+
+import sqlite3
+
+import pytest
+
+from features import SIGNAL_TABLE, SignalEngine, read_signal_frame, read_user_signals
+from features.store import SIGNAL_COLUMNS, create_signal_table, has_signal_table
+from personas.assignment import PersonaAssigner
+from tests.features.conftest import AS_OF
+
+
+@pytest.fixture
+def engine(signal_db):
+    """SignalEngine over the population with both windows stored."""
+    engine = SignalEngine(signal_db, as_of=AS_OF)
+    engine.generate_all()
+    return engine
+
+
+class TestSignalTable:
+    """Test writing and reading user_signal_values."""
+
+    def test_schema(self):
+        conn = sqlite3.connect(':memory:')
+        assert not has_signal_table(conn)
+        create_signal_table(conn)
+        types = {row[1]: row[2] for row in conn.execute(f"PRAGMA table_info({SIGNAL_TABLE})")}
+        assert types['aggregate_utilization_pct'] == 'REAL'
+        assert types['num_credit_cards'] == 'INTEGER'
+        assert types['any_overdue'] == 'INTEGER'
+        assert types['income_type'] == 'TEXT'
+        assert types['merchants'] == 'TEXT'
+        assert set(SIGNAL_COLUMNS) < set(types)
+
+    @pytest.mark.parametrize('window_type', ['30d', '180d'])
+    def test_round_trip(self, engine, signal_db, window_type):
+        for user_id in ('user_a', 'user_b'):
+            stored = read_user_signals(signal_db, user_id, window_type)
+            expected = engine.user_signals(user_id, window_type)
+            assert stored == expected
+            for category, block in expected.items():
+                for field, value in block.items():
+                    assert type(stored[category][field]) is type(value), field
+
+    def test_store_replaces_window(self, engine, signal_db):
+        engine.store('30d')
+        counts = dict(signal_db.execute(f"SELECT window_type, COUNT(*) FROM {SIGNAL_TABLE} GROUP BY window_type"))
+        assert counts == {'30d': 2, '180d': 2}
+        # Legacy JSON rows are written by default
+        assert signal_db.execute("SELECT COUNT(*) FROM user_signals").fetchone()[0] == 16
+
+    def test_without_json_blobs(self, signal_db):
+        SignalEngine(signal_db, as_of=AS_OF, json_blobs=False).generate_all()
+        assert signal_db.execute(f"SELECT COUNT(*) FROM {SIGNAL_TABLE}").fetchone()[0] == 4
+        assert signal_db.execute("SELECT COUNT(*) FROM user_signals").fetchone()[0] == 0
+
+    def test_missing_rows(self, engine, signal_db):
+        assert read_user_signals(signal_db, 'user_z', '30d') is None
+        assert read_user_signals(signal_db, 'user_a', '90d') is None
+        assert read_user_signals(sqlite3.connect(':memory:'), 'user_a', '30d') is None
+
+    def test_row_factory(self, engine, signal_db):
+        signal_db.row_factory = sqlite3.Row
+        assert read_user_signals(signal_db, 'user_a', '30d')['income']['num_deposits_in_window'] == 2
+        assert len(read_signal_frame(signal_db, '30d')) == 2
+
+
+class TestSignalFrame:
+    """Test population reads over typed columns."""
+
+    def test_frame(self, engine, signal_db):
+        frame = read_signal_frame(signal_db, '30d')
+        assert list(frame.columns) == list(SIGNAL_COLUMNS)
+        assert frame.loc['user_a', 'any_card_high_util'] == True  # noqa: E712
+        assert frame.loc['user_a', 'cards'][0]['utilization_pct'] == 80.0
+        assert frame.loc['user_b', 'merchants'] == []
+
+    def test_filter(self, engine, signal_db):
+        frame = read_signal_frame(signal_db, '30d', columns=['aggregate_utilization_pct'],
+                                  where='aggregate_utilization_pct > ?', params=(50,))
+        assert frame.to_dict('index') == {'user_a': {'aggregate_utilization_pct': 80.0}}
+        count = signal_db.execute(
+            f"SELECT COUNT(*) FROM {SIGNAL_TABLE} WHERE window_type = '30d' AND any_card_high_util"
+        ).fetchone()[0]
+        assert count == 1
+
+    def test_invalid(self, engine, signal_db):
+        with pytest.raises(ValueError):
+            read_signal_frame(signal_db, '30d', columns=['not_a_signal'])
+        with pytest.raises(ValueError):
+            read_signal_frame(sqlite3.connect(':memory:'), '30d')
+
+
+class TestPersonaAssignment:
+    """Test PersonaAssigner reading the stored signals."""
+
+    def test_typed_signals(self, test_db, frames):
+        test_db.execute("INSERT INTO users (user_id) VALUES ('user_a'), ('user_b')")
+        SignalEngine(test_db, frames=frames, json_blobs=False).generate_all()
+        assert test_db.execute("SELECT COUNT(*) FROM user_signals").fetchone()[0] == 0
+
+        result = PersonaAssigner(test_db).assign_personas('user_a', '30d')
+        assert result['primary_persona'] == 'high_utilization'
+
+    def test_json_fallback(self, test_db, frames):
+        test_db.execute("INSERT INTO users (user_id) VALUES ('user_a'), ('user_b')")
+        SignalEngine(test_db, frames=frames).generate_all()
+        test_db.execute(f"DROP TABLE {SIGNAL_TABLE}")
+
+        result = PersonaAssigner(test_db).assign_personas('user_a', '30d')
+        assert result['primary_persona'] == 'high_utilization'
+        assert result['criteria_met']['aggregate_utilization_pct'] == 80.0
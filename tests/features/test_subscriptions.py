@@ -0,0 +1,86 @@
+"""
+Tests for the sort-and-diff recurring merchant detector.
+
+Tests cover:
+- Agreement with a per-(user, merchant) reference implementation
+- Cadence and amount variation edge cases
+- Classifying every charge in one pass
+"""
+
+import numpy as np
+import pytest
+
+from features import SignalFrames, SubscriptionDetector
+from features.subscriptions import CADENCES, MAX_AMOUNT_VARIATION_PCT, MIN_RECURRING_CHARGES
+from tests.features.conftest import AS_OF, random_population, transaction
+
+
+def reference_recurring(frames: SignalFrames, lookback_days: int) -> set:
+    """Apply the recurring rule one (user, merchant) at a time."""
+    tx = frames.transactions
+    charges = tx[frames.in_window(lookback_days) & (tx['amount'] < 0).to_numpy()]
+    found = set()
+    for (user, merchant), group in charges.groupby(['user', 'merchant']):
+        if len(group) < MIN_RECURRING_CHARGES:
+            continue
+        amounts = -group['amount']
+        if amounts.std() * 100 / amounts.mean() > MAX_AMOUNT_VARIATION_PCT:
+            continue
+        gap = np.median(np.diff(np.sort(group['day'].to_numpy())))
+        for name, low, high in CADENCES:
+            if low <= gap <= high:
+                found.add((frames.user_ids[user], frames.merchant_names[merchant], name, len(group)))
+                break
+    return found
+
+
+class TestDetectRecurring:
+    """Test recurring merchant detection."""
+
+    @pytest.mark.parametrize('lookback_days', [60, 90, 180])
+    def test_matches_reference(self, lookback_days):
+        frames = random_population(40)
+        recurring = SubscriptionDetector().detect_recurring(frames, lookback_days)
+        found = {
+            (frames.user_ids[row.user], row.name, row.frequency, row.charges_in_window)
+            for row in recurring.itertuples()
+        }
+        expected = reference_recurring(frames, lookback_days)
+        assert expected
+        assert found == expected
+
+    def test_cadence_bounds(self, frames):
+        # Netflix charges 30 days apart are monthly; 40 days apart are not
+        recurring = SubscriptionDetector().detect_recurring(frames, 90)
+        assert list(recurring['frequency']) == ['monthly']
+
+        tx = frames.transactions
+        netflix = tx['merchant'] == list(frames.merchant_names).index('Netflix')
+        tx.loc[netflix & (tx['day'] == tx.loc[netflix, 'day'].min()), 'day'] -= 10
+        tx.loc[netflix & (tx['day'] == tx.loc[netflix, 'day'].max()), 'day'] += 10
+        assert len(SubscriptionDetector().detect_recurring(frames, 120)) == 0
+
+    def test_no_charges(self, frames):
+        frames.transactions['amount'] = frames.transactions['amount'].abs()
+        recurring = SubscriptionDetector().detect_recurring(frames, 90)
+        assert len(recurring) == 0
+        assert SubscriptionDetector().calculate(frames, 30)['recurring_merchant_count'].sum() == 0
+
+    def test_single_pass(self, monkeypatch):
+        # Every charge in the window goes through one recurring_series call:
+        # no per-user or per-merchant work (timings: tests/test_performance.py)
+        frames = random_population(200)
+        detector = SubscriptionDetector()
+        calls = []
+        recurring_series = detector.recurring_series
+
+        def counting(series, offset, amount, span):
+            calls.append(len(series))
+            return recurring_series(series, offset, amount, span)
+
+        monkeypatch.setattr(detector, 'recurring_series', counting)
+        detector.detect_recurring(frames, 90)
+
+        tx = frames.transactions
+        charges = frames.in_window(90) & (tx['amount'] < 0).to_numpy()
+        assert calls == [int(charges.sum())]
@@ -346,6 +346,450 @@ class TestSchemaValidation:
         
         with pytest.raises(ValueError, match="Duplicate user_ids"):
             validator.validate_users(invalid_df)
+    
+    def test_reported_rows(self):
+        """Test that row-level checks report the offending rows."""
+        from ingest.validator import SchemaValidator
+        
+        validator = SchemaValidator()
+        
+        users_df = pd.DataFrame({
+            'user_id': ['user_001', 'user_002', 'user_003', 'user_004'],
+            'name': ['A', 'B', 'C', 'D'],
+            'email': ['a@example.com', 'not-an-email', None, 'd@example'],
+            'metadata': ['{"age": 30}', '{broken', None, '{"age": 40}']
+        })
+        with pytest.raises(ValueError) as error:
+            validator.validate_users(users_df)
+        assert "Invalid email formats at rows: [(1, 'not-an-email'), (3, 'd@example')]" in str(error.value)
+        assert "Invalid JSON in metadata at rows: [1]" in str(error.value)
+        
+        transactions_df = pd.DataFrame({
+            'transaction_id': ['txn_001', 'txn_002', 'txn_003', 'txn_004'],
+            'account_id': ['acc_001'] * 4,
+            'user_id': ['user_001'] * 4,
+            'date': ['2025-05-01', '2025-04-30', '2025-10-31', '2025-11-01'],
+            'amount': pd.Series([12.5, '7.25', 3, 'abc'], dtype=object)
+        })
+        with pytest.raises(ValueError) as error:
+            validator.validate_transactions(transactions_df)
+        assert "Non-numeric amounts at rows: [1, 3]" in str(error.value)
+        assert "Dates out of range (2025-05-01 to 2025-10-31) at rows: [1, 3]" in str(error.value)
+
+    def test_missing_amounts(self):
+        """Test that missing amounts in an object column are non-numeric."""
+        from ingest.validator import SchemaValidator
+
+        validator = SchemaValidator()
+
+        transactions_df = pd.DataFrame({
+            'transaction_id': ['txn_001', 'txn_002', 'txn_003', 'txn_004'],
+            'account_id': ['acc_001'] * 4,
+            'user_id': ['user_001'] * 4,
+            'date': ['2025-05-01'] * 4,
+            'amount': pd.Series([1.0, None, 'x', 2], dtype=object)
+        })
+        with pytest.raises(ValueError) as error:
+            validator.validate_transactions(transactions_df)
+        assert "Non-numeric amounts at rows: [1, 2]" in str(error.value)
+
+    def test_valid_numeric_columns(self):
+        """Test that numeric and missing values pass the numeric checks."""
+        from ingest.validator import SchemaValidator
+        
+        validator = SchemaValidator()
+        
+        liabilities_df = pd.DataFrame({
+            'liability_id': ['liab_001', 'liab_002'],
+            'account_id': ['acc_001', 'acc_002'],
+            'user_id': ['user_001', 'user_002'],
+            'type': ['credit_card', 'mortgage'],
+            'apr_percentage': [19.99, None],
+            'minimum_payment_amount': pd.Series([25, None], dtype=object),
+            'last_payment_date': ['2025-10-01', None]
+        })
+        validator.validate_liabilities(liabilities_df)
+        
+        liabilities_df.loc[1, 'last_payment_date'] = 'someday'
+        with pytest.raises(ValueError, match="Invalid date format in last_payment_date"):
+            validator.validate_liabilities(liabilities_df)
+    
+    def test_report_is_bounded(self):
+        """Test that a badly broken frame yields counts and a capped sample."""
+        from ingest.validator import SchemaValidator
+        
+        validator = SchemaValidator(sample_size=3)
+        n = 100_000
+        users_df = pd.DataFrame({
+            'user_id': ['user_dup'] * n,
+            'name': ['A'] * n,
+            'email': [f'broken_{i}' for i in range(n)]
+        })
+        
+        with pytest.raises(ValueError) as error:
+            validator.validate_users(users_df)
+        
+        rules = validator.report.to_dict()['rules']
+        assert rules['duplicate_user_id']['count'] == n - 1
+        assert rules['duplicate_user_id']['sample'] == ['user_dup'] * 3
+        assert (rules['email_format']['first_row'], rules['email_format']['last_row']) == (0, n - 1)
+        assert len(str(error.value)) < 1000
+    
+    def test_profiles(self):
+        """Test that fast skips format checks and off skips everything."""
+        from ingest.validator import SchemaValidator
+        
+        users_df = pd.DataFrame({
+            'user_id': ['user_001', 'user_002'],
+            'name': ['A', 'B'],
+            'email': ['not-an-email', 'b@example.com']
+        })
+        
+        with pytest.raises(ValueError, match="Invalid email formats"):
+            SchemaValidator('strict').validate_users(users_df)
+        assert SchemaValidator('fast').validate_users(users_df).passed
+        
+        users_df['user_id'] = 'user_001'
+        with pytest.raises(ValueError, match="Duplicate user_ids"):
+            SchemaValidator('fast').validate_users(users_df)
+        report = SchemaValidator('off').validate_users(users_df.drop(columns='email'))
+        assert report.passed and report.profile == 'off'
+        
+        with pytest.raises(ValueError, match="Unknown validation profile"):
+            SchemaValidator('lenient')
+
+
+class TestVectorizedGeneration:
+    """Test the vectorized NumPy transaction engine."""
+    
+    def _generate(self, num_users: int, vectorized: bool, seed: int = 42) -> pd.DataFrame:
+        generator = SyntheticDataGenerator(num_users=num_users, seed=seed, vectorized=vectorized)
+        users_df = generator.generate_users()
+        accounts_df = generator.generate_accounts(users_df)
+        return generator.generate_transactions(accounts_df)
+    
+    def test_vectorized_columns_match(self):
+        """Test that both engines produce the same columns in the same order."""
+        assert self._generate(5, True).columns.tolist() == self._generate(5, False).columns.tolist()
+    
+    def test_vectorized_date_range(self):
+        """Test that vectorized transactions stay within the date range and are sorted."""
+        transactions_df = self._generate(10, True)
+        
+        assert transactions_df['date'].min() >= DATE_RANGE_START
+        assert transactions_df['date'].max() <= DATE_RANGE_END
+        assert transactions_df['date'].is_monotonic_increasing
+    
+    def test_vectorized_transaction_uniqueness(self):
+        """Test that vectorized transaction IDs are unique."""
+        transactions_df = self._generate(20, True)
+        
+        assert transactions_df['transaction_id'].is_unique, \
+            "Transaction IDs are not unique"
+        assert transactions_df['transaction_id'].str.match(r'^txn_[0-9a-f]{12}$').all()
+    
+    def test_vectorized_counts_per_user(self):
+        """Test that vectorized users have reasonable transaction counts."""
+        transactions_df = self._generate(20, True)
+        txns_per_user = transactions_df.groupby('user_id').size()
+        
+        assert txns_per_user.min() >= 150
+        assert txns_per_user.max() <= 800
+    
+    def test_vectorized_distribution_matches(self):
+        """Test that category counts and mean amounts match the row-by-row engine."""
+        stats_loop = self._generate(50, False).groupby('category_detailed')['amount'].agg(['count', 'mean'])
+        stats_vec = self._generate(50, True).groupby('category_detailed')['amount'].agg(['count', 'mean'])
+        
+        assert set(stats_loop.index) == set(stats_vec.index)
+        for category in stats_loop.index:
+            loop_count, loop_mean = stats_loop.loc[category]
+            vec_count, vec_mean = stats_vec.loc[category]
+            # Per-user draws (subscriptions, pay cadence) are too noisy at this size
+            if loop_count >= 500:
+                assert abs(vec_count - loop_count) <= 0.1 * loop_count, \
+                    f"{category}: count {vec_count} vs {loop_count}"
+            assert abs(vec_mean - loop_mean) <= 0.15 * abs(loop_mean) + 1, \
+                f"{category}: mean {vec_mean:.2f} vs {loop_mean:.2f}"
+    
+    def test_vectorized_locations(self):
+        """Test that only in-person merchants carry a location."""
+        transactions_df = self._generate(10, True)
+        located = transactions_df['location_city'].notna()
+        
+        assert (transactions_df.loc[located, 'category_primary'].isin(['FOOD_AND_DRINK', 'TRANSPORTATION'])).all()
+        assert transactions_df.loc[transactions_df['category_primary'] == 'INCOME', 'location_city'].isna().all()
+    
+    def test_vectorized_reproducible(self):
+        """Test that same seed produces identical vectorized transactions."""
+        txns1 = self._generate(5, True).drop(columns=['created_at', 'account_id', 'user_id'])
+        txns2 = self._generate(5, True).drop(columns=['created_at', 'account_id', 'user_id'])
+        
+        pd.testing.assert_frame_equal(txns1, txns2)
+
+
+class TestPopulationSynthesis:
+    """Test array-based user and account synthesis (vectorized=True)."""
+    
+    @pytest.fixture(scope='class')
+    def population(self):
+        generator = SyntheticDataGenerator(num_users=2000, seed=42, vectorized=True)
+        users_df = generator.generate_users()
+        accounts_df = generator.generate_accounts(users_df)
+        return generator, users_df, accounts_df
+    
+    def test_user_format(self, population):
+        """Test that users have the same shape as row-by-row users."""
+        _, users_df, _ = population
+        
+        assert users_df.columns.tolist() == ['user_id', 'name', 'email', 'created_at', 'metadata']
+        assert users_df['user_id'].tolist()[:2] == ['user_000', 'user_001']
+        assert users_df['email'].iloc[1] == 'user001@example.com'
+        assert users_df['name'].str.contains(' ').all()
+        # Metadata is exactly what json.dumps would write
+        for metadata in users_df['metadata'].head(50):
+            assert json.dumps(json.loads(metadata)) == metadata
+    
+    def test_demographics_distribution(self, population):
+        """Test that age brackets follow the configured weights."""
+        from ingest.config import AGE_BRACKETS
+        _, users_df, _ = population
+        metadata = users_df['metadata'].apply(json.loads)
+        
+        brackets = pd.Series([m['age_bracket'] for m in metadata]).value_counts(normalize=True)
+        for name, info in AGE_BRACKETS.items():
+            assert abs(brackets[name] - info['weight']) < 0.04, name
+        
+        for m in metadata:
+            assert SyntheticDataGenerator._get_income_bracket(m['income']) == m['income_bracket']
+            assert SyntheticDataGenerator._infer_life_stage(m['age'], m['income']) == m['life_stage']
+    
+    def test_profile_lookup(self, population):
+        """Test that indexed profile lookups match the stored metadata."""
+        generator, users_df, _ = population
+        
+        for user_id, metadata in zip(users_df['user_id'][:100], users_df['metadata'][:100]):
+            assert generator._get_user_metadata(user_id) == json.loads(metadata)
+        
+        with pytest.raises(ValueError):
+            generator._get_user_metadata('user_missing')
+    
+    def test_account_rules(self, population):
+        """Test account counts per user, ordering and unique IDs."""
+        _, users_df, accounts_df = population
+        per_user = accounts_df.groupby('user_id')['type']
+        
+        assert accounts_df['account_id'].is_unique
+        assert (per_user.apply(lambda t: (t == 'checking').sum()) == 1).all()
+        assert per_user.apply(lambda t: (t == 'credit_card').sum()).max() <= 3
+        assert (per_user.first() == 'checking').all()
+        assert accounts_df['user_id'].drop_duplicates().tolist() == users_df['user_id'].tolist()
+        assert 0.65 < (accounts_df['type'] == 'savings').sum() / len(users_df) < 0.75
+        assert accounts_df['mask'].str.match(r'^\d{4}$').all()
+        
+        cards = accounts_df[accounts_df['type'] == 'credit_card']
+        assert (cards['current_balance'] + cards['available_balance'] - cards['credit_limit']).abs().max() < 0.02
+
+
+class TestCompactTransactions:
+    """Test dictionary-encoded transaction frames (compact=True)."""
+
+    @pytest.fixture(scope='class')
+    def frames(self):
+        def generate(compact):
+            generator = SyntheticDataGenerator(num_users=200, seed=42, vectorized=True, compact=compact)
+            users_df = generator.generate_users()
+            accounts_df = generator.generate_accounts(users_df)
+            generator.generate_transactions(accounts_df)
+            return generator
+
+        return generate(False), generate(True)
+
+    def test_compact_dtypes(self, frames):
+        """Test that strings are categorical and dates/amounts are integers."""
+        from ingest.compact import COMPACT_COLUMNS
+        _, compact = frames
+        df = compact.transactions_df
+
+        assert df.columns.tolist() == COMPACT_COLUMNS
+        assert df['day'].dtype == 'int32'
+        assert df['amount_cents'].dtype == 'int32'
+        for column in ('account_id', 'user_id', 'merchant_name', 'merchant_entity_id',
+                       'category_primary', 'location_city', 'created_at'):
+            assert isinstance(df[column].dtype, pd.CategoricalDtype), column
+
+    def test_memory_reduction(self, frames):
+        """Test that compact frames use far less memory per transaction."""
+        regular, compact = frames
+        regular_bytes = regular.transactions_df.memory_usage(deep=True).sum()
+        compact_bytes = compact.transactions_df.memory_usage(deep=True).sum()
+
+        assert compact_bytes * 6 < regular_bytes
+
+    def test_expands_to_regular_frame(self, frames):
+        """Test that expanding gives exactly the regular vectorized frame."""
+        from ingest.compact import expand_transactions
+        regular, compact = frames
+        expanded = expand_transactions(compact.transactions_df)
+        columns = [c for c in regular.transactions_df.columns if c != 'created_at']
+
+        assert expanded.columns.tolist() == regular.transactions_df.columns.tolist()
+        pd.testing.assert_frame_equal(
+            expanded[columns].astype(object),
+            regular.transactions_df[columns].astype(object)
+        )
+
+    def test_export_matches_regular(self, frames, tmp_path, monkeypatch):
+        """Test that chunked CSV export writes the same file as a regular run."""
+        import ingest.compact
+        regular, compact = frames
+        monkeypatch.setattr(ingest.compact, 'EXPAND_CHUNK_ROWS', 1000)
+        # Same created_at so whole rows can be compared
+        created_at = compact.transactions_df['created_at'].cat.categories[0]
+        regular.transactions_df['created_at'] = created_at
+
+        regular.export_csv(str(tmp_path / 'regular'))
+        compact.export_csv(str(tmp_path / 'compact'))
+
+        name = 'synthetic_transactions.csv'
+        assert (tmp_path / 'compact' / name).read_text() == (tmp_path / 'regular' / name).read_text()
+
+        metadata = compact._create_metadata(str(tmp_path / 'compact'))
+        assert metadata['transaction_stats']['date_range']['min'] >= DATE_RANGE_START
+        assert metadata['transaction_stats']['date_range']['max'] <= DATE_RANGE_END
+
+
+class TestShardedGeneration:
+    """Test sharded generation with per-user random streams."""
+    
+    def _generate(self, num_users: int, workers: int, shard_size: int, seed: int = 42) -> dict:
+        generator = SyntheticDataGenerator(num_users=num_users, seed=seed, workers=workers)
+        return generator.generate_sharded(shard_size=shard_size)
+    
+    def test_identical_for_any_worker_count(self):
+        """Test that output is byte-identical for different workers and shard sizes."""
+        serial = self._generate(30, workers=1, shard_size=30)
+        parallel = self._generate(30, workers=3, shard_size=7)
+        
+        for name in serial:
+            assert serial[name].to_csv(index=False) == parallel[name].to_csv(index=False), \
+                f"{name} differs between serial and parallel generation"
+    
+    def test_different_seeds_differ(self):
+        """Test that a different seed produces different data and IDs."""
+        data1 = self._generate(5, workers=1, shard_size=5, seed=42)
+        data2 = self._generate(5, workers=1, shard_size=5, seed=43)
+        
+        assert not set(data1['accounts']['account_id']) & set(data2['accounts']['account_id'])
+        assert data1['users']['metadata'].tolist() != data2['users']['metadata'].tolist()
+    
+    def test_user_prefix_is_stable(self):
+        """Test that the first users do not change when more users are generated."""
+        small = self._generate(5, workers=1, shard_size=2)
+        large = self._generate(8, workers=1, shard_size=3)
+        
+        pd.testing.assert_frame_equal(small['users'], large['users'].iloc[:5])
+        pd.testing.assert_frame_equal(
+            small['accounts'],
+            large['accounts'][large['accounts']['user_id'].isin(small['users']['user_id'])]
+        )
+    
+    def test_sharded_integrity(self):
+        """Test unique IDs, foreign keys and date range of sharded output."""
+        data = self._generate(20, workers=1, shard_size=6)
+        
+        assert data['users']['user_id'].is_unique
+        assert data['accounts']['account_id'].is_unique
+        assert data['transactions']['transaction_id'].is_unique
+        assert data['liabilities']['liability_id'].is_unique
+        assert data['transactions']['account_id'].isin(data['accounts']['account_id']).all()
+        assert data['liabilities']['account_id'].isin(data['accounts']['account_id']).all()
+        assert (data['accounts'].groupby('user_id')['type'].apply(lambda t: (t == 'checking').sum()) == 1).all()
+        assert data['transactions']['date'].is_monotonic_increasing
+        assert data['transactions']['date'].min() >= DATE_RANGE_START
+        assert data['transactions']['date'].max() <= DATE_RANGE_END
+
+
+class TestSingleUserGeneration:
+    """Test random-access generation of individual users."""
+    
+    def test_matches_full_run(self):
+        """Test that generate_user() reproduces the user's rows of a full run."""
+        generator = SyntheticDataGenerator(num_users=25, seed=9, workers=1)
+        full = generator.generate_sharded(shard_size=6)
+        
+        for index in [0, 11, 24]:
+            user = generator.generate_user(index)
+            user_id = f'user_{index:03d}'
+            for name, df in user.items():
+                expected = full[name][full[name]['user_id'] == user_id]
+                assert len(df) == len(expected) > 0 or name == 'liabilities'
+                assert df.to_csv(index=False) == expected.to_csv(index=False), f"{name} of {user_id}"
+    
+    def test_find_users(self):
+        """Test profile search returns matching indices in order."""
+        generator = SyntheticDataGenerator(num_users=200, seed=9)
+        indices = generator.find_users(count=3, income_bracket='high')
+        
+        assert 0 < len(indices) <= 3
+        assert indices == sorted(indices)
+        for index in indices:
+            metadata = json.loads(generator.generate_user(index)['users']['metadata'].iloc[0])
+            assert metadata['income_bracket'] == 'high'
+    
+    def test_index_out_of_range(self):
+        """Test that indices outside the population are rejected."""
+        generator = SyntheticDataGenerator(num_users=5, seed=9)
+        
+        with pytest.raises(ValueError):
+            generator.generate_user(5)
+        with pytest.raises(ValueError):
+            generator.generate_user(-1)
+
+
+class TestStreamingGeneration:
+    """Test bounded-memory streaming generation."""
+    
+    def test_streaming_matches_in_memory(self, tmp_path):
+        """Test that streamed CSV files equal the in-memory sharded output."""
+        from ingest.streaming import generate_streaming
+        from ingest.sharded import generate_sharded
+        
+        expected = generate_sharded(25, seed=42, workers=1, shard_size=25)
+        summary = generate_streaming(25, seed=42, output_dir=str(tmp_path), workers=1, shard_size=4)
+        
+        for name, df in expected.items():
+            written = (tmp_path / f'synthetic_{name}.csv').read_text()
+            assert written == df.to_csv(index=False), f"{name} differs from in-memory output"
+            assert summary['counts'][name] == len(df)
+        
+        assert not [p for p in tmp_path.iterdir() if p.is_dir()], "Temporary run files left behind"
+    
+    def test_external_merge_is_stable(self, tmp_path):
+        """Test multi-pass merge keeps run order for equal dates."""
+        from ingest.streaming import external_merge
+        
+        runs = []
+        for i in range(7):
+            path = tmp_path / f'run_{i}.csv'
+            path.write_text(f'a,b,c,2025-05-0{1 + i % 3},{i}\na,b,c,2025-05-09,{i}\n')
+            runs.append(str(path))
+        
+        output = tmp_path / 'merged.csv'
+        external_merge(runs, str(output), 'h\n', str(tmp_path), fan_in=2)
+        lines = output.read_text().splitlines()
+        
+        assert lines[0] == 'h'
+        keys = [(line.split(',')[3], int(line.split(',')[4])) for line in lines[1:]]
+        assert keys == sorted(keys)
+    
+    def test_shard_size_for_budget(self):
+        """Test that shard size shrinks with workers and tiny budgets are rejected."""
+        from ingest.streaming import shard_size_for_budget
+        
+        assert shard_size_for_budget(1024, workers=1) > shard_size_for_budget(1024, workers=4) >= 1
+        with pytest.raises(ValueError, match="memory budget"):
+            shard_size_for_budget(100)
 
 
 class TestReproducibility:
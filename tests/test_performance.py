@@ -6,6 +6,8 @@ Tests performance requirements from PRD3-5:
 - Batch assignment throughput (100 users in <60s)
 - Database query performance
 - Concurrent request handling
+- Schema validation throughput per table
+- Recurring merchant detection scaling
 """
 
 import pytest
@@ -13,6 +15,10 @@ import time
 from personas.assignment import PersonaAssigner
 from personas.transitions import PersonaTransitionTracker
 from tests.personas.conftest import insert_test_user
+from ingest.data_generator import SyntheticDataGenerator
+from ingest.validator import SchemaValidator
+from features import SubscriptionDetector
+from tests.features.conftest import random_population
 
 
 class TestLatency:
@@ -363,3 +369,51 @@ class TestPerformanceMetrics:
         # Should handle at least 2 users per second
         assert throughput >= 2.0, f"Throughput {throughput:.2f} users/s is too low"
 
+
+class TestValidationThroughput:
+    """Benchmark SchemaValidator throughput per table."""
+    
+    @pytest.fixture(scope='class')
+    def frames(self):
+        """Generate one dataset to validate."""
+        generator = SyntheticDataGenerator(num_users=200, seed=42, vectorized=True)
+        users_df = generator.generate_users()
+        accounts_df = generator.generate_accounts(users_df)
+        return {
+            'users': users_df,
+            'accounts': accounts_df,
+            'transactions': generator.generate_transactions(accounts_df),
+            'liabilities': generator.generate_liabilities(accounts_df)
+        }
+    
+    @pytest.mark.parametrize('profile', ['strict', 'fast'])
+    @pytest.mark.parametrize('table', ['users', 'accounts', 'transactions', 'liabilities'])
+    def test_validation_throughput(self, frames, table, profile, benchmark):
+        """Measure validated rows per second for each table and profile."""
+        df = frames[table]
+        validate = getattr(SchemaValidator(profile), f'validate_{table}')
+        
+        benchmark(validate, df)
+        
+        if benchmark.stats:
+            throughput = len(df) / benchmark.stats.stats.mean
+            benchmark.extra_info['rows_per_second'] = throughput
+            print(f"\n{table} ({profile}): {throughput:,.0f} rows/second ({len(df)} rows)")
+
+
+class TestRecurringDetection:
+    """Benchmark recurring merchant detection at two population sizes."""
+    
+    @pytest.mark.parametrize('num_users', [100, 800])
+    def test_recurring_detection_throughput(self, num_users, benchmark):
+        """Measure charges classified per second; the rate should hold as users grow."""
+        frames = random_population(num_users)
+        detector = SubscriptionDetector()
+        
+        benchmark(detector.detect_recurring, frames, 90)
+        
+        if benchmark.stats:
+            throughput = len(frames.transactions) / benchmark.stats.stats.mean
+            benchmark.extra_info['rows_per_second'] = throughput
+            print(f"\nrecurring detection ({num_users} users): {throughput:,.0f} rows/second "
+                  f"({len(frames.transactions)} rows)")
@@ -249,6 +249,10 @@ def insert_test_signals(conn, user_id, signals):
     
     # Clear existing signals
     cursor.execute("DELETE FROM user_signals WHERE user_id = ?", (user_id,))
+    # Typed signal rows take precedence over the JSON rows inserted below
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'user_signal_values'")
+    if cursor.fetchone():
+        cursor.execute("DELETE FROM user_signal_values WHERE user_id = ?", (user_id,))
     
     # Insert signals
     for signal_type in ['credit', 'income', 'subscriptions', 'savings']: